@@ -0,0 +1,13 @@
+import os
+import sys
+
+# `python -m macOSUpdates` 진입점
+# Entry point for `python -m macOSUpdates`
+
+# 앱 모듈은 스크립트 폴더 기준으로 가져오므로 이 폴더를 경로에 추가
+# App modules are imported relative to the script folder, so put it on the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+sys.exit(main())
@@ -0,0 +1,54 @@
+import sys
+import os
+import datetime
+
+# 애플리케이션 리소스 경로 확인 함수
+# Function to determine application resource path
+def get_resource_path():
+    """
+    애플리케이션이 번들로 실행 중인지 확인하고 적절한 경로 반환
+    Check if application is running as a bundle and return appropriate path
+    """
+    if getattr(sys, 'frozen', False):
+        # 번들로 실행 중인 경우
+        # If running as a bundle
+        bundle_dir = os.path.dirname(sys.executable)
+        # macOS 앱 번들 구조에 맞게 경로 조정
+        # Adjust path according to macOS app bundle structure
+        if os.path.basename(os.path.dirname(os.path.dirname(bundle_dir))) == 'Contents':
+            return os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(bundle_dir))))
+        return bundle_dir
+    # 스크립트로 실행 중인 경우
+    # If running as a script
+    return os.path.dirname(os.path.abspath(__file__))
+
+# 임시 파일 경로 처리를 위한 함수
+# Function to handle temporary file paths
+def get_temp_path():
+    """
+    임시 파일 경로를 반환하는 함수 (/tmp 경로 사용)
+    Returns temp file path using /tmp directory
+    """
+    # /tmp 디렉토리 내에 로그 디렉토리 생성
+    # Create log directory in /tmp
+    temp_dir = os.path.join('/tmp', 'macOSUpdatelog')
+    if not os.path.exists(temp_dir):
+        os.makedirs(temp_dir)
+    
+    return temp_dir
+
+# 세션 로그 파일 경로 생성 함수
+# Function to build a session log file path
+def get_session_log_path(version, started=None, log_dir=None, session_id=None):
+    """
+    버전과 시작 시각으로 세션 로그 파일 경로를 만들어 반환 - session_id가 있으면 이름에 붙여
+    같은 초에 시작한 같은 버전의 세션끼리도 파일이 겹치지 않게 함
+    Build a session log file path from the version and start time - with `session_id` it is appended
+    to the name, so sessions of the same version started in the same second never share a file
+    """
+    started = started or datetime.datetime.now()
+    suffix = f"_{session_id}" if session_id else ''
+    return os.path.join(
+        log_dir or get_temp_path(),
+        f"macOS_update_{started.strftime('%Y%m%d_%H%M%S')}_{version}{suffix}.log"
+    )
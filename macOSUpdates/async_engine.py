@@ -0,0 +1,329 @@
+import time
+import signal
+import asyncio
+from fetch_runners import DEFAULT_TERMINATE_GRACE
+from pipe_reader import AsyncRawLineReader
+from diagnostics import stage_clock
+from fetch_engine import (FetchEngineBase, BlockingCall, DriveSteps, LineInterpreter, peer_step_events,
+                          FinishedEvent, ErrorEvent, dispatch_event)
+
+# asyncio 기반 다운로드 엔진 - 하나의 이벤트 루프에서 여러 softwareupdate 실행
+# asyncio download engine - drives many softwareupdate children from one event loop
+
+# 한 줄의 최대 길이 (StreamReader 버퍼 제한)
+# Maximum line length (StreamReader buffer limit)
+STREAM_LIMIT = 64 * 1024
+
+# asyncio 다운로드 엔진
+# asyncio download engine
+class AsyncFetchEngine(FetchEngineBase):
+    """
+    asyncio.create_subprocess_exec로 softwareupdate를 실행하고 이벤트를 비동기로 생성하는 클래스
+    Runs softwareupdate with asyncio.create_subprocess_exec and yields events asynchronously
+
+    이벤트는 소비자가 요청할 때만 읽으므로 소비가 느리면 파이프가 차서 자식 프로세스가 멈춤 (배압)
+    Output is only read when the consumer asks for the next event, so a slow consumer
+    fills the pipe and blocks the child (backpressure)
+    """
+
+    def __init__(self, job, log_sink=None, runner=None, cache=None,
+                 timeout=None, inactivity_timeout=None, terminate_grace=DEFAULT_TERMINATE_GRACE,
+                 metrics=None, start_percent=0, peer=None, verifier=None):
+        """
+        초기화 함수 - runner는 prepare(command)를 제공하는 SubprocessRunner 계열,
+        timeout/inactivity_timeout은 전체/무응답 제한 시간 (초), 나머지 인자는 FetchEngineBase와 같음
+        Initialization function - `runner` is a SubprocessRunner-style object providing prepare(command);
+        `timeout`/`inactivity_timeout` are the overall/inactivity limits in seconds,
+        the other arguments are the same as FetchEngineBase's
+        """
+        super().__init__(job, log_sink, runner, cache, metrics, start_percent, peer, terminate_grace, verifier)
+        self.timeout = timeout
+        self.inactivity_timeout = inactivity_timeout
+        self.step_result = None
+        self.flow_result = None
+        self._loop = None
+
+    def _stop(self):
+        # 엔진의 루프에서 SIGTERM 후 유예 시간이 지나면 SIGKILL (다른 스레드에서 불러도 됨)
+        # SIGTERM, then SIGKILL after the grace period, on the engine's loop (safe to call from other threads)
+        if self._loop is not None and self.process is not None and self.process.returncode is None:
+            self._loop.call_soon_threadsafe(lambda: self._loop.create_task(self._stop_process()))
+
+    def _signal(self, signum):
+        if self.process is not None and self.process.returncode is None:
+            self.process.send_signal(signum)
+
+    def _suspend_process(self):
+        self._signal(signal.SIGSTOP)
+
+    def _resume_process(self):
+        self._signal(signal.SIGCONT)
+
+    async def run(self, listener=None):
+        """
+        다운로드를 수행하며 이벤트를 listener에 전달 - 성공하면 True 반환
+        Perform the download, forwarding events to the listener - returns True on success
+        """
+        ok = False
+        async for event in self.events():
+            if listener is not None:
+                dispatch_event(event, listener)
+            if isinstance(event, FinishedEvent):
+                ok = True
+        return ok
+
+    async def _drive(self, generator, interpreter):
+        """
+        실행기 스레드에서 단계 제너레이터를 일시 정지/취소를 지키며 진행하고 이벤트를 생성
+        - 반환값 (취소되면 None)은 step_result에 저장
+        Run a step generator on an executor thread, honouring pause/cancel, while yielding events
+        - its return value (None when cancelled) goes to step_result
+        """
+        loop = asyncio.get_running_loop()
+        steps = asyncio.Queue()
+        done = object()
+
+        def pump():
+            try:
+                while self._running.wait() and not self.cancelled:
+                    try:
+                        step = next(generator)
+                    except StopIteration as stop:
+                        return stop.value
+                    loop.call_soon_threadsafe(steps.put_nowait, step)
+            finally:
+                generator.close()
+                loop.call_soon_threadsafe(steps.put_nowait, done)
+            return None
+
+        future = loop.run_in_executor(None, pump)
+        while True:
+            step = await steps.get()
+            if step is done:
+                break
+            for event in peer_step_events(step, interpreter, self._log):
+                yield event
+        self.step_result = await future
+
+    async def _run_flow(self, flow):
+        """
+        공유 흐름을 진행하며 이벤트를 생성 - 파일 작업은 실행기 스레드에서 처리하고 흐름의 반환값은 flow_result에 저장
+        Run a shared flow while yielding its events - file work runs on an executor thread and
+        the flow's return value goes to flow_result
+        """
+        loop = asyncio.get_running_loop()
+        reply = None
+        self.flow_result = None
+        try:
+            while True:
+                try:
+                    item = flow.send(reply)
+                except StopIteration as stop:
+                    self.flow_result = stop.value
+                    return
+                reply = None
+                if isinstance(item, BlockingCall):
+                    reply = await loop.run_in_executor(None, item.func, *item.args)
+                elif isinstance(item, DriveSteps):
+                    async for event in self._drive(item.steps, item.interpreter):
+                        yield event
+                    reply = self.step_result
+                else:
+                    yield item
+        finally:
+            flow.close()
+
+    async def _stop_process(self):
+        """
+        종료 요청 후 유예 시간이 지나면 강제 종료
+        Terminate, then kill once the grace period expires
+        """
+        process = self.process
+        if process is None or process.returncode is not None:
+            return
+        # 일시 정지된 프로세스는 SIGCONT를 받아야 SIGTERM을 처리함
+        # A suspended process only handles SIGTERM once continued
+        process.terminate()
+        process.send_signal(signal.SIGCONT)
+        try:
+            await asyncio.wait_for(process.wait(), self.terminate_grace)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def events(self):
+        """
+        다운로드를 수행하며 이벤트를 순서대로 생성하는 비동기 제너레이터
+        Async generator performing the download and yielding events in order
+        """
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        if self.metrics.started_at is None:
+            self.metrics.start()
+        try:
+            async for event in self._run_flow(self._before_download()):
+                yield event
+            if self.flow_result:
+                return
+
+            # 프로세스 실행
+            # Execute process
+            command, env = self.runner.prepare(self.job.command())
+            self.process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                env=env,
+                limit=STREAM_LIMIT
+            )
+            self.last_output_time = time.monotonic()
+            if self.cancelled:
+                self._stop()
+            elif self.paused:
+                self._signal(signal.SIGSTOP)
+
+            # raw 읽기는 CR/LF 모두에서 나눈 str 줄을, text 읽기는 LF로 나눈 bytes 줄을 반환
+            # The raw reader returns str lines split on CR and LF, the text reader bytes lines split on LF
+            if getattr(self.runner, 'reader', 'raw') == 'raw':
+                stdout = AsyncRawLineReader(self.process.stdout)
+            else:
+                stdout = self.process.stdout
+
+            deadline = loop.time() + self.timeout if self.timeout else None
+            interpreter = LineInterpreter(metrics=self.metrics, start_percent=self.start_percent)
+            self.interpreter = interpreter
+
+            # 프로세스 출력 처리 (전체/무응답 제한 시간 적용, 진단이 켜져 있으면 단계별 시간 기록)
+            # Process output handling (with overall and inactivity timeouts; per-stage times while diagnostics are on)
+            clock = stage_clock()
+            while True:
+                wait = self.inactivity_timeout
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    wait = remaining if wait is None else min(wait, remaining)
+                try:
+                    if wait is None:
+                        raw = await stdout.readline()
+                    else:
+                        raw = await asyncio.wait_for(stdout.readline(), max(wait, 0))
+                except asyncio.TimeoutError:
+                    # 일시 정지 중에는 무응답 제한 시간을 적용하지 않음
+                    # The inactivity timeout does not apply while paused
+                    if self.paused and (deadline is None or loop.time() < deadline):
+                        continue
+                    await self._stop_process()
+                    error_msg = "제한 시간 초과로 다운로드 중지 (Download stopped: timed out)"
+                    yield self._log(error_msg)
+                    self.log_sink.sync()
+                    self._record('timeout', self.process.returncode)
+                    yield ErrorEvent(error_msg, self.process.returncode)
+                    return
+                if not raw:
+                    break
+                if clock is not None:
+                    clock.lap('read')
+                self.last_output_time = time.monotonic()
+                if isinstance(raw, bytes):
+                    raw = raw.decode('utf-8', errors='replace')
+                output = raw.strip()
+                if output:
+                    event = self._log(output)
+                    if clock is not None:
+                        clock.lap('log')
+                    yield event
+                    if clock is not None:
+                        clock.lap('emit')
+                    events = interpreter.feed(output)
+                    if clock is not None:
+                        clock.lap('parse')
+                    for event in events:
+                        yield event
+                    if clock is not None:
+                        clock.lap('emit')
+
+            # 프로세스 종료 상태 확인
+            # Check process exit status
+            returncode = await self.process.wait()
+            async for event in self._run_flow(self._after_download(returncode)):
+                yield event
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # 작업이 취소되거나 소비자가 중간에 멈추면 (aclose()) 동기 엔진처럼 자식 프로세스를 정리하고 전파
+            # - 이미 끝난 세션의 요약은 그대로 둠
+            # On task cancellation or when the consumer stops early (aclose()) clean up the child like the sync
+            # engine does and propagate - an ended session's summary is left as it is
+            await self._stop_process()
+            if not self.summarized:
+                self.log_sink.log("다운로드 작업 취소됨 (Download task cancelled)")
+                self._record('cancelled', self.process.returncode if self.process else None)
+            raise
+        except Exception as e:
+            for event in self._failed(e):
+                yield event
+        finally:
+            self.log_sink.flush()
+
+# 여러 작업을 한 루프에서 동시에 실행하는 풀
+# Pool running several jobs concurrently on one loop
+class AsyncFetchPool:
+    """
+    동시 실행 수 제한 안에서 여러 AsyncFetchEngine을 실행하고 (엔진, 이벤트)를 하나의 스트림으로 합치는 클래스
+    Runs several AsyncFetchEngines under a concurrency cap and merges their
+    (engine, event) pairs into one stream
+
+    이벤트 큐 크기가 제한되어 있어 소비가 느리면 생산자가 기다림 (배압)
+    The event queue is bounded, so producers wait when the consumer is slow (backpressure)
+    """
+
+    def __init__(self, max_concurrency=2, queue_size=256):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_size = queue_size
+
+    async def stream(self, engines):
+        """
+        모든 엔진의 (엔진, 이벤트) 쌍을 도착 순서대로 생성
+        Yield (engine, event) pairs from every engine in arrival order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        queue = asyncio.Queue(self.queue_size)
+        done = object()
+
+        async def drive(engine):
+            try:
+                async with semaphore:
+                    async for event in engine.events():
+                        await queue.put((engine, event))
+            except Exception as e:
+                await queue.put((engine, ErrorEvent(f"예외 발생: {str(e)}")))
+            await queue.put((engine, done))
+
+        tasks = [asyncio.ensure_future(drive(engine)) for engine in engines]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                engine, event = await queue.get()
+                if event is done:
+                    remaining -= 1
+                    continue
+                yield engine, event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, engines, on_event=None):
+        """
+        모든 엔진을 실행하고 성공 여부 목록 반환 - on_event(engine, event)로 이벤트 전달
+        Run every engine and return a list of success flags - events go to on_event(engine, event)
+        """
+        results = {id(engine): False for engine in engines}
+        async for engine, event in self.stream(engines):
+            if on_event is not None:
+                on_event(engine, event)
+            if isinstance(event, FinishedEvent):
+                results[id(engine)] = True
+        return [results[id(engine)] for engine in engines]
@@ -0,0 +1,66 @@
+"""
+벤치마크 기준값 저장/비교 도우미
+Helpers storing and comparing benchmark baselines
+
+기준값 파일은 {플랫폼 키: {이름: {지표: 값}}} 형식의 JSON
+A baseline file is JSON shaped as {platform key: {name: {metric: value}}}
+"""
+import json
+import platform
+
+def baseline_key():
+    """
+    기준값을 구분하는 플랫폼/아키텍처 키
+    Platform/architecture key the baselines are stored under
+    """
+    return f"{platform.system()}-{platform.machine()}"
+
+def load_baselines(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def record_baseline(path, name, result):
+    """
+    이 플랫폼의 name 기준값을 result로 바꿔 저장
+    Store `result` as this platform's baseline for `name`
+    """
+    baselines = load_baselines(path)
+    baselines.setdefault(baseline_key(), {})[name] = result
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def compare(result, baseline, threshold, higher_is_better=(), thresholds=None):
+    """
+    기준값과 비교해 (지표, 값, 기준값, 한계, 회귀 여부) 목록 반환 -
+    기본은 낮을수록 좋고 higher_is_better의 지표는 높을수록 좋음, thresholds는 지표별 허용 비율
+    Compare with a baseline and return (metric, value, baseline, limit, regressed) rows -
+    lower is better except for the metrics in `higher_is_better`; `thresholds` overrides the ratio per metric
+    """
+    rows = []
+    for metric, expected in baseline.items():
+        value = result.get(metric)
+        if value is None or expected is None:
+            continue
+        allowed = (thresholds or {}).get(metric, threshold)
+        if metric in higher_is_better:
+            limit = expected * (1.0 - allowed)
+            regressed = value < limit
+        else:
+            limit = expected * (1.0 + allowed)
+            regressed = value > limit
+        rows.append((metric, value, expected, limit, regressed))
+    return rows
+
+def print_comparison(rows):
+    """
+    비교 결과를 출력하고 회귀가 있으면 True 반환
+    Print the comparison rows and return True when any metric regressed
+    """
+    for metric, value, expected, limit, regressed in rows:
+        print(f"  {metric:<18} {value:12.2f}  baseline {expected:12.2f}  limit {limit:12.2f}  "
+              f"{'REGRESSION' if regressed else 'OK'}")
+    return any(row[4] for row in rows)
@@ -0,0 +1,69 @@
+"""
+출력 분류기 마이크로 벤치마크 - 녹화된 출력으로 줄당 해석 비용 측정
+Output classifier micro-benchmark - measures per-line parsing cost over recorded transcripts
+
+사용법 (Usage):
+    python macOSUpdates/benchmarks/bench_classifier.py [--repeat N] [transcript ...]
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_softwareupdate import TRANSCRIPT_DIR
+from fetch_runners import load_transcript
+from output_classifier import OutputClassifier
+from fetch_engine import LineInterpreter
+
+# 이전 DownloadThread.run의 해석 방식 (비교 기준)
+# Parsing as previously done in DownloadThread.run (baseline)
+def legacy_classify(output, progress_pattern=r"(\d+\.?\d*)%"):
+    if "%" in output:
+        match = re.search(progress_pattern, output)
+        if match:
+            return int(float(match.group(1)))
+    elif "Downloading" in output:
+        return 'downloading'
+    elif "Verifying" in output:
+        return 'verifying'
+    elif "Installing" in output:
+        return 'installing'
+    return None
+
+def bench(name, func, lines, repeat):
+    """
+    func를 모든 줄에 repeat번 적용하고 줄당 나노초 출력
+    Apply func to every line `repeat` times and print nanoseconds per line
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines:
+            func(line)
+    elapsed = time.perf_counter() - start
+    total = len(lines) * repeat
+    print(f"{name:<24} {elapsed * 1e9 / total:8.1f} ns/line  {total / elapsed:12.0f} lines/s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('transcripts', nargs='*')
+    args = parser.parse_args(argv)
+
+    paths = args.transcripts or sorted(glob.glob(os.path.join(TRANSCRIPT_DIR, '*.txt')))
+    lines = []
+    for path in paths:
+        lines.extend(line.strip() for line in load_transcript(path, '15.3.1'))
+    print(f"{len(lines)} lines from {len(paths)} transcript(s), repeat {args.repeat}")
+
+    classifier = OutputClassifier()
+    bench('legacy (if/elif chain)', legacy_classify, lines, args.repeat)
+    bench('OutputClassifier', classifier.classify, lines, args.repeat)
+    interpreter = LineInterpreter()
+    bench('LineInterpreter.feed', interpreter.feed, lines, args.repeat)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+패키징 벤치마크 - 임시 번들(또는 --source 폴더)을 압축 방식/스레드 수별로 패키징하고
+tar를 디스크에 먼저 쓰고 압축하는 방식(두 번째 사본)과 비교
+Packaging benchmark - packages a temporary bundle (or the --source folder) per codec/thread count
+and compares it with writing the tar to disk first and compressing it afterwards (a second copy)
+
+사용법 (Usage):
+    python macOSUpdates/benchmarks/bench_package.py [--size-mb 512] [--codec zstd] [--threads 1 --threads 0]
+    python macOSUpdates/benchmarks/bench_package.py --source "/Applications/Install macOS Sonoma.app"
+
+임시 번들은 절반이 무작위(압축 안 됨), 절반이 반복 텍스트라 실제 설치 프로그램보다 잘 압축됨
+The temporary bundle is half random (incompressible) and half repeated text, so it compresses better
+than a real installer
+"""
+import os
+import sys
+import time
+import shutil
+import tarfile
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from installer_package import InstallerPackager, CODECS, DEFAULT_LEVELS
+
+def run_steps(steps):
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def make_bundle(root, size_mb):
+    """
+    size_mb 크기의 임시 번들 생성 (무작위 dmg 하나와 텍스트 파일 여러 개)
+    Create a temporary bundle of `size_mb` (one random dmg plus several text files)
+    """
+    app_path = os.path.join(root, 'Install macOS Bench.app')
+    payload = os.path.join(app_path, 'Contents', 'SharedSupport')
+    resources = os.path.join(app_path, 'Contents', 'Resources')
+    os.makedirs(payload)
+    os.makedirs(resources)
+    with open(os.path.join(payload, 'SharedSupport.dmg'), 'wb') as f:
+        for _ in range(size_mb // 2):
+            f.write(os.urandom(1024 * 1024))
+    text = b''.join(f"line {index} of a resource file\n".encode() for index in range(40000))
+    for index in range(size_mb // 2):
+        with open(os.path.join(resources, f'resource{index}.txt'), 'wb') as f:
+            f.write(text[:1024 * 1024])
+    return app_path
+
+def staged(source, output_dir, codec, level):
+    """
+    비교 기준 - tar 파일을 먼저 디스크에 쓰고 압축 명령으로 따로 압축
+    Baseline - write the tar file to disk first, then compress it with the command separately
+    """
+    tar_path = os.path.join(output_dir, 'staged.tar')
+    with tarfile.open(tar_path, 'w', format=tarfile.PAX_FORMAT) as tar:
+        tar.add(source, arcname=os.path.basename(source))
+    if codec != 'none':
+        subprocess.run([codec, '-q', f'-{level}', '-T0', '-f', tar_path], check=True)
+
+def bench(name, func, size_bytes, runs):
+    """
+    func를 runs번 실행해 가장 빠른 시간, 처리량, 압축률 출력
+    Run func `runs` times and print the best time, throughput and ratio
+    """
+    best = result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    ratio = f"{result.output_bytes / result.input_bytes:7.1%}" if result is not None else '      -'
+    print(f"{name:<30} {best * 1000:9.1f} ms  {size_bytes / best / 1e6:9.0f} MB/s  {ratio}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--size-mb', type=int, default=512)
+    parser.add_argument('--source', default=None)
+    parser.add_argument('--codec', dest='codecs', action='append', choices=sorted(CODECS), default=None)
+    parser.add_argument('--threads', dest='thread_counts', action='append', type=int, default=None)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--no-staged', action='store_true')
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix='bench_package_')
+    try:
+        source = args.source or make_bundle(root, args.size_mb)
+        output_dir = os.path.join(root, 'out')
+        size_bytes = sum(os.path.getsize(os.path.join(path, name))
+                         for path, _, files in os.walk(source) for name in files)
+        print(f"{size_bytes / 1e9:.2f} GB, {os.cpu_count()} CPU(s), best of {args.runs}")
+
+        for codec in args.codecs or ['zstd']:
+            level = DEFAULT_LEVELS[codec]
+            label = codec if level is None else f"{codec} -{level}"
+            for threads in [0] if codec == 'none' else args.thread_counts or [1, 0]:
+                packager = InstallerPackager(output_dir, codec, threads=threads)
+                bench(label if codec == 'none' else f"{label}, threads {threads or 'auto'}",
+                      lambda: run_steps(packager.package(source)), size_bytes, args.runs)
+            if not args.no_staged and (codec == 'none' or shutil.which(codec)):
+                bench(f"{label} staged tar + compress",
+                      lambda: staged(source, output_dir, codec, level), size_bytes, args.runs)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
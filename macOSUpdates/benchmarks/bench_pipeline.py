@@ -0,0 +1,259 @@
+"""
+다운로드 파이프라인 벤치마크 - 가짜 softwareupdate로 실제 GUI 파이프라인 전체를 측정
+Download pipeline benchmark - drives the real GUI pipeline end to end with a fake softwareupdate
+
+사용법 (Usage):
+    python macOSUpdates/benchmarks/bench_pipeline.py [--scenario NAME ...] [--runs N] [--threshold 0.25] [--record]
+                                                     [--reader raw|text]
+
+시나리오마다 새 프로세스에서 MainWindow/DownloadQueue/DownloadThread/SignalBridge/LogSink와
+로깅 파이프라인을 그대로 실행하고 (디스플레이가 없으면 Qt offscreen 플랫폼 사용) 다음을 측정:
+처리량 (줄/초), 줄당 CPU, 최대 RSS, UI 이벤트 수, 자식 출력부터 진행률 표시까지의 지연
+Each scenario runs in a fresh process through the real MainWindow/DownloadQueue/DownloadThread/
+SignalBridge/LogSink and logging pipeline (Qt offscreen platform without a display) and reports
+throughput (lines/s), CPU per line, peak RSS, UI event counts and the latency from child output
+to the progress update
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import NamedTuple, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from baselines import baseline_key, load_baselines, record_baseline, compare, print_comparison
+from fetch_runners import READERS, DEFAULT_READER
+
+# 기준값 파일 경로
+# Baseline file path
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pipeline_baseline.json')
+
+# 측정에 사용하는 버전
+# Version used for the measurement
+VERSION = '15.3.1'
+
+# 시나리오 하나의 최대 실행 시간 (초)
+# Maximum run time of one scenario (seconds)
+SCENARIO_TIMEOUT = 120.0
+
+# 벤치마크 시나리오 - 출력, 초당 줄 수 (None이면 최대 속도), 멈춤 지점, 진행률 줄을 CR로 끝낼지 여부
+# Benchmark scenario - transcript, lines per second (None for full speed), stall points and whether
+# progress lines end in CR
+class Scenario(NamedTuple):
+    transcript: str
+    rate: Optional[int] = None
+    stall: Optional[str] = None
+    carriage_returns: bool = False
+
+SCENARIOS = {
+    'recorded': Scenario('fetch_success.txt'),
+    'rate-1k': Scenario('synthetic:2000', 1000),
+    'rate-10k': Scenario('synthetic:20000', 10000),
+    'rate-100k': Scenario('synthetic:100000', 100000),
+    'stalls': Scenario('synthetic:2000', 1000, '500:0.5,1500:1.0'),
+    'cr-100k': Scenario('synthetic:100000', 100000, carriage_returns=True),
+}
+
+# 기준값과 비교할 지표 (lines_per_s만 높을수록 좋음)
+# Metrics compared against the baseline (only lines_per_s is higher-is-better)
+COMPARED_METRICS = ('lines_per_s', 'cpu_us_per_line', 'peak_rss_mib', 'ui_events', 'latency_p95_ms')
+
+# 스케줄링/프레임 시점에 따라 크게 흔들리는 지표의 허용 비율
+# Allowed ratio for metrics that swing with scheduling and frame timing
+METRIC_THRESHOLDS = {'latency_p95_ms': 1.0, 'ui_events': 0.5}
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+def first_progress_lines(lines):
+    """
+    정수 진행률마다 처음 그 값을 만든 출력 줄 번호
+    For every integer percent, the number of the first output line producing it
+    """
+    from output_classifier import OutputClassifier, Progress
+    classifier = OutputClassifier()
+    first = {}
+    for number, line in enumerate(lines):
+        result = classifier.classify(line.strip())
+        if isinstance(result, Progress):
+            first.setdefault(int(result.percent), number)
+    return first
+
+def run_scenario(scenario, work_dir, reader):
+    """
+    현재 프로세스에서 시나리오 하나를 reader 읽기 방식으로 실행하고 측정값 사전 반환 (--child 모드)
+    Run one scenario in this process with the `reader` output reader and return its measurements (--child mode)
+    """
+    import resource
+    if sys.platform != 'darwin' and not os.environ.get('DISPLAY'):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    from macOSUpdate import MainWindow, DownloadThread
+    from catalog import CatalogStore, PlistSource
+    from fake_softwareupdate import TRANSCRIPT_DIR
+    from fetch_runners import fake_softwareupdate_runner, load_transcript
+    from fetch_supervisor import RetryPolicy
+    from log_pipeline import setup_logging
+    from diagnostics import peak_rss_mib
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    log_dir = os.path.join(work_dir, 'logs')
+    times_path = os.path.join(work_dir, 'times.json')
+    setup_logging(log_dir)
+
+    runner = fake_softwareupdate_runner(scenario.transcript, scenario.rate, stall=scenario.stall,
+                                        times_path=times_path, carriage_returns=scenario.carriage_returns,
+                                        reader=reader)
+    store = CatalogStore(os.path.join(work_dir, 'catalog.json'),
+                         source=PlistSource(os.path.join(TRANSCRIPT_DIR, 'catalog_fixture.plist')))
+    window = MainWindow(catalog_store=store)
+    download_queue = window.download_queue
+    download_queue.log_dir = log_dir
+    download_queue.thread_factory = lambda log_sink, bridge, version: DownloadThread(
+        log_sink, bridge, version, runner=runner, policy=RetryPolicy(max_attempts=1))
+
+    # UI 스레드에 도착한 이벤트 수와 진행률 도착 시각
+    # Events arriving on the UI thread and progress arrival times
+    counts = {'progress': 0, 'status': 0, 'status_lines': 0, 'metrics': 0}
+    arrivals = []
+    finished = []
+
+    def on_progress(job, value):
+        counts['progress'] += 1
+        arrivals.append((value, time.monotonic()))
+
+    def on_status(job, lines):
+        counts['status'] += 1
+        counts['status_lines'] += len(lines)
+
+    def on_metrics(job, metrics):
+        counts['metrics'] += 1
+
+    def on_idle():
+        finished.append(time.monotonic())
+        app.quit()
+
+    download_queue.job_progress_signal.connect(on_progress)
+    download_queue.job_status_signal.connect(on_status)
+    download_queue.job_metrics_signal.connect(on_metrics)
+    download_queue.queue_idle_signal.connect(on_idle)
+
+    window.show()
+    app.processEvents()
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.monotonic()
+    QTimer.singleShot(0, lambda: download_queue.add_versions([VERSION]))
+    QTimer.singleShot(int(SCENARIO_TIMEOUT * 1000), app.quit)
+    app.exec_()
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    if not finished:
+        raise RuntimeError(f"{SCENARIO_TIMEOUT:.0f}초 안에 끝나지 않음 (did not finish within {SCENARIO_TIMEOUT:.0f} s)")
+    job = download_queue.jobs[0]
+
+    lines = load_transcript(scenario.transcript, VERSION)
+    with open(times_path, 'r', encoding='utf-8') as f:
+        emitted = json.load(f)
+    first_lines = first_progress_lines(lines)
+    latencies = [(arrived - emitted[first_lines[value]]) * 1000.0
+                 for value, arrived in arrivals if value in first_lines]
+
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    return {
+        'state': job.state,
+        'lines': len(lines),
+        'wall_s': round(finished[0] - started, 3),
+        'lines_per_s': round(len(lines) / max(finished[0] - emitted[0], 1e-9), 1),
+        'cpu_us_per_line': round(cpu * 1e6 / len(lines), 2),
+        'peak_rss_mib': peak_rss_mib(),
+        'ui_events': counts['progress'] + counts['status'] + counts['metrics'],
+        'ui_progress': counts['progress'],
+        'ui_status': counts['status'],
+        'ui_status_lines': counts['status_lines'],
+        'ui_metrics': counts['metrics'],
+        'latency_p50_ms': round(percentile(latencies, 0.5) or 0.0, 2),
+        'latency_p95_ms': round(percentile(latencies, 0.95) or 0.0, 2),
+        'latency_max_ms': round(max(latencies, default=0.0), 2),
+    }
+
+def measure(name, runs, reader):
+    """
+    시나리오를 runs번 새 프로세스에서 실행해 지표별 중앙값 반환
+    Run a scenario `runs` times in fresh processes and return the median per metric
+    """
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as work_dir:
+            process = subprocess.run([sys.executable, os.path.abspath(__file__), '--reader', reader,
+                                      '--child', name, work_dir],
+                                     stdout=subprocess.PIPE, universal_newlines=True,
+                                     timeout=SCENARIO_TIMEOUT + 30)
+        if process.returncode != 0:
+            raise RuntimeError(f"{name} 실행 실패 (run failed): exit code {process.returncode}")
+        sample = json.loads(process.stdout.strip().splitlines()[-1])
+        if sample.pop('state') != 'finished':
+            raise RuntimeError(f"{name} 다운로드 실패 (download failed)")
+        samples.append(sample)
+    return {metric: round(statistics.median(sample[metric] for sample in samples), 2) for metric in samples[0]}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='실행할 시나리오 (Scenario to run; default: all)')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='허용 회귀 비율 (Allowed regression ratio)')
+    parser.add_argument('--record', action='store_true',
+                        help='결과를 이 플랫폼의 기준값으로 저장 (Store the results as this platform\'s baselines)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력 (Print the results as JSON)')
+    parser.add_argument('--reader', choices=READERS, default=DEFAULT_READER,
+                        help='출력 읽기 방식, 기본이 아니면 기준값 이름에 붙음 '
+                             '(Output reader; non-default readers are appended to the baseline names)')
+    parser.add_argument('--child', nargs=2, metavar=('SCENARIO', 'WORK_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        name, work_dir = args.child
+        print(json.dumps(run_scenario(SCENARIOS[name], work_dir, args.reader)))
+        return 0
+
+    key = baseline_key()
+    baselines = load_baselines(args.baseline).get(key, {})
+    results = {}
+    regressed = False
+    for scenario in args.scenario or list(SCENARIOS):
+        result = measure(scenario, args.runs, args.reader)
+        name = scenario if args.reader == DEFAULT_READER else f"{scenario}/{args.reader}"
+        results[name] = result
+        if args.json:
+            continue
+        print(f"{name}: {result['lines']:.0f} lines in {result['wall_s']:.2f} s, "
+              f"{result['lines_per_s']:.0f} lines/s, {result['cpu_us_per_line']:.1f} us CPU/line, "
+              f"peak RSS {result['peak_rss_mib']:.1f} MiB, {result['ui_events']:.0f} UI events, "
+              f"latency p50 {result['latency_p50_ms']:.1f} / p95 {result['latency_p95_ms']:.1f} ms "
+              f"(median of {args.runs})")
+        if args.record:
+            record_baseline(args.baseline, name, {metric: result[metric] for metric in COMPARED_METRICS})
+        elif name in baselines:
+            regressed = print_comparison(compare(result, baselines[name], args.threshold,
+                                                 higher_is_better=('lines_per_s',),
+                                                 thresholds=METRIC_THRESHOLDS)) or regressed
+
+    if args.json:
+        print(json.dumps({'platform': key, 'results': results}, indent=2))
+    elif args.record:
+        print(f"기준값 저장 (Baselines recorded): {args.baseline}")
+    return 1 if regressed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+시작 시간 벤치마크 - 첫 화면까지의 시간을 기록된 기준값과 비교
+Startup benchmark - compares the time to first paint against a recorded baseline
+
+사용법 (Usage):
+    python macOSUpdates/benchmarks/bench_startup.py [--runs N] [--threshold 0.25] [--record]
+
+기준값은 플랫폼/아키텍처별로 startup_baseline.json에 저장되며, 중앙값이 기준값보다
+threshold 비율 이상 느리면 종료 코드 1로 끝남
+Baselines are stored per platform/architecture in startup_baseline.json; the run exits
+with code 1 when the median is slower than the baseline by more than `threshold`
+"""
+import os
+import sys
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_softwareupdate import TRANSCRIPT_DIR
+from startup_profile import profile_command
+from baselines import baseline_key, load_baselines, record_baseline, compare, print_comparison
+
+# 기준값 파일 경로
+# Baseline file path
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_baseline.json')
+
+# softwareupdate 없이 측정하도록 사용하는 카탈로그
+# Catalog used so the measurement never runs softwareupdate
+CATALOG_FIXTURE = os.path.join(TRANSCRIPT_DIR, 'catalog_fixture.plist')
+
+# 비교할 지표
+# Metrics compared against the baseline
+METRICS = ('first_paint_ms', 'import_ms')
+
+def measure(runs):
+    """
+    GUI를 runs번 실행해 지표별 중앙값 반환 - 실패한 실행이 있으면 RuntimeError
+    Launch the GUI `runs` times and return the median per metric - RuntimeError when a run fails
+    """
+    env = {}
+    if sys.platform != 'darwin' and not os.environ.get('DISPLAY'):
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    samples = {metric: [] for metric in METRICS}
+    for _ in range(runs):
+        report = profile_command(['gui', '--catalog-plist', CATALOG_FIXTURE], env=env)
+        if report['returncode'] != 0 or report['first_paint_ms'] is None:
+            raise RuntimeError(f"GUI 실행 실패 (GUI launch failed): exit code {report['returncode']}")
+        for metric in METRICS:
+            samples[metric].append(report[metric])
+    return {metric: round(statistics.median(values), 2) for metric, values in samples.items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='허용 회귀 비율 (Allowed regression ratio)')
+    parser.add_argument('--record', action='store_true',
+                        help='결과를 이 플랫폼의 기준값으로 저장 (Store the result as this platform\'s baseline)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    key = baseline_key()
+    result = measure(args.runs)
+    print(f"{key}: " + ', '.join(f"{metric} {value:.1f}" for metric, value in result.items())
+          + f" (median of {args.runs})")
+
+    if args.record:
+        record_baseline(args.baseline, 'gui', result)
+        print(f"기준값 저장 (Baseline recorded): {args.baseline}")
+        return 0
+
+    baseline = load_baselines(args.baseline).get(key, {}).get('gui')
+    if baseline is None:
+        print(f"{key} 기준값 없음 - --record로 기록 (No baseline for {key} - record one with --record)")
+        return 0
+    return 1 if print_comparison(compare(result, baseline, args.threshold)) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+업로드 벤치마크 - 로컬 대역 배포 지점에 파일을 올리며 병렬 연결 수, 이어 올리기, 청크 건너뛰기를 비교
+Upload benchmark - uploads a file to a local stand-in distribution point and compares the number of
+parallel connections, resuming and chunk skipping
+
+사용법 (Usage):
+    python macOSUpdates/benchmarks/bench_upload.py [--size-mb 256] [--latency-ms 20] [--workers 1 --workers 4]
+
+--latency-ms는 청크 요청마다 서버에서 기다리는 시간으로 실제 네트워크 왕복 시간을 흉내 냄
+(루프백에서는 이것이 없으면 병렬 연결의 이점이 거의 드러나지 않음)
+--latency-ms is a server-side wait per chunk request that mimics a real network round trip
+(without it, parallel connections show little benefit on loopback)
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distribution_upload import DistributionServer, DistributionRequestHandler, DistributionUploader
+
+def run_steps(steps, stop_after=None):
+    count = 0
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+        count += 1
+        if stop_after is not None and count >= stop_after:
+            steps.close()
+            return None
+
+def make_server(root, latency):
+    """
+    청크마다 latency초 기다리는 대역 서버를 백그라운드에서 실행
+    Run a stand-in server waiting `latency` seconds per chunk in the background
+    """
+    class SlowHandler(DistributionRequestHandler):
+        def do_PUT(self):
+            time.sleep(latency)
+            super().do_PUT()
+
+    server = DistributionServer(root)
+    server.RequestHandlerClass = SlowHandler
+    server.serve_in_thread()
+    return server
+
+def bench(name, func, size_bytes, runs, setup=None):
+    """
+    (setup 후) func를 runs번 실행해 가장 빠른 시간과 처리량 출력
+    Run func `runs` times (after `setup`) and print the best time and throughput
+    """
+    best = result = None
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<28} {best * 1000:9.1f} ms  {size_bytes / best / 1e6:9.0f} MB/s  "
+          f"sent {result.sent:>4}  skipped {result.skipped:>4}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--workers', dest='worker_counts', action='append', type=int, default=None)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix='bench_upload_')
+    try:
+        path = os.path.join(root, 'payload.bin')
+        with open(path, 'wb') as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+        size_bytes = args.size_mb * 1024 * 1024
+        server_root = os.path.join(root, 'server')
+        state_dir = os.path.join(root, 'state')
+        server = make_server(server_root, args.latency_ms / 1000)
+        print(f"{size_bytes / 1e9:.2f} GB, {args.latency_ms:.0f} ms per chunk request, {os.cpu_count()} CPU(s), "
+              f"best of {args.runs}")
+
+        def reset():
+            shutil.rmtree(server_root, ignore_errors=True)
+            shutil.rmtree(state_dir, ignore_errors=True)
+            os.makedirs(os.path.join(server_root, '.uploads', 'files'))
+
+        workers = args.worker_counts or [1, 4, 8]
+        for count in workers:
+            uploader = DistributionUploader(server.url, workers=count, state_dir=state_dir)
+            bench(f"{count} connection(s)", lambda: run_steps(uploader.upload(path)), size_bytes, args.runs, reset)
+
+        uploader = DistributionUploader(server.url, workers=max(workers), state_dir=state_dir)
+        half = size_bytes // uploader.chunk_size // 2
+
+        def interrupted():
+            reset()
+            run_steps(uploader.upload(path), stop_after=half)
+
+        bench('resume after interruption', lambda: run_steps(uploader.upload(path)), size_bytes, args.runs, interrupted)
+        bench('already on server', lambda: run_steps(uploader.upload(path)), size_bytes, args.runs)
+        server.shutdown()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
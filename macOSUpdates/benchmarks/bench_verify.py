@@ -0,0 +1,101 @@
+"""
+설치 프로그램 검증 벤치마크 - 임시 번들을 만들어 순차 읽기, mmap 스레드 풀, 해시 캐시 적중을 비교
+Installer verification benchmark - builds a temporary bundle and compares sequential reads,
+the mmap thread pool and hash cache hits
+
+사용법 (Usage):
+    python macOSUpdates/benchmarks/bench_verify.py [--size-mb 1024] [--files 4] [--workers N]
+
+페이지 캐시에 올라간 뒤의 해시 속도를 재므로 실제 디스크에서의 첫 검증은 이보다 느릴 수 있음
+Hashing is measured once the files are in the page cache, so a first verification straight
+from disk can be slower
+"""
+import os
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from installer_verify import InstallerVerifier, HashCache, DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS
+
+# 이전 build_manifest의 해시 방식 (비교 기준)
+# Hashing as previously done in build_manifest (baseline)
+def legacy_hash(app_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    for root, _, files in os.walk(app_path):
+        for name in sorted(files):
+            with open(os.path.join(root, name), 'rb') as f:
+                while True:
+                    data = f.read(chunk_size)
+                    if not data:
+                        break
+                    hashlib.sha256(data).hexdigest()
+
+def run_steps(steps):
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def make_bundle(root, size_mb, files):
+    """
+    size_mb 크기를 files개의 파일로 나눈 임시 번들 생성
+    Create a temporary bundle splitting `size_mb` over `files` files
+    """
+    app_path = os.path.join(root, 'Install macOS Bench.app')
+    payload = os.path.join(app_path, 'Contents', 'SharedSupport')
+    os.makedirs(payload)
+    block = os.urandom(1024 * 1024)
+    for index in range(files):
+        with open(os.path.join(payload, f'payload{index}.dmg'), 'wb') as f:
+            for _ in range(size_mb // files):
+                f.write(block)
+    return app_path
+
+def bench(name, func, size_bytes, runs):
+    """
+    func를 runs번 실행해 가장 빠른 시간과 처리량 출력
+    Run func `runs` times and print the best time and throughput
+    """
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<28} {best * 1000:9.1f} ms  {size_bytes / best / 1e6:9.0f} MB/s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--size-mb', type=int, default=1024)
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix='bench_verify_')
+    try:
+        app_path = make_bundle(root, args.size_mb, args.files)
+        size_bytes = (args.size_mb // args.files) * args.files * 1024 * 1024
+        print(f"{size_bytes / 1e9:.2f} GB in {args.files} file(s), {os.cpu_count()} CPU(s), "
+              f"best of {args.runs}")
+        legacy_hash(app_path)
+
+        bench('sequential read (legacy)', lambda: legacy_hash(app_path), size_bytes, args.runs)
+        single = InstallerVerifier(workers=1, reference_dir=root)
+        bench('mmap, 1 thread', lambda: run_steps(single.build(app_path)), size_bytes, args.runs)
+        pooled = InstallerVerifier(workers=args.workers, reference_dir=root)
+        bench(f'mmap, {args.workers} threads', lambda: run_steps(pooled.build(app_path)), size_bytes, args.runs)
+
+        cached = InstallerVerifier(HashCache(os.path.join(root, 'hashes.json')), reference_dir=root)
+        run_steps(cached.build(app_path))
+        bench('hash cache hit', lambda: run_steps(cached.verify(app_path, '14.0')), size_bytes, args.runs)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 #!/bin/bash
 
-# 이전 빌드 정리
-rm -rf build dist
+# build/dist는 지우지 않음 - py2app는 앱 번들만 다시 만들고, libffi 탐색은 build_app 캐시를 재사용
+# build/dist are kept - py2app only recreates the app bundle, and the libffi lookup reuses the build_app cache
 
 # 환경 변수 설정
 export DYLD_LIBRARY_PATH=$(brew --prefix libffi)/lib:$DYLD_LIBRARY_PATH
@@ -14,14 +14,15 @@ echo "Python framework path: $PYTHON_FRAMEWORK"
 # 애플리케이션 빌드
 python setup.py py2app
 
-# libffi 라이브러리 찾기
-LIBFFI_PATH=$(find /usr/local/Cellar /opt/homebrew/Cellar -name 'libffi*.dylib' | head -1)
+# libffi 라이브러리 찾기 (탐색 폴더가 바뀌지 않았으면 캐시된 결과)
+# Find the libffi library (the cached result while the searched folders are unchanged)
+LIBFFI_PATH=$(python -c "from build_app import BuildCache, discover_dependencies; print((discover_dependencies(BuildCache())['libffi'] or [''])[0])")
 
 # 프레임워크 디렉토리에 복사
 if [ -n "$LIBFFI_PATH" ]; then
     echo "Copying $LIBFFI_PATH to app bundle..."
     mkdir -p dist/macOS\ Installer\ Downloader.app/Contents/Frameworks/
-    cp $LIBFFI_PATH dist/macOS\ Installer\ Downloader.app/Contents/Frameworks/
+    cp "$LIBFFI_PATH" dist/macOS\ Installer\ Downloader.app/Contents/Frameworks/
     echo "Done!"
 else
     echo "libffi library not found!"
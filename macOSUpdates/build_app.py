@@ -0,0 +1,345 @@
+import os
+import sys
+import json
+import glob
+import shutil
+import hashlib
+import argparse
+import platform
+import subprocess
+
+# 증분 앱 빌드 도구 - 입력 해시로 의존성 탐색과 PyInstaller 분석 결과를 캐시하고,
+# 입력이 바뀐 아키텍처 변형만 병렬로 다시 빌드
+# Incremental app build driver - dependency discovery and PyInstaller analysis results are cached
+# by input hashes, and only the architecture variants whose inputs changed are rebuilt, in parallel
+#
+# 사용법 (Usage):
+#     python build_app.py [--arch arm64 --arch x86_64 ...] [--jobs N] [--plan] [--clean]
+#     python build_app.py --deps
+
+# 이 폴더 (앱 소스, spec 파일, build/dist 폴더의 기준)
+# This folder (holds the app sources and the spec file; build/dist live under it)
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 앱 이름과 모든 변형이 공유하는 spec 파일
+# App name and the spec file shared by every variant
+APP_NAME = 'macOS Installer Downloader'
+SPEC_PATH = os.path.join(PROJECT_DIR, f'{APP_NAME}.spec')
+
+# 빌드할 수 있는 아키텍처 (universal2는 접미사 없는 기본 앱 이름)
+# Architectures that can be built (universal2 takes the plain app name)
+ARCHES = ('arm64', 'x86_64', 'universal2')
+DEFAULT_ARCHES = ('universal2',)
+
+# spec 파일에 아키텍처를 전달하는 환경 변수
+# Environment variable handing the architecture to the spec file
+ARCH_ENV = 'MACOSUPDATES_TARGET_ARCH'
+
+# 빌드 캐시 파일 (build 폴더 안이라 --clean이나 build 폴더 삭제로 함께 지워짐)
+# Build cache file (inside the build folder, so --clean or deleting build removes it too)
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_DIR, 'build', 'build_cache.json')
+
+# 앱 소스가 아닌 빌드/보관용 파일
+# Build and archive files that are not app sources
+NON_APP_SOURCES = {'setup.py', 'build_app.py', 'code_backup.py'}
+
+# libffi를 찾을 Homebrew Cellar 폴더와 라이브러리 폴더
+# Homebrew Cellar folders and library folders searched for libffi
+CELLAR_DIRS = ['/usr/local/Cellar', '/opt/homebrew/Cellar']
+LIB_DIRS = ['/usr/local/lib', '/opt/homebrew/lib']
+
+# 아키텍처별 앱 이름
+# App name per architecture
+def variant_name(arch):
+    return APP_NAME if arch == 'universal2' else f'{APP_NAME}-{arch}'
+
+# 파일/값 해시
+# Hash files/values
+def digest(*parts):
+    """
+    JSON으로 바꿀 수 있는 값들의 sha256
+    sha256 of JSON-serialisable values
+    """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+def file_digests(paths):
+    """
+    파일 경로별 내용 sha256 (없는 파일은 None)
+    Content sha256 per file path (None for missing files)
+    """
+    digests = {}
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                digests[os.path.relpath(path, PROJECT_DIR)] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            digests[os.path.relpath(path, PROJECT_DIR)] = None
+    return digests
+
+def app_sources(project_dir=PROJECT_DIR):
+    """
+    번들에 들어가는 앱 모듈 목록
+    App modules that go into the bundle
+    """
+    return sorted(path for path in glob.glob(os.path.join(project_dir, '*.py'))
+                  if os.path.basename(path) not in NON_APP_SOURCES)
+
+def output_digest(output, name=APP_NAME):
+    """
+    빌드된 앱 실행 파일 (Contents/MacOS/<name>, name은 변형 이름)의 sha256 (없으면 None)
+    - dist의 앱이 다른 빌드로 바뀌었는지 확인용
+    sha256 of the built app's executable (Contents/MacOS/<name>, where name is the variant name; None when missing)
+    - tells whether the app in dist was replaced by another build
+    """
+    hasher = hashlib.sha256()
+    try:
+        with open(os.path.join(output, 'Contents', 'MacOS', name), 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+# 빌드 캐시
+# Build cache
+class BuildCache:
+    """
+    의존성 탐색 결과와 변형별 입력 해시를 담는 JSON 파일
+    JSON file holding dependency discovery results and per-variant input hashes
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def get(self, section, key):
+        return self.data.get(section, {}).get(key)
+
+    def put(self, section, key, value):
+        self.data.setdefault(section, {})[key] = value
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+# 의존성 탐색
+# Dependency discovery
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def discovery_key(cellar_dirs=None, lib_dirs=None):
+    """
+    탐색 결과가 바뀔 수 있는 폴더들의 수정 시각 해시 - Homebrew가 공식(formula)이나 버전을
+    추가/제거하면 Cellar 또는 그 공식 폴더의 수정 시각이 바뀜
+    Hash of the modification times of the folders the result depends on - Homebrew adding or
+    removing a formula or version changes the mtime of the Cellar or of that formula's folder
+    """
+    cellar_dirs = CELLAR_DIRS if cellar_dirs is None else cellar_dirs
+    lib_dirs = LIB_DIRS if lib_dirs is None else lib_dirs
+    stamps = []
+    for cellar in cellar_dirs:
+        stamps.append((cellar, _mtime(cellar)))
+        for formula in sorted(glob.glob(os.path.join(cellar, '*'))):
+            stamps.append((formula, _mtime(formula)))
+    stamps.extend((directory, _mtime(directory)) for directory in lib_dirs)
+    return digest(sys.executable, stamps)
+
+def find_libffi(cellar_dirs=None, lib_dirs=None):
+    """
+    Homebrew나 시스템에 설치된 libffi 라이브러리 경로 목록 (셸 find 대신 정해진 깊이만 검색)
+    Paths of libffi libraries installed via Homebrew or the system (fixed-depth globs instead of a shell find)
+    """
+    cellar_dirs = CELLAR_DIRS if cellar_dirs is None else cellar_dirs
+    lib_dirs = LIB_DIRS if lib_dirs is None else lib_dirs
+    paths = []
+    for cellar in cellar_dirs:
+        paths.extend(sorted(glob.glob(os.path.join(cellar, '*', '*', 'lib', 'libffi*.dylib'))))
+    for directory in lib_dirs:
+        paths.extend(sorted(glob.glob(os.path.join(directory, 'libffi*.dylib'))))
+    return paths
+
+def find_python_framework():
+    """
+    현재 Python의 Python.framework 경로 (없으면 None)
+    Python.framework path of the running Python (None when there is none)
+    """
+    framework_path = os.path.normpath(os.path.join(os.path.dirname(sys.executable), '..', '..', 'Python.framework'))
+    return framework_path if os.path.exists(framework_path) else None
+
+def discover_dependencies(cache=None, cellar_dirs=None, lib_dirs=None):
+    """
+    번들에 넣을 네이티브 의존성 - 탐색 폴더가 바뀌지 않았으면 캐시된 결과 사용
+    Native dependencies to bundle - the cached result is used while the searched folders are unchanged
+    """
+    key = discovery_key(cellar_dirs, lib_dirs)
+    if cache is not None:
+        cached = cache.get('dependencies', 'result')
+        if cached is not None and cache.get('dependencies', 'key') == key:
+            return cached
+    result = {
+        'libffi': find_libffi(cellar_dirs, lib_dirs),
+        'python_framework': find_python_framework(),
+    }
+    if cache is not None:
+        cache.put('dependencies', 'key', key)
+        cache.put('dependencies', 'result', result)
+        cache.save()
+    return result
+
+# 도구 버전
+# Toolchain versions
+def toolchain(pyinstaller):
+    """
+    분석 결과에 영향을 주는 Python/패키지 버전
+    Python/package versions that affect the analysis
+    """
+    from importlib import metadata
+    versions = {'python': sys.version, 'platform': platform.platform(), 'pyinstaller_command': pyinstaller}
+    for package in ('pyinstaller', 'PyQt5', 'qasync'):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+# 변형 빌드 계획
+# Variant build plan
+def plan_variant(arch, cache, dependencies, tools, dist_dir, work_dir):
+    """
+    변형 하나의 빌드 계획 - action은 'skip' (입력이 같고 결과가 마지막으로 빌드한 그대로), 'incremental'
+    (분석 결과를 재사용해 바뀐 모듈만 다시 분석), 'full' (분석 입력이 바뀌었거나 처음)
+    Build plan for one variant - action is 'skip' (same inputs, output still the one last built), 'incremental'
+    (analysis results reused, only changed modules re-analysed) or 'full' (analysis inputs changed, or first build)
+
+    분석 키는 spec/빌드 설정/도구/의존성만 포함하므로 앱 모듈만 바뀌면 PyInstaller의 작업 폴더를
+    그대로 두고 다시 실행함 (PyInstaller가 바뀐 모듈만 다시 분석)
+    The analysis key only covers the spec/build settings/tools/dependencies, so when only app modules
+    change PyInstaller's work folder is kept and PyInstaller re-analyses just the changed modules
+    """
+    name = variant_name(arch)
+    analysis_files = file_digests([SPEC_PATH, os.path.join(PROJECT_DIR, 'build_config.py')])
+    analysis_key = digest(arch, analysis_files, tools, dependencies)
+    input_key = digest(analysis_key, file_digests(app_sources()))
+    output = os.path.join(dist_dir, name + '.app')
+    state = cache.get('variants', arch) or {}
+
+    # 결과 폴더가 있는 것만으로는 부족함 - 다른 스크립트가 다른 아키텍처의 앱을 복사해 넣었을 수 있으므로 실행 파일 해시 비교
+    # An existing output folder is not enough - another script may have copied another architecture's app
+    # over it, so the executable's hash is compared
+    if (state.get('inputs') == input_key and state.get('output') is not None
+            and output_digest(output, name) == state['output']):
+        action = 'skip'
+    elif state.get('analysis') == analysis_key and os.path.isdir(os.path.join(work_dir, arch)):
+        action = 'incremental'
+    else:
+        action = 'full'
+    return {'arch': arch, 'name': name, 'action': action, 'output': output,
+            'analysis': analysis_key, 'inputs': input_key}
+
+def build_variant(plan, pyinstaller, dist_dir, work_dir, log_dir):
+    """
+    변형 하나를 자기 작업 폴더에서 PyInstaller로 빌드 - (계획, 종료 코드, 로그 경로) 반환
+    Build one variant with PyInstaller in its own work folder - returns (plan, exit code, log path)
+    """
+    variant_work_dir = os.path.join(work_dir, plan['arch'])
+    if plan['action'] == 'full':
+        # 분석 입력이 바뀌면 이 변형의 작업 폴더만 비움 (다른 변형은 그대로)
+        # When analysis inputs change only this variant's work folder is emptied (other variants are kept)
+        shutil.rmtree(variant_work_dir, ignore_errors=True)
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{plan['arch']}.log")
+    command = pyinstaller + ['--noconfirm', '--distpath', dist_dir, '--workpath', variant_work_dir, SPEC_PATH]
+    env = dict(os.environ, **{ARCH_ENV: plan['arch']})
+    with open(log_path, 'w', encoding='utf-8') as log:
+        returncode = subprocess.call(command, cwd=PROJECT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return plan, returncode, log_path
+
+def build(arches, jobs=None, clean=False, plan_only=False, pyinstaller=None,
+          dist_dir=None, work_dir=None, cache_path=DEFAULT_CACHE_PATH, out=sys.stdout):
+    """
+    입력이 바뀐 변형만 병렬로 빌드 - 모두 성공하거나 최신이면 True 반환
+    Build the variants whose inputs changed, in parallel - returns True when every one succeeded or was up to date
+    """
+    pyinstaller = pyinstaller or [sys.executable, '-m', 'PyInstaller']
+    dist_dir = dist_dir or os.path.join(PROJECT_DIR, 'dist')
+    work_dir = work_dir or os.path.join(PROJECT_DIR, 'build')
+    cache = BuildCache(cache_path)
+    if clean:
+        # 고른 변형의 작업 폴더/입력 해시와 의존성 탐색 결과만 지움
+        # Only the chosen variants' work folders/input hashes and the discovery result are dropped
+        cache.data.pop('dependencies', None)
+        for arch in arches:
+            shutil.rmtree(os.path.join(work_dir, arch), ignore_errors=True)
+            cache.put('variants', arch, None)
+    dependencies = discover_dependencies(cache)
+    tools = toolchain(pyinstaller)
+    plans = [plan_variant(arch, cache, dependencies, tools, dist_dir, work_dir) for arch in arches]
+    for plan in plans:
+        print(f"{plan['name']}: {plan['action']}", file=out, flush=True)
+    pending = [plan for plan in plans if plan['action'] != 'skip']
+    if plan_only or not pending:
+        return True
+
+    # 변형마다 작업 폴더와 앱 이름이 달라 서로 겹치지 않으므로 동시에 빌드
+    # Each variant has its own work folder and app name, so they build concurrently without clashing
+    from concurrent.futures import ThreadPoolExecutor
+    log_dir = os.path.join(work_dir, 'logs')
+    ok = True
+    with ThreadPoolExecutor(max_workers=jobs or len(pending)) as executor:
+        results = executor.map(lambda plan: build_variant(plan, pyinstaller, dist_dir, work_dir, log_dir), pending)
+        for plan, returncode, log_path in results:
+            if returncode == 0:
+                cache.put('variants', plan['arch'], {'analysis': plan['analysis'], 'inputs': plan['inputs'],
+                                                     'output': output_digest(plan['output'], plan['name'])})
+                print(f"{plan['name']}: 빌드 완료 (built) -> {plan['output']}", file=out, flush=True)
+            else:
+                # 실패한 변형은 다음에 다시 빌드하도록 입력 해시를 지움
+                # Forget a failed variant's input hash so it is rebuilt next time
+                cache.put('variants', plan['arch'], None)
+                print(f"{plan['name']}: 빌드 실패 (build failed), exit code {returncode} - {log_path}",
+                      file=out, flush=True)
+                ok = False
+    cache.save()
+    return ok
+
+# 명령줄 진입점
+# Command line entry point
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='증분 앱 빌드 (Incremental app build)')
+    parser.add_argument('--arch', dest='arches', action='append', choices=ARCHES, default=None,
+                        help='빌드할 아키텍처, 여러 번 지정 가능 (Architecture to build, repeatable), default universal2')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='동시에 빌드할 변형 수 (Variants built at the same time)')
+    parser.add_argument('--clean', action='store_true',
+                        help='고른 변형을 캐시 없이 처음부터 빌드 (Build the chosen variants from scratch, ignoring the cache)')
+    parser.add_argument('--plan', action='store_true',
+                        help='빌드하지 않고 변형별 계획만 출력 (Print the per-variant plan without building)')
+    parser.add_argument('--deps', action='store_true',
+                        help='탐색한 네이티브 의존성을 JSON으로 출력 (Print the discovered native dependencies as JSON)')
+    parser.add_argument('--pyinstaller', default=None,
+                        help='PyInstaller 명령 (PyInstaller command), default "python -m PyInstaller"')
+    args = parser.parse_args(argv)
+
+    if args.deps:
+        print(json.dumps(discover_dependencies(BuildCache()), indent=2))
+        return 0
+    pyinstaller = args.pyinstaller.split() if args.pyinstaller else None
+    ok = build(args.arches or list(DEFAULT_ARCHES), args.jobs, args.clean, args.plan, pyinstaller)
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
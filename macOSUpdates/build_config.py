@@ -0,0 +1,48 @@
+# py2app (setup.py)와 PyInstaller (.spec)가 공유하는 빌드 설정
+# Build settings shared by py2app (setup.py) and PyInstaller (.spec)
+#
+# 앱이 실제로 쓰는 Qt 모듈만 포함하고 쓰지 않는 Qt/표준 라이브러리 모듈은 제외해
+# 번들 크기와 첫 실행 시간을 줄임
+# Only the Qt modules the app uses are bundled; unused Qt and stdlib modules are excluded
+# to shrink the bundle and the cold start
+
+# 반드시 포함할 모듈 (함수 안에서 가져오는 앱 모듈 포함)
+# Modules that must be bundled (including app modules imported inside functions)
+INCLUDES = [
+    'PyQt5.QtCore',
+    'PyQt5.QtGui',
+    'PyQt5.QtWidgets',
+    'PyQt5.sip',
+    'qasync',
+    'cli',
+    'async_engine',
+    'qt_async',
+    'peer_seed',
+    'session_index',
+    'startup_profile',
+    'diagnostics_view',
+]
+
+# 쓰지 않는 Qt 모듈
+# Unused Qt modules
+QT_EXCLUDES = [
+    'PyQt5.Qt3DAnimation', 'PyQt5.Qt3DCore', 'PyQt5.Qt3DExtras', 'PyQt5.Qt3DInput',
+    'PyQt5.Qt3DLogic', 'PyQt5.Qt3DRender', 'PyQt5.QtBluetooth', 'PyQt5.QtDBus',
+    'PyQt5.QtDesigner', 'PyQt5.QtHelp', 'PyQt5.QtLocation', 'PyQt5.QtMultimedia',
+    'PyQt5.QtMultimediaWidgets', 'PyQt5.QtNetwork', 'PyQt5.QtNfc', 'PyQt5.QtOpenGL',
+    'PyQt5.QtPositioning', 'PyQt5.QtPrintSupport', 'PyQt5.QtQml', 'PyQt5.QtQuick',
+    'PyQt5.QtQuickWidgets', 'PyQt5.QtRemoteObjects', 'PyQt5.QtSensors', 'PyQt5.QtSerialPort',
+    'PyQt5.QtSql', 'PyQt5.QtSvg', 'PyQt5.QtTest', 'PyQt5.QtTextToSpeech', 'PyQt5.QtWebChannel',
+    'PyQt5.QtWebEngine', 'PyQt5.QtWebEngineCore', 'PyQt5.QtWebEngineWidgets', 'PyQt5.QtWebSockets',
+    'PyQt5.QtXml', 'PyQt5.QtXmlPatterns', 'PyQt5.uic',
+]
+
+# 쓰지 않는 표준 라이브러리/개발 도구 모듈
+# Unused stdlib and development-tool modules
+STDLIB_EXCLUDES = [
+    'tkinter', 'turtle', 'unittest', 'doctest', 'pydoc', 'pdb', 'test', 'lib2to3',
+    'distutils', 'setuptools', 'pip', 'xmlrpc', 'ftplib', 'imaplib', 'poplib', 'smtplib',
+    'curses', 'idlelib', 'ensurepip', 'venv',
+]
+
+EXCLUDES = QT_EXCLUDES + STDLIB_EXCLUDES
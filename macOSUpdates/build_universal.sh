@@ -1,16 +1,16 @@
 #!/bin/bash
 
-# 이전 빌드 정리
-rm -rf build dist
-
 # Homebrew Python 경로 (Universal Binary)
 PYTHON_PATH=$(brew --prefix python)/bin/python3
 
 # 필요한 패키지 설치
 $PYTHON_PATH -m pip install pyinstaller pyqt5
 
-# Universal Binary 빌드
-$PYTHON_PATH -m PyInstaller --clean --windowed --target-architecture universal2 --name="macOS Installer Downloader" macOSUpdate.py
+# Universal Binary 빌드 - 입력이 바뀌지 않았으면 건너뛰고, 앱 모듈만 바뀌었으면 분석 결과를 재사용
+# (처음부터 다시 빌드하려면 --clean)
+# Universal Binary build - skipped when nothing changed, analysis results reused when only app modules changed
+# (pass --clean to rebuild from scratch)
+$PYTHON_PATH build_app.py --arch universal2 "$@" || exit 1
 
 echo "Build completed!"
 
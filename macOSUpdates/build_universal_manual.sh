@@ -1,19 +1,18 @@
 #!/bin/bash
 
-# 이전 빌드 정리
-rm -rf build dist
-
 # PyInstaller 설치
 pip install pyinstaller
 
-# Intel(x86_64) 버전 빌드
+# Intel(x86_64) 버전 빌드 (입력이 바뀌지 않았으면 건너뜀)
+# Build the Intel (x86_64) version (skipped when nothing changed)
 echo "Building x86_64 version..."
-pyinstaller --clean --windowed --target-architecture x86_64 --name="macOS Installer Downloader" macOSUpdate.py
-
-# 빌드된 앱 이름 변경
-mv dist/macOS\ Installer\ Downloader.app dist/macOS\ Installer\ Downloader-x86_64.app
+python build_app.py --arch x86_64 "$@" || exit 1
 
-# 앱 복사본 생성 (Universal Binary용)
+# 앱 복사본 생성 (Universal Binary용) - 이전 복사본만 교체
+# Create the app copy (for the Universal Binary) - only the previous copy is replaced
+# build_app.py는 실행 파일 해시를 기록하므로 나중의 --arch universal2 빌드는 이 복사본을 다시 빌드함
+# build_app.py records the executable's hash, so a later --arch universal2 build rebuilds over this copy
+rm -rf dist/macOS\ Installer\ Downloader.app
 cp -R dist/macOS\ Installer\ Downloader-x86_64.app dist/macOS\ Installer\ Downloader.app
 
 echo "Build completed!"
@@ -1,17 +1,16 @@
 #!/bin/bash
 
-# 이전 빌드 정리
-rm -rf build dist
-
 # PyInstaller 설치 (필요한 경우)
 pip install pyinstaller
 
 # x86_64 아키텍처로만 빌드
-pyinstaller --clean --windowed --target-architecture x86_64 --name="macOS Installer Downloader" macOSUpdate.py
+# 공유 include/exclude 목록을 쓰는 spec 파일로 build_app.py가 증분 빌드
+# build_app.py builds incrementally from the spec file so the shared include/exclude lists apply
+python build_app.py --arch x86_64 "$@" || exit 1
 
 # 빌드 완료 확인
 echo "Build completed!"
 
 # 바이너리 정보 확인
 echo "Checking binary architecture..."
-file dist/macOS\ Installer\ Downloader.app/Contents/MacOS/macOS\ Installer\ Downloader 
\ No newline at end of file
+file dist/macOS\ Installer\ Downloader-x86_64.app/Contents/MacOS/macOS\ Installer\ Downloader-x86_64 
\ No newline at end of file
@@ -0,0 +1,355 @@
+import os
+import re
+import json
+import time
+import bisect
+import hashlib
+import datetime
+import threading
+from typing import NamedTuple, Optional
+from fetch_runners import SubprocessRunner
+
+# 설치 가능한 macOS 전체 설치 프로그램 카탈로그
+# Catalog of the available full macOS installers
+
+# 카탈로그 캐시 파일 기본 경로
+# Default path of the catalog cache file
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser('~/Library/Caches'), 'macOSUpdates', 'catalog.json')
+
+# 카탈로그 소스별 캐시 파일 경로
+# Catalog cache file path per source
+def catalog_path_for(source):
+    """
+    softwareupdate 소스는 기본 경로, 다른 소스 (plist, 재생)는 그 옆의 따로 된 파일 - 실제 캐시를 덮어쓰지 않도록
+    The default path for the softwareupdate source, a separate file next to it for other sources
+    (plist, replay) so they never overwrite the real cache
+    """
+    if source.name == SoftwareUpdateSource.name:
+        return DEFAULT_CATALOG_PATH
+    digest = hashlib.sha1(source.name.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(os.path.dirname(DEFAULT_CATALOG_PATH), f'catalog-{digest}.json')
+
+# 캐시된 카탈로그를 새로 받기 전까지 사용할 기본 시간 (초)
+# Default seconds a cached catalog is used before it is refreshed
+DEFAULT_CATALOG_TTL = 6 * 60 * 60
+
+# 카탈로그 조회 명령
+# Catalog listing command
+LIST_COMMAND = ['softwareupdate', '--list-full-installers']
+
+# softwareupdate --list-full-installers 한 줄 형식
+# Line format of softwareupdate --list-full-installers
+LIST_LINE_RE = re.compile(
+    r'^\*\s*Title:\s*(?P<title>.*?),\s*Version:\s*(?P<version>[^,]+),'
+    r'\s*Size:\s*(?P<size>\d+)\s*(?P<unit>[KMG]i?B)?,\s*Build:\s*(?P<build>[^,\s]+)'
+    r'(?:,\s*Deferred:\s*(?P<deferred>\w+))?'
+)
+
+# 크기 단위별 바이트 수
+# Bytes per size unit
+SIZE_UNITS = {'KiB': 1024, 'KB': 1000, 'MiB': 1024 ** 2, 'MB': 1000 ** 2, 'GiB': 1024 ** 3, 'GB': 1000 ** 3}
+
+# 카탈로그 항목
+# Catalog entry
+class CatalogEntry(NamedTuple):
+    version: str
+    build: str
+    title: str
+    size: Optional[int] = None
+    date: Optional[str] = None
+    deferred: bool = False
+
+# 버전 정렬 키
+# Version sort key
+def version_key(version):
+    """
+    '15.3.1' 같은 버전을 숫자 튜플로 변환 - 숫자가 아닌 부분은 0으로 취급
+    Turn a version such as '15.3.1' into a tuple of ints - non-numeric parts count as 0
+    """
+    return tuple(int(part) if part.isdigit() else 0 for part in version.split('.'))
+
+# softwareupdate 출력 해석
+# Parse softwareupdate output
+def parse_list_output(lines):
+    """
+    softwareupdate --list-full-installers 출력에서 카탈로그 항목 목록 생성 (날짜 없음)
+    Build catalog entries from softwareupdate --list-full-installers output (no dates)
+    """
+    entries = []
+    for line in lines:
+        match = LIST_LINE_RE.match(line.strip())
+        if match is None:
+            continue
+        size = int(match.group('size')) * SIZE_UNITS.get(match.group('unit') or 'KiB', 1)
+        entries.append(CatalogEntry(
+            version=match.group('version').strip(),
+            build=match.group('build'),
+            title=match.group('title'),
+            size=size,
+            deferred=(match.group('deferred') or 'NO').upper() == 'YES',
+        ))
+    return entries
+
+# 카탈로그 plist 해석
+# Parse a catalog plist
+def parse_catalog_plist(path):
+    """
+    Products 사전을 가진 카탈로그 plist에서 설치 프로그램 항목 목록 생성
+    Build installer entries from a catalog plist with a Products dictionary
+
+    Version/Build가 있는 InstallAssistant 제품만 사용하며 PostDate를 날짜로 사용
+    Only InstallAssistant products carrying Version/Build are used; PostDate becomes the date
+    """
+    import plistlib
+    with open(path, 'rb') as f:
+        catalog = plistlib.load(f)
+    entries = []
+    for product in catalog.get('Products', {}).values():
+        meta = product.get('ExtendedMetaInfo', {})
+        if 'InstallAssistantPackageIdentifiers' not in meta:
+            continue
+        version, build = product.get('Version'), product.get('Build')
+        if not version or not build:
+            continue
+        date = product.get('PostDate')
+        if isinstance(date, datetime.datetime):
+            date = date.date().isoformat()
+        entries.append(CatalogEntry(
+            version=version,
+            build=build,
+            title=product.get('Title', 'macOS'),
+            size=product.get('Size'),
+            date=date,
+        ))
+    return entries
+
+# 색인된 카탈로그
+# Indexed catalog
+class Catalog:
+    """
+    버전/빌드/날짜로 색인된 메모리 안의 카탈로그 - 한 번 만들고 읽기만 함
+    In-memory catalog indexed by version, build and date - built once, then read-only
+    """
+
+    def __init__(self, entries, fetched_at=None, source=None):
+        """
+        초기화 함수 - 항목은 최신 버전부터 정렬되며 같은 버전은 처음 것만 사용
+        Initialization function - entries are sorted newest version first; the first of a duplicate version wins
+        """
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self.source = source
+        self._by_version = {}
+        self._by_build = {}
+        for entry in entries:
+            self._by_version.setdefault(entry.version, entry)
+            self._by_build.setdefault(entry.build, entry)
+        self.entries = sorted(self._by_version.values(), key=lambda e: version_key(e.version), reverse=True)
+
+        # 날짜 조회용 정렬 목록과 필터용 검색 문자열
+        # Sorted list for date lookups and search strings for filtering
+        dated = sorted((e for e in self.entries if e.date), key=lambda e: e.date)
+        self._dates = [e.date for e in dated]
+        self._dated = dated
+        self._search = [f"{e.version} {e.build} {e.title}".lower() for e in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def lookup(self, key):
+        """
+        버전 또는 빌드로 항목 조회 - 없으면 None
+        Look an entry up by version or build - None when unknown
+        """
+        return self._by_version.get(key) or self._by_build.get(key)
+
+    def latest(self, major=None):
+        """
+        가장 높은 버전 (major를 지정하면 해당 주 버전 중 가장 높은 버전)
+        Highest version (within `major` when given)
+        """
+        for entry in self.entries:
+            if major is None or version_key(entry.version)[0] == major:
+                return entry
+        return None
+
+    def released_between(self, start=None, end=None):
+        """
+        게시일이 [start, end] 범위인 항목 - 날짜는 'YYYY-MM-DD' 문자열
+        Entries posted within [start, end] - dates are 'YYYY-MM-DD' strings
+        """
+        low = bisect.bisect_left(self._dates, start) if start else 0
+        high = bisect.bisect_right(self._dates, end) if end else len(self._dates)
+        return self._dated[low:high]
+
+    def filter(self, text):
+        """
+        공백으로 나눈 모든 단어가 버전/빌드/제목에 포함된 항목
+        Entries whose version, build or title contains every whitespace-separated word of `text`
+        """
+        words = text.lower().split()
+        if not words:
+            return list(self.entries)
+        return [entry for entry, search in zip(self.entries, self._search)
+                if all(word in search for word in words)]
+
+    def to_dict(self):
+        return {
+            'fetched_at': self.fetched_at,
+            'source': self.source,
+            'entries': [entry._asdict() for entry in self.entries],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        entries = [CatalogEntry(**entry) for entry in data.get('entries', [])]
+        return cls(entries, data.get('fetched_at'), data.get('source'))
+
+# softwareupdate 카탈로그 소스
+# softwareupdate catalog source
+class SoftwareUpdateSource:
+    """
+    softwareupdate --list-full-installers를 한 번 실행해 항목을 읽는 소스
+    Source running softwareupdate --list-full-installers once to read the entries
+    """
+
+    name = 'softwareupdate'
+
+    def __init__(self, runner=None, name=None):
+        """
+        초기화 함수 - 녹화된 출력을 재생하는 runner에는 다른 name을 주어 실제 카탈로그와 구분
+        Initialization function - give a runner replaying recorded output another `name` to keep it apart
+        from the real catalog
+        """
+        self.runner = runner or SubprocessRunner()
+        if name is not None:
+            self.name = name
+
+    def fetch(self):
+        """
+        명령을 실행해 항목 목록 반환 - 실패하면 OSError
+        Run the command and return the entries - raises OSError on failure
+        """
+        process = self.runner.start(list(LIST_COMMAND))
+        lines = []
+        while True:
+            line = process.stdout.readline()
+            if not line:
+                break
+            lines.append(line)
+        returncode = process.wait()
+        if returncode != 0:
+            raise OSError(f"softwareupdate 종료 코드 (exit code) {returncode}")
+        return parse_list_output(lines)
+
+# 로컬 plist 카탈로그 소스
+# Local plist catalog source
+class PlistSource:
+    """
+    로컬 카탈로그 plist 파일을 읽는 소스 (테스트/오프라인용)
+    Source reading a local catalog plist file (for tests/offline use)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = f"plist:{os.path.abspath(path)}"
+
+    def fetch(self):
+        return parse_catalog_plist(self.path)
+
+# 디스크 캐시를 가진 카탈로그 저장소
+# Catalog store with an on-disk cache
+class CatalogStore:
+    """
+    카탈로그를 디스크에 캐시하고 TTL이 지나면 백그라운드에서 새로 받는 저장소
+    Store caching the catalog on disk and refreshing it in the background once the TTL expires
+
+    load()는 오래된 캐시라도 즉시 반환하므로 UI는 프로세스 실행을 기다리지 않음
+    load() returns even a stale cache immediately so the UI never waits on a process
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_CATALOG_TTL, source=None):
+        """
+        초기화 함수 - path가 None이면 소스별 캐시 경로 (catalog_path_for)
+        Initialization function - with no `path` the per-source cache path is used (catalog_path_for)
+        """
+        self.ttl = ttl
+        self.source = source or SoftwareUpdateSource()
+        self.path = path or catalog_path_for(self.source)
+        self._lock = threading.Lock()
+        self._catalog = None
+
+    def load(self):
+        """
+        캐시된 카탈로그 반환 (메모리, 없으면 디스크) - 다른 소스로 만든 캐시나 없으면 None
+        Return the cached catalog (memory, then disk) - None when missing or built from another source
+        """
+        with self._lock:
+            if self._catalog is None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        catalog = Catalog.from_dict(json.load(f))
+                except (OSError, ValueError, TypeError):
+                    return None
+                if catalog.source != self.source.name:
+                    return None
+                self._catalog = catalog
+            return self._catalog
+
+    def is_stale(self, catalog=None, now=None):
+        """
+        카탈로그가 없거나 TTL이 지났는지 여부
+        Whether the catalog is missing or older than the TTL
+        """
+        catalog = catalog if catalog is not None else self.load()
+        if catalog is None:
+            return True
+        now = time.time() if now is None else now
+        return now - catalog.fetched_at >= self.ttl
+
+    def refresh(self):
+        """
+        소스에서 카탈로그를 새로 받아 캐시에 저장한 뒤 반환
+        Fetch the catalog from the source, store it in the cache and return it
+        """
+        catalog = Catalog(self.source.fetch(), source=self.source.name)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(catalog.to_dict(), f, indent=2)
+        os.replace(temp_path, self.path)
+        with self._lock:
+            self._catalog = catalog
+        return catalog
+
+    def get(self):
+        """
+        신선한 캐시가 있으면 사용하고 아니면 새로 받음
+        Use the cache when fresh, otherwise refresh
+        """
+        catalog = self.load()
+        if not self.is_stale(catalog):
+            return catalog
+        return self.refresh()
+
+    def refresh_in_background(self, callback, force=False):
+        """
+        캐시가 오래되었으면 스레드에서 새로 받고 callback(catalog, error) 호출 - 스레드 또는 None 반환
+        Refresh on a thread when the cache is stale and call callback(catalog, error) - returns the thread or None
+        """
+        if not force and not self.is_stale():
+            return None
+
+        def worker():
+            try:
+                catalog = self.refresh()
+            except (OSError, ValueError) as e:
+                callback(None, e)
+                return
+            callback(catalog, None)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        return thread
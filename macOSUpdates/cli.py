@@ -0,0 +1,792 @@
+import startup_profile
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import datetime
+from log_sink import LogSink
+from fetch_engine import FetchJob, FinishedEvent, ErrorEvent, RetryEvent, dispatch_event, chain_packaging
+from fetch_supervisor import (FetchSupervisor, AsyncFetchSupervisor, RetryPolicy,
+                              DEFAULT_INACTIVITY_TIMEOUT, DEFAULT_PROGRESS_TIMEOUT)
+from fetch_runners import READERS, DEFAULT_READER, SubprocessRunner, fake_softwareupdate_runner
+from installer_cache import InstallerCache, parse_size
+from installer_verify import InstallerVerifier, HashCache, DEFAULT_WORKERS, format_result
+from catalog import CatalogStore, SoftwareUpdateSource, PlistSource, DEFAULT_CATALOG_TTL
+from app_paths import get_temp_path, get_session_log_path
+from log_pipeline import setup_logging, new_session_id
+
+startup_profile.mark('cli_imported')
+
+# 헤드리스 실행을 위한 명령줄 인터페이스 (PyQt5를 가져오지 않음)
+# Command line interface for headless runs (does not import PyQt5)
+#
+# asyncio와 하위 명령 전용 모듈은 필요할 때 가져와 GUI 시작을 늦추지 않음
+# asyncio and subcommand-only modules are imported on demand so they don't slow down GUI startup
+
+# 패키징 압축 방식 (installer_package.CODECS와 같음 - tarfile을 시작할 때 가져오지 않도록 여기에 적음)
+# Packaging codecs (same as installer_package.CODECS - listed here so tarfile is not imported at startup)
+PACKAGE_CODECS = ('zstd', 'xz', 'none')
+
+# 사람이 읽을 수 있는 형식으로 출력하는 listener
+# Listener printing human-readable output
+class TextListener:
+    """
+    엔진 이벤트를 표준 출력에 한 줄씩 출력
+    Prints engine events to stdout one line at a time
+    """
+
+    def __init__(self, version, stream=None):
+        self.version = version
+        self.stream = stream or sys.stdout
+
+    def post_status(self, message):
+        print(message, file=self.stream, flush=True)
+
+    def post_progress(self, value):
+        pass
+
+    def post_finished(self):
+        print(f"macOS {self.version} 다운로드 완료 (Download completed)", file=self.stream, flush=True)
+
+    def post_error(self, message):
+        print(f"오류 (Error): {message}", file=self.stream, flush=True)
+
+# JSON 줄 형식으로 출력하는 listener
+# Listener printing JSON lines
+class JsonListener:
+    """
+    엔진 이벤트를 한 줄에 하나의 JSON 객체로 출력 (Jamf 정책 스크립트용)
+    Prints engine events as one JSON object per line (for Jamf policy scripts)
+    """
+
+    def __init__(self, version, stream=None, host=None):
+        self.version = version
+        self.stream = stream or sys.stdout
+        self.host = host
+
+    def _emit(self, event, **fields):
+        record = {'event': event, 'version': self.version, 'time': time.time()}
+        if self.host is not None:
+            record['host'] = self.host
+        record.update(fields)
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def post_status(self, message):
+        self._emit('status', message=message)
+
+    def post_progress(self, value):
+        self._emit('progress', percent=value)
+
+    def post_metrics(self, metrics):
+        self._emit('metrics', **metrics._asdict())
+
+    def post_retry(self, retry):
+        self._emit('retry', **retry._asdict())
+
+    def post_finished(self):
+        self._emit('finished')
+
+    def post_error(self, message):
+        self._emit('error', message=message)
+
+# 종료 신호를 KeyboardInterrupt로 바꿈
+# Turn a termination signal into KeyboardInterrupt
+def raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+# 한 버전을 헤드리스로 다운로드
+# Fetch one version headless
+def fetch_version(version, listener, log_dir, cache=None, runner=None, supervisor_options=None, packager=None,
+                  uploader=None):
+    """
+    세션 로그를 열고 감시/재시도와 함께 FetchEngine으로 다운로드 - 성공하면 True 반환,
+    packager가 있으면 성공한 뒤 설치 프로그램을 패키징하고 uploader가 있으면 배포 지점에 업로드
+    (그 단계까지 성공해야 True)
+    Open a session log and download with FetchEngine under the watchdog/retry supervisor - returns True on success;
+    with `packager` the installer is packaged afterwards and with `uploader` uploaded to the distribution point
+    (True only when those stages succeeded too)
+    """
+    started = datetime.datetime.now()
+    session_id = new_session_id()
+    log_file_path = get_session_log_path(version, started, log_dir, session_id)
+    with LogSink(log_file_path, mode='w', session_id=session_id, version=version) as log_sink:
+        log_sink.write(f"=== macOS {version} 다운로드 세션 시작 ({started.strftime('%Y-%m-%d %H:%M:%S')}) ===")
+        log_sink.sync()
+        supervisor = FetchSupervisor(FetchJob(version), log_sink, listener, runner=runner, cache=cache,
+                                     **(supervisor_options or {}))
+        if packager is None:
+            ok = supervisor.run()
+        else:
+            ok = False
+            installer_dirs = cache.installer_dirs if cache is not None else None
+            for event in chain_packaging(supervisor.events(), packager, version, log_sink, installer_dirs,
+                                         control=supervisor, uploader=uploader):
+                dispatch_event(event, listener)
+                ok = ok or isinstance(event, FinishedEvent)
+        ended = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        log_sink.write(f"=== 다운로드 완료 ({ended}) ===" if ok else f"!!! 오류 발생 ({ended}) !!!")
+    return ok
+
+# 여러 버전을 asyncio 엔진으로 동시에 다운로드
+# Fetch several versions concurrently on the asyncio engine
+async def fetch_versions_async(versions, listener_class, log_dir, parallel, cache=None, runner=None,
+                               supervisor_options=None):
+    """
+    하나의 이벤트 루프에서 최대 parallel개의 다운로드를 실행 - 모두 성공하면 True 반환
+    Run up to `parallel` downloads on one event loop - returns True if all succeeded
+    """
+    from async_engine import AsyncFetchPool
+
+    started = datetime.datetime.now()
+    sinks, engines, listeners = [], [], {}
+    for version in versions:
+        session_id = new_session_id()
+        log_sink = LogSink(get_session_log_path(version, started, log_dir, session_id), mode='w',
+                           session_id=session_id, version=version)
+        log_sink.write(f"=== macOS {version} 다운로드 세션 시작 ({started.strftime('%Y-%m-%d %H:%M:%S')}) ===")
+        sinks.append(log_sink)
+        engine = AsyncFetchSupervisor(FetchJob(version), log_sink, runner=runner, cache=cache,
+                                      **(supervisor_options or {}))
+        engines.append(engine)
+        listeners[id(engine)] = listener_class(version)
+
+    try:
+        results = await AsyncFetchPool(parallel).run(
+            engines, lambda engine, event: dispatch_event(event, listeners[id(engine)]))
+    finally:
+        ended = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for log_sink in sinks:
+            log_sink.write(f"=== 세션 종료 ({ended}) ===")
+            log_sink.close()
+    return all(results)
+
+# 명령줄 인자 파서 생성
+# Build the command line argument parser
+def build_parser():
+    """
+    명령줄 인자 파서를 생성하는 함수
+    Create the command line argument parser
+    """
+    parser = argparse.ArgumentParser(
+        prog='macOSUpdates',
+        description='macOS Installer Downloader'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    gui_parser = subparsers.add_parser('gui', help='GUI 실행 (Run the GUI, default)')
+    gui_parser.add_argument('--async-engine', action='store_true',
+                            help='qasync로 작업을 asyncio에서 실행 (Run jobs on asyncio via qasync)')
+    gui_parser.add_argument('--catalog-plist', metavar='PATH', default=None,
+                            help='softwareupdate 대신 로컬 카탈로그 plist 사용 (Use a local catalog plist instead of softwareupdate)')
+    gui_parser.add_argument('--profile-startup', action='store_true',
+                            help='-X importtime으로 첫 화면까지의 시간 측정 후 종료 (Measure time to first paint with -X importtime, then exit)')
+    gui_parser.add_argument('--profile-output', metavar='PATH', default=None,
+                            help='시작 시간 보고서 JSON 경로 (Startup report JSON path)')
+    gui_parser.add_argument('--package-dir', metavar='DIR', default=None,
+                            help='받은 설치 프로그램을 이 폴더에 압축 파일로 패키징 (Package fetched installers into archives in this folder)')
+    gui_parser.add_argument('--upload-url', metavar='URL', default=None,
+                            help='패키징한 설치 프로그램을 올릴 배포 지점 (Distribution point packaged installers are uploaded to)')
+    gui_parser.add_argument('--cache-max-versions', type=int, default=None, metavar='N',
+                            help='캐시에 둘 최대 버전 수, 넘으면 가장 오래 안 쓴 것부터 삭제 (Most versions kept in the cache; least recently used are deleted first)')
+    gui_parser.add_argument('--cache-max-bytes', type=parse_size, default=None, metavar='SIZE',
+                            help='캐시 최대 용량, 예: 60G (Cache size limit, e.g. 60G)')
+    gui_parser.add_argument('--diagnostics', action='store_true',
+                            help='진단 패널을 연 상태로 시작, Ctrl+Shift+D로 전환 (Start with the diagnostics panel open; Ctrl+Shift+D toggles it)')
+
+    logs_parser = subparsers.add_parser('logs', help='지난 다운로드 세션 검색 (Search past download sessions)')
+    logs_parser.add_argument('--log-dir', default=None,
+                             help='세션 로그 폴더 (Session log folder)')
+    logs_parser.add_argument('--version', default=None,
+                             help='버전 또는 접두사, 예: 15 (Version or prefix, e.g. 15)')
+    logs_parser.add_argument('--failed', action='store_true',
+                             help='실패한 세션만 (Failed sessions only)')
+    logs_parser.add_argument('--result', default=None,
+                             help='결과로 거르기, 예: cancelled (Filter on result, e.g. cancelled)')
+    logs_parser.add_argument('--days', type=float, default=None,
+                             help='최근 N일 (Last N days)')
+    logs_parser.add_argument('--since', metavar='YYYY-MM-DD', default=None,
+                             help='이 날짜 이후 시작한 세션 (Sessions started on or after this date)')
+    logs_parser.add_argument('--grep', default=None,
+                             help='로그 줄 전문 검색 (Full-text search over log lines)')
+    logs_parser.add_argument('--lines', action='store_true',
+                             help='--grep과 일치하는 줄 출력 (Print the lines matching --grep)')
+    logs_parser.add_argument('--limit', type=int, default=50,
+                             help='최대 결과 수 (Maximum results)')
+    logs_parser.add_argument('--json', action='store_true',
+                             help='JSON 출력 (JSON output)')
+
+    catalog_parser = subparsers.add_parser('catalog', help='설치 가능한 버전 목록 (List available versions)')
+    catalog_parser.add_argument('--filter', default='',
+                                help='버전/빌드/제목 필터 (Filter on version/build/title)')
+    catalog_parser.add_argument('--since', metavar='YYYY-MM-DD', default=None,
+                                help='이 날짜 이후 게시된 항목만 (Only entries posted on or after this date)')
+    catalog_parser.add_argument('--refresh', action='store_true',
+                                help='캐시를 무시하고 새로 받음 (Ignore the cache and fetch again)')
+    catalog_parser.add_argument('--ttl', type=float, default=DEFAULT_CATALOG_TTL,
+                                help='캐시 유효 시간 (초) (Cache lifetime in seconds)')
+    catalog_parser.add_argument('--plist', metavar='PATH', default=None,
+                                help='softwareupdate 대신 로컬 카탈로그 plist 사용 (Use a local catalog plist instead of softwareupdate)')
+    catalog_parser.add_argument('--replay', metavar='TRANSCRIPT', default=None,
+                                help='녹화된 --list-full-installers 출력 재생 (Replay a recorded --list-full-installers transcript)')
+    catalog_parser.add_argument('--json', action='store_true',
+                                help='JSON 출력 (JSON output)')
+
+    fetch_parser = subparsers.add_parser('fetch', help='헤드리스 다운로드 (Headless download)')
+    fetch_parser.add_argument('--version', dest='versions', action='append', required=True,
+                              help='받을 macOS 버전, 여러 번 지정 가능 (macOS version to fetch, repeatable)')
+    fetch_parser.add_argument('--json', action='store_true',
+                              help='JSON 줄 형식으로 진행 상황 출력 (Emit progress as JSON lines)')
+    fetch_parser.add_argument('--no-cache', action='store_true',
+                              help='설치 프로그램 캐시 사용 안 함 (Do not use the installer cache)')
+    fetch_parser.add_argument('--cache-max-versions', type=int, default=None, metavar='N',
+                              help='캐시에 둘 최대 버전 수, 넘으면 가장 오래 안 쓴 것부터 삭제 (Most versions kept in the cache; least recently used are deleted first)')
+    fetch_parser.add_argument('--cache-max-bytes', type=parse_size, default=None, metavar='SIZE',
+                              help='캐시 최대 용량, 예: 60G (Cache size limit, e.g. 60G)')
+    fetch_parser.add_argument('--log-dir', default=None,
+                              help='세션 로그 폴더 (Session log folder)')
+    fetch_parser.add_argument('--replay', metavar='TRANSCRIPT', default=None,
+                              help='softwareupdate 대신 녹화된 출력 재생 (Replay a transcript instead of softwareupdate)')
+    fetch_parser.add_argument('--replay-rate', type=float, default=None,
+                              help='재생 속도, 초당 줄 수 (Replay speed in lines per second)')
+    fetch_parser.add_argument('--replay-exit', type=int, default=0,
+                              help='재생 후 종료 코드 (Exit code after the replay)')
+    fetch_parser.add_argument('--replay-cr', action='store_true',
+                              help='재생할 때 진행률 줄을 CR로 끝냄 (End progress lines in CR while replaying)')
+    fetch_parser.add_argument('--reader', choices=READERS, default=DEFAULT_READER,
+                              help='출력 읽기 방식 (Output reader): raw는 논블로킹 바이트 읽기 (non-blocking bytes), text는 텍스트 줄 버퍼 (text line buffering)')
+    fetch_parser.add_argument('--parallel', type=int, default=0, metavar='N',
+                              help='asyncio 엔진으로 최대 N개 버전을 동시에 다운로드 (Fetch up to N versions at once on the asyncio engine)')
+    fetch_parser.add_argument('--max-attempts', type=int, default=5,
+                              help='실패/멈춤 시 최대 시도 횟수 (Maximum attempts on failure or stall)')
+    fetch_parser.add_argument('--retry-delay', type=float, default=10.0,
+                              help='첫 재시도 대기 시간, 이후 두 배씩 증가 (First retry delay in seconds, doubled each time)')
+    fetch_parser.add_argument('--inactivity-timeout', type=float, default=DEFAULT_INACTIVITY_TIMEOUT,
+                              help='출력이 없으면 재시작할 시간 (Seconds without output before restarting)')
+    fetch_parser.add_argument('--progress-timeout', type=float, default=DEFAULT_PROGRESS_TIMEOUT,
+                              help='진행률이 오르지 않으면 재시작할 시간 (Seconds without progress before restarting)')
+    fetch_parser.add_argument('--peer', dest='peers', action='append', default=[],
+                              help='softwareupdate 전에 시도할 LAN 시드 주소, 여러 번 지정 가능 (LAN seed tried before softwareupdate, repeatable), e.g. 10.0.0.5:8631')
+    fetch_parser.add_argument('--installer-dir', default=None,
+                              help='피어에서 받은 설치 프로그램을 둘 폴더 (Folder receiving installers pulled from peers)')
+    fetch_parser.add_argument('--no-verify', action='store_true',
+                              help='받은 설치 프로그램 무결성 검증 안 함 (Do not verify the fetched installer)')
+    fetch_parser.add_argument('--package-dir', metavar='DIR', default=None,
+                              help='받은 뒤 이 폴더에 압축 파일로 패키징 (Package the installer into an archive in this folder afterwards)')
+    fetch_parser.add_argument('--codec', choices=PACKAGE_CODECS, default=PACKAGE_CODECS[0],
+                              help='패키징 압축 방식 (Packaging codec)')
+    fetch_parser.add_argument('--upload-url', metavar='URL', default=None,
+                              help='패키징한 뒤 이 배포 지점에 업로드, 토큰은 MACOSUPDATES_UPLOAD_TOKEN '
+                                   '(Upload to this distribution point after packaging, token from MACOSUPDATES_UPLOAD_TOKEN)')
+    fetch_parser.add_argument('--diagnostics', action='store_true',
+                              help='줄 처리 단계별 시간을 측정해 끝에 stderr로 출력 (Time each line handling stage and print it to stderr at the end)')
+
+    verify_parser = subparsers.add_parser('verify', help='설치 프로그램 무결성 검증 (Verify an installer\'s integrity)')
+    verify_parser.add_argument('path',
+                               help='설치 프로그램 번들 경로 (Installer bundle path)')
+    verify_parser.add_argument('--version', default=None,
+                               help='예상 macOS 버전 (Expected macOS version)')
+    verify_parser.add_argument('--manifest', default=None,
+                               help='비교할 매니페스트 JSON, 없으면 저장된 기준 사용 (Manifest JSON to compare against, the stored reference by default)')
+    verify_parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                               help='해시 스레드 수 (Hashing threads)')
+    verify_parser.add_argument('--no-cache', action='store_true',
+                               help='해시 캐시를 쓰지 않고 모두 다시 해시 (Rehash everything without the hash cache)')
+    verify_parser.add_argument('--json', action='store_true',
+                               help='결과를 JSON으로 출력 (Print the result as JSON)')
+
+    package_parser = subparsers.add_parser('package', help='설치 프로그램을 배포용 압축 파일로 패키징 (Package an installer into a distribution archive)')
+    package_parser.add_argument('path',
+                                help='패키징할 폴더 (보통 설치 프로그램 번들) (Folder to package, usually an installer bundle)')
+    package_parser.add_argument('--output-dir', default=None,
+                                help='압축 파일 폴더 (Archive folder)')
+    package_parser.add_argument('--codec', choices=PACKAGE_CODECS, default=PACKAGE_CODECS[0],
+                                help='압축 방식 (Codec)')
+    package_parser.add_argument('--level', type=int, default=None,
+                                help='압축 수준 (Compression level)')
+    package_parser.add_argument('--threads', type=int, default=0,
+                                help='압축 스레드 수, 0이면 자동 (Compression threads, 0 for automatic)')
+    package_parser.add_argument('--version', default=None,
+                                help='번들에 버전 정보가 없을 때 이름에 붙일 버전 (Version for the name when the bundle has none)')
+    package_parser.add_argument('--json', action='store_true',
+                                help='결과를 JSON으로 출력 (Print the result as JSON)')
+
+    upload_parser = subparsers.add_parser('upload', help='파일을 배포 지점에 업로드 (Upload files to a distribution point)')
+    upload_parser.add_argument('paths', nargs='+',
+                               help='올릴 파일 (보통 패키징한 압축 파일과 매니페스트) (Files to upload, usually a packaged archive and its manifest)')
+    upload_parser.add_argument('--url', required=True,
+                               help='배포 지점 주소, 토큰은 MACOSUPDATES_UPLOAD_TOKEN '
+                                    '(Distribution point URL, token from MACOSUPDATES_UPLOAD_TOKEN)')
+    upload_parser.add_argument('--workers', type=int, default=4,
+                               help='병렬 업로드 수 (Parallel uploads)')
+    upload_parser.add_argument('--restart', action='store_true',
+                               help='저장된 진행 상황을 버리고 처음부터 (Discard saved progress and start over)')
+    upload_parser.add_argument('--json', action='store_true',
+                               help='결과를 JSON으로 출력 (Print the results as JSON)')
+
+    dp_parser = subparsers.add_parser('distribution-server',
+                                      help='업로드를 받는 대역 배포 지점 실행 (Run a stand-in distribution point receiving uploads)')
+    dp_parser.add_argument('--root', required=True,
+                           help='받은 파일을 둘 폴더 (Folder receiving the files)')
+    dp_parser.add_argument('--bind', default='127.0.0.1',
+                           help='바인드 주소 (Bind address)')
+    dp_parser.add_argument('--port', type=int, default=8632,
+                           help='포트 (Port)')
+
+    seed_parser = subparsers.add_parser('seed', help='받은 설치 프로그램을 LAN에 제공 (Serve downloaded installers on the LAN)')
+    seed_parser.add_argument('--bind', default='0.0.0.0',
+                             help='수신 주소 (Listen address)')
+    seed_parser.add_argument('--port', type=int, default=None,
+                             help='수신 포트 (Listen port)')
+    seed_parser.add_argument('--installer-dir', dest='installer_dirs', action='append', default=None,
+                             help='제공할 설치 프로그램 폴더, 여러 번 지정 가능 (Installer folder to serve, repeatable)')
+
+    fleet_parser = subparsers.add_parser('fleet', help='여러 Mac에 SSH로 설치 프로그램 준비 (Stage installers on many Macs over SSH)')
+    fleet_parser.add_argument('--inventory', required=True,
+                              help='한 줄에 하나의 [user@]host 목록 파일 (File listing one [user@]host per line)')
+    fleet_parser.add_argument('--version', required=True,
+                              help='받을 macOS 버전 (macOS version to fetch)')
+    fleet_parser.add_argument('--parallel', type=int, default=16, metavar='N',
+                              help='동시에 실행할 호스트 수 (Hosts fetching at the same time)')
+    fleet_parser.add_argument('--max-connections', type=int, default=32,
+                              help='열어 둘 최대 SSH 연결 수 (Maximum SSH connections kept open)')
+    fleet_parser.add_argument('--ssh-option', dest='ssh_options', action='append', default=[],
+                              help="추가 ssh -o 옵션, 여러 번 지정 가능 (Extra ssh -o option, repeatable), e.g. User=admin")
+    fleet_parser.add_argument('--remote-command', default=None,
+                              help='원격 헤드리스 CLI 명령 (Remote headless CLI command)')
+    fleet_parser.add_argument('--remote-arg', dest='remote_args', action='append', default=[],
+                              help='원격 fetch에 전달할 인자, 여러 번 지정 가능 (Extra argument for the remote fetch, repeatable)')
+    fleet_parser.add_argument('--json', action='store_true',
+                              help='호스트별 이벤트를 JSON 줄로 출력 (Emit per-host events as JSON lines)')
+    fleet_parser.add_argument('--log-dir', default=None,
+                              help='호스트별 로그 폴더 (Per-host log folder)')
+    fleet_parser.add_argument('--fake-hosts', metavar='TRANSCRIPT', default=None,
+                              help='SSH 대신 로컬에서 녹화된 출력을 재생하는 가짜 호스트 사용 (Use fake hosts replaying a transcript locally instead of SSH)')
+    fleet_parser.add_argument('--fake-rate', type=float, default=None,
+                              help='가짜 호스트 재생 속도, 초당 줄 수 (Fake host replay speed in lines per second)')
+    fleet_parser.add_argument('--fake-fail', action='append', default=[],
+                              help='연결에 실패하는 가짜 호스트 (Fake host that fails to connect)')
+    return parser
+
+# 여러 호스트에서 원격 fetch 실행
+# Run the remote fetch on many hosts
+def run_fleet_command(args):
+    """
+    fleet 하위 명령 실행 - 모든 호스트가 성공하면 True 반환
+    Run the fleet subcommand - returns True if every host succeeded
+    """
+    import asyncio
+    import fleet
+
+    hosts = fleet.load_inventory(args.inventory)
+    started = datetime.datetime.now()
+    setup_logging(args.log_dir or get_temp_path())
+    log_dir = os.path.join(args.log_dir or get_temp_path(), f"fleet_{started.strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(log_dir, exist_ok=True)
+
+    if args.fake_hosts:
+        transport = fleet.FakeHostTransport(args.fake_hosts, args.fake_rate, failing_hosts=args.fake_fail,
+                                            log_dir=os.path.join(log_dir, 'remote'))
+    else:
+        transport = fleet.SSHTransport(args.ssh_options, args.remote_command or fleet.DEFAULT_REMOTE_COMMAND)
+
+    view = fleet.FleetView(hosts)
+    if args.json:
+        listeners = {host: JsonListener(args.version, host=host) for host in hosts}
+        on_event = lambda host, event: dispatch_event(event, listeners[host])
+    else:
+        # 호스트가 끝나거나 재시도할 때와 2초마다 요약 출력
+        # Print when a host ends or retries, and a summary every two seconds
+        last_summary = [time.monotonic()]
+
+        def on_event(host, event):
+            if isinstance(event, (FinishedEvent, ErrorEvent, RetryEvent)):
+                state = view.hosts[host]
+                print(f"{host}: {state.state} {state.message}", flush=True)
+            now = time.monotonic()
+            if now - last_summary[0] >= 2.0:
+                last_summary[0] = now
+                print(view.summary_line(), flush=True)
+
+    results, view = asyncio.run(fleet.run_fleet(
+        hosts, args.version, transport, args.parallel, args.max_connections,
+        log_dir, args.remote_args, on_event, view))
+
+    if not args.json:
+        print(view.summary_line())
+        print('\n'.join(view.table()))
+        print(f"로그 (Logs): {log_dir}")
+    return all(results)
+
+# 시드 서버 실행
+# Run the seed server
+def run_seed_command(args):
+    """
+    seed 하위 명령 실행 - 매니페스트를 미리 만든 뒤 중지될 때까지 제공
+    Run the seed subcommand - builds manifests up front, then serves until stopped
+    """
+    from peer_seed import SeedServer, DEFAULT_SEED_PORT
+
+    cache = InstallerCache(installer_dirs=args.installer_dirs)
+    server = SeedServer(cache, args.bind, args.port or DEFAULT_SEED_PORT)
+    for version in server.entries():
+        print(f"매니페스트 준비 중 (Preparing manifest): macOS {version}", flush=True)
+        server.manifest(version)
+    print(f"시드 제공 중 (Seeding on) {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+# 단계 제너레이터 실행 (verify/package/upload)
+# Drive a step generator (verify/package/upload)
+def drive(steps, on_progress):
+    """
+    상태 문자열/진행 상황을 생성하는 단계 제너레이터를 끝까지 실행하고 그 반환값 반환 - 각 단계는 on_progress로 전달
+    Run a step generator yielding status strings/progress to the end and return its return value -
+    every step is handed to `on_progress`
+    """
+    while True:
+        try:
+            step = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        on_progress(step)
+
+def print_steps(quiet=False):
+    """
+    drive()용 콜백 - 상태 문자열과 10% 단위 진행률 출력 (quiet이면 출력하지 않음)
+    Callback for drive() - prints status strings and progress in 10% steps (nothing when `quiet`)
+    """
+    last_percent = -1
+
+    def on_progress(step):
+        nonlocal last_percent
+        if quiet:
+            return
+        if isinstance(step, str):
+            print(step, flush=True)
+            return
+        percent = step.bytes_done * 100 // step.bytes_total if step.bytes_total else 100
+        if percent // 10 > last_percent // 10:
+            print(f"{percent}%", flush=True)
+        last_percent = percent
+
+    return on_progress
+
+# 설치 프로그램 검증
+# Verify an installer
+def run_verify_command(args):
+    """
+    verify 하위 명령 실행 - 통과하면 0, 실패하면 1 반환
+    Run the verify subcommand - returns 0 when it passed, 1 when it failed
+    """
+    reference = None
+    if args.manifest:
+        with open(args.manifest, 'r', encoding='utf-8') as f:
+            reference = json.load(f)
+    verifier = InstallerVerifier(None if args.no_cache else HashCache(), workers=args.workers)
+    steps = verifier.verify(args.path, args.version, reference)
+    result = drive(steps, print_steps(quiet=args.json))
+
+    if args.json:
+        print(json.dumps({
+            'ok': result.ok,
+            'problems': result.problems,
+            'version': result.manifest['version'],
+            'build': result.manifest['build'],
+            'files': len(result.manifest['files']),
+            'bytes': result.manifest['size'],
+            'hashed_bytes': result.hashed_bytes,
+            'cached_bytes': result.cached_bytes,
+            'seconds': round(result.seconds, 3),
+            'recorded': result.recorded,
+        }, ensure_ascii=False))
+    else:
+        for problem in result.problems:
+            print(problem)
+        print(format_result(result))
+    return 0 if result.ok else 1
+
+# 설치 프로그램 패키징
+# Package an installer
+def run_package_command(args):
+    """
+    package 하위 명령 실행 - 성공하면 0, 실패하면 1 반환
+    Run the package subcommand - returns 0 on success, 1 on failure
+    """
+    from installer_package import InstallerPackager, DEFAULT_PACKAGE_DIR, format_package_result
+
+    try:
+        packager = InstallerPackager(args.output_dir or DEFAULT_PACKAGE_DIR, args.codec, args.level, args.threads)
+        steps = packager.package(args.path, args.version)
+        result = drive(steps, print_steps(quiet=args.json))
+    except (OSError, ValueError) as e:
+        print(f"패키징 실패 (Packaging failed): {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps({
+            'archive': result.archive_path,
+            'manifest': result.manifest_path,
+            'codec': result.manifest['codec'],
+            'level': result.manifest['level'],
+            'input_bytes': result.input_bytes,
+            'output_bytes': result.output_bytes,
+            'chunks': len(result.manifest['chunks']),
+            'seconds': round(result.seconds, 3),
+        }, ensure_ascii=False))
+    else:
+        print(format_package_result(result))
+    return 0
+
+# 배포 지점 업로드
+# Upload to a distribution point
+def run_upload_command(args):
+    """
+    upload 하위 명령 실행 - 모두 올리면 0, 실패하면 1 반환 (Ctrl+C로 멈추면 다음 실행에서 이어 올림)
+    Run the upload subcommand - returns 0 when everything was uploaded, 1 on failure
+    (stopping with Ctrl+C resumes on the next run)
+    """
+    from distribution_upload import DistributionUploader, UPLOAD_ERRORS, format_upload_result
+
+    uploader = DistributionUploader(args.url, workers=args.workers)
+    for path in args.paths:
+        if args.restart:
+            uploader.discard_state(path)
+        steps = uploader.upload(path)
+        try:
+            result = drive(steps, print_steps(quiet=args.json))
+        except UPLOAD_ERRORS as e:
+            print(f"업로드 실패 (Upload failed): {path}: {e}", file=sys.stderr)
+            return 1
+        except KeyboardInterrupt:
+            steps.close()
+            print("업로드 중단됨 - 다시 실행하면 이어 올림 (Upload interrupted - run again to resume)", file=sys.stderr)
+            return 130
+        if args.json:
+            print(json.dumps(result._asdict(), ensure_ascii=False))
+        else:
+            print(format_upload_result(result))
+    return 0
+
+# 대역 배포 지점 실행
+# Run the stand-in distribution point
+def run_distribution_server_command(args):
+    """
+    distribution-server 하위 명령 실행 - 중지될 때까지 업로드를 받음 (토큰은 MACOSUPDATES_UPLOAD_TOKEN)
+    Run the distribution-server subcommand - receives uploads until stopped (token from MACOSUPDATES_UPLOAD_TOKEN)
+    """
+    from distribution_upload import DistributionServer, UPLOAD_TOKEN_ENV
+
+    server = DistributionServer(args.root, args.bind, args.port, os.environ.get(UPLOAD_TOKEN_ENV))
+    print(f"업로드 받는 중 (Receiving uploads on) {server.url} -> {args.root}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+# 세션 색인 검색
+# Search the session index
+def run_logs_command(args):
+    """
+    logs 하위 명령 실행 - 색인되지 않은 기존 로그를 먼저 추가한 뒤 검색
+    Run the logs subcommand - adds existing unindexed logs first, then searches
+    """
+    from log_pipeline import INDEX_NAME
+    from session_index import SessionIndex, since_timestamp
+
+    log_dir = args.log_dir or get_temp_path()
+    index = SessionIndex(os.path.join(log_dir, INDEX_NAME))
+    try:
+        index.backfill(log_dir, before=time.time())
+        if args.lines and args.grep:
+            for line in index.search_lines(args.grep, limit=args.limit):
+                print(json.dumps(line, ensure_ascii=False) if args.json
+                      else f"{line['session_id']}  {line['ts'] or '':<23}  {line['text']}")
+            return 0
+        sessions = index.sessions(version=args.version, result=args.result, failed=args.failed,
+                                  since=since_timestamp(args.days, args.since), text=args.grep,
+                                  limit=args.limit)
+    finally:
+        index.close()
+    for session in sessions:
+        if args.json:
+            print(json.dumps(session, ensure_ascii=False))
+        else:
+            print(f"{session['started'] or '':<26} {session['version'] or '':<10} {session['result'] or '-':<10} "
+                  f"{session['attempts'] or '-':>2}  {session['log_file']}")
+    return 0
+
+# 카탈로그 출력
+# Print the catalog
+def run_catalog_command(args):
+    """
+    catalog 하위 명령 실행 - 캐시가 신선하면 프로세스 없이 바로 출력
+    Run the catalog subcommand - prints straight from the cache when it is fresh
+    """
+    if args.plist:
+        source = PlistSource(args.plist)
+    else:
+        if args.replay:
+            source = SoftwareUpdateSource(fake_softwareupdate_runner(args.replay),
+                                          name=f"replay:{os.path.abspath(args.replay)}")
+        else:
+            source = SoftwareUpdateSource()
+    store = CatalogStore(ttl=args.ttl, source=source)
+    try:
+        catalog = store.refresh() if args.refresh else store.get()
+    except (OSError, ValueError) as e:
+        print(f"카탈로그를 받을 수 없음 (Could not load the catalog): {e}", file=sys.stderr)
+        return 1
+
+    entries = catalog.filter(args.filter)
+    if args.since:
+        # softwareupdate --list-full-installers 출력에는 출시일이 없음
+        # softwareupdate --list-full-installers output carries no release dates
+        if entries and not catalog.released_between():
+            print("이 카탈로그에는 출시일이 없어 --since로 거를 수 없음 - --plist로 카탈로그 plist 사용 "
+                  "(This catalog has no release dates, so --since matches nothing - use --plist "
+                  "with a catalog plist)", file=sys.stderr)
+        recent = set(catalog.released_between(args.since))
+        entries = [entry for entry in entries if entry in recent]
+    if args.json:
+        for entry in entries:
+            print(json.dumps(entry._asdict()))
+        return 0
+    for entry in entries:
+        print(f"{entry.version:<10} {entry.build:<10} {entry.date or '':<10}  {entry.title}")
+    return 0
+
+# 명령줄 진입점
+# Command line entry point
+def main(argv=None):
+    """
+    명령줄 진입점 - GUI 모드일 때만 PyQt5를 가져옴
+    Command line entry point - PyQt5 is only imported in GUI mode
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command in (None, 'gui') and getattr(args, 'profile_startup', False):
+        child_argv = ['gui']
+        if args.async_engine:
+            child_argv.append('--async-engine')
+        if args.catalog_plist:
+            child_argv += ['--catalog-plist', args.catalog_plist]
+        report = startup_profile.profile_command(child_argv, args.profile_output)
+        print(startup_profile.format_report(report))
+        return report['returncode']
+
+    if args.command in (None, 'gui'):
+        import macOSUpdate
+        catalog_store = None
+        if getattr(args, 'catalog_plist', None):
+            catalog_store = CatalogStore(source=PlistSource(args.catalog_plist))
+        return macOSUpdate.main(use_async_engine=getattr(args, 'async_engine', False),
+                                catalog_store=catalog_store,
+                                diagnostics=getattr(args, 'diagnostics', False),
+                                package_dir=getattr(args, 'package_dir', None),
+                                upload_url=getattr(args, 'upload_url', None),
+                                cache_max_versions=getattr(args, 'cache_max_versions', None),
+                                cache_max_bytes=getattr(args, 'cache_max_bytes', None))
+
+    if args.command == 'catalog':
+        return run_catalog_command(args)
+
+    if args.command == 'logs':
+        return run_logs_command(args)
+
+    if args.command == 'fleet':
+        return 0 if run_fleet_command(args) else 1
+
+    if args.command == 'seed':
+        return run_seed_command(args)
+
+    if args.command == 'verify':
+        return run_verify_command(args)
+
+    if args.command == 'package':
+        return run_package_command(args)
+
+    if args.command == 'upload':
+        return run_upload_command(args)
+
+    if args.command == 'distribution-server':
+        return run_distribution_server_command(args)
+
+    if (args.package_dir or args.upload_url) and args.parallel > 0:
+        print("--package-dir/--upload-url은 --parallel과 함께 쓸 수 없음 "
+              "(--package-dir/--upload-url cannot be combined with --parallel)", file=sys.stderr)
+        return 2
+
+    log_dir = args.log_dir or get_temp_path()
+    os.makedirs(log_dir, exist_ok=True)
+    setup_logging(log_dir)
+    cache = None if args.no_cache else InstallerCache(max_versions=args.cache_max_versions,
+                                                      max_bytes=args.cache_max_bytes)
+    listener_class = JsonListener if args.json else TextListener
+    if args.replay:
+        runner = fake_softwareupdate_runner(args.replay, args.replay_rate, args.replay_exit,
+                                            carriage_returns=args.replay_cr, reader=args.reader)
+    else:
+        runner = SubprocessRunner(reader=args.reader)
+
+    supervisor_options = {
+        'policy': RetryPolicy(args.max_attempts, args.retry_delay),
+        'inactivity_timeout': args.inactivity_timeout,
+        'progress_timeout': args.progress_timeout,
+    }
+    # 재생은 실제로 아무것도 받지 않으므로 검증할 설치 프로그램도 없음
+    # A replay fetches nothing, so there is no installer to verify
+    if not (args.no_verify or args.replay):
+        supervisor_options['verifier'] = InstallerVerifier(HashCache())
+    if args.peers:
+        from peer_seed import PeerClient
+        installer_dir = args.installer_dir or (cache.installer_dirs[0] if cache else '/Applications')
+        supervisor_options['peer'] = PeerClient(args.peers, installer_dir)
+
+    packager = uploader = None
+    if args.package_dir or args.upload_url:
+        from installer_package import InstallerPackager, DEFAULT_PACKAGE_DIR
+        packager = InstallerPackager(args.package_dir or DEFAULT_PACKAGE_DIR, args.codec)
+    if args.upload_url:
+        from distribution_upload import DistributionUploader
+        uploader = DistributionUploader(args.upload_url)
+
+    timers = None
+    if args.diagnostics:
+        from diagnostics import enable_stage_timers
+        timers = enable_stage_timers()
+
+    # SIGTERM도 Ctrl+C처럼 처리해 엔진이 softwareupdate를 중지하고 세션 로그를 닫게 함
+    # Treat SIGTERM like Ctrl+C so the engine stops softwareupdate and the session logs get closed
+    signal.signal(signal.SIGTERM, raise_interrupt)
+    try:
+        if args.parallel > 0:
+            import asyncio
+            ok = asyncio.run(fetch_versions_async(
+                args.versions, listener_class, log_dir, args.parallel, cache, runner, supervisor_options))
+        else:
+            ok = True
+            for version in args.versions:
+                ok = fetch_version(version, listener_class(version), log_dir, cache, runner, supervisor_options,
+                                   packager, uploader) and ok
+    except KeyboardInterrupt:
+        print("다운로드 취소됨 (Download cancelled)", file=sys.stderr)
+        return 130
+
+    if timers is not None:
+        from diagnostics import format_stage_report
+        print(format_stage_report(timers.snapshot()), file=sys.stderr)
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import os
+import sys
+import json
+import time
+import datetime
+import threading
+import traceback
+
+# 실행 중인 앱의 진단 도구 (Qt 없음) - 단계별 타이머, 샘플링 프로파일러, 스레드 덤프
+# Diagnostics for the running app (no Qt) - per-stage timers, sampling profiler, thread dumps
+#
+# 모두 명시적으로 켜야 동작하며, 꺼져 있으면 다운로드 엔진은 줄마다 None 검사만 함
+# Everything is opt-in; while it is off the download engines only do a None check per line
+
+# 다운로드 엔진의 줄 처리 단계 (표시 순서)
+# Line handling stages of the download engines (display order)
+STAGES = ('read', 'parse', 'log', 'emit')
+
+# 진단을 시작할 때 켜는 환경 변수 (번들 앱은 명령줄 인자가 없음)
+# Environment variable turning diagnostics on at startup (bundled apps get no command line)
+DIAGNOSTICS_ENV = 'MACOSUPDATES_DIAGNOSTICS'
+
+# 샘플링 프로파일러 기본 간격 (초)과 tracemalloc 스택 깊이
+# Default sampling profiler interval (seconds) and tracemalloc stack depth
+DEFAULT_SAMPLE_INTERVAL = 0.005
+TRACEMALLOC_FRAMES = 10
+
+# 보고서에 넣을 가장 큰 항목 수
+# Number of top entries kept in the reports
+TOP_ENTRIES = 40
+
+# debug_info에 포함할 환경 변수 접두사 (나머지는 기록하지 않음)
+# Environment variable prefixes included in debug_info (everything else is left out)
+ENV_PREFIXES = ('LANG', 'LC_', 'PATH', 'PYTHON', 'QT_', 'MACOSUPDATES_', 'TMPDIR')
+
+# 단계별 누적 시간
+# Per-stage accumulated time
+class StageTimers:
+    """
+    단계별 횟수/총 시간/최대 시간을 모으는 스레드 안전 누적기
+    Thread-safe accumulator of per-stage counts, total and maximum time
+    """
+
+    def __init__(self):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self.since = time.monotonic()
+
+    def add(self, stage, elapsed_ns):
+        """
+        stage에 elapsed_ns 나노초 추가
+        Add `elapsed_ns` nanoseconds to `stage`
+        """
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [0, 0, 0]
+            entry[0] += 1
+            entry[1] += elapsed_ns
+            if elapsed_ns > entry[2]:
+                entry[2] = elapsed_ns
+
+    def clock(self):
+        return LapClock(self)
+
+    def snapshot(self):
+        """
+        {'seconds', 'lines', 'stages': {단계: {count, total_ms, mean_us, max_us, share}}} 사전 반환 -
+        lines는 read 횟수, share는 전체 단계 시간 중 비율
+        Return {'seconds', 'lines', 'stages': {stage: {count, total_ms, mean_us, max_us, share}}} -
+        `lines` is the read count and `share` the fraction of all stage time
+        """
+        with self._lock:
+            stages = {stage: list(entry) for stage, entry in self._stages.items()}
+            seconds = time.monotonic() - self.since
+        grand_total = sum(entry[1] for entry in stages.values()) or 1
+        ordered = [stage for stage in STAGES if stage in stages]
+        ordered += sorted(stage for stage in stages if stage not in STAGES)
+        return {
+            'seconds': round(seconds, 3),
+            'lines': stages.get('read', [0])[0],
+            'stages': {stage: {
+                'count': stages[stage][0],
+                'total_ms': round(stages[stage][1] / 1e6, 3),
+                'mean_us': round(stages[stage][1] / 1e3 / max(stages[stage][0], 1), 2),
+                'max_us': round(stages[stage][2] / 1e3, 2),
+                'share': round(stages[stage][1] / grand_total, 4),
+            } for stage in ordered},
+        }
+
+# 구간 타이머
+# Lap timer
+class LapClock:
+    """
+    이전 lap() 이후의 시간을 단계에 더하는 타이머 - 엔진 하나가 한 스레드에서만 사용
+    Timer charging the time since the previous lap() to a stage - used by one engine on one thread
+    """
+
+    def __init__(self, timers):
+        self.timers = timers
+        self.last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        now = time.perf_counter_ns()
+        self.timers.add(stage, now - self.last)
+        self.last = now
+
+# 프로세스 전체 단계 타이머 (켜기 전에는 None)
+# Process-wide stage timers (None until enabled)
+_stage_timers = None
+
+def enable_stage_timers():
+    """
+    단계 타이머를 켜고 반환 - 이미 켜져 있으면 기존 타이머 반환
+    Turn the stage timers on and return them - the existing timers when already on
+    """
+    global _stage_timers
+    if _stage_timers is None:
+        _stage_timers = StageTimers()
+    return _stage_timers
+
+def disable_stage_timers():
+    global _stage_timers
+    _stage_timers = None
+
+def stage_timers():
+    """
+    켜져 있는 단계 타이머 (꺼져 있으면 None)
+    The active stage timers (None while off)
+    """
+    return _stage_timers
+
+def stage_clock():
+    """
+    단계 타이머가 켜져 있으면 새 구간 타이머, 아니면 None - 엔진이 작업 시작 시 호출
+    A new lap clock while the stage timers are on, otherwise None - called by engines as a job starts
+    """
+    timers = _stage_timers
+    return timers.clock() if timers is not None else None
+
+def enabled_from_env():
+    return os.environ.get(DIAGNOSTICS_ENV, '') not in ('', '0')
+
+def format_stage_report(snapshot):
+    """
+    단계 타이머 스냅샷을 사람이 읽을 수 있는 여러 줄 문자열로 변환
+    Format a stage timer snapshot as human-readable lines
+    """
+    lines = [f"{snapshot['lines']} 줄 / {snapshot['seconds']:.1f} 초 "
+             f"({snapshot['lines']} lines in {snapshot['seconds']:.1f} s)",
+             f"  {'stage':<8} {'count':>9} {'total ms':>11} {'mean us':>10} {'max us':>11} {'share':>7}"]
+    for stage, entry in snapshot['stages'].items():
+        lines.append(f"  {stage:<8} {entry['count']:>9} {entry['total_ms']:>11.1f} {entry['mean_us']:>10.1f} "
+                     f"{entry['max_us']:>11.1f} {entry['share']:>7.1%}")
+    return '\n'.join(lines)
+
+# 실행 환경 정보
+# Runtime environment information
+def debug_info():
+    """
+    지원 요청에 필요한 실행 환경 정보 사전 - 환경 변수는 ENV_PREFIXES에 해당하는 것만 포함
+    Runtime environment details useful for support requests - only environment variables
+    matching ENV_PREFIXES are included
+    """
+    import platform
+    info = {
+        'python': sys.version.split()[0],
+        'executable': sys.executable,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'pid': os.getpid(),
+        'cwd': os.getcwd(),
+        'frozen': bool(getattr(sys, 'frozen', False)),
+        'threads': threading.active_count(),
+        'env': {key: value for key, value in sorted(os.environ.items()) if key.startswith(ENV_PREFIXES)},
+    }
+    if getattr(sys, '_MEIPASS', None):
+        info['meipass'] = sys._MEIPASS
+    qt_core = sys.modules.get('PyQt5.QtCore')
+    if qt_core is not None:
+        info['qt'] = qt_core.QT_VERSION_STR
+        info['pyqt'] = qt_core.PYQT_VERSION_STR
+    return info
+
+def peak_rss_mib():
+    """
+    프로세스의 최대 RSS (MiB) - resource 모듈이 없으면 None
+    Peak RSS of the process (MiB) - None without the resource module
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KiB 단위
+    # Bytes on macOS, KiB on Linux
+    return round(peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0, 1)
+
+# 스레드 덤프
+# Thread dump
+def thread_dump():
+    """
+    모든 스레드의 현재 스택을 {스레드 이름: 스택 줄 목록}으로 반환 ("멈춤" 보고 분석용)
+    Return every thread's current stack as {thread name: stack lines} (for "it froze" reports)
+    """
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    return {f"{names.get(ident, 'unknown')} ({ident})": traceback.format_stack(frame)
+            for ident, frame in sys._current_frames().items()}
+
+def _stamp():
+    return datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+
+def write_snapshot(log_dir, extra=None):
+    """
+    단계 타이머/실행 환경/스레드 덤프 (및 extra)를 로그 폴더에 JSON으로 기록하고 경로 반환
+    Write the stage timers, runtime details and a thread dump (plus `extra`) as JSON
+    into the log folder and return its path
+    """
+    timers = stage_timers()
+    snapshot = {
+        'time': datetime.datetime.now().isoformat(timespec='seconds'),
+        'info': debug_info(),
+        'peak_rss_mib': peak_rss_mib(),
+        'stages': timers.snapshot() if timers is not None else None,
+        'threads': thread_dump(),
+    }
+    snapshot.update(extra or {})
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, f"diagnostics-{_stamp()}.diagnostics.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2, ensure_ascii=False)
+    return path
+
+# 모든 스레드를 보는 샘플링 프로파일러
+# Sampling profiler covering every thread
+class SamplingProfiler:
+    """
+    sys._current_frames()로 모든 스레드의 스택을 주기적으로 수집하는 프로파일러 -
+    호출한 스레드 (GUI)는 cProfile로, 메모리는 tracemalloc으로 함께 기록
+    Profiler sampling every thread's stack through sys._current_frames(); the calling (GUI)
+    thread is also recorded with cProfile and memory with tracemalloc
+
+    stop()은 로그 폴더에 다음 파일을 쓰고 경로 목록을 반환
+    stop() writes these files into the log folder and returns their paths:
+        profile-*.folded       스레드별 접힌 스택 (flamegraph/speedscope) - folded stacks per thread
+        profile-*.profile.txt  가장 많이 샘플된 함수 - most sampled functions
+        profile-*.pstats       호출 스레드의 cProfile 통계 - cProfile stats of the calling thread
+        memory-*.memory.txt    tracemalloc 할당 상위 목록 - top tracemalloc allocations
+    """
+
+    def __init__(self, log_dir, interval=DEFAULT_SAMPLE_INTERVAL, memory=True):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.log_dir = log_dir
+        self.interval = interval
+        self.memory = memory
+        self.samples = {}
+        self.sample_count = 0
+        self.started_at = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._cprofile = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        """
+        샘플링 스레드, 호출 스레드의 cProfile, tracemalloc 시작
+        Start the sampling thread, cProfile on the calling thread and tracemalloc
+        """
+        if self.running:
+            return self
+        import cProfile
+        self.samples = {}
+        self.sample_count = 0
+        self.started_at = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name='diagnostics-sampler', daemon=True)
+        self._thread.start()
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+        if self.memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+        return self
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                key = ';'.join(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+            self.sample_count += 1
+
+    def stop(self):
+        """
+        프로파일링을 멈추고 결과 파일을 기록한 뒤 경로 목록 반환
+        Stop profiling, write the result files and return their paths
+        """
+        if not self.running:
+            return []
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._cprofile.disable()
+        os.makedirs(self.log_dir, exist_ok=True)
+        stamp = _stamp()
+        paths = [self._write_folded(stamp), self._write_top(stamp)]
+
+        pstats_path = os.path.join(self.log_dir, f"profile-{stamp}.pstats")
+        self._cprofile.dump_stats(pstats_path)
+        self._cprofile = None
+        paths.append(pstats_path)
+
+        if self.memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                paths.append(self._write_memory(stamp, tracemalloc.take_snapshot(),
+                                                tracemalloc.get_traced_memory()))
+                tracemalloc.stop()
+        return paths
+
+    def _write_folded(self, stamp):
+        path = os.path.join(self.log_dir, f"profile-{stamp}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.samples.items(), key=lambda item: item[1], reverse=True):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def _write_top(self, stamp):
+        # 함수별 자체 샘플 (스택 맨 위)과 포함 샘플 (스택 어딘가)
+        # Per-function self samples (top of stack) and inclusive samples (anywhere on the stack)
+        own, inclusive = {}, {}
+        for stack, count in self.samples.items():
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            own[frames[-1]] = own.get(frames[-1], 0) + count
+            for name in set(frames):
+                inclusive[name] = inclusive.get(name, 0) + count
+        total = sum(self.samples.values()) or 1
+        seconds = time.monotonic() - self.started_at
+        lines = [f"{self.sample_count} 샘플 / {seconds:.1f} 초, 간격 {self.interval * 1000:.0f} ms "
+                 f"({self.sample_count} samples in {seconds:.1f} s, {self.interval * 1000:.0f} ms interval)", '',
+                 '자체 (Self):']
+        lines.extend(f"  {count / total:7.1%}  {name}"
+                     for name, count in sorted(own.items(), key=lambda item: item[1], reverse=True)[:TOP_ENTRIES])
+        lines += ['', '포함 (Inclusive):']
+        lines.extend(f"  {count / total:7.1%}  {name}"
+                     for name, count in sorted(inclusive.items(), key=lambda item: item[1], reverse=True)[:TOP_ENTRIES])
+        path = os.path.join(self.log_dir, f"profile-{stamp}.profile.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def _write_memory(self, stamp, snapshot, traced):
+        current, peak = traced
+        lines = [f"추적 중 {current / 1024 / 1024:.1f} MiB, 최대 {peak / 1024 / 1024:.1f} MiB "
+                 f"(traced {current / 1024 / 1024:.1f} MiB, peak {peak / 1024 / 1024:.1f} MiB)", '']
+        lines.extend(str(stat) for stat in snapshot.statistics('lineno')[:TOP_ENTRIES])
+        path = os.path.join(self.log_dir, f"memory-{stamp}.memory.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
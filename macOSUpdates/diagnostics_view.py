@@ -0,0 +1,237 @@
+import time
+import collections
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                            QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import QObject, QTimer, Qt
+from diagnostics import (STAGES, SamplingProfiler, enable_stage_timers, stage_timers, write_snapshot,
+                         peak_rss_mib)
+from log_pipeline import get_logger
+
+# 진단 로거
+# Diagnostics logger
+logger = get_logger('diagnostics')
+
+# 이벤트 루프 측정 간격 (ms), 보관할 측정 수, 로그에 남길 지연 (ms)
+# Event loop probe interval (ms), samples kept, and the lag logged as a warning (ms)
+LOOP_PROBE_INTERVAL = 50
+LOOP_SAMPLES = 200
+LOOP_WARN_LAG = 1000
+
+# 패널 갱신 간격 (ms)
+# Panel refresh interval (ms)
+PANEL_REFRESH_INTERVAL = 500
+
+# GUI 이벤트 루프 지연 측정기
+# GUI event loop latency probe
+class EventLoopMonitor(QObject):
+    """
+    일정 간격 타이머가 예정보다 얼마나 늦게 실행되는지로 GUI 이벤트 루프 지연을 측정
+    Measures GUI event loop latency as how late a fixed-interval timer fires
+
+    LOOP_WARN_LAG 이상 막히면 로그에 경고를 남김
+    Blocks of LOOP_WARN_LAG or more are logged as warnings
+    """
+
+    def __init__(self, interval=LOOP_PROBE_INTERVAL, parent=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__(parent)
+        self.interval = interval
+        self.lags = collections.deque(maxlen=LOOP_SAMPLES)
+        self.max_lag = 0.0
+        self._last = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._probe)
+
+    @property
+    def running(self):
+        return self._timer.isActive()
+
+    def start(self):
+        if not self.running:
+            self._last = time.monotonic()
+            self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def reset(self):
+        self.lags.clear()
+        self.max_lag = 0.0
+
+    def _probe(self):
+        now = time.monotonic()
+        lag = max(0.0, (now - self._last) * 1000.0 - self.interval)
+        self._last = now
+        self.lags.append(lag)
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if lag >= LOOP_WARN_LAG:
+            logger.warning(f"GUI 이벤트 루프가 {lag:.0f} ms 막힘 (GUI event loop blocked for {lag:.0f} ms)")
+
+    def stats(self):
+        """
+        최근 지연 (ms)의 last/p50/p95와 전체 최대값
+        last/p50/p95 of the recent lags (ms) and the overall maximum
+        """
+        lags = sorted(self.lags)
+        if not lags:
+            return {'last_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'last_ms': round(self.lags[-1], 1),
+            'p50_ms': round(lags[len(lags) // 2], 1),
+            'p95_ms': round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 1),
+            'max_ms': round(self.max_lag, 1),
+        }
+
+# 숨겨진 진단 패널
+# Hidden diagnostics panel
+class DiagnosticsPanel(QWidget):
+    """
+    단계별 타이머, 이벤트 루프 지연, 작업 수를 실시간으로 보여주고
+    프로파일링/스냅샷을 제어하는 패널 - 처음 보일 때 단계 타이머와 지연 측정을 켬
+    Panel showing the per-stage timers, event loop latency and job counts live, with
+    profiling/snapshot controls - the stage timers and latency probe start the first time it is shown
+    """
+
+    COLUMNS = ['단계 (Stage)', '횟수 (Count)', '합계 ms (Total)', '평균 us (Mean)', '최대 us (Max)', '비율 (Share)']
+
+    def __init__(self, log_dir, download_queue=None, parent=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__(parent)
+        self.log_dir = log_dir
+        self.download_queue = download_queue
+        self.loop_monitor = EventLoopMonitor(parent=self)
+        self.profiler = SamplingProfiler(log_dir)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table = QTableWidget(len(STAGES), len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setMaximumHeight(150)
+        for row, stage in enumerate(STAGES):
+            self.table.setItem(row, 0, QTableWidgetItem(stage))
+            for column in range(1, len(self.COLUMNS)):
+                self.table.setItem(row, column, QTableWidgetItem('-'))
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel(self)
+        self.summary_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        reset_button = QPushButton('초기화 (Reset)', self)
+        reset_button.clicked.connect(self.reset)
+        button_layout.addWidget(reset_button)
+        self.profile_button = QPushButton('프로파일링 시작 (Start profiling)', self)
+        self.profile_button.clicked.connect(self.toggle_profiling)
+        button_layout.addWidget(self.profile_button)
+        snapshot_button = QPushButton('스냅샷 저장 (Save snapshot)', self)
+        snapshot_button.clicked.connect(self.save_snapshot)
+        button_layout.addWidget(snapshot_button)
+        button_layout.addStretch(1)
+        layout.addLayout(button_layout)
+
+        self.info_label = QLabel(self)
+        self.info_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.info_label.setWordWrap(True)
+        layout.addWidget(self.info_label)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(PANEL_REFRESH_INTERVAL)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        enable_stage_timers()
+        self.loop_monitor.start()
+        self._refresh_timer.start()
+        self.refresh()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """
+        단계 타이머와 지연/작업 요약 표시 갱신
+        Refresh the stage timer table and the latency/job summary
+        """
+        timers = stage_timers()
+        snapshot = timers.snapshot() if timers is not None else {'seconds': 0.0, 'lines': 0, 'stages': {}}
+        for row, stage in enumerate(STAGES):
+            entry = snapshot['stages'].get(stage)
+            values = ['-'] * 5 if entry is None else [
+                str(entry['count']), f"{entry['total_ms']:.1f}", f"{entry['mean_us']:.1f}",
+                f"{entry['max_us']:.1f}", f"{entry['share']:.1%}"]
+            for column, value in enumerate(values, start=1):
+                self.table.item(row, column).setText(value)
+
+        loop = self.loop_monitor.stats()
+        rate = snapshot['lines'] / snapshot['seconds'] if snapshot['seconds'] else 0.0
+        parts = [f"줄 (Lines): {snapshot['lines']} ({rate:.0f}/s)",
+                 f"이벤트 루프 지연 (Event loop lag) ms: {loop['last_ms']:.1f} / "
+                 f"p95 {loop['p95_ms']:.1f} / max {loop['max_ms']:.1f}"]
+        if self.download_queue is not None:
+            parts.append(f"실행/대기 (Running/Pending): {len(self.download_queue.running_jobs())}/"
+                         f"{len(self.download_queue.pending_jobs())}")
+        rss = peak_rss_mib()
+        if rss is not None:
+            parts.append(f"최대 RSS (Peak RSS): {rss:.0f} MiB")
+        self.summary_label.setText('  |  '.join(parts))
+
+    def reset(self):
+        timers = stage_timers()
+        if timers is not None:
+            timers.reset()
+        self.loop_monitor.reset()
+        self.refresh()
+
+    def toggle_profiling(self):
+        """
+        샘플링 프로파일러 시작/중지 - 중지하면 결과 파일을 로그 폴더에 기록
+        Start/stop the sampling profiler - stopping writes the result files into the log folder
+        """
+        if not self.profiler.running:
+            self.profiler.start()
+            self.profile_button.setText('프로파일링 중지 (Stop profiling)')
+            self.info_label.setText('프로파일링 중 (Profiling)...')
+            logger.info("프로파일링 시작 (Profiling started)")
+            return
+        paths = self.profiler.stop()
+        self.profile_button.setText('프로파일링 시작 (Start profiling)')
+        self.info_label.setText('프로파일 저장 (Profile written): ' + ', '.join(paths))
+        logger.info(f"프로파일 저장 (Profile written): {', '.join(paths)}")
+
+    def save_snapshot(self):
+        """
+        단계 타이머, 지연, 작업 상태, 스레드 덤프를 로그 폴더에 JSON으로 저장
+        Save the stage timers, latency, job states and a thread dump as JSON into the log folder
+        """
+        extra = {'event_loop': self.loop_monitor.stats()}
+        if self.download_queue is not None:
+            extra['jobs'] = [{
+                'version': job.version,
+                'state': job.state,
+                'progress': job.progress,
+                'session': job.session_id,
+                'log_file': job.log_file_path,
+            } for job in self.download_queue.jobs]
+        try:
+            path = write_snapshot(self.log_dir, extra)
+        except OSError as e:
+            self.info_label.setText(f'스냅샷 저장 실패 (Snapshot failed): {e}')
+            return
+        self.info_label.setText(f'스냅샷 저장 (Snapshot written): {path}')
+        logger.info(f"진단 스냅샷 저장 (Diagnostics snapshot written): {path}")
@@ -0,0 +1,573 @@
+import os
+import json
+import time
+import queue
+import shutil
+import hashlib
+import threading
+import http.client
+from typing import NamedTuple
+from urllib.parse import quote, unquote, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from installer_verify import hash_range, DEFAULT_CHUNK_SIZE
+
+# 배포 지점 업로드 - 패키징한 설치 프로그램을 청크로 나눠 연결 풀 위에서 병렬로 올리고,
+# 진행 상황을 저장해 중단되면 첫 번째 빠진 청크부터 이어 올리며, 서버에 이미 있는 청크는 체크섬으로 건너뜀
+# Distribution point upload - packaged installers are split into chunks and uploaded in parallel over
+# a connection pool; progress is persisted so an interrupted upload resumes at the first missing chunk,
+# and chunks the server already has are skipped by checksum
+#
+# 업로드 프로토콜 (배포 지점 앞단이나 DistributionServer가 구현)
+# Upload protocol (implemented by a distribution point front end or by DistributionServer)
+#   POST /uploads                          {name, size, chunk_size, chunks, id?} -> {id, chunks: {index: sha256}}
+#   PUT  /uploads/<id>/chunks/<index>      본문 = 청크, X-Chunk-SHA256 헤더 (body = chunk, X-Chunk-SHA256 header)
+#   POST /uploads/<id>/complete            -> {name, size} (빠진 청크가 있으면 409 / 409 with missing chunks)
+
+# 업로드 상태 기본 폴더
+# Default folder for upload state
+DEFAULT_UPLOAD_STATE_DIR = os.path.join(os.path.expanduser('~/Library/Caches'), 'macOSUpdates', 'uploads')
+
+# 기본 병렬 업로드 수 (연결 풀 크기와 같음)
+# Default number of parallel uploads (same as the connection pool size)
+DEFAULT_UPLOAD_WORKERS = 4
+
+# 청크마다 시도할 횟수와 재시도 대기 시간 (초)
+# Attempts per chunk and the delay between them (seconds)
+CHUNK_ATTEMPTS = 3
+CHUNK_RETRY_DELAY = 2.0
+
+# 연결 제한 시간 (초)
+# Connection timeout (seconds)
+UPLOAD_TIMEOUT = 60
+
+# 상태 파일을 다시 쓰는 최소 간격 (초)
+# Minimum interval between state file writes (seconds)
+STATE_SAVE_INTERVAL = 1.0
+
+# 토큰을 담는 환경 변수 (명령줄 인자에 비밀을 남기지 않도록)
+# Environment variable holding the token (so secrets never show up in command lines)
+UPLOAD_TOKEN_ENV = 'MACOSUPDATES_UPLOAD_TOKEN'
+
+# 업로드 오류 (서버가 거부한 요청)
+# Upload error (a request the server rejected)
+class UploadError(Exception):
+    pass
+
+# 업로드 단계를 실패로 끝내는 오류
+# Errors that fail the upload stage
+UPLOAD_ERRORS = (OSError, ValueError, UploadError, http.client.HTTPException)
+
+# 업로드 진행률 (PeerProgress와 같은 모양이라 같은 방식으로 이벤트로 바뀜)
+# Upload progress (shaped like PeerProgress so it turns into events the same way)
+class UploadProgress(NamedTuple):
+    bytes_done: int
+    bytes_total: int
+
+# 업로드 결과
+# Upload result
+class UploadResult(NamedTuple):
+    """
+    sent는 이번에 보낸 청크 수, skipped는 서버에 이미 있어 건너뛴 청크 수
+    `sent` is the number of chunks sent this time, `skipped` the chunks the server already had
+    """
+    name: str
+    size: int
+    sent: int
+    skipped: int
+    sent_bytes: int
+    seconds: float
+
+# HTTP(S) 연결 풀
+# HTTP(S) connection pool
+class ConnectionPool:
+    """
+    한 서버로의 keep-alive 연결을 스레드 간에 재사용하는 풀 - 오류가 난 연결은 버리고 새로 만듦
+    Pool reusing keep-alive connections to one server across threads - failed connections are dropped
+    and replaced
+    """
+
+    def __init__(self, url, token=None, timeout=UPLOAD_TIMEOUT):
+        """
+        초기화 함수 - url은 'https://host[:port][/prefix]', token이 있으면 Bearer 인증
+        Initialization function - `url` is 'https://host[:port][/prefix]'; with `token`, Bearer authentication
+        """
+        parts = urlsplit(url if '//' in url else f'http://{url}')
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.headers = {'Authorization': f'Bearer {token}'} if token else {}
+        self._idle = queue.LifoQueue()
+        self._ssl_context = None
+
+    def _connect(self):
+        if not self.https:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        if self._ssl_context is None:
+            # ssl은 HTTPS를 쓸 때만 가져옴
+            # ssl is only imported when HTTPS is used
+            import ssl
+            self._ssl_context = ssl.create_default_context()
+        return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self._ssl_context)
+
+    def request(self, method, path, body=None, headers=None):
+        """
+        요청을 보내고 (상태 코드, 본문) 반환 - 연결은 응답을 다 읽은 뒤 풀로 돌려놓음
+        Send a request and return (status, body) - the connection goes back to the pool once the response is read
+        """
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        try:
+            connection.request(method, self.prefix + path, body=body, headers={**self.headers, **(headers or {})})
+            response = connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self._idle.put(connection)
+        return response.status, data
+
+    def request_json(self, method, path, data=None, expected=(200, 201)):
+        """
+        JSON 요청 - 기대한 상태 코드가 아니면 UploadError
+        JSON request - raises UploadError for an unexpected status code
+        """
+        body = json.dumps(data).encode('utf-8') if data is not None else None
+        status, response = self.request(method, path, body, {'Content-Type': 'application/json'})
+        if status not in expected:
+            raise UploadError(f"HTTP {status} {method} {path}: {response[:200].decode('utf-8', 'replace')}")
+        return json.loads(response) if response else {}
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+# 파일 청크 해시
+# Chunk hashes of a file
+def chunk_hashes(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    파일의 청크별 sha256 - 패키징 매니페스트(<파일>.manifest.json)가 있고 크기/청크 크기가 맞으면 그대로 사용
+    Per-chunk sha256 of a file - taken from the packaging manifest (<file>.manifest.json) when it exists
+    and its size/chunk size match
+    """
+    size = os.path.getsize(path)
+    try:
+        with open(path + '.manifest.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest['size'] == size and manifest['chunk_size'] == chunk_size:
+            return manifest['chunks']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return [hash_range(path, offset, min(chunk_size, size - offset)) for offset in range(0, size, chunk_size)]
+
+# 배포 지점 업로더
+# Distribution point uploader
+class DistributionUploader:
+    """
+    파일을 청크 단위로 배포 지점에 병렬 업로드하는 클래스 - 진행 상황은 state_dir에 저장되어 중단 후 이어 올림
+    Uploads files to a distribution point chunk by chunk in parallel - progress is kept in `state_dir`
+    so an interrupted upload resumes
+
+    upload()는 제너레이터라 엔진이 일시 정지/취소를 지키며 진행함
+    upload() is a generator, so engines drive it honouring pause/cancel
+    """
+
+    def __init__(self, url, token=None, workers=DEFAULT_UPLOAD_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE,
+                 state_dir=DEFAULT_UPLOAD_STATE_DIR, timeout=UPLOAD_TIMEOUT):
+        """
+        초기화 함수 - token이 None이면 MACOSUPDATES_UPLOAD_TOKEN 환경 변수 사용
+        Initialization function - without `token` the MACOSUPDATES_UPLOAD_TOKEN environment variable is used
+        """
+        self.url = url
+        self.token = token if token is not None else os.environ.get(UPLOAD_TOKEN_ENV)
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.state_dir = state_dir
+        self.timeout = timeout
+
+    def state_path(self, path):
+        key = hashlib.sha256(f"{self.url}\n{os.path.abspath(path)}".encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.state_dir, f"{key}.json")
+
+    def load_state(self, path, info):
+        """
+        파일이 바뀌지 않았으면 저장된 업로드 상태 (청크 해시, 세션 id, 올린 청크), 아니면 None
+        The stored upload state (chunk hashes, session id, uploaded chunks) while the file is unchanged, otherwise None
+        """
+        try:
+            with open(self.state_path(path), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('key') != [info.st_size, info.st_mtime_ns, self.chunk_size]:
+            return None
+        return state
+
+    def save_state(self, path, state):
+        state_path = self.state_path(path)
+        os.makedirs(self.state_dir, exist_ok=True)
+        temp_path = state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    def discard_state(self, path):
+        try:
+            os.remove(self.state_path(path))
+        except OSError:
+            pass
+
+    def _send_chunk(self, pool, path, upload_id, index, expected, size):
+        """
+        청크 하나를 보냄 - 연결 오류나 5xx/체크섬 거부는 CHUNK_ATTEMPTS번까지 다시 시도
+        Send one chunk - connection errors and 5xx/checksum rejections are retried up to CHUNK_ATTEMPTS times
+        """
+        offset = index * self.chunk_size
+        length = min(self.chunk_size, size - offset)
+        with open(path, 'rb') as f:
+            data = os.pread(f.fileno(), length, offset)
+        if hashlib.sha256(data).hexdigest() != expected:
+            raise UploadError(f"업로드 중 파일이 바뀜 (File changed during upload): chunk {index}")
+        for attempt in range(1, CHUNK_ATTEMPTS + 1):
+            try:
+                status, body = pool.request('PUT', f"/uploads/{quote(upload_id)}/chunks/{index}", data,
+                                            {'Content-Type': 'application/octet-stream', 'X-Chunk-SHA256': expected})
+            except (OSError, http.client.HTTPException) as e:
+                if attempt == CHUNK_ATTEMPTS:
+                    raise
+                error = e
+            else:
+                if status in (200, 201, 204):
+                    return length
+                error = UploadError(f"HTTP {status} chunk {index}: {body[:200].decode('utf-8', 'replace')}")
+                if (status < 500 and status != 422) or attempt == CHUNK_ATTEMPTS:
+                    raise error
+            time.sleep(CHUNK_RETRY_DELAY * attempt)
+        raise error
+
+    def upload(self, path, name=None):
+        """
+        업로드 제너레이터 - 상태 문자열과 UploadProgress를 생성하고 UploadResult 반환
+        Upload generator - yields status strings and UploadProgress, returns an UploadResult
+        """
+        started = time.monotonic()
+        name = name or os.path.basename(path)
+        info = os.stat(path)
+        size = info.st_size
+        state = self.load_state(path, info)
+        if state is None:
+            yield f"청크 체크섬 계산 중 (Hashing chunks): {path}"
+            state = {'key': [size, info.st_mtime_ns, self.chunk_size], 'name': name,
+                     'chunks': chunk_hashes(path, self.chunk_size), 'id': None, 'done': []}
+        chunks = state['chunks']
+
+        pool = ConnectionPool(self.url, self.token, self.timeout)
+        try:
+            # 세션 생성/재개 - 서버가 이미 가진 청크 중 체크섬이 맞는 것은 건너뜀
+            # Create/resume the session - chunks the server already has with a matching checksum are skipped
+            session = pool.request_json('POST', '/uploads', {
+                'name': name, 'size': size, 'chunk_size': self.chunk_size, 'chunks': chunks, 'id': state['id']})
+            state['id'] = session['id']
+            remote = {int(index): sha256 for index, sha256 in session.get('chunks', {}).items()}
+            done = {index for index, sha256 in remote.items() if index < len(chunks) and chunks[index] == sha256}
+            state['done'] = sorted(done)
+            self.save_state(path, state)
+            missing = [index for index in range(len(chunks)) if index not in done]
+
+            def chunk_length(index):
+                return min(self.chunk_size, size - index * self.chunk_size)
+
+            bytes_done = sum(chunk_length(index) for index in done)
+            if missing and done:
+                yield (f"업로드 재개 (Resuming upload): {name} - from chunk {missing[0]} of {len(chunks)}, "
+                       f"{len(done)} chunk(s) already on the server")
+            else:
+                yield f"업로드 중 (Uploading): {name} ({size / 1e9:.2f} GB, {len(chunks)} chunk(s)) -> {self.url}"
+            yield UploadProgress(bytes_done, size)
+
+            sent_bytes = 0
+            if missing:
+                # concurrent.futures는 가져오는 데 시간이 걸리므로 올릴 것이 있을 때만 가져옴 (시작 시간 예산)
+                # concurrent.futures is slow to import, so it is only imported when there is something to send
+                # (startup budget)
+                from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+                saved_at = time.monotonic()
+                pending = iter(missing)
+                submitted = {}
+                in_flight = set()
+                try:
+                    with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                        # 작업 스레드 수만큼만 보내는 중으로 두어 순서대로 올리고,
+                        # 제너레이터가 멈추면 (일시 정지) 새 청크도 보내지 않음
+                        # Only as many chunks as workers are in flight, so chunks go out in order and
+                        # no new chunk is sent while the generator is held (paused)
+                        def submit_next():
+                            index = next(pending, None)
+                            if index is not None:
+                                future = executor.submit(self._send_chunk, pool, path, state['id'], index,
+                                                         chunks[index], size)
+                                submitted[future] = index
+                                in_flight.add(future)
+
+                        for _ in range(self.workers):
+                            submit_next()
+                        while in_flight:
+                            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in finished:
+                                in_flight.discard(future)
+                                length = future.result()
+                                done.add(submitted[future])
+                                bytes_done += length
+                                sent_bytes += length
+                                submit_next()
+                            if time.monotonic() - saved_at >= STATE_SAVE_INTERVAL:
+                                state['done'] = sorted(done)
+                                self.save_state(path, state)
+                                saved_at = time.monotonic()
+                            yield UploadProgress(bytes_done, size)
+                finally:
+                    # 중단되어도 (보내던 청크가 끝난 뒤) 올린 청크까지 기록해 다음에 이어 올림
+                    # Even when interrupted, record every chunk sent (once in-flight chunks end) so the next run resumes
+                    done.update(index for future, index in submitted.items()
+                                if future.done() and future.exception() is None)
+                    state['done'] = sorted(done)
+                    self.save_state(path, state)
+
+            result = pool.request_json('POST', f"/uploads/{quote(state['id'])}/complete", {})
+            self.discard_state(path)
+            return UploadResult(result.get('name', name), size, len(missing), len(chunks) - len(missing),
+                                sent_bytes, time.monotonic() - started)
+        finally:
+            pool.close()
+
+# 업로드 결과 요약 문자열
+# Upload result summary string
+def format_upload_result(result):
+    """
+    보낸 양, 건너뛴 청크, 처리량을 담은 한 줄 요약
+    One-line summary with the bytes sent, chunks skipped and throughput
+    """
+    rate = result.sent_bytes / result.seconds / 1e6 if result.seconds else 0.0
+    return (f"업로드 완료 (Upload finished): {result.name} - {result.sent_bytes / 1e9:.2f} GB sent, "
+            f"{result.sent} chunk(s) sent, {result.skipped} skipped, {result.seconds:.1f} s, {rate:.0f} MB/s")
+
+# 배포 지점 대역 서버
+# Stand-in distribution point server
+class DistributionServer(ThreadingHTTPServer):
+    """
+    업로드 프로토콜을 구현하는 HTTP 서버 - 테스트/벤치마크와 업로드를 받을 간단한 배포 지점용
+    HTTP server implementing the upload protocol - for tests/benchmarks and as a simple distribution point
+
+    청크는 root/.uploads/<id>/에 저장되고 complete 때 root/<name>으로 합쳐짐; 완성된 파일의 청크 목록을
+    남겨 같은 이름을 다시 올리면 바뀌지 않은 청크는 기존 파일에서 가져옴
+    Chunks are stored in root/.uploads/<id>/ and joined into root/<name> on complete; the chunk list of
+    each finished file is kept, so uploading the same name again takes unchanged chunks from the existing file
+    """
+    daemon_threads = True
+
+    def __init__(self, root, host='127.0.0.1', port=0, token=None):
+        """
+        초기화 함수 - token이 있으면 같은 Bearer 토큰이 있는 요청만 받음
+        Initialization function - with `token`, only requests carrying the same Bearer token are accepted
+        """
+        super().__init__((host, port), DistributionRequestHandler)
+        self.root = root
+        self.token = token
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, '.uploads', 'files'), exist_ok=True)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def session_dir(self, upload_id):
+        return os.path.join(self.root, '.uploads', upload_id)
+
+    def load_session(self, upload_id):
+        if not upload_id or not upload_id.isalnum():
+            return None
+        try:
+            with open(os.path.join(self.session_dir(upload_id), 'session.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def file_chunks(self, name, chunk_size):
+        """
+        완성된 파일 name의 청크 목록 (파일이 바뀌었거나 청크 크기가 다르면 빈 사전)
+        Chunk list of the finished file `name` (empty when the file changed or the chunk size differs)
+        """
+        try:
+            with open(os.path.join(self.root, '.uploads', 'files', name + '.json'), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            info = os.stat(os.path.join(self.root, name))
+        except (OSError, ValueError):
+            return {}
+        if record['key'] != [info.st_size, info.st_mtime_ns, chunk_size]:
+            return {}
+        return record['chunks']
+
+    def save_file_chunks(self, name, chunk_size, chunks):
+        info = os.stat(os.path.join(self.root, name))
+        path = os.path.join(self.root, '.uploads', 'files', name + '.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'key': [info.st_size, info.st_mtime_ns, chunk_size], 'chunks': chunks}, f)
+        os.replace(path + '.tmp', path)
+
+    def save_session(self, session):
+        path = os.path.join(self.session_dir(session['id']), 'session.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(session, f)
+        os.replace(path + '.tmp', path)
+
+    def serve_in_thread(self):
+        """
+        백그라운드 스레드에서 서버 실행 후 스레드 반환
+        Run the server on a background thread and return the thread
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+# 대역 서버 요청 처리기
+# Stand-in server request handler
+class DistributionRequestHandler(BaseHTTPRequestHandler):
+    """
+    배포 지점 대역 서버의 요청 처리기 (HTTP/1.1 연결 유지)
+    Request handler of the stand-in distribution point server (HTTP/1.1 keep-alive)
+    """
+    protocol_version = 'HTTP/1.1'
+    server_version = 'macOSUpdatesDistribution/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message, **fields):
+        self._send_json({'error': message, **fields}, status)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def _parts(self):
+        # 인증 확인 후 경로 조각 반환 (실패하면 응답을 보내고 None)
+        # Check authentication and return the path parts (None after sending a response on failure)
+        token = self.server.token
+        if token and self.headers.get('Authorization') != f'Bearer {token}':
+            self._read_body()
+            self._send_error(401, 'unauthorized')
+            return None
+        return [unquote(part) for part in self.path.split('?', 1)[0].split('/') if part]
+
+    def do_POST(self):
+        parts = self._parts()
+        if parts is None:
+            return
+        try:
+            request = json.loads(self._read_body() or b'{}')
+        except ValueError:
+            self._send_error(400, 'invalid json')
+            return
+        if parts == ['uploads']:
+            self._open_session(request)
+        elif len(parts) == 3 and parts[0] == 'uploads' and parts[2] == 'complete':
+            self._complete(parts[1])
+        else:
+            self._send_error(404, 'not found')
+
+    def _open_session(self, request):
+        name = os.path.basename(str(request.get('name') or ''))
+        if not name or name.startswith('.'):
+            self._send_error(400, 'invalid name')
+            return
+        with self.server._lock:
+            session = self.server.load_session(request.get('id'))
+            shape = (request.get('size'), request.get('chunk_size'))
+            if session is None or session['name'] != name or (session['size'], session['chunk_size']) != shape:
+                session = {'id': os.urandom(12).hex(), 'name': name, 'size': request.get('size'),
+                           'chunk_size': request.get('chunk_size'), 'chunks': {}}
+                os.makedirs(self.server.session_dir(session['id']))
+            # 같은 이름의 완성된 파일에 있는 청크도 이미 있는 것으로 알림
+            # Chunks of a finished file with the same name count as already present too
+            session['existing'] = self.server.file_chunks(name, session['chunk_size'])
+            self.server.save_session(session)
+            chunks = {**session['existing'], **session['chunks']}
+            status = 200 if chunks else 201
+        self._send_json({'id': session['id'], 'chunks': chunks}, status)
+
+    def do_PUT(self):
+        parts = self._parts()
+        if parts is None:
+            return
+        data = self._read_body()
+        if len(parts) != 4 or parts[0] != 'uploads' or parts[2] != 'chunks' or not parts[3].isdigit():
+            self._send_error(404, 'not found')
+            return
+        session = self.server.load_session(parts[1])
+        if session is None:
+            self._send_error(404, 'no such upload')
+            return
+        index = int(parts[3])
+        sha256 = hashlib.sha256(data).hexdigest()
+        if sha256 != self.headers.get('X-Chunk-SHA256'):
+            self._send_error(422, 'checksum mismatch')
+            return
+        path = os.path.join(self.server.session_dir(session['id']), str(index))
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+        with self.server._lock:
+            session = self.server.load_session(parts[1])
+            session['chunks'][str(index)] = sha256
+            self.server.save_session(session)
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _complete(self, upload_id):
+        session = self.server.load_session(upload_id)
+        if session is None:
+            self._send_error(404, 'no such upload')
+            return
+        chunk_size = session['chunk_size']
+        count = -(-session['size'] // chunk_size)
+        existing = self.server.file_chunks(session['name'], chunk_size)
+        chunks = {**existing, **session['chunks']}
+        missing = [index for index in range(count) if str(index) not in chunks]
+        if missing:
+            self._send_error(409, 'missing chunks', missing=missing[:100])
+            return
+        session_dir = self.server.session_dir(upload_id)
+        final_path = os.path.join(self.server.root, session['name'])
+        with open(final_path + '.partial', 'wb') as output:
+            for index in range(count):
+                if str(index) in session['chunks']:
+                    with open(os.path.join(session_dir, str(index)), 'rb') as f:
+                        shutil.copyfileobj(f, output, 1024 * 1024)
+                else:
+                    # 올라오지 않은 청크는 기존 파일의 같은 위치에서 복사
+                    # Chunks that were not sent are copied from the same place in the existing file
+                    with open(final_path, 'rb') as f:
+                        output.write(os.pread(f.fileno(), chunk_size, index * chunk_size))
+        os.replace(final_path + '.partial', final_path)
+        self.server.save_file_chunks(session['name'], chunk_size,
+                                     {str(index): chunks[str(index)] for index in range(count)})
+        shutil.rmtree(session_dir, ignore_errors=True)
+        self._send_json({'name': session['name'], 'size': session['size']})
@@ -0,0 +1,308 @@
+import time
+import datetime
+import itertools
+from PyQt5.QtCore import QObject, pyqtSignal
+from log_sink import LogSink
+from signal_bridge import SignalBridge
+from app_paths import get_session_log_path
+from log_pipeline import new_session_id
+
+# 동시에 실행할 기본 다운로드 작업 수
+# Default number of downloads run at the same time
+DEFAULT_MAX_CONCURRENCY = 2
+
+# 다운로드 큐의 개별 작업
+# Single job in the download queue
+class DownloadJob:
+    """
+    한 macOS 버전의 다운로드 작업 상태를 보관하는 클래스
+    Holds the state of one macOS version download
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    PAUSED = 'paused'
+    CANCELLING = 'cancelling'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    STATE_LABELS = {
+        PENDING: '대기 중 (Pending)',
+        RUNNING: '다운로드 중 (Running)',
+        PAUSED: '일시 정지 (Paused)',
+        CANCELLING: '취소 중 (Cancelling)',
+        FINISHED: '완료 (Finished)',
+        FAILED: '오류 (Failed)',
+        CANCELLED: '취소됨 (Cancelled)',
+    }
+
+    def __init__(self, job_id, version):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.job_id = job_id
+        self.version = version
+        self.state = DownloadJob.PENDING
+        self.progress = 0
+        self.last_status = ''
+        self.metrics = None
+        self.last_progress_time = None
+        self.log_file_path = None
+        self.session_id = None
+        self.log_sink = None
+        self.bridge = None
+        self.thread = None
+
+    @property
+    def state_label(self):
+        """
+        UI에 표시할 상태 문자열
+        State string shown in the UI
+        """
+        return DownloadJob.STATE_LABELS[self.state]
+
+    @property
+    def is_active(self):
+        """
+        아직 끝나지 않은 작업인지 여부
+        Whether the job has not reached a terminal state yet
+        """
+        return self.state in (DownloadJob.PENDING, DownloadJob.RUNNING, DownloadJob.PAUSED, DownloadJob.CANCELLING)
+
+# 여러 버전을 동시에 받는 다운로드 큐
+# Download queue fetching several versions concurrently
+class DownloadQueue(QObject):
+    """
+    버전 목록을 받아 동시 실행 수 제한 안에서 다운로드 스레드를 실행하는 큐
+    Queue that runs download threads for a list of versions under a concurrency cap
+    """
+    job_added_signal = pyqtSignal(object)
+    job_changed_signal = pyqtSignal(object)
+    job_progress_signal = pyqtSignal(object, int)
+    job_metrics_signal = pyqtSignal(object, object)
+    job_status_signal = pyqtSignal(object, list)
+    queue_idle_signal = pyqtSignal()
+
+    def __init__(self, thread_factory, log_dir, max_concurrency=DEFAULT_MAX_CONCURRENCY, parent=None):
+        """
+        초기화 함수 - thread_factory(log_sink, bridge, version)는 다운로드 스레드를 생성
+        Initialization function - thread_factory(log_sink, bridge, version) creates a download thread
+        """
+        super().__init__(parent)
+        self.thread_factory = thread_factory
+        self.log_dir = log_dir
+        self.max_concurrency = max(1, max_concurrency)
+        self.jobs = []
+        self._pending = []
+        self._ids = itertools.count(1)
+
+    def add_versions(self, versions):
+        """
+        버전 목록을 큐에 추가하고 생성된 작업 목록을 반환
+        Add versions to the queue and return the created jobs
+        """
+        jobs = []
+        for version in versions:
+            job = DownloadJob(next(self._ids), version)
+            self.jobs.append(job)
+            self._pending.append(job)
+            jobs.append(job)
+            self.job_added_signal.emit(job)
+        self._schedule()
+        return jobs
+
+    def set_max_concurrency(self, value):
+        """
+        전체 동시 실행 수 제한 변경
+        Change the global concurrency cap
+        """
+        self.max_concurrency = max(1, value)
+        self._schedule()
+
+    def running_jobs(self):
+        """
+        실행 중인 작업 목록
+        List of running jobs
+        """
+        return [job for job in self.jobs if job.state == DownloadJob.RUNNING]
+
+    def started_jobs(self):
+        """
+        실행 슬롯을 차지한 작업 목록 (실행 중 + 일시 정지 + 스레드가 아직 끝나지 않은 취소 중)
+        Jobs holding a concurrency slot (running, paused, and cancelling until their thread ends)
+        """
+        started = (DownloadJob.RUNNING, DownloadJob.PAUSED, DownloadJob.CANCELLING)
+        return [job for job in self.jobs if job.state in started]
+
+    def pending_jobs(self):
+        """
+        대기 순서대로 정렬된 대기 작업 목록
+        Pending jobs in the order they will start
+        """
+        return list(self._pending)
+
+    def move(self, job, offset):
+        """
+        대기 중인 작업의 우선순위를 offset 만큼 이동 (음수는 앞으로)
+        Move a pending job by `offset` places in the queue (negative moves it forward)
+        """
+        if job not in self._pending:
+            return False
+        index = self._pending.index(job)
+        new_index = min(max(index + offset, 0), len(self._pending) - 1)
+        if new_index == index:
+            return False
+        self._pending.insert(new_index, self._pending.pop(index))
+        self.job_changed_signal.emit(job)
+        return True
+
+    def cancel(self, job):
+        """
+        대기 중이면 큐에서 제거하고, 실행/일시 정지 중이면 다운로드 프로세스를 중지 -
+        스레드가 끝날 때까지는 취소 중 상태로 실행 슬롯을 유지
+        Remove a pending job from the queue or stop a running/paused download - the job stays
+        cancelling, holding its concurrency slot, until its thread ends
+        """
+        if job.state == DownloadJob.PENDING:
+            self._pending.remove(job)
+            self._set_state(job, DownloadJob.CANCELLED)
+            self._check_idle()
+        elif job.state in (DownloadJob.RUNNING, DownloadJob.PAUSED):
+            self._set_state(job, DownloadJob.CANCELLING)
+            job.thread.cancel()
+
+    def pause(self, job):
+        """
+        실행 중인 작업을 일시 정지 (실행 슬롯은 유지)
+        Pause a running job (it keeps its concurrency slot)
+        """
+        if job.state != DownloadJob.RUNNING:
+            return False
+        job.thread.pause()
+        self._set_state(job, DownloadJob.PAUSED)
+        return True
+
+    def resume(self, job):
+        """
+        일시 정지한 작업 재개
+        Resume a paused job
+        """
+        if job.state != DownloadJob.PAUSED:
+            return False
+        job.thread.resume()
+        job.last_progress_time = time.monotonic()
+        self._set_state(job, DownloadJob.RUNNING)
+        return True
+
+    def wait_for_threads(self, msecs):
+        """
+        작업 스레드가 모두 끝나기를 합쳐서 최대 msecs 동안 기다림 (모든 작업이 같은 마감 시간 공유) - 모두 끝났으면 True
+        Wait at most `msecs` in total for every job thread to end (all jobs share one deadline) - True when all ended
+        """
+        deadline = time.monotonic() + msecs / 1000
+        ended = True
+        for job in self.jobs:
+            if job.thread is not None:
+                remaining = max(0, int((deadline - time.monotonic()) * 1000))
+                ended = job.thread.wait(remaining) and ended
+        return ended
+
+    def running_threads(self):
+        """
+        아직 끝나지 않은 작업 스레드 수
+        Number of job threads that have not ended yet
+        """
+        return sum(1 for job in self.jobs if job.thread is not None and job.thread.isRunning())
+
+    def cancel_all(self):
+        """
+        모든 대기/실행 중 작업 취소
+        Cancel every pending and running job
+        """
+        for job in list(self.jobs):
+            self.cancel(job)
+
+    def _schedule(self):
+        """
+        동시 실행 제한 안에서 대기 작업 시작
+        Start pending jobs while under the concurrency cap
+        """
+        while self._pending and len(self.started_jobs()) < self.max_concurrency:
+            self._start(self._pending.pop(0))
+
+    def _start(self, job):
+        """
+        작업별 로그 싱크/브리지/스레드를 만들고 다운로드 시작
+        Create the per-job log sink, bridge and thread, then start the download
+        """
+        timestamp = datetime.datetime.now()
+        job.session_id = new_session_id()
+        job.log_file_path = get_session_log_path(job.version, timestamp, self.log_dir, job.session_id)
+        job.log_sink = LogSink(job.log_file_path, mode='w', session_id=job.session_id, version=job.version)
+        start_message = f"=== macOS {job.version} 다운로드 세션 시작 ({timestamp.strftime('%Y-%m-%d %H:%M:%S')}) ==="
+        job.log_sink.write(start_message)
+        job.log_sink.sync()
+
+        job.bridge = SignalBridge(parent=self)
+        job.bridge.progress_signal.connect(lambda value, job=job: self._on_progress(job, value))
+        job.bridge.metrics_signal.connect(lambda metrics, job=job: self._on_metrics(job, metrics))
+        job.bridge.status_batch_signal.connect(lambda lines, job=job: self._on_status(job, lines))
+        job.bridge.finished_signal.connect(lambda job=job: self._on_finished(job))
+        job.bridge.error_signal.connect(lambda message, job=job: self._on_error(job, message))
+        job.bridge.start()
+
+        job.last_progress_time = time.monotonic()
+        self._set_state(job, DownloadJob.RUNNING)
+        self.job_status_signal.emit(job, [start_message])
+
+        job.thread = self.thread_factory(job.log_sink, job.bridge, job.version)
+        job.thread.start()
+
+    def _on_progress(self, job, value):
+        job.progress = value
+        job.last_progress_time = time.monotonic()
+        self.job_progress_signal.emit(job, value)
+
+    def _on_metrics(self, job, metrics):
+        job.metrics = metrics
+        self.job_metrics_signal.emit(job, metrics)
+
+    def _on_status(self, job, lines):
+        job.last_status = lines[-1]
+        self.job_status_signal.emit(job, lines)
+
+    def _on_finished(self, job):
+        completion_message = f"=== 다운로드 완료 ({datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ==="
+        job.progress = 100
+        self._end_job(job, DownloadJob.FINISHED, completion_message)
+
+    def _on_error(self, job, message):
+        if job.state == DownloadJob.CANCELLING:
+            end_message = f"=== 다운로드 취소됨 (Download cancelled) ({datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ==="
+            self._end_job(job, DownloadJob.CANCELLED, end_message)
+        else:
+            self._end_job(job, DownloadJob.FAILED, f"!!! 오류 발생: {message} !!!")
+
+    def _end_job(self, job, state, message):
+        """
+        작업 종료 처리 - 로그를 닫고 다음 작업을 스케줄
+        Finish a job - close its log and schedule the next one
+        """
+        job.last_status = message
+        job.log_sink.write(message)
+        job.log_sink.close()
+        self.job_status_signal.emit(job, [message])
+        self._set_state(job, state)
+        job.bridge.deleteLater()
+        job.bridge = None
+        self._schedule()
+        self._check_idle()
+
+    def _set_state(self, job, state):
+        job.state = state
+        self.job_changed_signal.emit(job)
+
+    def _check_idle(self):
+        if not any(job.is_active for job in self.jobs):
+            self.queue_idle_signal.emit()
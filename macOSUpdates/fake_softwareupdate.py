@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+가짜 softwareupdate - 녹화된 출력을 지정한 속도로 재생 (macOS/네트워크 없이 테스트용)
+Fake softwareupdate - replays a recorded transcript at a given speed
+(for testing without macOS or network)
+
+환경 변수 (Environment variables):
+    FAKE_SU_TRANSCRIPT  재생할 파일 경로/이름 또는 'synthetic:N' (transcript path or name, or 'synthetic:N'),
+                        기본 fetch_success.txt
+    FAKE_SU_RATE        초당 줄 수 (lines per second), 기본 최대 속도 (default: full speed)
+    FAKE_SU_EXIT        종료 코드 (exit code), 기본 0
+    FAKE_SU_STALL       'line:seconds[,line:seconds...]' - 해당 줄 앞에서 멈춤 (pause before those lines)
+    FAKE_SU_TIMES       줄마다 출력한 시각 (time.monotonic)을 종료 시 JSON으로 기록할 경로
+                        (path receiving the time.monotonic of every written line as JSON on exit)
+    FAKE_SU_CR          1이면 진행률 줄을 실제처럼 \\r로 끝냄 (1 ends progress lines in \\r like the real tool)
+    FAKE_SU_IGNORE_TERM 1이면 SIGTERM을 무시해 SIGKILL까지 가게 함 (1 ignores SIGTERM so stopping needs SIGKILL)
+"""
+import os
+import sys
+import json
+import time
+import signal
+
+# 녹화된 출력 파일 폴더 - 출력 읽기는 이 모듈에만 둠 (fetch_runners.load_transcript도 이것을 사용)
+# Folder containing recorded transcripts - transcript loading lives only in this module
+# (fetch_runners.load_transcript uses it too)
+TRANSCRIPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'transcripts')
+
+# 합성 출력 이름 접두사 ('synthetic:N'은 진행률 N줄)
+# Synthetic transcript name prefix ('synthetic:N' has N progress lines)
+SYNTHETIC_PREFIX = 'synthetic:'
+
+def synthetic_transcript(count):
+    """
+    진행률 count줄을 가진 합성 softwareupdate 출력 ({version} 포함) - 실제 출력과 같은 형식
+    Synthetic softwareupdate output with `count` progress lines ({version} placeholders) -
+    same format as the real output
+    """
+    lines = ['Scanning for {version} installer', 'Downloading macOS {version}']
+    lines.extend(f"Installing: {index * 100.0 / max(count - 1, 1):.2f}%" for index in range(count))
+    lines.extend(['Verifying macOS {version}', 'Install finished successfully'])
+    return lines
+
+def read_transcript(transcript):
+    """
+    파일 경로/이름 또는 'synthetic:N'에서 출력 줄 목록 읽기 ({version}은 그대로)
+    Read the output lines of a file path/name or 'synthetic:N' ({version} left as is)
+    """
+    if transcript.startswith(SYNTHETIC_PREFIX):
+        return synthetic_transcript(int(transcript[len(SYNTHETIC_PREFIX):]))
+    if not os.path.exists(transcript):
+        transcript = os.path.join(TRANSCRIPT_DIR, transcript)
+    with open(transcript, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f]
+
+def parse_stalls(value):
+    """
+    'line:seconds,...' 형식을 {줄 번호: 초} 사전으로 변환
+    Turn 'line:seconds,...' into a {line number: seconds} dict
+    """
+    stalls = {}
+    for item in filter(None, (value or '').split(',')):
+        line, seconds = item.split(':')
+        stalls[int(line)] = float(seconds)
+    return stalls
+
+def main(argv):
+    """
+    메인 함수 - softwareupdate 인자를 받아 녹화된 출력을 재생
+    Main function - accepts softwareupdate arguments and replays the transcript
+    """
+    version = ''
+    if '--full-installer-version' in argv:
+        index = argv.index('--full-installer-version')
+        if index + 1 < len(argv):
+            version = argv[index + 1]
+
+    lines = read_transcript(os.environ.get('FAKE_SU_TRANSCRIPT', 'fetch_success.txt'))
+    rate = float(os.environ.get('FAKE_SU_RATE', '0') or 0)
+    exit_code = int(os.environ.get('FAKE_SU_EXIT', '0'))
+    stalls = parse_stalls(os.environ.get('FAKE_SU_STALL'))
+    times_path = os.environ.get('FAKE_SU_TIMES')
+    carriage_returns = os.environ.get('FAKE_SU_CR') == '1'
+    if os.environ.get('FAKE_SU_IGNORE_TERM') == '1':
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    times = []
+
+    interval = 1.0 / rate if rate > 0 else 0.0
+    next_time = time.monotonic()
+    for number, line in enumerate(lines):
+        if number in stalls:
+            time.sleep(stalls[number])
+            next_time = time.monotonic()
+        if interval:
+            next_time += interval
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        ending = '\r' if carriage_returns and '%' in line else '\n'
+        sys.stdout.write(line.replace('{version}', version) + ending)
+        sys.stdout.flush()
+        if times_path:
+            times.append(time.monotonic())
+
+    if times_path:
+        with open(times_path, 'w', encoding='utf-8') as f:
+            json.dump(times, f)
+    return exit_code
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,804 @@
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Iterator, NamedTuple, Optional
+from output_classifier import OutputClassifier, Progress, Phase, Error
+from log_sink import NullLogSink
+from log_pipeline import SESSION_LOGGER
+from fetch_metrics import FetchMetrics, MetricsEvent, write_summary
+from fetch_runners import (SubprocessRunner, DEFAULT_TERMINATE_GRACE, stop_process, suspend_process,
+                           resume_process)
+from diagnostics import stage_clock
+from installer_cache import find_installer
+from installer_verify import format_result
+
+# 다운로드 엔진 - Qt에 의존하지 않는 softwareupdate 실행 로직
+# Download engine - softwareupdate driving logic with no Qt dependency
+
+# 기본 출력 분류기 (정규식은 한 번만 컴파일)
+# Default output classifier (regexes are compiled once)
+DEFAULT_CLASSIFIER = OutputClassifier()
+
+# 단계별 UI 상태 메시지
+# UI status message for each phase
+PHASE_MESSAGES = {
+    'downloading': "다운로드 시작... (Starting download...)",
+    'verifying': "다운로드 검증 중... (Verifying download...)",
+    'installing': "설치 중... (Installing...)",
+}
+
+# 진행률 상태 메시지 형식 (다운로드/설치 프로그램 검증/패키징/업로드)
+# Progress status message formats (download/installer verification/packaging/upload)
+DOWNLOAD_STATUS = "다운로드 진행 중: {0}% (Downloading: {0}%)"
+VERIFY_STATUS = "설치 프로그램 검증 중: {0}% (Verifying installer: {0}%)"
+PACKAGE_STATUS = "패키징 중: {0}% (Packaging: {0}%)"
+UPLOAD_STATUS = "업로드 중: {0}% (Uploading: {0}%)"
+
+# 엔진 이벤트 타입 (줄마다 생성되므로 가벼운 NamedTuple 사용)
+# Engine event types (created per line, so lightweight NamedTuples)
+class StatusEvent(NamedTuple):
+    """
+    상태 메시지 (softwareupdate 출력 줄 또는 해석된 상태)
+    Status message (a softwareupdate output line or an interpreted state)
+    """
+    message: str
+
+class ProgressEvent(NamedTuple):
+    """
+    다운로드 진행률 (0-100)
+    Download progress (0-100)
+    """
+    percent: int
+
+class FinishedEvent(NamedTuple):
+    """
+    다운로드 성공 - 캐시 적중이면 cached_path 설정
+    Download succeeded - cached_path is set on a cache hit
+    """
+    cached_path: Optional[str] = None
+
+class ErrorEvent(NamedTuple):
+    """
+    다운로드 실패 - 프로세스가 종료 코드로 끝났으면 returncode 설정
+    Download failed - returncode is set when the process exited with a code
+    """
+    message: str
+    returncode: Optional[int] = None
+
+class RetryEvent(NamedTuple):
+    """
+    실패한 시도 후 재시도 예약 - delay초 뒤 attempt번째 시도 시작
+    Retry scheduled after a failed attempt - attempt number `attempt` starts in `delay` seconds
+    """
+    attempt: int
+    max_attempts: int
+    delay: float
+    reason: str
+
+# 이벤트를 listener 메서드로 전달
+# Forward an event to listener methods
+def dispatch_event(event, listener):
+    """
+    이벤트를 post_status/post_progress/post_finished/post_error 호출로 변환
+    Translate an event into a post_status/post_progress/post_finished/post_error call
+    """
+    if isinstance(event, StatusEvent):
+        listener.post_status(event.message)
+    elif isinstance(event, ProgressEvent):
+        listener.post_progress(event.percent)
+    elif isinstance(event, FinishedEvent):
+        listener.post_finished()
+    elif isinstance(event, ErrorEvent):
+        listener.post_error(event.message)
+    elif isinstance(event, MetricsEvent):
+        post_metrics = getattr(listener, 'post_metrics', None)
+        if post_metrics is not None:
+            post_metrics(event)
+    elif isinstance(event, RetryEvent):
+        post_retry = getattr(listener, 'post_retry', None)
+        if post_retry is not None:
+            post_retry(event)
+
+# 세션 측정 종료 및 요약 기록
+# Finish session metrics and write the summary
+def record_summary(metrics, log_sink, version, result, returncode=None):
+    """
+    측정을 끝내고 세션 로그 옆에 요약 JSON을 기록 (로그 파일이 없으면 기록하지 않음)
+    Finish metrics and write the summary JSON next to the session log (skipped without a log file)
+    """
+    metrics.finish(result, returncode)
+    if not getattr(log_sink, 'path', None):
+        return None
+    summary = {'version': version, 'log_file': log_sink.path}
+    if getattr(log_sink, 'session_id', None):
+        summary['session'] = log_sink.session_id
+    summary.update(metrics.summary())
+    if summary.get('session'):
+        # 세션 색인이 메타데이터를 갱신하도록 로깅 파이프라인에도 전달
+        # Also hand it to the logging pipeline so the session index updates its metadata
+        logging.getLogger(SESSION_LOGGER).info(
+            f"세션 요약 (Session summary): {summary['result']}",
+            extra={'session_id': summary['session'], 'version': version, 'summary': summary})
+    try:
+        return write_summary(log_sink.path, summary)
+    except OSError:
+        return None
+
+# 피어 다운로드 단계를 엔진 이벤트로 변환
+# Turn a peer download step into engine events
+def peer_step_events(step, interpreter, log):
+    """
+    상태 문자열은 log(message)가 만든 상태 이벤트로, PeerProgress/VerifyProgress는 진행률 이벤트로 변환
+    (peer_seed는 피어를 쓸 때만 필요하므로 여기서 가져오지 않음)
+    Status strings become the status event returned by log(message); PeerProgress/VerifyProgress become
+    progress events (peer_seed is only needed when a peer is used, so it is not imported here)
+    """
+    if isinstance(step, str):
+        return [log(step)]
+    percent = step.bytes_done * 100.0 / step.bytes_total if step.bytes_total else 100.0
+    return interpreter.interpret(Progress(round(percent, 2), step.bytes_done, step.bytes_total))
+
+# softwareupdate 출력 해석기
+# softwareupdate output interpreter
+class LineInterpreter:
+    """
+    출력 한 줄을 진행률/상태 이벤트로 변환 (동기/비동기 엔진이 공유)
+    Turns one output line into progress/status events (shared by the sync and async engines)
+    """
+
+    def __init__(self, classifier=None, metrics=None, start_percent=0, status_format=DOWNLOAD_STATUS):
+        """
+        초기화 함수 - metrics가 있으면 진행률 샘플마다 처리량을 기록,
+        start_percent보다 낮은 진행률은 보고하지 않음 (재시도 시 진행률 유지)
+        Initialization function - with `metrics`, throughput is recorded for every progress sample;
+        progress below `start_percent` is not reported (keeps progress across retries)
+        """
+        self.classifier = classifier or DEFAULT_CLASSIFIER
+        self.metrics = metrics
+        self.start_percent = start_percent
+        self.status_format = status_format
+        self.last_progress = start_percent
+        self.last_error = None
+
+    def feed(self, output):
+        """
+        이미 공백이 제거된 한 줄을 해석해 이벤트 목록 반환
+        Interpret one stripped line and return a list of events
+        """
+        result = self.classifier.classify(output)
+        if not isinstance(result, Progress) and self.metrics is not None:
+            # 진행률이 없는 줄에서도 멈춤 시작을 알림
+            # Report the start of a stall on lines without progress too
+            was_stalled = self.metrics.stalled
+            if self.metrics.check_stall() and not was_stalled:
+                events = [self.metrics.snapshot()]
+                if result is not None:
+                    events.extend(self.interpret(result))
+                return events
+        if result is None:
+            return []
+        return self.interpret(result)
+
+    def interpret(self, result):
+        """
+        분류 결과 하나를 이벤트 목록으로 변환 (피어 진행률도 Progress로 전달)
+        Turn one classification result into a list of events (peer progress is passed in as Progress too)
+        """
+        # 진행률 추출
+        # Extract progress
+        if isinstance(result, Progress):
+            metrics_event = None
+            if self.metrics is not None:
+                was_stalled = self.metrics.stalled
+                metrics_event = self.metrics.sample(result.percent, result.bytes_done, result.bytes_total)
+                if metrics_event.stalled and not was_stalled:
+                    return [metrics_event]
+            progress = int(result.percent)
+            if progress == self.last_progress or progress < self.start_percent:
+                return []
+            self.last_progress = progress
+            events = [ProgressEvent(progress),
+                      StatusEvent(self.status_format.format(progress))]
+            if metrics_event is not None:
+                events.append(metrics_event)
+            return events
+
+        # 다운로드 상태 메시지 확인
+        # Check download status message
+        if isinstance(result, Phase):
+            message = PHASE_MESSAGES.get(result.name)
+            return [StatusEvent(message)] if message else []
+
+        if isinstance(result, Error):
+            self.last_error = result
+            return [StatusEvent(f"softwareupdate 오류 (error): {result.text}")]
+        return []
+
+# 다운로드할 작업 정의
+# Definition of what to fetch
+class FetchJob:
+    """
+    한 버전의 전체 설치 프로그램 다운로드 작업
+    Full-installer fetch of one version
+    """
+
+    def __init__(self, version):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.version = version
+
+    def command(self):
+        """
+        실행할 softwareupdate 명령어
+        softwareupdate command to execute
+        """
+        return ['softwareupdate', '--fetch-full-installer', '--full-installer-version', self.version]
+
+    def __repr__(self):
+        return f"FetchJob({self.version!r})"
+
+# 공유 흐름이 엔진에 맡기는 요청 (동기 엔진은 그 자리에서, 비동기 엔진은 실행기 스레드에서 처리)
+# Requests the shared flow hands to its engine (handled inline by the sync engine, on an executor thread by the async one)
+class BlockingCall(NamedTuple):
+    """
+    파일을 읽거나 해시하는 함수 호출 - 결과가 흐름으로 돌아감
+    A call that reads or hashes files - its result is sent back into the flow
+    """
+    func: Callable
+    args: tuple = ()
+
+class DriveSteps(NamedTuple):
+    """
+    단계 제너레이터 (피어 받기/검증)를 끝까지 진행 - 반환값 (취소되면 None)이 흐름으로 돌아감
+    Run a step generator (peer pull/verification) to the end - its return value (None when cancelled)
+    is sent back into the flow
+    """
+    steps: Iterator
+    interpreter: LineInterpreter
+
+# 동기/비동기 엔진의 공통 부분
+# Common part of the sync and async engines
+class FetchEngineBase(ABC):
+    """
+    캐시/피어/검증/요약 흐름과 취소/일시 정지 상태를 담는 클래스 - 하위 클래스는 프로세스 입출력과
+    흐름의 요청 (BlockingCall, DriveSteps) 처리만 구현
+    Holds the cache/peer/verify/summary flow and the cancel/pause state - subclasses only implement
+    process I/O and handling the flow's requests (BlockingCall, DriveSteps)
+
+    흐름 메서드는 이벤트와 요청을 생성하는 제너레이터이며, 요청의 결과는 send()로 돌려받음
+    Flow methods are generators yielding events and requests; a request's result comes back through send()
+    """
+
+    def __init__(self, job, log_sink=None, runner=None, cache=None, metrics=None, start_percent=0,
+                 peer=None, terminate_grace=DEFAULT_TERMINATE_GRACE, verifier=None):
+        """
+        초기화 함수 - 재시도 시 metrics와 start_percent로 이전 시도의 상태를 이어받음,
+        peer(PeerClient)가 있으면 softwareupdate보다 LAN 피어를 먼저 시도,
+        terminate_grace는 중지할 때 SIGTERM 후 SIGKILL까지 기다리는 시간,
+        verifier(InstallerVerifier)가 있으면 받은/캐시된 설치 프로그램을 사용하기 전에 검증
+        Initialization function - on retries, `metrics` and `start_percent` carry over the previous attempt's state;
+        with `peer` (a PeerClient), LAN peers are tried before softwareupdate;
+        `terminate_grace` is how long stopping waits between SIGTERM and SIGKILL;
+        with `verifier` (an InstallerVerifier), fetched/cached installers are verified before they are used
+        """
+        self.job = job
+        self.log_sink = log_sink or NullLogSink()
+        self.runner = runner or SubprocessRunner()
+        self.cache = cache
+        self.metrics = metrics or FetchMetrics()
+        self.start_percent = start_percent
+        self.peer = peer
+        self.terminate_grace = terminate_grace
+        self.verifier = verifier
+        self.verifying = False
+        self.verify_problems = None
+        self.interpreter = None
+        self.process = None
+        self.cancelled = False
+        self.paused = False
+        self.abort_reason = None
+        self.last_output_time = None
+        self._running = threading.Event()
+        self._running.set()
+        self._known_installers = None
+        self.summarized = False
+
+    @property
+    def version(self):
+        return self.job.version
+
+    @abstractmethod
+    def _stop(self):
+        """
+        프로세스를 SIGTERM 후 유예 시간이 지나면 SIGKILL로 중지 (호출한 스레드는 막지 않음)
+        Stop the process with SIGTERM, then SIGKILL after the grace period (the caller never blocks)
+        """
+
+    @abstractmethod
+    def _suspend_process(self):
+        """
+        실행 중인 프로세스를 SIGSTOP으로 일시 정지
+        Suspend the running process with SIGSTOP
+        """
+
+    @abstractmethod
+    def _resume_process(self):
+        """
+        일시 정지된 프로세스를 SIGCONT로 재개
+        Resume the suspended process with SIGCONT
+        """
+
+    def cancel(self):
+        """
+        다운로드 취소 - 실행 중인 softwareupdate 프로세스를 중지하고 받다 만 파일을 지움
+        Cancel the download - stop the running softwareupdate process and delete partial files
+        """
+        self.cancelled = True
+        self._running.set()
+        self._stop()
+
+    def abort(self, reason):
+        """
+        감시자가 멈춘 프로세스를 중지 - 취소와 달리 재시도 대상
+        Stop a hung process on behalf of a watchdog - unlike cancel(), this is retryable
+        """
+        self.abort_reason = reason
+        self._stop()
+
+    def pause(self):
+        """
+        다운로드 일시 정지 - softwareupdate 프로세스를 SIGSTOP으로 멈추고 피어 받기도 멈춤
+        Pause the download - suspends the softwareupdate process with SIGSTOP and holds a peer pull
+        """
+        self.paused = True
+        self._running.clear()
+        self._suspend_process()
+
+    def resume(self):
+        """
+        일시 정지한 다운로드 재개 - 멈춰 있던 시간은 멈춤 감시와 처리량에서 제외
+        Resume a paused download - the paused time is left out of the hang watchdog and throughput
+        """
+        if not self.paused:
+            return
+        self.paused = False
+        self._resume_process()
+        self.last_output_time = time.monotonic()
+        self.metrics.resume()
+        self._running.set()
+
+    def _log(self, message):
+        # 세션 로그에 기록하고 상태 이벤트 생성
+        # Record to the session log and create a status event
+        self.log_sink.log(message)
+        return StatusEvent(message)
+
+    def _record(self, result, returncode=None):
+        # 세션 요약 기록 (소비자가 끝난 세션을 늦게 닫아도 결과를 덮어쓰지 않도록 기록했음을 표시)
+        # Record the session summary (marked as done so a consumer closing an ended session late never overwrites it)
+        self.summarized = True
+        record_summary(self.metrics, self.log_sink, self.version, result, returncode)
+
+    def _result(self):
+        # 실패한 세션의 요약 결과 이름
+        # Summary result name of a failed session
+        if self.cancelled:
+            return 'cancelled'
+        return 'stalled' if self.abort_reason else 'error'
+
+    def _verify(self, app_path):
+        """
+        설치 프로그램을 검증하는 흐름 - 통과 여부 반환, 진행률은 다운로드와 같은 이벤트로 보고
+        (처리량은 다운로드 측정값과 섞이지 않도록 따로 측정)
+        Flow verifying an installer - returns whether it passed; progress is reported with the same events
+        as the download (throughput is measured separately so it never mixes with the download's)
+        """
+        interpreter = LineInterpreter(metrics=FetchMetrics(), status_format=VERIFY_STATUS)
+        self.verifying = True
+        try:
+            result = yield DriveSteps(self.verifier.verify(app_path, self.version), interpreter)
+        finally:
+            self.verifying = False
+        if result is None:
+            return False
+        yield self._log(format_result(result))
+        for problem in result.problems:
+            yield self._log(problem)
+        self.verify_problems = result.problems
+        return result.ok
+
+    def _verify_download(self):
+        """
+        softwareupdate가 받은 설치 프로그램을 찾아 검증하는 흐름 - 통과 여부 반환
+        (검증기가 없거나 설치 프로그램을 찾지 못하면 통과로 봄)
+        Flow finding and verifying the installer softwareupdate fetched - returns whether it passed
+        (passes when there is no verifier or no installer can be found)
+        """
+        if self.verifier is None:
+            return True
+        installer_dirs = self.cache.installer_dirs if self.cache is not None else None
+        match = yield BlockingCall(find_installer, (self.version, installer_dirs,
+                                                    self.metrics.started_wall.timestamp()))
+        if match is None:
+            yield self._log("검증할 설치 프로그램을 찾지 못해 검증 생략 (No installer found to verify, skipped)")
+            return True
+        return (yield from self._verify(match[0]))
+
+    def _cancelled(self):
+        """
+        받다 만 파일을 지우고 취소 결과를 기록하는 흐름
+        Flow deleting partial files and recording the cancelled result
+        """
+        yield from self._discard_partial()
+        error_msg = "다운로드 취소됨 (Download cancelled)"
+        yield self._log(error_msg)
+        self._record('cancelled')
+        yield ErrorEvent(error_msg)
+
+    def _discard_partial(self):
+        """
+        취소된 다운로드가 남긴 받다 만 피어 staging 폴더와 불완전한 설치 프로그램을 지우는 흐름
+        Flow deleting the partial peer staging folder and incomplete installers a cancelled download left behind
+        """
+        if self.peer is not None:
+            staging = yield BlockingCall(self.peer.discard_partial)
+            if staging:
+                yield self._log(f"받다 만 파일 삭제 (Removed partial download): {staging}")
+        if self.cache is not None and self._known_installers is not None:
+            for path in (yield BlockingCall(self.cache.discard_partial, (self._known_installers,))):
+                yield self._log(f"불완전한 설치 프로그램 삭제 (Removed incomplete installer): {path}")
+
+    def _before_download(self):
+        """
+        softwareupdate를 실행하기 전의 흐름 - 캐시나 피어로 끝났거나 취소되었으면 True 반환
+        Flow run before softwareupdate starts - returns True when the cache or a peer ended the fetch,
+        or it was cancelled
+        """
+        # 캐시에 검증된 설치 프로그램이 있으면 다운로드 생략
+        # Skip the download when a verified installer is already cached
+        if self.cache is not None:
+            yield BlockingCall(self.cache.scan)
+            cached_path = yield BlockingCall(self.cache.lookup, (self.version,))
+            # 캐시된 설치 프로그램도 검증 (바뀌지 않았으면 해시 캐시 덕분에 바로 끝남)
+            # Cached installers are verified too (instant through the hash cache when unchanged)
+            if cached_path and self.verifier is not None and not (yield from self._verify(cached_path)):
+                if self.cancelled:
+                    yield from self._cancelled()
+                    return True
+                yield self._log("캐시된 설치 프로그램 검증 실패 - 다시 받음 "
+                                "(Cached installer failed verification, fetching it again)")
+                cached_path = None
+            if cached_path:
+                yield self._log(f"캐시된 설치 프로그램 사용 (Using cached installer): {cached_path}")
+                self.log_sink.flush()
+                self._record('cached', 0)
+                yield ProgressEvent(100)
+                yield FinishedEvent(cached_path)
+                return True
+
+        # LAN 피어에 설치 프로그램이 있으면 Apple 대신 피어에서 받음
+        # Pull from a LAN peer instead of Apple when one has the installer
+        if self.peer is not None:
+            interpreter = LineInterpreter(metrics=self.metrics, start_percent=self.start_percent)
+            peer_path = yield DriveSteps(self.peer.download(self.version), interpreter)
+            if peer_path and self.verifier is not None and not (yield from self._verify(peer_path)):
+                if not self.cancelled:
+                    yield self._log("피어에서 받은 설치 프로그램 검증 실패 "
+                                    "(The installer from the peer failed verification)")
+                peer_path = None
+            if peer_path:
+                if self.cache is not None:
+                    yield BlockingCall(self.cache.record, (self.version, self.metrics.started_wall.timestamp()))
+                self.log_sink.flush()
+                self._record('peer', 0)
+                yield ProgressEvent(100)
+                yield FinishedEvent(peer_path)
+                return True
+            if self.cancelled:
+                yield from self._cancelled()
+                return True
+            yield self._log("피어에서 받지 못해 softwareupdate 사용 (No peer could serve it, using softwareupdate)")
+            self.metrics.reset_baseline()
+
+        yield self._log("다운로드 시작 (Download started)")
+
+        # 취소 시 새로 생긴 불완전한 설치 프로그램만 지우도록 기존 번들을 기억
+        # Existing bundles are remembered so cancelling only deletes new incomplete ones
+        if self.cache is not None:
+            self._known_installers = set(self.cache.installer_paths())
+        return False
+
+    def _after_download(self, returncode):
+        """
+        softwareupdate가 끝난 뒤의 흐름 - 받은 설치 프로그램을 검증/캐시에 등록하거나 실패를 기록
+        Flow run after softwareupdate exits - verifies and caches the fetched installer, or records the failure
+        """
+        if returncode == 0:
+            yield self._log("다운로드 완료 (Download completed)")
+            if not (yield from self._verify_download()):
+                if self.cancelled:
+                    yield from self._cancelled()
+                    return
+                error_msg = "설치 프로그램 검증 실패 (Installer verification failed)"
+                yield self._log(error_msg)
+                self.log_sink.sync()
+                self._record('corrupt', 0)
+                yield ErrorEvent(error_msg)
+                return
+            if self.cache is not None:
+                entry = yield BlockingCall(self.cache.record, (self.version, self.metrics.started_wall.timestamp()))
+                if entry is not None:
+                    yield self._log(f"캐시에 등록됨 (Added to cache): {entry['path']}")
+            self.log_sink.flush()
+            self._record('finished', 0)
+            yield ProgressEvent(100)
+            yield FinishedEvent()
+            return
+
+        if self.cancelled:
+            yield from self._discard_partial()
+        error_msg = f"다운로드 중 오류가 발생했습니다. 종료 코드: {returncode}"
+        if self.abort_reason and not self.cancelled:
+            error_msg = f"{error_msg} - {self.abort_reason}"
+        yield self._log(error_msg)
+        self.log_sink.sync()
+        self._record(self._result(), returncode)
+        yield ErrorEvent(error_msg, returncode)
+
+    def _failed(self, error):
+        """
+        예외로 끝난 다운로드를 기록하며 이벤트 생성
+        Record a download that ended with an exception, yielding events
+        """
+        error_msg = f"예외 발생: {str(error)}"
+        yield self._log(error_msg)
+        self.log_sink.sync()
+        self._record('error')
+        yield ErrorEvent(error_msg)
+
+# 한 작업을 실행하는 엔진
+# Engine running one job
+class FetchEngine(FetchEngineBase):
+    """
+    실행기로 softwareupdate를 실행하고 출력을 해석해 이벤트를 만드는 클래스
+    Runs softwareupdate through a runner and turns its output into events
+
+    events()로 이벤트를 순회하거나, run()으로 listener에 전달
+    (listener는 post_status(str), post_progress(int), post_finished(), post_error(str)를 제공)
+    Iterate events with events(), or use run() to forward them to a listener
+    (the listener provides post_status(str), post_progress(int), post_finished() and post_error(str))
+    """
+
+    def __init__(self, job, log_sink=None, listener=None, runner=None, cache=None,
+                 metrics=None, start_percent=0, peer=None, terminate_grace=DEFAULT_TERMINATE_GRACE,
+                 verifier=None):
+        """
+        초기화 함수 - listener 외의 인자는 FetchEngineBase와 같음
+        Initialization function - arguments other than `listener` are the same as FetchEngineBase's
+        """
+        super().__init__(job, log_sink, runner, cache, metrics, start_percent, peer, terminate_grace, verifier)
+        self.listener = listener
+
+    def _stop(self):
+        # 다른 스레드에서 SIGTERM 후 유예 시간이 지나면 SIGKILL (호출한 스레드는 막지 않음)
+        # SIGTERM, then SIGKILL after the grace period, on another thread (the caller never blocks)
+        process = self.process
+        if process is not None and process.poll() is None:
+            threading.Thread(target=stop_process, args=(process, self.terminate_grace), daemon=True).start()
+
+    def _suspend_process(self):
+        if self.process is not None:
+            suspend_process(self.process)
+
+    def _resume_process(self):
+        if self.process is not None:
+            resume_process(self.process)
+
+    def run(self):
+        """
+        다운로드를 수행하며 이벤트를 listener에 전달 - 성공하면 True 반환
+        Perform the download, forwarding events to the listener - returns True on success
+        """
+        ok = False
+        for event in self.events():
+            if self.listener is not None:
+                dispatch_event(event, self.listener)
+            if isinstance(event, FinishedEvent):
+                ok = True
+        return ok
+
+    def _drive(self, steps, interpreter):
+        """
+        단계 제너레이터를 일시 정지/취소를 지키며 끝까지 진행해 이벤트를 생성하고 그 반환값 (취소되면 None) 반환
+        Run a step generator to the end, honouring pause/cancel, while yielding events;
+        returns its return value (None when cancelled)
+        """
+        try:
+            while self._running.wait() and not self.cancelled:
+                try:
+                    step = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+                yield from peer_step_events(step, interpreter, self._log)
+        finally:
+            steps.close()
+        return None
+
+    def _run_flow(self, flow):
+        """
+        공유 흐름을 이 스레드에서 진행하며 이벤트를 생성하고 흐름의 반환값 반환
+        Run a shared flow on this thread while yielding its events; returns the flow's return value
+        """
+        reply = None
+        try:
+            while True:
+                try:
+                    item = flow.send(reply)
+                except StopIteration as stop:
+                    return stop.value
+                reply = None
+                if isinstance(item, BlockingCall):
+                    reply = item.func(*item.args)
+                elif isinstance(item, DriveSteps):
+                    reply = yield from self._drive(item.steps, item.interpreter)
+                else:
+                    yield item
+        finally:
+            flow.close()
+
+    def events(self):
+        """
+        다운로드를 수행하며 이벤트를 순서대로 생성하는 제너레이터
+        Generator performing the download and yielding events in order
+        """
+        if self.metrics.started_at is None:
+            self.metrics.start()
+        try:
+            if (yield from self._run_flow(self._before_download())):
+                return
+
+            # 프로세스 실행
+            # Execute process
+            process = self.runner.start(self.job.command())
+            self.process = process
+            self.last_output_time = time.monotonic()
+            if self.cancelled:
+                self._stop()
+            elif self.paused:
+                suspend_process(process)
+
+            interpreter = LineInterpreter(metrics=self.metrics, start_percent=self.start_percent)
+            self.interpreter = interpreter
+
+            # 프로세스 출력 실시간 처리 - 진단이 켜져 있으면 단계별 시간 기록
+            # (yield에서 돌아오기까지의 시간은 소비자가 이벤트를 전달하는 시간)
+            # Real-time process output handling - per-stage times are recorded while diagnostics are on
+            # (the time until a yield resumes is the consumer delivering the event)
+            clock = stage_clock()
+            while True:
+                output = process.stdout.readline()
+                if output == '' and process.poll() is not None:
+                    break
+                if output:
+                    if clock is not None:
+                        clock.lap('read')
+                    self.last_output_time = time.monotonic()
+                    output = output.strip()
+                    event = self._log(output)
+                    if clock is not None:
+                        clock.lap('log')
+                    yield event
+                    if clock is not None:
+                        clock.lap('emit')
+                    events = interpreter.feed(output)
+                    if clock is not None:
+                        clock.lap('parse')
+                    yield from events
+                    if clock is not None:
+                        clock.lap('emit')
+
+            # 프로세스 종료 상태 확인
+            # Check process exit status
+            yield from self._run_flow(self._after_download(process.returncode))
+
+        except Exception as e:
+            yield from self._failed(e)
+        finally:
+            # 소비자가 중간에 멈추거나 (close(), KeyboardInterrupt) 예외가 나도 자식 프로세스를 남기지 않음
+            # Never leave the child behind when the consumer stops early (close(), KeyboardInterrupt) or on errors
+            if self.process is not None and self.process.poll() is None:
+                stop_process(self.process, self.terminate_grace)
+            # 종료 시 남은 로그 기록
+            # Flush remaining log lines on exit
+            self.log_sink.flush()
+
+# 다운로드 뒤 패키징/업로드 단계 연결
+# Chain the packaging/upload stages after a download
+def chain_packaging(events, packager, version, log_sink, installer_dirs=None, control=None, uploader=None):
+    """
+    엔진 이벤트를 그대로 전달하다가 성공(FinishedEvent)하면 먼저 설치 프로그램을 패키징하고,
+    uploader(DistributionUploader)가 있으면 압축 파일과 매니페스트를 배포 지점에 올리는 제너레이터
+    - 단계가 실패하거나 취소되면 FinishedEvent 대신 ErrorEvent를 생성;
+    control(엔진/감시자)의 paused/cancelled를 지킴
+    Generator passing engine events through and, on success (FinishedEvent), packaging the installer first
+    and, with `uploader` (a DistributionUploader), uploading the archive and its manifest to the distribution
+    point - a failed or cancelled stage yields an ErrorEvent instead of the FinishedEvent;
+    honours `control`'s (an engine/supervisor) paused/cancelled flags
+    """
+    # tarfile 등은 패키징할 때만 필요하므로 여기서 가져옴 (시작 시간 예산)
+    # tarfile and friends are only needed when packaging, so they are imported here (startup budget)
+    from installer_package import format_package_result
+
+    # 버전을 읽을 수 없는 번들은 다운로드 시작 이후 바뀐 것만 대신 씀
+    # Only bundles changed after the fetch started stand in when the version is unreadable
+    started = time.time()
+
+    def log(message):
+        log_sink.log(message)
+        return StatusEvent(message)
+
+    def cancelled():
+        return control is not None and control.cancelled
+
+    def run_stage(steps, status_format, errors):
+        # 단계 제너레이터를 진행하며 이벤트를 생성하고 그 반환값 (실패/취소되면 None) 반환
+        # (처리량은 다운로드 측정값과 섞이지 않도록 단계마다 따로 측정)
+        # Drive a stage generator while yielding events; returns its return value (None on failure/cancel)
+        # (throughput is measured per stage so it never mixes with the download's)
+        interpreter = LineInterpreter(metrics=FetchMetrics(), status_format=status_format)
+        try:
+            while not cancelled():
+                if control is not None and control.paused:
+                    time.sleep(0.1)
+                    continue
+                try:
+                    step = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+                yield from peer_step_events(step, interpreter, log)
+        except errors as e:
+            yield log(f"오류 (Error): {e}")
+        finally:
+            steps.close()
+        return None
+
+    def failed(stage, stage_english):
+        error_msg = (f"{stage} 취소됨 ({stage_english} cancelled)" if cancelled()
+                     else f"{stage} 실패 ({stage_english} failed)")
+        yield log(error_msg)
+        log_sink.flush()
+        yield ErrorEvent(error_msg)
+
+    for event in events:
+        if not isinstance(event, FinishedEvent):
+            yield event
+            continue
+        app_path = event.cached_path
+        if app_path is None:
+            match = find_installer(version, installer_dirs, started)
+            app_path = match[0] if match is not None else None
+        if app_path is None:
+            yield log("패키징할 설치 프로그램을 찾지 못해 패키징 생략 (No installer found to package, skipped)")
+            yield event
+            continue
+
+        result = yield from run_stage(packager.package(app_path, version), PACKAGE_STATUS, (OSError, ValueError))
+        if result is None:
+            yield from failed("패키징", "Packaging")
+            return
+        yield log(format_package_result(result))
+
+        if uploader is not None:
+            from distribution_upload import UPLOAD_ERRORS, format_upload_result
+            for path in (result.archive_path, result.manifest_path):
+                uploaded = yield from run_stage(uploader.upload(path), UPLOAD_STATUS, UPLOAD_ERRORS)
+                if uploaded is None:
+                    yield from failed("업로드", "Upload")
+                    return
+                yield log(format_upload_result(uploaded))
+        log_sink.flush()
+        yield ProgressEvent(100)
+        yield event
@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import datetime
+from typing import NamedTuple, Optional
+
+# 다운로드 처리량/남은 시간 측정
+# Download throughput/ETA measurement
+
+# EWMA 평활 계수 (클수록 최근 샘플 비중이 큼)
+# EWMA smoothing factor (higher weights recent samples more)
+DEFAULT_ALPHA = 0.3
+
+# 진행률 변화 없이 이 시간이 지나면 멈춤으로 판단 (초)
+# Seconds without progress before the fetch is considered stalled
+DEFAULT_STALL_SECONDS = 60.0
+
+# 측정 결과 이벤트
+# Measurement event
+class MetricsEvent(NamedTuple):
+    """
+    진행률 샘플 시점의 처리량/남은 시간 - bytes_per_second는 출력에 바이트 수가 있을 때만 설정
+    Throughput/ETA at a progress sample - bytes_per_second is only set when the output carries byte counts
+    """
+    percent: float
+    percent_per_second: Optional[float]
+    bytes_per_second: Optional[float]
+    eta_seconds: Optional[float]
+    elapsed: float
+    stalled: bool
+
+# 진행률 샘플 기반 측정기
+# Meter based on progress samples
+class FetchMetrics:
+    """
+    진행률 샘플마다 시각을 기록하고 EWMA 처리량, 남은 시간, 멈춤 여부를 계산하는 클래스
+    Timestamps every progress sample and computes EWMA throughput, ETA and stalls
+    """
+
+    def __init__(self, alpha=DEFAULT_ALPHA, stall_seconds=DEFAULT_STALL_SECONDS, clock=time.monotonic):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.alpha = alpha
+        self.stall_seconds = stall_seconds
+        self.clock = clock
+
+        self.started_at = None
+        self.started_wall = None
+        self.ended_wall = None
+        self.samples = 0
+        self.attempts = 1
+        self.percent = 0.0
+        self.bytes_done = None
+        self.bytes_total = None
+        self.percent_rate = None
+        self.bytes_rate = None
+        self.peak_percent_rate = None
+        self.stalled = False
+        self.stall_count = 0
+        self.stalled_seconds = 0.0
+        self.result = None
+        self.returncode = None
+        self._last_time = None
+        self._last_percent = None
+        self._last_bytes = None
+        self._stall_started = None
+        self._ended_at = None
+
+    def start(self, now=None):
+        """
+        측정 시작
+        Start measuring
+        """
+        self.started_at = self.clock() if now is None else now
+        self.started_wall = datetime.datetime.now()
+        self._last_time = self.started_at
+        self._last_percent = 0.0
+
+    def new_attempt(self, now=None):
+        """
+        재시도 시작 - 새 프로세스는 0%부터 다시 출력하므로 비교 기준을 초기화
+        Start a retry - the new process reports from 0% again, so reset the comparison baseline
+        """
+        self.attempts += 1
+        self.reset_baseline(now)
+
+    def reset_baseline(self, now=None):
+        """
+        새 출처(재시도, 피어 실패 후 softwareupdate)가 0%부터 다시 보고하므로 비교 기준을 초기화
+        Reset the comparison baseline because a new source (retry, softwareupdate after a peer) reports from 0% again
+        """
+        now = self.clock() if now is None else now
+        self._end_stall(now)
+        self._last_time = now
+        self._last_percent = 0.0
+        self._last_bytes = None
+
+    def resume(self, now=None):
+        """
+        일시 정지 뒤 재개 - 멈춰 있던 시간이 처리량/멈춤 판단에 들어가지 않도록 기준 시각을 옮김
+        Resume after a pause - moves the baseline time so the paused time never counts towards throughput or stalls
+        """
+        now = self.clock() if now is None else now
+        self._end_stall(now)
+        self._last_time = now
+
+    @property
+    def last_progress_time(self):
+        """
+        마지막으로 진행률이 증가한 시각 (clock 기준)
+        Time of the last progress increase (on `clock`)
+        """
+        return self._last_time
+
+    def _ewma(self, previous, value):
+        return value if previous is None else self.alpha * value + (1 - self.alpha) * previous
+
+    def sample(self, percent, bytes_done=None, bytes_total=None, now=None):
+        """
+        진행률 샘플을 기록하고 현재 측정값 반환
+        Record a progress sample and return the current measurement
+        """
+        now = self.clock() if now is None else now
+        if self.started_at is None:
+            self.start(now)
+        self.samples += 1
+
+        elapsed = now - self._last_time
+        if percent > self._last_percent:
+            if elapsed > 0:
+                self.percent_rate = self._ewma(self.percent_rate, (percent - self._last_percent) / elapsed)
+                if self.peak_percent_rate is None or self.percent_rate > self.peak_percent_rate:
+                    self.peak_percent_rate = self.percent_rate
+                if bytes_done is not None and self._last_bytes is not None:
+                    self.bytes_rate = self._ewma(self.bytes_rate, (bytes_done - self._last_bytes) / elapsed)
+            self._end_stall(now)
+            self._last_time = now
+            self._last_percent = percent
+        else:
+            self.check_stall(now)
+
+        self.percent = percent
+        if bytes_done is not None:
+            self._last_bytes = bytes_done
+            self.bytes_done = bytes_done
+            self.bytes_total = bytes_total
+        return self.snapshot(now)
+
+    def check_stall(self, now=None):
+        """
+        마지막 진행 이후 stall_seconds가 지났는지 확인
+        Check whether stall_seconds have passed since the last progress
+        """
+        now = self.clock() if now is None else now
+        if self._last_time is not None and not self.stalled and now - self._last_time >= self.stall_seconds:
+            self.stalled = True
+            self.stall_count += 1
+            self._stall_started = self._last_time
+        return self.stalled
+
+    def _end_stall(self, now):
+        if self.stalled:
+            self.stalled_seconds += now - self._stall_started
+            self.stalled = False
+            self._stall_started = None
+
+    def eta_seconds(self):
+        """
+        현재 EWMA 처리량으로 계산한 남은 시간 (알 수 없으면 None)
+        Remaining time at the current EWMA throughput (None if unknown)
+        """
+        if self.stalled or not self.percent_rate:
+            return None
+        return max(0.0, (100.0 - self.percent) / self.percent_rate)
+
+    def snapshot(self, now=None):
+        """
+        현재 측정값 이벤트 생성
+        Build a measurement event for the current state
+        """
+        now = self.clock() if now is None else now
+        elapsed = now - self.started_at if self.started_at is not None else 0.0
+        return MetricsEvent(self.percent, self.percent_rate, self.bytes_rate,
+                            self.eta_seconds(), elapsed, self.stalled)
+
+    def finish(self, result, returncode=None, now=None):
+        """
+        측정 종료 - result는 'finished', 'error', 'cached' 등
+        Stop measuring - result is 'finished', 'error', 'cached', ...
+        """
+        now = self.clock() if now is None else now
+        self._end_stall(now)
+        self.result = result
+        self.returncode = returncode
+        self.ended_wall = datetime.datetime.now()
+        self._ended_at = now
+
+    def summary(self):
+        """
+        세션 요약 딕셔너리
+        Session summary dictionary
+        """
+        ended_at = self._ended_at if self._ended_at is not None else self.clock()
+        duration = ended_at - self.started_at if self.started_at is not None else 0.0
+        return {
+            'started': self.started_wall.isoformat() if self.started_wall else None,
+            'ended': self.ended_wall.isoformat() if self.ended_wall else None,
+            'duration_seconds': round(duration, 3),
+            'result': self.result,
+            'returncode': self.returncode,
+            'attempts': self.attempts,
+            'samples': self.samples,
+            'final_percent': self.percent,
+            'average_percent_per_second': round(self.percent / duration, 4) if duration > 0 else None,
+            'peak_percent_per_second': round(self.peak_percent_rate, 4) if self.peak_percent_rate else None,
+            'bytes_done': self.bytes_done,
+            'bytes_total': self.bytes_total,
+            'average_bytes_per_second': round(self.bytes_done / duration, 1) if self.bytes_done and duration > 0 else None,
+            'stall_count': self.stall_count,
+            'stalled_seconds': round(self.stalled_seconds, 3),
+        }
+
+# 세션 로그 옆에 요약 JSON 기록
+# Write the summary JSON next to the session log
+def summary_path_for(log_file_path):
+    """
+    세션 로그 경로에 대응하는 요약 JSON 경로
+    Summary JSON path matching a session log path
+    """
+    return os.path.splitext(log_file_path)[0] + '.summary.json'
+
+def write_summary(log_file_path, summary):
+    """
+    세션 로그 옆에 요약 JSON을 기록하고 경로 반환
+    Write the summary JSON next to the session log and return its path
+    """
+    path = summary_path_for(log_file_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return path
+
+# 표시용 포맷 함수
+# Formatting helpers for display
+def format_duration(seconds):
+    """
+    초를 H:MM:SS 또는 M:SS 문자열로 변환
+    Format seconds as H:MM:SS or M:SS
+    """
+    if seconds is None:
+        return '--:--'
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+def format_metrics(metrics):
+    """
+    측정값을 '1.2 MB/s · 0.35%/s · ETA 4:10' 형식의 문자열로 변환
+    Format a measurement as '1.2 MB/s · 0.35%/s · ETA 4:10'
+    """
+    if metrics.stalled:
+        return '멈춤 (Stalled)'
+    parts = []
+    if metrics.bytes_per_second is not None:
+        parts.append(f"{metrics.bytes_per_second / 1e6:.1f} MB/s")
+    if metrics.percent_per_second is not None:
+        parts.append(f"{metrics.percent_per_second:.2f}%/s")
+    parts.append(f"ETA {format_duration(metrics.eta_seconds)}")
+    return ' · '.join(parts)
@@ -0,0 +1,273 @@
+import os
+import sys
+import time
+import signal
+import threading
+import subprocess
+from pipe_reader import RawLineReader
+from fake_softwareupdate import read_transcript
+
+# 다운로드 엔진이 사용하는 명령 실행기
+# Command runners used by the download engine
+#
+# 실행기는 start(command)로 Popen과 같은 핸들을 반환
+# (stdout.readline(), poll(), terminate(), kill(), send_signal(), wait(), returncode)
+# A runner's start(command) returns a Popen-like handle
+# (stdout.readline(), poll(), terminate(), kill(), send_signal(), wait(), returncode)
+
+# 출력 읽기 방식 - raw는 논블로킹 바이트 읽기 (CR/LF 모두에서 나눔), text는 텍스트 모드 줄 버퍼
+# Output reader modes - raw is non-blocking byte reading (split on CR and LF), text is text-mode line buffering
+READERS = ('raw', 'text')
+DEFAULT_READER = 'raw'
+
+# 가짜 softwareupdate 스크립트 경로
+# Path of the fake softwareupdate script
+FAKE_SOFTWAREUPDATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_softwareupdate.py')
+
+# 종료 요청 후 강제 종료까지 기다리는 기본 시간 (초)
+# Default seconds to wait after terminate before killing
+DEFAULT_TERMINATE_GRACE = 5.0
+
+# 프로세스 중지 (SIGTERM 후 SIGKILL)
+# Stop a process (SIGTERM, then SIGKILL)
+def stop_process(process, grace=DEFAULT_TERMINATE_GRACE):
+    """
+    종료를 요청하고 grace초 안에 끝나지 않으면 강제 종료한 뒤 종료 코드 반환
+    Ask the process to terminate, kill it when it has not exited within `grace` seconds, and return its exit code
+
+    일시 정지된 프로세스는 SIGCONT를 받아야 SIGTERM을 처리하므로 함께 보냄
+    A suspended process only handles SIGTERM once continued, so SIGCONT is sent along with it
+    """
+    if process.poll() is not None:
+        return process.returncode
+    process.terminate()
+    resume_process(process)
+    try:
+        return process.wait(grace)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        return process.wait()
+
+# 프로세스 일시 정지/재개
+# Suspend/resume a process
+def suspend_process(process):
+    """
+    실행 중인 프로세스를 SIGSTOP으로 일시 정지
+    Suspend a running process with SIGSTOP
+    """
+    if process.poll() is None:
+        process.send_signal(signal.SIGSTOP)
+
+def resume_process(process):
+    """
+    일시 정지된 프로세스를 SIGCONT로 재개
+    Resume a suspended process with SIGCONT
+    """
+    if process.poll() is None:
+        process.send_signal(signal.SIGCONT)
+
+# 녹화된 출력 읽기
+# Load a recorded transcript
+def load_transcript(path, version=''):
+    """
+    녹화된 softwareupdate 출력을 읽어 {version}을 치환한 줄 목록으로 반환 ('synthetic:N'은 합성 출력)
+    Read a recorded softwareupdate transcript and return its lines with {version} filled in
+    ('synthetic:N' gives a synthetic transcript)
+    """
+    return [line.replace('{version}', version) for line in read_transcript(path)]
+
+# 실제 프로세스를 실행하는 실행기
+# Runner that launches a real process
+class SubprocessRunner:
+    """
+    subprocess.Popen으로 명령을 실행하는 기본 실행기
+    Default runner launching commands with subprocess.Popen
+
+    prefix를 지정하면 command[0] (softwareupdate) 대신 사용, reader는 출력 읽기 방식 (READERS)
+    When `prefix` is given it replaces command[0] (softwareupdate); `reader` is the output reader mode (READERS)
+    """
+
+    def __init__(self, prefix=None, env=None, reader=DEFAULT_READER):
+        """
+        초기화 함수
+        Initialization function
+        """
+        if reader not in READERS:
+            raise ValueError(f"알 수 없는 읽기 방식 (Unknown reader): {reader}")
+        self.prefix = prefix
+        self.env = env
+        self.reader = reader
+
+    def prepare(self, command):
+        """
+        실제로 실행할 (명령어, 환경 변수) 반환 - 비동기 엔진도 사용
+        Return the (command, environment) to execute - also used by the async engine
+        """
+        if self.prefix:
+            command = list(self.prefix) + list(command[1:])
+        env = None
+        if self.env:
+            env = dict(os.environ)
+            env.update(self.env)
+        return command, env
+
+    def start(self, command):
+        """
+        프로세스 실행
+        Execute process
+        """
+        command, env = self.prepare(command)
+        if self.reader == 'text':
+            return subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                bufsize=1,
+                env=env
+            )
+
+        # 버퍼 없는 바이너리 파이프를 논블로킹 줄 읽기로 감쌈
+        # Wrap the unbuffered binary pipe in the non-blocking line reader
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            env=env
+        )
+        process.stdout = RawLineReader(process.stdout)
+        return process
+
+# 가짜 softwareupdate 실행 파일을 사용하는 실행기
+# Runner using the fake softwareupdate executable
+def fake_softwareupdate_runner(transcript='fetch_success.txt', rate=None, exit_code=0, stall=None,
+                               times_path=None, carriage_returns=False, reader=DEFAULT_READER):
+    """
+    녹화된 출력을 지정한 속도로 재생하는 가짜 softwareupdate 프로세스를 실행하는 실행기 생성
+    Create a runner that launches the fake softwareupdate process replaying a transcript
+
+    rate는 초당 줄 수 (None이면 최대 속도), stall은 'line:seconds[,...]' 형식의 멈춤 지점,
+    times_path를 주면 가짜 프로세스가 줄마다 출력한 시각을 JSON으로 기록,
+    carriage_returns이면 실제 softwareupdate처럼 진행률 줄을 CR로 끝냄
+    `rate` is lines per second (None for full speed); `stall` lists 'line:seconds[,...]' pause points;
+    with `times_path` the fake process records when it wrote each line as JSON; with `carriage_returns`
+    progress lines end in CR like the real softwareupdate
+    """
+    env = {
+        'FAKE_SU_TRANSCRIPT': transcript,
+        'FAKE_SU_EXIT': str(exit_code),
+    }
+    if rate:
+        env['FAKE_SU_RATE'] = str(rate)
+    if stall:
+        env['FAKE_SU_STALL'] = stall
+    if times_path:
+        env['FAKE_SU_TIMES'] = times_path
+    if carriage_returns:
+        env['FAKE_SU_CR'] = '1'
+    return SubprocessRunner(prefix=[sys.executable, FAKE_SOFTWAREUPDATE], env=env, reader=reader)
+
+# 프로세스 없이 녹화된 출력을 재생하는 핸들
+# Handle replaying a transcript without a process
+class ReplayProcess:
+    """
+    메모리 안의 줄 목록을 재생하는 Popen 호환 핸들
+    Popen-compatible handle replaying an in-memory list of lines
+    """
+
+    class _Stream:
+        def __init__(self, owner):
+            self._owner = owner
+
+        def readline(self):
+            return self._owner._next_line()
+
+        def close(self):
+            pass
+
+    def __init__(self, lines, rate=None, exit_code=0):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self._lines = iter(lines)
+        self._interval = 1.0 / rate if rate else 0.0
+        self._exit_code = exit_code
+        self._next_time = time.monotonic()
+        self._running = threading.Event()
+        self._running.set()
+        self.returncode = None
+        self.pid = None
+        self.stdout = ReplayProcess._Stream(self)
+
+    def _next_line(self):
+        self._running.wait()
+        if self.returncode is not None:
+            return ''
+        line = next(self._lines, None)
+        if line is None:
+            self.returncode = self._exit_code
+            return ''
+        if self._interval:
+            self._next_time += self._interval
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return line + '\n'
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        while self.returncode is None:
+            self._next_line()
+        return self.returncode
+
+    def terminate(self):
+        if self.returncode is None:
+            self.returncode = -15
+        self._running.set()
+
+    def kill(self):
+        if self.returncode is None:
+            self.returncode = -9
+        self._running.set()
+
+    def send_signal(self, signum):
+        # SIGSTOP/SIGCONT는 재생을 멈추고/이어감
+        # SIGSTOP/SIGCONT pause/continue the replay
+        if signum == signal.SIGSTOP:
+            self._running.clear()
+        elif signum == signal.SIGCONT:
+            self._next_time = time.monotonic()
+            self._running.set()
+
+# 프로세스 없이 녹화된 출력을 재생하는 실행기
+# Runner replaying transcripts without a process
+class ReplayRunner:
+    """
+    별도 프로세스 없이 같은 스레드에서 녹화된 출력을 재생하는 실행기 (Linux CI용)
+    Runner replaying a transcript in-process (for Linux CI)
+    """
+
+    def __init__(self, transcript='fetch_success.txt', rate=None, exit_code=0):
+        """
+        초기화 함수 - transcript는 파일 경로/이름 또는 줄 목록
+        Initialization function - `transcript` is a file path/name or a list of lines
+        """
+        self.transcript = transcript
+        self.rate = rate
+        self.exit_code = exit_code
+
+    def start(self, command):
+        """
+        명령의 버전 인자로 출력을 채워 재생 핸들 반환
+        Return a replay handle with the command's version filled in
+        """
+        version = command[-1] if len(command) > 1 else ''
+        if isinstance(self.transcript, str):
+            lines = load_transcript(self.transcript, version)
+        else:
+            lines = [line.replace('{version}', version) for line in self.transcript]
+        return ReplayProcess(lines, self.rate, self.exit_code)
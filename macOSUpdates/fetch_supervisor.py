@@ -0,0 +1,380 @@
+import time
+import random
+import threading
+from abc import ABC, abstractmethod
+from fetch_metrics import FetchMetrics
+from fetch_engine import (FetchEngine, StatusEvent, ProgressEvent, FinishedEvent,
+                          ErrorEvent, RetryEvent, dispatch_event)
+
+# 다운로드 감시 및 자동 재시도
+# Download watchdog and automatic retry
+
+# 출력이 없을 때 멈춤으로 판단하는 기본 시간 (초)
+# Default seconds without any output before the fetch is considered hung
+DEFAULT_INACTIVITY_TIMEOUT = 300.0
+
+# 진행률이 오르지 않을 때 멈춤으로 판단하는 기본 시간 (초)
+# Default seconds without a progress increase before the fetch is considered hung
+DEFAULT_PROGRESS_TIMEOUT = 900.0
+
+# asyncio와 비동기 엔진은 AsyncFetchSupervisor를 쓸 때만 가져옴 (스레드 GUI 시작 시간 단축)
+# asyncio and the async engine are only imported when AsyncFetchSupervisor is used
+# (keeps the threaded GUI's startup short)
+
+# 감시자 확인 간격 (초)
+# Watchdog polling interval (seconds)
+WATCHDOG_INTERVAL = 1.0
+
+# 재시도 정책
+# Retry policy
+class RetryPolicy:
+    """
+    최대 시도 횟수와 지수 백오프 + 지터로 재시도 대기 시간을 정하는 클래스
+    Decides the attempt budget and the retry delay (exponential backoff plus jitter)
+
+    permanent_errors에 포함된 softwareupdate 오류는 재시도하지 않음 (예: 없는 버전)
+    softwareupdate errors containing one of `permanent_errors` are not retried (e.g. unknown version)
+    """
+
+    def __init__(self, max_attempts=5, base_delay=10.0, max_delay=600.0, jitter=0.5,
+                 permanent_errors=('not found',), rng=None):
+        """
+        초기화 함수 - jitter는 대기 시간에 곱하는 [1 - jitter, 1] 범위의 무작위 비율
+        Initialization function - `jitter` scales each delay by a random factor in [1 - jitter, 1]
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.permanent_errors = tuple(text.lower() for text in permanent_errors)
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt):
+        """
+        attempt번째 시도가 실패한 뒤 기다릴 시간 (초)
+        Seconds to wait after attempt number `attempt` failed
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * (1.0 - self.jitter * self.rng.random())
+
+    def should_retry(self, attempt, engine):
+        """
+        실패한 시도를 다시 실행할지 여부
+        Whether a failed attempt should be run again
+        """
+        if engine.cancelled or attempt >= self.max_attempts:
+            return False
+        last_error = engine.interpreter.last_error if engine.interpreter is not None else None
+        if last_error is not None and not engine.abort_reason:
+            text = last_error.text.lower()
+            if any(permanent in text for permanent in self.permanent_errors):
+                return False
+        return True
+
+# 감시자 공통 판단 로직
+# Shared watchdog check
+def hang_reason(engine, inactivity_timeout, progress_timeout, now=None):
+    """
+    출력/진행률이 제한 시간 동안 없었으면 그 이유를, 아니면 None 반환 (일시 정지/설치 프로그램 검증 중이면 항상 None)
+    Return why the engine looks hung when output/progress has been silent too long, otherwise None
+    (always None while paused or verifying the installer)
+    """
+    if engine.process is None or engine.last_output_time is None or engine.paused or engine.verifying:
+        return None
+    now = time.monotonic() if now is None else now
+    if inactivity_timeout and now - engine.last_output_time >= inactivity_timeout:
+        return f"{int(inactivity_timeout)}초 동안 출력 없음 (no output for {int(inactivity_timeout)} s)"
+    last_progress = engine.metrics.last_progress_time
+    if progress_timeout and last_progress is not None and now - last_progress >= progress_timeout:
+        return f"{int(progress_timeout)}초 동안 진행 없음 (no progress for {int(progress_timeout)} s)"
+    return None
+
+# 동기/비동기 감시/재시도의 공통 부분
+# Common part of the sync and async supervisors
+class FetchSupervisorBase(ABC):
+    """
+    엔진을 감시하며 멈추거나 실패하면 백오프 후 다시 실행하는 클래스의 공통 부분 - 하위 클래스는 엔진 클래스,
+    감시 방식과 재시도 대기만 구현
+    Common part of the classes that watch an engine and re-run it after a backoff when it hangs or fails
+    - subclasses only supply the engine class, the watchdog and the retry wait
+
+    재시도 사이에 측정값과 마지막 진행률을 이어받아 진행률이 0으로 돌아가지 않음
+    Metrics and the last percent carry over between attempts so progress never drops back to zero
+    """
+
+    def __init__(self, job, log_sink=None, runner=None, cache=None, policy=None,
+                 inactivity_timeout=DEFAULT_INACTIVITY_TIMEOUT, progress_timeout=DEFAULT_PROGRESS_TIMEOUT,
+                 peer=None, verifier=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.job = job
+        self.log_sink = log_sink
+        self.runner = runner
+        self.cache = cache
+        self.policy = policy or RetryPolicy()
+        self.inactivity_timeout = inactivity_timeout
+        self.progress_timeout = progress_timeout
+        self.peer = peer
+        self.verifier = verifier
+        self.metrics = FetchMetrics()
+        self.engine = None
+        self.attempt = 0
+        self.percent = 0
+        self.cancelled = False
+        self.paused = False
+        self._failure = None
+        self._wake = None
+
+    @property
+    def version(self):
+        return self.job.version
+
+    def cancel(self):
+        """
+        다운로드 취소 - 실행 중인 시도와 재시도 대기를 모두 중지
+        Cancel the download - stops the running attempt and any pending retry
+        """
+        self.cancelled = True
+        if self._wake is not None:
+            self._wake.set()
+        if self.engine is not None:
+            self.engine.cancel()
+
+    def pause(self):
+        """
+        다운로드 일시 정지 - 다음 시도도 일시 정지 상태로 시작
+        Pause the download - the next attempt also starts paused
+        """
+        self.paused = True
+        if self.engine is not None:
+            self.engine.pause()
+
+    def resume(self):
+        """
+        일시 정지한 다운로드 재개
+        Resume a paused download
+        """
+        self.paused = False
+        if self.engine is not None:
+            self.engine.resume()
+
+    def _log(self, message):
+        if self.log_sink is not None:
+            self.log_sink.log(message)
+        return StatusEvent(message)
+
+    @abstractmethod
+    def _engine_class(self):
+        """
+        시도마다 만들 엔진 클래스
+        Engine class created for each attempt
+        """
+
+    def _start_attempt(self):
+        """
+        다음 시도의 엔진을 만들어 engine에 두고 시도 상태 이벤트 반환
+        Create the next attempt's engine as `engine` and return the attempt status event
+        """
+        self.attempt += 1
+        if self.attempt > 1:
+            self.metrics.new_attempt()
+        event = self._log(f"=== 시도 {self.attempt}/{self.policy.max_attempts} "
+                          f"(Attempt {self.attempt}/{self.policy.max_attempts}) ===")
+        self.engine = self._engine_class()(self.job, self.log_sink, runner=self.runner, cache=self.cache,
+                                           metrics=self.metrics, start_percent=self.percent, peer=self.peer,
+                                           verifier=self.verifier)
+        self._failure = None
+        if self.cancelled:
+            self.engine.cancel()
+        elif self.paused:
+            self.engine.pause()
+        return event
+
+    def _observe(self, event):
+        """
+        엔진 이벤트를 살펴보고 그대로 전달할지 반환 - 실패는 시도가 끝날 때까지 보류
+        Inspect an engine event and return whether to pass it on - a failure is held back until the attempt ends
+        """
+        if isinstance(event, ErrorEvent):
+            self._failure = event
+            return False
+        # 검증 진행률은 다음 시도가 이어받을 다운로드 진행률이 아님
+        # Verification progress is not download progress for the next attempt to carry over
+        if isinstance(event, ProgressEvent) and not self.engine.verifying:
+            self.percent = max(self.percent, event.percent)
+        return True
+
+    def _end_attempt(self):
+        """
+        끝난 시도의 (생성할 이벤트 목록, 재시도 전 대기 시간) 반환 - 대기 시간이 None이면 다운로드가 끝난 것
+        Return (events to yield, wait before the retry) for the attempt that just ended
+        - a wait of None means the download is over
+        """
+        failure = self._failure
+        if failure is None:
+            return [], None
+        if self.engine.verify_problems:
+            # 손상된 설치 프로그램은 처음부터 다시 받으므로 진행률도 0부터
+            # A corrupt installer is fetched again from scratch, so progress restarts at zero
+            self.percent = 0
+        if not self.policy.should_retry(self.attempt, self.engine):
+            return [failure], None
+
+        delay = self.policy.delay(self.attempt)
+        reason = self.engine.abort_reason or failure.message
+        return [self._log(f"{delay:.1f}초 후 재시도 (Retrying in {delay:.1f} s): {reason}"),
+                RetryEvent(self.attempt + 1, self.policy.max_attempts, delay, reason)], delay
+
+    def _cancelled(self):
+        # 재시도 전에 취소됨
+        # Cancelled before a retry
+        return ErrorEvent(self._log("다운로드 취소됨 (Download cancelled)").message)
+
+# 동기 엔진 감시/재시도
+# Supervisor for the synchronous engine
+class FetchSupervisor(FetchSupervisorBase):
+    """
+    FetchEngine을 감시하며 멈추거나 실패하면 백오프 후 다시 실행하는 클래스
+    Watches a FetchEngine and re-runs it after a backoff when it hangs or fails
+
+    FetchEngine과 같은 events()/run()/cancel()/pause()/resume() 인터페이스 제공
+    Offers the same events()/run()/cancel()/pause()/resume() interface as FetchEngine
+    """
+
+    def __init__(self, job, log_sink=None, listener=None, runner=None, cache=None, policy=None,
+                 inactivity_timeout=DEFAULT_INACTIVITY_TIMEOUT, progress_timeout=DEFAULT_PROGRESS_TIMEOUT,
+                 peer=None, verifier=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__(job, log_sink, runner, cache, policy, inactivity_timeout, progress_timeout,
+                         peer, verifier)
+        self.listener = listener
+        self._wake = threading.Event()
+
+    def _engine_class(self):
+        return FetchEngine
+
+    def run(self):
+        """
+        다운로드를 수행하며 이벤트를 listener에 전달 - 성공하면 True 반환
+        Perform the download, forwarding events to the listener - returns True on success
+        """
+        ok = False
+        for event in self.events():
+            if self.listener is not None:
+                dispatch_event(event, self.listener)
+            if isinstance(event, FinishedEvent):
+                ok = True
+        return ok
+
+    def _watch(self, engine, stop):
+        # 멈춘 프로세스를 중지하는 감시 스레드
+        # Watchdog thread stopping a hung process
+        while not stop.wait(WATCHDOG_INTERVAL):
+            reason = hang_reason(engine, self.inactivity_timeout, self.progress_timeout)
+            if reason:
+                engine.abort(reason)
+                return
+
+    def events(self):
+        """
+        시도마다 엔진을 실행하며 이벤트를 생성 - 중간 실패는 재시도 이벤트로 바뀜
+        Run the engine once per attempt and yield its events - intermediate failures become retry events
+        """
+        while not self.cancelled:
+            yield self._start_attempt()
+            engine = self.engine
+            stop = threading.Event()
+            watchdog = threading.Thread(target=self._watch, args=(engine, stop), daemon=True)
+            watchdog.start()
+            try:
+                for event in engine.events():
+                    if self._observe(event):
+                        yield event
+            finally:
+                stop.set()
+                watchdog.join()
+
+            events, delay = self._end_attempt()
+            yield from events
+            if delay is None:
+                return
+            if self._wake.wait(delay):
+                break
+
+        yield self._cancelled()
+
+# asyncio 엔진 감시/재시도
+# Supervisor for the asyncio engine
+class AsyncFetchSupervisor(FetchSupervisorBase):
+    """
+    AsyncFetchEngine용 감시/재시도 - AsyncFetchEngine과 같은 events()/run()/cancel()/pause()/resume() 인터페이스 제공
+    Watchdog and retry for AsyncFetchEngine - offers the same events()/run()/cancel()/pause()/resume() interface
+    """
+
+    def _engine_class(self):
+        from async_engine import AsyncFetchEngine
+        return AsyncFetchEngine
+
+    async def run(self, listener=None):
+        """
+        다운로드를 수행하며 이벤트를 listener에 전달 - 성공하면 True 반환
+        Perform the download, forwarding events to the listener - returns True on success
+        """
+        ok = False
+        async for event in self.events():
+            if listener is not None:
+                dispatch_event(event, listener)
+            if isinstance(event, FinishedEvent):
+                ok = True
+        return ok
+
+    async def _watch(self, engine):
+        import asyncio
+        while True:
+            await asyncio.sleep(WATCHDOG_INTERVAL)
+            reason = hang_reason(engine, self.inactivity_timeout, self.progress_timeout)
+            if reason:
+                engine.abort(reason)
+                return
+
+    async def events(self):
+        """
+        시도마다 엔진을 실행하며 이벤트를 생성 - 중간 실패는 재시도 이벤트로 바뀜
+        Run the engine once per attempt and yield its events - intermediate failures become retry events
+        """
+        import asyncio
+
+        self._wake = asyncio.Event()
+        while not self.cancelled:
+            yield self._start_attempt()
+            engine = self.engine
+            watchdog = asyncio.ensure_future(self._watch(engine))
+            events = engine.events()
+            try:
+                async for event in events:
+                    if self._observe(event):
+                        yield event
+            finally:
+                watchdog.cancel()
+                # 소비자가 중간에 멈추면 가비지 수집을 기다리지 않고 엔진을 바로 닫아 자식 프로세스를 정리
+                # When the consumer stops early, close the engine right away (not at garbage collection)
+                # so it cleans up its child
+                await events.aclose()
+
+            events, delay = self._end_attempt()
+            for event in events:
+                yield event
+            if delay is None:
+                return
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+        yield self._cancelled()
@@ -0,0 +1,562 @@
+import os
+import sys
+import json
+import time
+import shlex
+import asyncio
+import tempfile
+import collections
+from log_sink import LogSink
+from log_pipeline import new_session_id
+from fetch_metrics import MetricsEvent
+from async_engine import AsyncFetchPool
+from fetch_engine import (StatusEvent, ProgressEvent, FinishedEvent, ErrorEvent, RetryEvent)
+
+# 여러 Mac에 SSH로 설치 프로그램을 준비하는 오케스트레이터
+# Orchestrator staging installers on many Macs over SSH
+#
+# 각 호스트에서 헤드리스 fetch (--json)를 실행하고 JSON 줄을 엔진 이벤트로 되돌려
+# AsyncFetchPool로 합침
+# Runs the headless fetch (--json) on every host, turns its JSON lines back into
+# engine events and merges them with AsyncFetchPool
+
+# 원격 Mac에서 헤드리스 fetch를 실행하는 기본 명령
+# Default command running the headless fetch on a remote Mac
+DEFAULT_REMOTE_COMMAND = '/usr/bin/python3 -m macOSUpdates'
+
+# 호스트별 OS 버전 확인 명령
+# Per-host OS version check
+PREFLIGHT_COMMAND = '/usr/bin/sw_vers -productVersion'
+
+# ControlMaster 연결 유지 시간 (초)
+# Seconds a ControlMaster connection is kept alive
+DEFAULT_CONTROL_PERSIST = 600
+
+# 로컬 헤드리스 진입점 (가짜 호스트용)
+# Local headless entry point (for fake hosts)
+CLI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli.py')
+
+# 호스트 목록 읽기
+# Read the host inventory
+def load_inventory(path):
+    """
+    한 줄에 하나씩 [user@]host 형식의 호스트 목록을 읽음 ('#' 주석, 쉼표 뒤 열은 무시, 중복 제거)
+    Read one [user@]host per line ('#' comments, columns after a comma ignored, duplicates removed)
+    """
+    hosts = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            host = line.replace(',', ' ').split()[0]
+            if host not in hosts:
+                hosts.append(host)
+    return hosts
+
+# 호스트별 연결을 재사용하는 풀
+# Pool reusing per-host connections
+class ConnectionPool:
+    """
+    열린 연결 수를 max_connections 이하로 유지하며 호스트별 연결을 재사용하는 풀
+    Pool reusing per-host connections while keeping at most `max_connections` open
+
+    자리가 없으면 가장 오래 쓰지 않은 유휴 연결을 닫고, 모두 사용 중이면 반납될 때까지 기다림.
+    opener(host)/closer(host)는 실제 연결을 열고 닫는 코루틴
+    When full, the least recently used idle connection is closed; when every connection
+    is busy, callers wait for one to be released. opener(host)/closer(host) are coroutines
+    opening and closing the real connection
+    """
+
+    class _Connection:
+        def __init__(self):
+            self.leases = 1
+            self.ready = asyncio.get_running_loop().create_future()
+
+    def __init__(self, opener, closer, max_connections=32):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.opener = opener
+        self.closer = closer
+        self.max_connections = max(1, max_connections)
+        self.opened = 0
+        self.reused = 0
+        self._entries = collections.OrderedDict()
+        self._cond = None
+        self._closing = []
+
+    def _condition(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def _evict_idle(self):
+        # 가장 오래 쓰지 않은 유휴 연결을 닫음
+        # Close the least recently used idle connection
+        for host, entry in self._entries.items():
+            if entry.leases == 0 and entry.ready.done():
+                del self._entries[host]
+                self._closing.append(asyncio.ensure_future(self.closer(host)))
+                return True
+        return False
+
+    async def acquire(self, host):
+        """
+        host 연결을 빌림 (없으면 열고, 자리가 없으면 기다림)
+        Lease the connection to `host` (opening it, or waiting for room, as needed)
+        """
+        cond = self._condition()
+        async with cond:
+            while True:
+                entry = self._entries.get(host)
+                if entry is not None:
+                    entry.leases += 1
+                    self._entries.move_to_end(host)
+                    self.reused += 1
+                    opening = False
+                    break
+                if len(self._entries) < self.max_connections or self._evict_idle():
+                    entry = ConnectionPool._Connection()
+                    self._entries[host] = entry
+                    self.opened += 1
+                    opening = True
+                    break
+                await cond.wait()
+
+        if not opening:
+            if not await asyncio.shield(entry.ready):
+                await self.release(host)
+                raise ConnectionError(f"{host}: 연결 실패 (connection failed)")
+            return
+
+        # 연결은 잠금 밖에서 열어 여러 호스트의 핸드셰이크가 겹치도록 함
+        # Connect outside the lock so handshakes to different hosts overlap
+        try:
+            await self.opener(host)
+        except BaseException:
+            entry.ready.set_result(False)
+            async with cond:
+                self._entries.pop(host, None)
+                cond.notify_all()
+            raise
+        entry.ready.set_result(True)
+
+    async def release(self, host):
+        """
+        빌린 연결 반납 - 연결은 다음 사용을 위해 열어 둠
+        Return a leased connection - it stays open for reuse
+        """
+        cond = self._condition()
+        async with cond:
+            entry = self._entries.get(host)
+            if entry is not None:
+                entry.leases -= 1
+            cond.notify_all()
+
+    async def close_all(self):
+        """
+        모든 연결 닫기
+        Close every connection
+        """
+        hosts = list(self._entries)
+        self._entries.clear()
+        await asyncio.gather(*(self.closer(host) for host in hosts), *self._closing,
+                             return_exceptions=True)
+        self._closing = []
+
+# 실제 SSH 전송
+# Real SSH transport
+class SSHTransport:
+    """
+    OpenSSH ControlMaster 연결로 원격 명령을 실행하는 전송 계층
+    Transport running remote commands over OpenSSH ControlMaster connections
+    """
+
+    def __init__(self, ssh_options=(), remote_command=DEFAULT_REMOTE_COMMAND,
+                 control_dir=None, control_persist=DEFAULT_CONTROL_PERSIST, connect_timeout=10):
+        """
+        초기화 함수 - ssh_options는 추가 '-o' 옵션 목록 (예: 'User=admin')
+        Initialization function - `ssh_options` are extra '-o' options (e.g. 'User=admin')
+        """
+        # 소켓 경로 길이 제한 때문에 짧은 /tmp 경로 사용
+        # Use a short /tmp path because of the socket path length limit
+        self.control_dir = control_dir or tempfile.mkdtemp(prefix='mu-ssh-', dir='/tmp')
+        self.control_persist = control_persist
+        self.remote_command = remote_command
+        self.base = ['ssh', '-o', 'BatchMode=yes', '-o', f'ConnectTimeout={connect_timeout}',
+                     '-o', f'ControlPath={os.path.join(self.control_dir, "%C")}']
+        for option in ssh_options:
+            self.base += ['-o', option]
+
+    async def _ssh(self, *args):
+        # -f로 백그라운드에 남는 마스터가 파이프를 물고 있지 않도록 stderr는 임시 파일로 받음
+        # stderr goes to a temp file so a master backgrounded with -f does not hold a pipe open
+        with tempfile.TemporaryFile() as stderr:
+            process = await asyncio.create_subprocess_exec(
+                *self.base, *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=stderr
+            )
+            returncode = await process.wait()
+            stderr.seek(0)
+            return returncode, stderr.read().decode('utf-8', errors='replace').strip()
+
+    async def open(self, host):
+        """
+        ControlMaster 연결을 백그라운드로 열기
+        Open a background ControlMaster connection
+        """
+        returncode, stderr = await self._ssh('-o', 'ControlMaster=yes',
+                                             '-o', f'ControlPersist={self.control_persist}',
+                                             '-N', '-f', host)
+        if returncode != 0:
+            raise ConnectionError(stderr or f"ssh 종료 코드 (exit code) {returncode}")
+
+    async def close(self, host):
+        """
+        ControlMaster 연결 닫기
+        Close the ControlMaster connection
+        """
+        await self._ssh('-O', 'exit', host)
+
+    def command(self, host, remote_args):
+        """
+        열린 연결로 원격 도구를 실행하는 ssh 명령
+        ssh command running the remote tool over the open connection
+        """
+        remote = ' '.join([self.remote_command] + [shlex.quote(arg) for arg in remote_args])
+        return self.base + ['-o', 'ControlMaster=no', host, remote]
+
+    def preflight(self, host):
+        """
+        원격 macOS 버전을 출력하는 ssh 명령
+        ssh command printing the remote macOS version
+        """
+        return self.base + ['-o', 'ControlMaster=no', host, PREFLIGHT_COMMAND]
+
+# SSH 대신 로컬에서 실행하는 가짜 호스트 전송
+# Fake-host transport running locally instead of over SSH
+class FakeHostTransport:
+    """
+    각 호스트의 fetch를 로컬 헤드리스 CLI + 녹화된 출력 재생으로 대신하는 전송 계층 (SSH/macOS 없이 테스트용)
+    Transport standing in for SSH: every host's fetch runs the local headless CLI replaying
+    a transcript (for testing without SSH or macOS)
+
+    failing_hosts는 연결에 실패하는 호스트, connect_delay는 가짜 핸드셰이크 시간
+    `failing_hosts` fail to connect; `connect_delay` is the fake handshake time
+    """
+
+    def __init__(self, transcript='fetch_success.txt', rate=None, exit_code=0,
+                 failing_hosts=(), connect_delay=0.05, log_dir=None, os_version='14.6.1'):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.transcript = transcript
+        self.rate = rate
+        self.exit_code = exit_code
+        self.failing_hosts = set(failing_hosts)
+        self.connect_delay = connect_delay
+        self.log_dir = log_dir or tempfile.mkdtemp(prefix='mu-fake-hosts-')
+        self.os_version = os_version
+        self.open_hosts = set()
+
+    async def open(self, host):
+        await asyncio.sleep(self.connect_delay)
+        if host in self.failing_hosts:
+            raise ConnectionError(f"ssh: connect to host {host} port 22: Connection refused")
+        self.open_hosts.add(host)
+
+    async def close(self, host):
+        self.open_hosts.discard(host)
+
+    def command(self, host, remote_args):
+        command = [sys.executable, CLI_SCRIPT] + list(remote_args)
+        # 호스트마다 별도 로그 폴더 (같은 시각/버전의 로그 파일 이름이 겹치지 않도록)
+        # Separate log folder per host (so same-time/same-version log names do not collide)
+        log_dir = os.path.join(self.log_dir, host.replace('@', '_'))
+        command += ['--no-cache', '--log-dir', log_dir, '--replay', self.transcript,
+                    '--replay-exit', str(self.exit_code)]
+        if self.rate:
+            command += ['--replay-rate', str(self.rate)]
+        return command
+
+    def preflight(self, host):
+        return [sys.executable, '-c', f'print({self.os_version!r})']
+
+# JSON 줄을 엔진 이벤트로 변환
+# Turn a JSON line back into an engine event
+def event_from_record(record):
+    """
+    헤드리스 fetch --json 출력 한 줄(딕셔너리)을 엔진 이벤트로 변환 (모르는 이벤트는 None)
+    Convert one headless `fetch --json` record (a dict) into an engine event (None when unknown)
+    """
+    kind = record.get('event')
+    if kind == 'status':
+        return StatusEvent(record.get('message', ''))
+    if kind == 'progress':
+        return ProgressEvent(record.get('percent', 0))
+    if kind == 'finished':
+        return FinishedEvent()
+    if kind == 'error':
+        return ErrorEvent(record.get('message', ''))
+    if kind == 'metrics':
+        return MetricsEvent(*(record.get(field) for field in MetricsEvent._fields))
+    if kind == 'retry':
+        return RetryEvent(*(record.get(field) for field in RetryEvent._fields))
+    return None
+
+# 한 호스트의 원격 fetch
+# Remote fetch on one host
+class HostFetch:
+    """
+    연결 풀에서 호스트 연결을 빌려 원격 헤드리스 fetch를 실행하고 이벤트를 생성하는 클래스
+    (AsyncFetchPool이 엔진처럼 다룰 수 있도록 events()/cancel() 제공)
+    Leases the host's connection from the pool, runs the remote headless fetch and yields
+    events (offers events()/cancel() so AsyncFetchPool can drive it like an engine)
+    """
+
+    def __init__(self, host, version, transport, pool, log_dir=None, remote_args=()):
+        """
+        초기화 함수 - log_dir이 있으면 호스트별 로그를 기록 (fetch가 시작될 때 열고 끝나면 닫음)
+        Initialization function - with `log_dir` a per-host log is written (opened when the fetch starts,
+        closed when it ends)
+        """
+        self.host = host
+        self.version = version
+        self.transport = transport
+        self.pool = pool
+        self.log_dir = log_dir
+        self.log_sink = None
+        self.remote_args = list(remote_args)
+        self.os_version = None
+        self.process = None
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        원격 fetch 취소 - ssh 프로세스를 종료하면 원격 명령도 끝남
+        Cancel the remote fetch - ending the ssh process ends the remote command
+        """
+        self.cancelled = True
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+
+    def _log(self, message):
+        if self.log_sink is not None:
+            self.log_sink.log(message)
+        return StatusEvent(message)
+
+    def _open_log(self):
+        # 호스트가 수백 개여도 열린 로그 파일은 동시에 실행 중인 fetch 수만큼만 유지
+        # Only the fetches actually running hold a log file open, however many hosts there are
+        if not self.log_dir:
+            return
+        self.log_sink = LogSink(os.path.join(self.log_dir, f"{self.host.replace('@', '_')}.log"), mode='w',
+                                session_id=new_session_id(), version=self.version)
+        self.log_sink.write(f"=== {self.host}: macOS {self.version} 원격 다운로드 시작 (Remote fetch started) ===")
+
+    def _close_log(self):
+        log_sink, self.log_sink = self.log_sink, None
+        if log_sink is not None:
+            log_sink.close()
+
+    async def _preflight(self):
+        process = await asyncio.create_subprocess_exec(
+            *self.transport.preflight(self.host),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await process.communicate()
+        if process.returncode == 0:
+            self.os_version = stdout.decode('utf-8', errors='replace').strip()
+
+    async def events(self):
+        """
+        원격 fetch 이벤트를 순서대로 생성하는 비동기 제너레이터
+        Async generator yielding the remote fetch's events in order
+        """
+        self._open_log()
+        events = self._fetch_events()
+        try:
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
+            self._close_log()
+
+    async def _fetch_events(self):
+        yield self._log(f"{self.host}: 연결 중 (Connecting)")
+        try:
+            await self.pool.acquire(self.host)
+        except Exception as e:
+            error_msg = f"{self.host}: 연결 실패 (Connection failed): {e}"
+            self._log(error_msg)
+            yield ErrorEvent(error_msg)
+            return
+
+        try:
+            await self._preflight()
+            if self.os_version:
+                yield self._log(f"{self.host}: macOS {self.os_version}")
+
+            remote_args = ['fetch', '--version', self.version, '--json'] + self.remote_args
+            self.process = await asyncio.create_subprocess_exec(
+                *self.transport.command(self.host, remote_args),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
+            )
+            if self.cancelled:
+                self.process.terminate()
+
+            terminal = None
+            async for raw in self.process.stdout:
+                line = raw.decode('utf-8', errors='replace').strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # JSON이 아닌 줄 (ssh 경고, 원격 오류 등)은 상태로 전달
+                    # Non-JSON lines (ssh warnings, remote errors ...) pass through as status
+                    yield self._log(f"{self.host}: {line}")
+                    continue
+                event = event_from_record(record)
+                if event is None:
+                    continue
+                if isinstance(event, StatusEvent):
+                    self._log(event.message)
+                if isinstance(event, (FinishedEvent, ErrorEvent)):
+                    terminal = event
+                yield event
+
+            returncode = await self.process.wait()
+            if terminal is None:
+                error_msg = f"{self.host}: 원격 fetch 비정상 종료 (Remote fetch exited abnormally): {returncode}"
+                self._log(error_msg)
+                yield ErrorEvent(error_msg, returncode)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        finally:
+            await self.pool.release(self.host)
+
+# 호스트별 상태를 모은 전체 보기
+# Aggregate view of per-host state
+class FleetView:
+    """
+    호스트별 상태/진행률을 모아 요약 줄과 표로 보여 주는 클래스
+    Collects per-host state and progress and renders a summary line and a table
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    RETRYING = 'retrying'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+
+    class HostState:
+        __slots__ = ('host', 'state', 'percent', 'message', 'eta', 'attempt')
+
+        def __init__(self, host):
+            self.host = host
+            self.state = FleetView.PENDING
+            self.percent = 0
+            self.message = ''
+            self.eta = None
+            self.attempt = 1
+
+    def __init__(self, hosts):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.hosts = collections.OrderedDict((host, FleetView.HostState(host)) for host in hosts)
+        self.started = time.monotonic()
+
+    def update(self, host, event):
+        """
+        호스트 이벤트를 반영하고 상태가 바뀌었으면 True 반환
+        Apply a host event and return True when the host's state changed
+        """
+        state = self.hosts[host]
+        previous = state.state
+        if isinstance(event, StatusEvent):
+            state.message = event.message
+            if state.state in (FleetView.PENDING, FleetView.RETRYING):
+                state.state = FleetView.RUNNING
+        elif isinstance(event, ProgressEvent):
+            state.percent = event.percent
+        elif isinstance(event, MetricsEvent):
+            state.eta = event.eta_seconds
+        elif isinstance(event, RetryEvent):
+            state.state = FleetView.RETRYING
+            state.attempt = event.attempt
+        elif isinstance(event, FinishedEvent):
+            state.state = FleetView.FINISHED
+            state.percent = 100
+        elif isinstance(event, ErrorEvent):
+            state.state = FleetView.FAILED
+            state.message = event.message
+        return state.state != previous
+
+    def counts(self):
+        """
+        상태별 호스트 수
+        Number of hosts in each state
+        """
+        counts = collections.Counter(state.state for state in self.hosts.values())
+        return {name: counts.get(name, 0) for name in
+                (FleetView.PENDING, FleetView.RUNNING, FleetView.RETRYING, FleetView.FINISHED, FleetView.FAILED)}
+
+    def summary_line(self):
+        """
+        한 줄 요약 (전체 진행률 포함)
+        One-line summary including overall progress
+        """
+        counts = self.counts()
+        overall = sum(state.percent for state in self.hosts.values()) / max(1, len(self.hosts))
+        elapsed = int(time.monotonic() - self.started)
+        return (f"[{elapsed // 60}:{elapsed % 60:02d}] {len(self.hosts)} hosts | "
+                f"running {counts['running']} | retrying {counts['retrying']} | pending {counts['pending']} | "
+                f"done {counts['finished']} | failed {counts['failed']} | overall {overall:.1f}%")
+
+    def table(self):
+        """
+        호스트별 상태 표 (줄 목록)
+        Per-host state table (list of lines)
+        """
+        width = max([len(host) for host in self.hosts] + [4])
+        lines = [f"{'HOST':<{width}}  {'STATE':<9} {'%':>4}  MESSAGE"]
+        for state in self.hosts.values():
+            lines.append(f"{state.host:<{width}}  {state.state:<9} {state.percent:>4}  {state.message}")
+        return lines
+
+# 여러 호스트에 동시에 fetch 실행
+# Run the fetch on many hosts concurrently
+async def run_fleet(hosts, version, transport, parallel=16, max_connections=32,
+                    log_dir=None, remote_args=(), on_event=None, view=None):
+    """
+    모든 호스트에서 원격 fetch를 실행하고 (성공 여부 목록, FleetView) 반환
+    - on_event(host, event)는 view가 갱신된 뒤 호출, 호스트별 로그는 log_dir에 기록
+    Run the remote fetch on every host and return (list of success flags, FleetView)
+    - on_event(host, event) is called after `view` is updated; per-host logs are written to log_dir
+    """
+    view = view or FleetView(hosts)
+    pool = ConnectionPool(transport.open, transport.close, max_connections)
+    fetches = [HostFetch(host, version, transport, pool, log_dir, remote_args) for host in hosts]
+
+    def forward(fetch, event):
+        view.update(fetch.host, event)
+        if on_event is not None:
+            on_event(fetch.host, event)
+
+    try:
+        results = await AsyncFetchPool(parallel, queue_size=max(256, len(hosts))).run(fetches, forward)
+    finally:
+        await pool.close_all()
+    return results, view
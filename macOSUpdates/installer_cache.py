@@ -0,0 +1,281 @@
+import os
+import glob
+import json
+import time
+import shutil
+import hashlib
+import plistlib
+import threading
+
+# 설치 프로그램을 찾을 기본 폴더
+# Default folder searched for installers
+DEFAULT_INSTALLER_DIRS = ['/Applications']
+
+# 캐시 인덱스 파일 기본 경로
+# Default path of the cache index file
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser('~/Library/Caches'), 'macOSUpdates', 'installers.json')
+
+# 지문 계산 시 대용량 파일 앞/뒤에서 읽을 바이트 수
+# Bytes sampled from the head and tail of large files for the fingerprint
+SAMPLE_BYTES = 1024 * 1024
+
+# 크기 문자열 단위 (1024 배수)
+# Size string units (powers of 1024)
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+# 설치 프로그램 안의 버전 정보 파일
+# Version information file inside the installer
+ASSET_INFO_PATH = os.path.join(
+    'Contents', 'SharedSupport',
+    'com_apple_MobileAsset_MacSoftwareUpdate', 'com_apple_MobileAsset_MacSoftwareUpdate.xml'
+)
+
+# 크기 문자열 변환
+# Parse a size string
+def parse_size(text):
+    """
+    '40G', '512M', '1073741824' 같은 크기 문자열을 바이트 수로 변환 (잘못된 형식이면 ValueError)
+    Convert a size string such as '40G', '512M' or '1073741824' to bytes (ValueError when malformed)
+    """
+    text = text.strip().upper().rstrip('B')
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ''
+    number = float(text[:len(text) - len(unit)])
+    if number < 0:
+        raise ValueError(f"negative size: {text}")
+    return int(number * SIZE_UNITS[unit])
+
+# 설치 프로그램 버전/빌드 읽기
+# Read installer version/build
+def read_installer_version(app_path):
+    """
+    설치 프로그램 번들에서 (버전, 빌드)를 읽어 반환, 알 수 없으면 (None, None)
+    Return (version, build) read from an installer bundle, or (None, None) if unknown
+    """
+    try:
+        with open(os.path.join(app_path, ASSET_INFO_PATH), 'rb') as f:
+            info = plistlib.load(f)
+        asset = info['Assets'][0]
+        return asset.get('OSVersion'), asset.get('Build')
+    except (OSError, KeyError, IndexError, plistlib.InvalidFileException, ValueError):
+        return None, None
+
+# 설치 프로그램 지문 계산
+# Compute installer fingerprint
+def fingerprint_installer(app_path):
+    """
+    번들 전체 크기와 Info.plist 및 가장 큰 파일의 앞/뒤 샘플 해시로 지문 생성
+    Build a fingerprint from the bundle size plus a hash of Info.plist and
+    head/tail samples of the largest payload file
+    """
+    total_size = 0
+    largest_path, largest_size = None, -1
+    for root, _, files in os.walk(app_path):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                size = os.lstat(path).st_size
+            except OSError:
+                continue
+            total_size += size
+            if size > largest_size:
+                largest_path, largest_size = path, size
+
+    digest = hashlib.sha256()
+    info_plist = os.path.join(app_path, 'Contents', 'Info.plist')
+    if os.path.exists(info_plist):
+        with open(info_plist, 'rb') as f:
+            digest.update(f.read())
+    if largest_path is not None:
+        with open(largest_path, 'rb') as f:
+            digest.update(f.read(SAMPLE_BYTES))
+            if largest_size > SAMPLE_BYTES:
+                f.seek(max(SAMPLE_BYTES, largest_size - SAMPLE_BYTES))
+                digest.update(f.read(SAMPLE_BYTES))
+
+    return {'size': total_size, 'checksum': digest.hexdigest()}
+
+# 설치 프로그램 번들 찾기
+# Find installer bundles
+def installer_paths(installer_dirs=None):
+    """
+    설치 프로그램 폴더에 있는 모든 'Install macOS' 번들 경로
+    Paths of every 'Install macOS' bundle in the installer folders
+    """
+    paths = []
+    for directory in installer_dirs or DEFAULT_INSTALLER_DIRS:
+        paths.extend(glob.glob(os.path.join(directory, 'Install macOS*.app')))
+    return sorted(paths)
+
+def find_installer(version, installer_dirs=None, since=None):
+    """
+    해당 버전의 설치 프로그램 (경로, 빌드) - 없으면 버전 정보를 읽을 수 없는 번들 중 since (epoch 초) 이후
+    가장 최근에 바뀐 번들, 그것도 없으면 None
+    (path, build) of the installer for `version` - otherwise the most recently changed bundle whose version
+    is unreadable (changed after `since`, in epoch seconds, when given), None when there is none
+    """
+    unreadable = []
+    for path in installer_paths(installer_dirs):
+        found_version, build = read_installer_version(path)
+        if found_version == version:
+            return path, build
+        if found_version is None:
+            unreadable.append(path)
+    # 다른 버전으로 확인된 번들은 절대 대신 쓰지 않음 - 버전을 모르는 번들만, 이번 다운로드 이후 생긴 것만 사용
+    # A bundle known to be another version is never used instead - only unreadable ones changed by this fetch
+    changed = {}
+    for path in unreadable:
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+        # 설치 패키지가 mtime을 보존할 수 있으므로 ctime도 봄
+        # ctime is checked too since installer packages may preserve mtimes
+        changed[path] = max(info.st_mtime, info.st_ctime)
+    if since is not None:
+        changed = {path: when for path, when in changed.items() if when >= since}
+    if not changed:
+        return None
+    newest = max(changed, key=changed.get)
+    return newest, None
+
+# 이미 받은 설치 프로그램을 위한 로컬 캐시
+# Local cache of installers that are already downloaded
+class InstallerCache:
+    """
+    버전/빌드별로 설치 프로그램을 색인하고 검증된 적중 시 다운로드를 건너뛰게 하는 캐시
+    Indexes installers by version/build so a verified hit can skip the download
+    """
+
+    def __init__(self, index_path=DEFAULT_INDEX_PATH, installer_dirs=None,
+                 max_versions=None, max_bytes=None):
+        """
+        초기화 함수 - max_versions/max_bytes가 None이면 제거하지 않음
+        Initialization function - nothing is evicted when max_versions/max_bytes are None
+        """
+        self.index_path = index_path
+        self.installer_dirs = installer_dirs or DEFAULT_INSTALLER_DIRS
+        self.max_versions = max_versions
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.index_path)
+
+    def installer_paths(self):
+        """
+        설치 프로그램 폴더에 있는 모든 'Install macOS' 번들 경로
+        Paths of every 'Install macOS' bundle in the installer folders
+        """
+        return installer_paths(self.installer_dirs)
+
+    def discard_partial(self, known_paths):
+        """
+        known_paths 이후 새로 생긴 번들 중 버전 정보가 없는 (덜 받은) 번들을 지우고 경로 목록 반환
+        Delete bundles that appeared since `known_paths` and carry no version info (incomplete), returning their paths
+        """
+        removed = []
+        with self._lock:
+            for path in self.installer_paths():
+                if path in known_paths or read_installer_version(path)[0]:
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path)
+        return removed
+
+    def scan(self):
+        """
+        디스크의 설치 프로그램을 색인에 추가하고 사라진 항목을 제거
+        Add on-disk installers to the index and drop entries that disappeared
+        """
+        with self._lock:
+            known_paths = {entry['path'] for entry in self._entries.values()}
+            for path in self.installer_paths():
+                if path in known_paths:
+                    continue
+                version, build = read_installer_version(path)
+                if version:
+                    self._add_locked(version, build, path)
+            for version in [v for v, e in self._entries.items() if not os.path.isdir(e['path'])]:
+                del self._entries[version]
+            self._save()
+            return dict(self._entries)
+
+    def lookup(self, version):
+        """
+        검증된 캐시 적중이면 설치 프로그램 경로를, 아니면 None 반환
+        Return the installer path on a verified hit, otherwise None
+        """
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is None or not os.path.isdir(entry['path']):
+                return None
+            if fingerprint_installer(entry['path']) != entry['fingerprint']:
+                # 지문이 달라진 항목은 신뢰할 수 없으므로 색인에서 제거
+                # Drop entries whose fingerprint changed; they can't be trusted
+                del self._entries[version]
+                self._save()
+                return None
+            entry['last_used'] = time.time()
+            self._save()
+            return entry['path']
+
+    def record(self, version, since=None):
+        """
+        다운로드 후 해당 버전의 설치 프로그램을 찾아 색인에 추가 (since는 find_installer 참고)
+        After a download, find the installer for `version` and add it to the index (see find_installer for `since`)
+        """
+        with self._lock:
+            match = find_installer(version, self.installer_dirs, since)
+            if match is None:
+                return None
+            entry = self._add_locked(version, match[1], match[0])
+            self._evict_locked(keep=version)
+            self._save()
+            return entry
+
+    def _add_locked(self, version, build, path):
+        now = time.time()
+        entry = {
+            'version': version,
+            'build': build,
+            'path': path,
+            'fingerprint': fingerprint_installer(path),
+            'added': now,
+            'last_used': now,
+        }
+        self._entries[version] = entry
+        return entry
+
+    def _evict_locked(self, keep=None):
+        """
+        최근에 가장 적게 쓰인 버전부터 개수/용량 제한을 넘는 만큼 삭제
+        Delete least recently used versions until the count/size limits are met
+        """
+        if self.max_versions is None and self.max_bytes is None:
+            return []
+        evicted = []
+        by_age = sorted(self._entries.values(), key=lambda e: e['last_used'])
+        for entry in by_age:
+            total = sum(e['fingerprint']['size'] for e in self._entries.values())
+            over_count = self.max_versions is not None and len(self._entries) > self.max_versions
+            over_size = self.max_bytes is not None and total > self.max_bytes
+            if not (over_count or over_size):
+                break
+            if entry['version'] == keep:
+                continue
+            shutil.rmtree(entry['path'], ignore_errors=True)
+            del self._entries[entry['version']]
+            evicted.append(entry['version'])
+        return evicted
@@ -0,0 +1,444 @@
+import os
+import json
+import time
+import shutil
+import tarfile
+import hashlib
+import threading
+import subprocess
+from typing import NamedTuple
+from installer_cache import read_installer_version
+
+# 받은 설치 프로그램을 배포용 압축 파일로 묶는 단계 - 번들을 tar 스트림으로 직접 써서
+# 멀티스레드 압축기(zstd/xz)에 흘려 보내므로 디스크에는 압축 결과만 남고 (두 번째 전체 사본 없음),
+# 압축 결과는 쓰는 동안 청크 단위로 해시해 청크 매니페스트를 남김
+# Packaging stage turning a fetched installer into a compressed archive for distribution - the bundle
+# is written as a tar stream straight into a multithreaded compressor (zstd/xz), so only the compressed
+# result reaches the disk (no second full copy), and the output is hashed chunk by chunk while it is
+# written to produce a chunk manifest
+#
+# 압축은 별도 프로세스(zstd/xz 명령)나 GIL을 놓는 모듈(zstandard)에서 돌아가므로
+# 번들 읽기/tar 헤더 작성과 압축이 서로 다른 코어에서 동시에 진행됨
+# Compression runs in a separate process (the zstd/xz commands) or a module that releases the GIL
+# (zstandard), so reading the bundle/writing tar headers and compressing proceed on different cores
+
+# 지원하는 압축 방식과 확장자
+# Supported codecs and their extensions
+CODECS = {'zstd': '.tar.zst', 'xz': '.tar.xz', 'none': '.tar'}
+DEFAULT_CODEC = 'zstd'
+
+# 압축 방식별 기본 수준 (설치 프로그램의 dmg는 이미 압축되어 있으므로 빠른 수준이 기본)
+# Default level per codec (the installer's dmg is already compressed, so a fast level is the default)
+DEFAULT_LEVELS = {'zstd': 3, 'xz': 6, 'none': None}
+
+# 압축 스레드 수 - 0이면 압축기가 코어 수에 맞춤
+# Compression threads - 0 lets the compressor match the core count
+DEFAULT_THREADS = 0
+
+# 압축 결과 청크 크기 (검증/피어 매니페스트와 같음) 및 번들 읽기 단위
+# Chunk size of the compressed output (same as verification/peer manifests) and bundle read size
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+
+# 압축 결과 기본 폴더
+# Default folder for archives
+DEFAULT_PACKAGE_DIR = os.path.join(os.path.expanduser('~/Library/Caches'), 'macOSUpdates', 'packages')
+
+# tar 블록/레코드 크기
+# tar block/record sizes
+BLOCK_SIZE = tarfile.BLOCKSIZE
+RECORD_SIZE = tarfile.RECORDSIZE
+
+# 패키징 진행률 (PeerProgress/VerifyProgress와 같은 모양이라 같은 방식으로 이벤트로 바뀜)
+# Packaging progress (shaped like PeerProgress/VerifyProgress so it turns into events the same way)
+class PackageProgress(NamedTuple):
+    bytes_done: int
+    bytes_total: int
+
+# 패키징 결과
+# Packaging result
+class PackageResult(NamedTuple):
+    """
+    압축 파일과 청크 매니페스트 경로 - input_bytes는 tar 스트림 크기, output_bytes는 압축 결과 크기
+    Paths of the archive and its chunk manifest - `input_bytes` is the tar stream size,
+    `output_bytes` the compressed size
+    """
+    archive_path: str
+    manifest_path: str
+    manifest: dict
+    input_bytes: int
+    output_bytes: int
+    seconds: float
+
+# 압축 결과를 기록하며 청크별로 해시하는 출력
+# Output writing the compressed result while hashing it chunk by chunk
+class ChunkedSink:
+    """
+    파일에 쓰는 동안 chunk_size마다 sha256을 계산하는 출력 (청크 목록이 무결성 기록이므로 전체 해시는 따로 계산하지 않음)
+    Output computing a sha256 per `chunk_size` bytes while writing to a file (the chunk list is the
+    integrity record, so no separate whole-file hash is computed)
+    """
+
+    def __init__(self, stream, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.chunks = []
+        self._chunk = hashlib.sha256()
+        self._chunk_fill = 0
+
+    def write(self, data):
+        data = memoryview(data)
+        self.stream.write(data)
+        self.size += len(data)
+        while data:
+            take = min(len(data), self.chunk_size - self._chunk_fill)
+            self._chunk.update(data[:take])
+            self._chunk_fill += take
+            data = data[take:]
+            if self._chunk_fill == self.chunk_size:
+                self.chunks.append(self._chunk.hexdigest())
+                self._chunk = hashlib.sha256()
+                self._chunk_fill = 0
+
+    def finish(self):
+        """
+        마지막 (덜 찬) 청크를 닫고 청크 해시 목록 반환
+        Close the last (partial) chunk and return the chunk hashes
+        """
+        if self._chunk_fill:
+            self.chunks.append(self._chunk.hexdigest())
+            self._chunk_fill = 0
+        return self.chunks
+
+# 압축기 - write(data), close(), abort()를 제공
+# Compressors - provide write(data), close() and abort()
+class _StoreCompressor:
+    # 압축하지 않음 ('none')
+    # No compression ('none')
+    description = 'tar'
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def write(self, data):
+        self.sink.write(data)
+
+    def close(self):
+        pass
+
+    def abort(self):
+        pass
+
+class _ProcessCompressor:
+    """
+    zstd/xz 명령을 파이프로 실행하는 압축기 - 압축 결과는 읽기 스레드가 sink로 옮김
+    Compressor running the zstd/xz command over pipes - a reader thread moves the output into the sink
+    """
+
+    def __init__(self, command, sink):
+        self.description = ' '.join(command)
+        self.sink = sink
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE)
+        self._error = None
+        self._reader = threading.Thread(target=self._drain, name='package-drain', daemon=True)
+        self._reader.start()
+
+    def _drain(self):
+        try:
+            while True:
+                data = self.process.stdout.read1(READ_SIZE)
+                if not data:
+                    return
+                self.sink.write(data)
+        except Exception as e:
+            self._error = e
+            self.process.kill()
+
+    def _failure(self):
+        stderr = self.process.stderr.read().decode('utf-8', 'replace').strip()
+        if self._error is not None:
+            return self._error
+        return OSError(f"{self.description}: 종료 코드 (exit code) {self.process.returncode}"
+                       + (f" - {stderr}" if stderr else ''))
+
+    def write(self, data):
+        try:
+            self.process.stdin.write(data)
+        except BrokenPipeError:
+            self.process.wait()
+            self._reader.join()
+            raise self._failure()
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._reader.join()
+        if self.process.wait() != 0 or self._error is not None:
+            raise self._failure()
+
+    def abort(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self._reader.join()
+
+class _ZstandardCompressor:
+    # zstandard 모듈 (설치되어 있을 때, 압축은 GIL 없이 작업 스레드에서 실행)
+    # The zstandard module (when installed; compression runs on worker threads without the GIL)
+    def __init__(self, zstandard, level, threads, sink):
+        self.description = f"zstandard level {level}, threads {threads or 'auto'}"
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads or -1)
+        self.writer = compressor.stream_writer(sink, closefd=False)
+
+    def write(self, data):
+        self.writer.write(data)
+
+    def close(self):
+        self.writer.close()
+
+    def abort(self):
+        pass
+
+class _LzmaCompressor:
+    # 표준 라이브러리 lzma (xz 명령이 없을 때의 대체, 단일 스레드)
+    # Standard library lzma (fallback without the xz command, single-threaded)
+    def __init__(self, level, sink):
+        import lzma
+        self.description = f"lzma preset {level} (단일 스레드, single-threaded)"
+        self.compressor = lzma.LZMACompressor(preset=level)
+        self.sink = sink
+
+    def write(self, data):
+        output = self.compressor.compress(data)
+        if output:
+            self.sink.write(output)
+
+    def close(self):
+        self.sink.write(self.compressor.flush())
+
+    def abort(self):
+        pass
+
+def open_compressor(codec, level, threads, sink):
+    """
+    codec에 맞는 압축기 생성 - zstd는 zstandard 모듈, 없으면 zstd 명령;
+    xz는 xz 명령 (멀티스레드), 없으면 표준 lzma 모듈
+    Create the compressor for `codec` - zstd uses the zstandard module, else the zstd command;
+    xz uses the xz command (multithreaded), else the standard lzma module
+    """
+    if codec == 'none':
+        return _StoreCompressor(sink)
+    if codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            zstandard = None
+        if zstandard is not None:
+            return _ZstandardCompressor(zstandard, level, threads, sink)
+        command = shutil.which('zstd')
+        if command is None:
+            raise OSError("zstd를 찾을 수 없음 - zstandard 모듈이나 zstd 명령 필요 "
+                          "(zstd not found - needs the zstandard module or the zstd command)")
+        flags = ['--ultra'] if level > 19 else []
+        return _ProcessCompressor([command, '-q', *flags, f'-{level}', f'-T{threads}', '-c', '-'], sink)
+    if codec == 'xz':
+        command = shutil.which('xz')
+        if command is None:
+            return _LzmaCompressor(level, sink)
+        return _ProcessCompressor([command, '-q', f'-{level}', f'-T{threads}', '-c', '-'], sink)
+    raise ValueError(f"알 수 없는 압축 방식 (Unknown codec): {codec}")
+
+# tar 항목
+# tar entries
+def _tar_entries(source_dir):
+    """
+    (tar 이름, 경로, TarInfo) 목록 - 폴더, 일반 파일, 심볼릭 링크만 (검증 매니페스트와 같은 순서)
+    List of (tar name, path, TarInfo) - folders, regular files and symlinks only (same order as
+    verification manifests)
+    """
+    top = os.path.basename(source_dir.rstrip(os.sep))
+    entries = []
+
+    def add(path, name):
+        info = os.lstat(path)
+        tarinfo = tarfile.TarInfo(name)
+        tarinfo.mode = info.st_mode & 0o7777
+        tarinfo.mtime = int(info.st_mtime)
+        tarinfo.uid, tarinfo.gid = info.st_uid, info.st_gid
+        if os.path.islink(path):
+            tarinfo.type = tarfile.SYMTYPE
+            tarinfo.linkname = os.readlink(path)
+        elif os.path.isdir(path):
+            tarinfo.type = tarfile.DIRTYPE
+        elif os.path.isfile(path):
+            tarinfo.size = info.st_size
+        else:
+            return
+        entries.append((name, path, tarinfo))
+
+    add(source_dir, top)
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        relative_root = os.path.relpath(root, source_dir)
+        for name in dirs + sorted(files):
+            relative = os.path.normpath(os.path.join(relative_root, name))
+            add(os.path.join(root, name), '/'.join([top] + relative.split(os.sep)))
+    return entries
+
+# 설치 프로그램 패키징
+# Installer packager
+class InstallerPackager:
+    """
+    폴더 (보통 설치 프로그램 번들)를 압축 tar 파일과 청크 매니페스트로 만드는 클래스
+    Turns a folder (usually an installer bundle) into a compressed tar archive plus a chunk manifest
+
+    package()는 제너레이터라 엔진이 일시 정지/취소를 지키며 진행함; 취소되거나 실패하면
+    만들던 파일을 지움
+    package() is a generator, so engines drive it honouring pause/cancel; the files being written are
+    deleted when it is cancelled or fails
+    """
+
+    def __init__(self, output_dir=DEFAULT_PACKAGE_DIR, codec=DEFAULT_CODEC, level=None,
+                 threads=DEFAULT_THREADS, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        초기화 함수 - level이 None이면 압축 방식별 기본 수준
+        Initialization function - with `level` None the codec's default level is used
+        """
+        if codec not in CODECS:
+            raise ValueError(f"알 수 없는 압축 방식 (Unknown codec): {codec}")
+        self.output_dir = output_dir
+        self.codec = codec
+        self.level = DEFAULT_LEVELS[codec] if level is None else level
+        self.threads = max(0, threads)
+        self.chunk_size = chunk_size
+
+    def archive_name(self, source_dir, version=None, build=None):
+        """
+        압축 파일 이름 - 번들 이름에 버전/빌드를 붙임 ('Install macOS Sonoma-14.1-23B74.tar.zst')
+        Archive file name - the bundle name plus version/build ('Install macOS Sonoma-14.1-23B74.tar.zst')
+        """
+        stem = os.path.basename(source_dir.rstrip(os.sep))
+        if stem.endswith('.app'):
+            stem = stem[:-len('.app')]
+        for part in (version, build):
+            if part:
+                stem = f"{stem}-{part}"
+        return stem + CODECS[self.codec]
+
+    def package(self, source_dir, version=None):
+        """
+        패키징 제너레이터 - 상태 문자열과 PackageProgress를 생성하고 PackageResult 반환
+        Packaging generator - yields status strings and PackageProgress, returns a PackageResult
+        """
+        started = time.monotonic()
+        source_dir = os.path.abspath(source_dir)
+        output_dir = os.path.abspath(self.output_dir)
+        if not os.path.isdir(source_dir):
+            raise OSError(f"폴더가 아님 (Not a folder): {source_dir}")
+        if os.path.commonpath([source_dir, output_dir]) == source_dir:
+            raise ValueError(f"출력 폴더가 원본 안에 있음 (Output folder is inside the source): {output_dir}")
+        found_version, build = read_installer_version(source_dir)
+        version = found_version or version
+        entries = _tar_entries(source_dir)
+        headers = [tarinfo.tobuf(tarfile.PAX_FORMAT, 'utf-8', 'surrogateescape') for _, _, tarinfo in entries]
+        # tar 스트림 전체 크기를 미리 계산해 진행률을 tar 바이트 기준으로 보고
+        # The tar stream size is known up front, so progress is reported in tar bytes
+        total = sum(len(header) + -(-tarinfo.size // BLOCK_SIZE) * BLOCK_SIZE
+                    for header, (_, _, tarinfo) in zip(headers, entries))
+        total += 2 * BLOCK_SIZE
+        total += -total % RECORD_SIZE
+
+        os.makedirs(output_dir, exist_ok=True)
+        archive_path = os.path.join(output_dir, self.archive_name(source_dir, version, build))
+        manifest_path = archive_path + '.manifest.json'
+        partial_path = archive_path + '.partial'
+        files = []
+        done = 0
+        finished = False
+        stream = open(partial_path, 'wb')
+        compressor = None
+        try:
+            sink = ChunkedSink(stream, self.chunk_size)
+            compressor = open_compressor(self.codec, self.level, self.threads, sink)
+            yield (f"패키징 중 (Packaging): {source_dir} -> {archive_path} [{compressor.description}]")
+            yield PackageProgress(0, total)
+            buffer = bytearray(READ_SIZE)
+            view = memoryview(buffer)
+            for header, (name, path, tarinfo) in zip(headers, entries):
+                compressor.write(header)
+                done += len(header)
+                if not tarinfo.isreg():
+                    continue
+                files.append({'path': name, 'size': tarinfo.size, 'offset': done})
+                remaining = tarinfo.size
+                with open(path, 'rb') as f:
+                    while remaining:
+                        count = f.readinto(view[:min(READ_SIZE, remaining)])
+                        if not count:
+                            raise OSError(f"파일이 줄어듦 (File shrank while packaging): {path}")
+                        compressor.write(view[:count])
+                        remaining -= count
+                        done += count
+                        yield PackageProgress(done, total)
+                padding = -tarinfo.size % BLOCK_SIZE
+                if padding:
+                    compressor.write(bytes(padding))
+                    done += padding
+            # 끝 표시 (빈 블록 두 개)와 레코드 크기까지 채우기
+            # End-of-archive marker (two empty blocks) plus padding to the record size
+            compressor.write(bytes(total - done))
+            done = total
+            compressor.close()
+            stream.close()
+            chunks = sink.finish()
+            yield PackageProgress(done, total)
+
+            manifest = {
+                'archive': os.path.basename(archive_path),
+                'codec': self.codec,
+                'level': self.level,
+                'source': os.path.basename(source_dir),
+                'version': version,
+                'build': build,
+                'tar_size': total,
+                'size': sink.size,
+                'chunk_size': self.chunk_size,
+                'chunks': chunks,
+                'files': files,
+            }
+            temp_path = manifest_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(partial_path, archive_path)
+            os.replace(temp_path, manifest_path)
+            finished = True
+        finally:
+            if not finished:
+                # 취소 (제너레이터 close) 또는 실패 - 압축기를 멈추고 만들던 파일을 지움
+                # Cancelled (generator closed) or failed - stop the compressor and delete the partial files
+                if compressor is not None:
+                    compressor.abort()
+                stream.close()
+                for path in (partial_path, manifest_path + '.tmp'):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        return PackageResult(archive_path, manifest_path, manifest, total, sink.size, time.monotonic() - started)
+
+# 패키징 결과 요약 문자열
+# Packaging result summary string
+def format_package_result(result):
+    """
+    입력/출력 크기, 압축률, 처리량을 담은 한 줄 요약
+    One-line summary with input/output sizes, ratio and throughput
+    """
+    rate = result.input_bytes / result.seconds / 1e6 if result.seconds else 0.0
+    ratio = result.output_bytes / result.input_bytes if result.input_bytes else 1.0
+    return (f"패키징 완료 (Packaging finished): {result.input_bytes / 1e9:.2f} GB -> "
+            f"{result.output_bytes / 1e9:.2f} GB ({ratio:.1%}), {len(result.manifest['chunks'])} chunk(s), "
+            f"{result.seconds:.1f} s, {rate:.0f} MB/s - {result.archive_path}")
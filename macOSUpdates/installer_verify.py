@@ -0,0 +1,342 @@
+import os
+import json
+import mmap
+import time
+import hashlib
+import threading
+from typing import NamedTuple
+from installer_cache import read_installer_version
+
+# 받은 설치 프로그램 무결성 검증 - 큰 파일을 청크로 나눠 여러 스레드에서 mmap으로 해시하고
+# 기준 매니페스트와 비교, 결과는 (경로, 크기, mtime, inode)로 캐시
+# Integrity verification of fetched installers - large files are hashed in chunks on a thread
+# pool through mmap and compared with a reference manifest; results are cached by
+# (path, size, mtime, inode)
+#
+# hashlib은 큰 버퍼를 해시하는 동안 GIL을 놓으므로 스레드만으로 코어 수만큼 병렬화됨
+# hashlib releases the GIL while hashing large buffers, so threads alone scale across cores
+
+# 검증 데이터 기본 폴더 (설치 프로그램 캐시 색인 옆)
+# Default folder for verification data (next to the installer cache index)
+DEFAULT_VERIFY_DIR = os.path.join(os.path.expanduser('~/Library/Caches'), 'macOSUpdates')
+
+# 해시 캐시 파일과 기준 매니페스트 폴더
+# Hash cache file and reference manifest folder
+DEFAULT_HASH_CACHE_PATH = os.path.join(DEFAULT_VERIFY_DIR, 'hashes.json')
+DEFAULT_REFERENCE_DIR = os.path.join(DEFAULT_VERIFY_DIR, 'verified')
+
+# 체크섬 청크 크기 (peer_seed 매니페스트와 같음, mmap 오프셋 정렬 단위의 배수)
+# Checksum chunk size (same as peer_seed manifests, a multiple of the mmap offset alignment)
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# 기본 작업 스레드 수
+# Default number of worker threads
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+# 검증 진행률 (PeerProgress와 같은 모양이라 같은 방식으로 이벤트로 바뀜)
+# Verification progress (shaped like PeerProgress so it turns into events the same way)
+class VerifyProgress(NamedTuple):
+    bytes_done: int
+    bytes_total: int
+
+# 검증 결과
+# Verification result
+class VerifyResult(NamedTuple):
+    """
+    problems가 비어 있으면 통과 - recorded이면 이번 매니페스트를 기준으로 새로 저장함
+    Passed when `problems` is empty - `recorded` means this manifest was stored as the new reference
+    """
+    problems: list
+    manifest: dict
+    recorded: bool
+    hashed_bytes: int
+    cached_bytes: int
+    seconds: float
+
+    @property
+    def ok(self):
+        return not self.problems
+
+# 파일 해시 캐시
+# File hash cache
+class HashCache:
+    """
+    파일별 청크 sha256 목록을 (크기, mtime, inode, 청크 크기)가 같을 때만 재사용하는 JSON 캐시
+    JSON cache reusing a file's per-chunk sha256 list only while (size, mtime, inode, chunk size) match
+    """
+
+    def __init__(self, path=DEFAULT_HASH_CACHE_PATH):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(info, chunk_size):
+        return [info.st_size, info.st_mtime_ns, info.st_ino, chunk_size]
+
+    def lookup(self, path, info, chunk_size):
+        """
+        파일이 바뀌지 않았으면 저장된 청크 해시 목록, 아니면 None
+        The stored chunk hashes when the file is unchanged, otherwise None
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None or entry['key'] != self._key(info, chunk_size):
+            return None
+        return entry['sha256']
+
+    def store(self, path, info, chunk_size, chunks):
+        with self._lock:
+            self._entries[path] = {'key': self._key(info, chunk_size), 'sha256': chunks}
+            self._dirty = True
+
+    def save(self):
+        """
+        바뀐 내용이 있으면 사라진 파일을 빼고 원자적으로 기록
+        Write atomically when something changed, dropping files that no longer exist
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            self._entries = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+
+# 파일 구간 해시
+# Hash one file range
+def hash_range(path, offset, length):
+    """
+    파일의 offset부터 length 바이트를 mmap으로 읽어 sha256 (복사 없이 페이지 캐시에서 바로 해시)
+    sha256 of `length` bytes at `offset`, read through mmap (hashed straight from the page cache without copying)
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), length, offset=offset, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            return hashlib.sha256(mapped).hexdigest()
+
+# 매니페스트 비교
+# Compare manifests
+def compare_manifests(expected, actual, limit=20):
+    """
+    기준 매니페스트와 다른 파일/링크 설명 목록 (최대 limit개)
+    Descriptions of files/links that differ from the reference manifest (at most `limit`)
+    """
+    problems = []
+    expected_files = {item['path']: item for item in expected['files']}
+    actual_files = {item['path']: item for item in actual['files']}
+    for path, item in expected_files.items():
+        other = actual_files.get(path)
+        if other is None:
+            problems.append(f"없음 (missing): {path}")
+        elif other['size'] != item['size']:
+            problems.append(f"크기 다름 (size differs): {path} ({other['size']} != {item['size']})")
+        elif other['sha256'] != item['sha256']:
+            bad = next(index for index, (a, b) in enumerate(zip(item['sha256'], other['sha256'])) if a != b)
+            problems.append(f"내용 다름 (content differs): {path} (chunk {bad})")
+    problems.extend(f"추가됨 (unexpected): {path}" for path in actual_files if path not in expected_files)
+    expected_links = {item['path']: item['target'] for item in expected['links']}
+    actual_links = {item['path']: item['target'] for item in actual['links']}
+    problems.extend(f"링크 다름 (link differs): {path}" for path, target in expected_links.items()
+                    if actual_links.get(path) != target)
+    if len(problems) > limit:
+        problems = problems[:limit] + [f"... +{len(problems) - limit}"]
+    return problems
+
+# 설치 프로그램 검증기
+# Installer verifier
+class InstallerVerifier:
+    """
+    번들의 매니페스트 (peer_seed 형식)를 병렬로 만들고 버전별 기준 매니페스트와 비교하는 클래스
+    Builds a bundle's manifest (peer_seed format) in parallel and compares it with the per-version reference
+
+    기준이 없으면 처음 검증한 매니페스트를 기준으로 저장하므로 이후의 변경/손상을 찾아냄
+    Without a reference, the first verified manifest is stored as the reference, so later changes or
+    corruption are caught
+    """
+
+    def __init__(self, hash_cache=None, reference_dir=DEFAULT_REFERENCE_DIR,
+                 chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS):
+        """
+        초기화 함수 - hash_cache가 None이면 매번 모두 해시
+        Initialization function - without `hash_cache` everything is hashed every time
+        """
+        if chunk_size % mmap.ALLOCATIONGRANULARITY:
+            raise ValueError(f"청크 크기는 {mmap.ALLOCATIONGRANULARITY}의 배수여야 함 "
+                             f"(chunk size must be a multiple of {mmap.ALLOCATIONGRANULARITY})")
+        self.hash_cache = hash_cache
+        self.reference_dir = reference_dir
+        self.chunk_size = chunk_size
+        self.workers = max(1, workers)
+
+    def reference_path(self, version, build):
+        return os.path.join(self.reference_dir, f"{version}-{build or 'unknown'}.json")
+
+    def load_reference(self, version, build):
+        """
+        저장된 기준 매니페스트 (없으면 None)
+        The stored reference manifest (None when there is none)
+        """
+        try:
+            with open(self.reference_path(version, build), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_reference(self, manifest):
+        path = self.reference_path(manifest['version'], manifest['build'])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, path)
+        return path
+
+    def build(self, app_path, version=None, build=None):
+        """
+        매니페스트를 만드는 제너레이터 - VerifyProgress를 생성하고 매니페스트를 반환
+        캐시에 없는 파일만 청크 단위로 스레드 풀에서 해시
+        Generator building the manifest - yields VerifyProgress and returns the manifest;
+        only files missing from the cache are hashed, chunk by chunk, on the thread pool
+        """
+        manifest, _, _ = yield from self._build(app_path, version, build)
+        return manifest
+
+    def _build(self, app_path, version, build):
+        # build()와 같지만 (매니페스트, 해시한 바이트, 캐시에서 가져온 바이트)를 반환
+        # (여러 엔진이 한 검증기를 함께 쓰므로 개수는 인스턴스에 두지 않음)
+        # Like build(), but returns (manifest, bytes hashed, bytes taken from the cache)
+        # (several engines share one verifier, so the counts are not kept on the instance)
+        hashed_bytes = cached_bytes = 0
+        manifest = {
+            'version': version,
+            'build': build,
+            'bundle': os.path.basename(app_path.rstrip(os.sep)),
+            'chunk_size': self.chunk_size,
+            'size': 0,
+            'dirs': [],
+            'links': [],
+            'files': [],
+        }
+        pending = []
+        for root, dirs, files in os.walk(app_path):
+            dirs.sort()
+            relative_root = os.path.relpath(root, app_path)
+            for name in dirs + sorted(files):
+                path = os.path.join(root, name)
+                relative = os.path.normpath(os.path.join(relative_root, name))
+                info = os.lstat(path)
+                mode = info.st_mode & 0o7777
+                if os.path.islink(path):
+                    manifest['links'].append({'path': relative, 'target': os.readlink(path)})
+                elif name in dirs:
+                    manifest['dirs'].append({'path': relative, 'mode': mode})
+                else:
+                    item = {'path': relative, 'size': info.st_size, 'mode': mode, 'sha256': None}
+                    manifest['files'].append(item)
+                    manifest['size'] += info.st_size
+                    chunks = self.hash_cache.lookup(path, info, self.chunk_size) if self.hash_cache else None
+                    if chunks is not None:
+                        item['sha256'] = chunks
+                        cached_bytes += info.st_size
+                    else:
+                        pending.append((item, path, info))
+
+        total = manifest['size']
+        done = total - sum(info.st_size for _, _, info in pending)
+        yield VerifyProgress(done, total)
+        if pending:
+            # concurrent.futures는 가져오는 데 시간이 걸리므로 해시할 것이 있을 때만 가져옴 (시작 시간 예산)
+            # concurrent.futures is slow to import, so it is only imported when there is hashing to do (startup budget)
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {}
+                for item, path, info in pending:
+                    count = -(-info.st_size // self.chunk_size)
+                    item['sha256'] = [None] * count
+                    for index in range(count):
+                        offset = index * self.chunk_size
+                        length = min(self.chunk_size, info.st_size - offset)
+                        future = executor.submit(hash_range, path, offset, length)
+                        futures[future] = (item, index, length)
+                try:
+                    for future in as_completed(futures):
+                        item, index, length = futures[future]
+                        item['sha256'][index] = future.result()
+                        done += length
+                        hashed_bytes += length
+                        yield VerifyProgress(done, total)
+                finally:
+                    for future in futures:
+                        future.cancel()
+            if self.hash_cache is not None:
+                for item, path, info in pending:
+                    self.hash_cache.store(path, info, self.chunk_size, item['sha256'])
+                self.hash_cache.save()
+        return manifest, hashed_bytes, cached_bytes
+
+    def verify(self, app_path, version=None, reference=None):
+        """
+        설치 프로그램을 검증하는 제너레이터 - 상태 문자열과 VerifyProgress를 생성하고 VerifyResult 반환
+        version을 주면 번들 안의 버전 정보와 맞는지 확인 (정보가 없으면 version을 기준 이름으로 사용),
+        reference가 없으면 저장된 기준과 비교
+        Generator verifying an installer - yields status strings and VerifyProgress, returns a VerifyResult;
+        with `version` the bundle's own version info must match (without that info `version` names the
+        reference), and without `reference` the stored reference is used
+        """
+        started = time.monotonic()
+        problems = []
+        found_version, build = read_installer_version(app_path)
+        if version is not None and found_version is not None and found_version != version:
+            problems.append(f"버전 다름 (version differs): {found_version} != {version}")
+
+        yield f"설치 프로그램 검증 중 (Verifying installer): {app_path}"
+        manifest, hashed_bytes, cached_bytes = yield from self._build(app_path, found_version or version, build)
+        # 없는 경로나 빈 번들은 파일 0개짜리 매니페스트가 되므로 통과시키거나 기준으로 저장하지 않음
+        # A missing path or an empty bundle gives a 0-file manifest, which must never pass or become the reference
+        if not os.path.isdir(app_path):
+            problems.append(f"설치 프로그램 폴더 없음 (installer folder not found): {app_path}")
+        elif not manifest['files']:
+            problems.append("번들에 파일 없음 (bundle has no files)")
+
+        recorded = False
+        if reference is None and manifest['version'] and manifest['files']:
+            reference = self.load_reference(manifest['version'], build)
+            if reference is None and not problems:
+                self.save_reference(manifest)
+                recorded = True
+        if reference is not None:
+            problems.extend(compare_manifests(reference, manifest))
+        return VerifyResult(problems, manifest, recorded, hashed_bytes, cached_bytes, time.monotonic() - started)
+
+# 검증 결과 요약 문자열
+# Verification result summary string
+def format_result(result):
+    """
+    해시한 양, 캐시에서 가져온 양, 처리량을 담은 한 줄 요약
+    One-line summary with the bytes hashed, bytes taken from the cache and throughput
+    """
+    rate = result.hashed_bytes / result.seconds / 1e6 if result.seconds else 0.0
+    state = "검증 통과 (Verification passed)" if result.ok else "검증 실패 (Verification failed)"
+    text = (f"{state}: {len(result.manifest['files'])} files, "
+            f"{result.hashed_bytes / 1e9:.2f} GB hashed, {result.cached_bytes / 1e9:.2f} GB cached, "
+            f"{result.seconds:.1f} s ({rate:.0f} MB/s)")
+    if result.recorded:
+        text += " - 기준으로 저장됨 (stored as the reference)"
+    return text
@@ -0,0 +1,321 @@
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+import datetime
+import threading
+import logging.handlers
+
+# 애플리케이션 전체 로깅 파이프라인
+# Application-wide logging pipeline
+#
+# 모든 로그는 QueueHandler로 큐에 넣고 QueueListener 스레드가 파일에 기록하므로
+# 다운로드/GUI 스레드는 디스크 입출력을 기다리지 않음
+# Every record goes onto a queue via QueueHandler and a QueueListener thread writes it,
+# so download/GUI threads never wait on disk I/O
+
+# 애플리케이션 로거 이름 (세션 로그는 하위 로거 사용)
+# Application logger name (session logs use a child logger)
+APP_LOGGER = 'macOSUpdates'
+SESSION_LOGGER = APP_LOGGER + '.session'
+
+# 로그 폴더 안의 세션 색인 파일 이름 (session_index와 sqlite3는 파이프라인 시작 후에만 가져옴)
+# Session index file name inside the log folder (session_index and sqlite3 are only imported once the pipeline starts)
+INDEX_NAME = 'sessions.sqlite'
+
+# JSON lines 로그 파일 이름
+# JSON lines log file name
+JSON_LOG_NAME = 'macOSUpdates.jsonl'
+
+# 회전 기준 기본값 - 크기 (바이트), 나이 (초), 보관할 압축 파일 수
+# Rotation defaults - size (bytes), age (seconds) and number of compressed backups kept
+DEFAULT_ROTATE_BYTES = 10 * 1024 * 1024
+DEFAULT_ROTATE_AGE = 24 * 60 * 60
+DEFAULT_BACKUP_COUNT = 10
+
+# 로그 폴더 보관 제한 기본값 - 전체 크기, 파일 수, 나이
+# Log folder retention defaults - total size, file count and age
+DEFAULT_RETENTION_BYTES = 200 * 1024 * 1024
+DEFAULT_RETENTION_FILES = 500
+DEFAULT_RETENTION_AGE = 30 * 24 * 60 * 60
+
+# 보관 제한을 적용할 파일 이름 접미사 (진단 스냅샷/프로파일 포함)
+# File name suffixes the retention cap applies to (diagnostics snapshots/profiles included)
+RETAINED_SUFFIXES = ('.log', '.log.gz', '.summary.json', '.jsonl', '.jsonl.gz', '.diagnostics.json',
+                     '.folded', '.profile.txt', '.pstats', '.memory.txt')
+
+# 세션 ID 생성
+# Create a session ID
+def new_session_id():
+    """
+    짧은 무작위 세션 ID 반환
+    Return a short random session ID
+    """
+    return uuid.uuid4().hex[:12]
+
+# JSON lines 형식
+# JSON lines formatter
+class JsonLinesFormatter(logging.Formatter):
+    """
+    로그 레코드를 세션 ID/버전을 포함한 한 줄의 JSON으로 변환
+    Formats a record as one JSON line including its session ID/version
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        session_id = getattr(record, 'session_id', None)
+        if session_id:
+            entry['session'] = session_id
+        version = getattr(record, 'version', None)
+        if version:
+            entry['version'] = version
+        summary = getattr(record, 'summary', None)
+        if summary is not None:
+            entry['summary'] = summary
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+# 크기/나이 기준으로 회전하며 이전 파일을 압축하는 핸들러
+# Handler rotating by size or age and compressing old files
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    max_bytes를 넘거나 첫 레코드 이후 max_age초가 지나면 회전하고 이전 파일을 gzip으로 압축
+    Rotates once `max_bytes` is exceeded or `max_age` seconds passed since the first record,
+    gzip-compressing the rotated file
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_ROTATE_BYTES, max_age=DEFAULT_ROTATE_AGE,
+                 backup_count=DEFAULT_BACKUP_COUNT):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.max_age = max_age
+        self.opened_at = self._first_record_time()
+
+    def _first_record_time(self):
+        # 기존 파일의 첫 레코드 시각 (없으면 지금)
+        # Time of the existing file's first record (now when there is none)
+        try:
+            with open(self.baseFilename, 'r', encoding='utf-8') as f:
+                first = json.loads(f.readline())
+            return datetime.datetime.fromisoformat(first['ts']).timestamp()
+        except (OSError, ValueError, KeyError, TypeError):
+            return time.time()
+
+    def rotation_filename(self, default_name):
+        return default_name + '.gz'
+
+    def rotate(self, source, dest):
+        import gzip
+        import shutil
+        if not os.path.exists(source):
+            return
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if self.max_age and time.time() - self.opened_at >= self.max_age:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.opened_at = time.time()
+
+# 로그 폴더 보관 제한
+# Log folder retention cap
+def prune_log_dir(log_dir, max_bytes=DEFAULT_RETENTION_BYTES, max_files=DEFAULT_RETENTION_FILES,
+                  max_age=DEFAULT_RETENTION_AGE, keep=(), now=None):
+    """
+    나이 제한을 넘은 로그를 지우고, 크기/개수 제한을 넘으면 오래된 것부터 삭제 - 삭제한 경로 목록 반환
+    Delete logs older than `max_age`, then the oldest ones while over the size/count caps -
+    returns the deleted paths
+
+    keep에 있는 경로 (쓰는 중인 파일)는 삭제하지 않음
+    Paths in `keep` (files being written) are never deleted
+    """
+    now = time.time() if now is None else now
+    keep = {os.path.abspath(path) for path in keep}
+    files = []
+    try:
+        names = os.listdir(log_dir)
+    except OSError:
+        return []
+    for name in names:
+        path = os.path.join(log_dir, name)
+        if not name.endswith(RETAINED_SUFFIXES) or os.path.abspath(path) in keep:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+
+    deleted = []
+    total = sum(size for _, size, _ in files)
+    count = len(files)
+    for mtime, size, path in files:
+        too_old = max_age is not None and now - mtime >= max_age
+        over_size = max_bytes is not None and total > max_bytes
+        over_count = max_files is not None and count > max_files
+        if not (too_old or over_size or over_count):
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        deleted.append(path)
+        total -= size
+        count -= 1
+    return deleted
+
+# 큐 기반 로깅 파이프라인
+# Queue-based logging pipeline
+class LoggingPipeline:
+    """
+    QueueHandler/QueueListener로 JSON lines 파일 (및 선택적으로 콘솔)에 기록하는 파이프라인
+    Pipeline writing through QueueHandler/QueueListener to a JSON lines file (and optionally the console)
+    """
+
+    def __init__(self, log_dir, level=logging.DEBUG, console=False,
+                 rotate_bytes=DEFAULT_ROTATE_BYTES, rotate_age=DEFAULT_ROTATE_AGE,
+                 backup_count=DEFAULT_BACKUP_COUNT, retention=None, index=True):
+        """
+        초기화 함수 - retention은 prune_log_dir 인자 사전 (None이면 기본값),
+        index이면 세션 로그를 로그 폴더의 SQLite 색인에도 기록
+        Initialization function - `retention` is a dict of prune_log_dir arguments (None for defaults);
+        with `index` session lines are also recorded in a SQLite index in the log folder
+        """
+        self.log_dir = log_dir
+        self.level = level
+        self.console = console
+        self.rotate_bytes = rotate_bytes
+        self.rotate_age = rotate_age
+        self.backup_count = backup_count
+        self.retention = retention or {}
+        self.index = index
+        self.path = os.path.join(log_dir, JSON_LOG_NAME)
+        self.index_path = os.path.join(log_dir, INDEX_NAME)
+        self.queue = queue.SimpleQueue()
+        self.started_at = None
+        self._queue_handler = None
+        self._listener = None
+
+    @property
+    def started(self):
+        return self._listener is not None
+
+    def start(self):
+        """
+        리스너 스레드를 시작하고 애플리케이션 로거에 큐 핸들러 연결, 보관 제한은 백그라운드에서 적용
+        Start the listener thread and attach the queue handler to the app logger;
+        the retention cap is applied in the background
+        """
+        if self.started:
+            return self
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.started_at = time.time()
+        file_handler = CompressingRotatingFileHandler(
+            self.path, self.rotate_bytes, self.rotate_age, self.backup_count)
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers = [file_handler]
+        if self.console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            # 세션 줄은 세션 로그/색인에만 기록
+            # Session lines only go to the session logs/index
+            console_handler.addFilter(lambda record: not record.name.startswith(SESSION_LOGGER))
+            handlers.append(console_handler)
+        if self.index:
+            from session_index import SessionIndexHandler
+            handlers.append(SessionIndexHandler(self.index_path))
+        self._listener = logging.handlers.QueueListener(self.queue, *handlers)
+        self._listener.start()
+
+        self._queue_handler = logging.handlers.QueueHandler(self.queue)
+        logger = logging.getLogger(APP_LOGGER)
+        logger.setLevel(self.level)
+        logger.addHandler(self._queue_handler)
+        logger.propagate = False
+
+        threading.Thread(target=self.prune, daemon=True).start()
+        return self
+
+    def prune(self):
+        """
+        로그 폴더에 보관 제한 적용 (현재 JSON 로그는 유지) 후 지워진 로그와 나이 제한을 넘은 세션을
+        색인에서 빼고 색인되지 않은 기존 세션 로그를 추가
+        Apply the retention cap to the log folder (the current JSON log is kept), then drop the sessions
+        of the deleted logs and those past the age cap from the index, and add existing session logs
+        that are not indexed yet
+        """
+        deleted = prune_log_dir(self.log_dir, keep=[self.path], **self.retention)
+        if self.index:
+            import sqlite3
+            from session_index import SessionIndex
+            index = SessionIndex(self.index_path)
+            try:
+                index.forget_logs(deleted)
+                index.backfill(self.log_dir, before=self.started_at)
+                index.prune(self.retention.get('max_age', DEFAULT_RETENTION_AGE))
+            except sqlite3.Error:
+                pass
+            finally:
+                index.close()
+        return deleted
+
+    def stop(self):
+        """
+        큐 핸들러를 떼고 남은 레코드를 모두 기록한 뒤 리스너 중지
+        Detach the queue handler, drain the remaining records and stop the listener
+        """
+        if not self.started:
+            return
+        logging.getLogger(APP_LOGGER).removeHandler(self._queue_handler)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+        self._queue_handler = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+# 프로세스 전체 파이프라인
+# Process-wide pipeline
+_pipeline = None
+
+def setup_logging(log_dir, **options):
+    """
+    프로세스 전체 로깅 파이프라인을 한 번만 시작해 반환 - 종료 시 자동으로 중지
+    Start the process-wide logging pipeline once and return it - stopped automatically at exit
+    """
+    global _pipeline
+    if _pipeline is None:
+        import atexit
+        _pipeline = LoggingPipeline(log_dir, **options).start()
+        atexit.register(_pipeline.stop)
+    return _pipeline
+
+def get_logger(name=None):
+    """
+    애플리케이션 로거 (또는 하위 로거) 반환
+    Return the application logger (or a child logger)
+    """
+    return logging.getLogger(f"{APP_LOGGER}.{name}" if name else APP_LOGGER)
@@ -0,0 +1,183 @@
+import os
+import time
+import datetime
+import logging
+import threading
+from log_pipeline import SESSION_LOGGER
+
+# 세션 로그 파일을 위한 버퍼링된 기록기
+# Buffered writer for session log files
+class LogSink:
+    """
+    하나의 파일 핸들을 유지하며 로그 줄을 메모리에 모았다가 크기/시간 기준으로 기록하는 클래스
+    Keeps one file handle open and flushes buffered log lines by size or time
+
+    시간 기준은 타이머로도 지켜지므로 출력이 멈춘 동안에도 버퍼가 flush_interval 안에 기록됨
+    The time threshold is also kept by a timer, so the buffer is written within `flush_interval` while output stalls
+
+    session_id를 지정하면 각 줄을 세션 ID/버전과 함께 로깅 파이프라인에도 전달
+    With a `session_id`, every line is also forwarded to the logging pipeline with the session ID/version
+    """
+
+    def __init__(self, path, mode='a', max_lines=256, max_bytes=64 * 1024, flush_interval=1.0,
+                 session_id=None, version=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.path = path
+        self.session_id = session_id
+        self.version = version
+        self._logger = logging.getLogger(SESSION_LOGGER)
+        self._extra = {'session_id': session_id, 'version': version, 'log_file': path}
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._timer = None
+        self._file = open(path, mode, encoding='utf-8')
+
+    @property
+    def closed(self):
+        """
+        파일 핸들이 닫혔는지 여부
+        Whether the file handle has been closed
+        """
+        return self._file is None
+
+    def write(self, line):
+        """
+        한 줄을 그대로 버퍼에 추가하는 함수
+        Append one line to the buffer as-is
+        """
+        self._forward(line)
+        self._append(line)
+
+    def _forward(self, message):
+        # 로깅 파이프라인으로 전달 (큐에 넣기만 하므로 막히지 않음)
+        # Forward to the logging pipeline (only enqueues, never blocks)
+        if self.session_id and self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(message, extra=self._extra)
+
+    def _append(self, line):
+        with self._lock:
+            if self._file is None:
+                return
+            entry = line + "\n"
+            self._buffer.append(entry)
+            self._buffered_bytes += len(entry)
+
+            # 크기 또는 시간 기준을 넘으면 파일에 기록
+            # Write to file once the size or time threshold is crossed
+            if (len(self._buffer) >= self.max_lines
+                    or self._buffered_bytes >= self.max_bytes
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+            elif self._timer is None:
+                # 다음 줄이 오지 않아도 flush_interval 뒤에 기록 (타이머는 한 번에 하나만)
+                # Write after flush_interval even if no further line arrives (one timer at a time)
+                self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._flush_locked()
+
+    def log(self, message):
+        """
+        타임스탬프를 붙여 한 줄을 기록하는 함수
+        Record one line prefixed with a timestamp
+        """
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._forward(message)
+        self._append(f"[{timestamp}] {message}")
+
+    def flush(self):
+        """
+        버퍼 내용을 파일에 기록하는 함수
+        Write buffered lines to the file
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def sync(self):
+        """
+        버퍼를 기록하고 디스크에 fsync 하는 함수 (세션 경계 또는 오류 시 사용)
+        Flush the buffer and fsync to disk (used at session boundaries or on error)
+        """
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        """
+        남은 버퍼를 기록하고 파일을 닫는 함수
+        Flush remaining lines, fsync and close the file
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._flush_locked()
+            try:
+                os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+
+    def _flush_locked(self):
+        if self._file is None or not self._buffer:
+            self._last_flush = time.monotonic()
+            return
+        self._file.write(''.join(self._buffer))
+        self._file.flush()
+        self._buffer.clear()
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# 아무것도 기록하지 않는 로그 싱크 (벤치마크/헤드리스 실행용)
+# Log sink that records nothing (for benchmarks/headless runs)
+class NullLogSink:
+    """
+    LogSink와 같은 인터페이스를 제공하지만 아무것도 기록하지 않는 클래스
+    Same interface as LogSink but discards everything
+    """
+    path = None
+    session_id = None
+    closed = False
+
+    def write(self, line):
+        pass
+
+    def log(self, message):
+        pass
+
+    def flush(self):
+        pass
+
+    def sync(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
@@ -0,0 +1,259 @@
+import os
+from PyQt5.QtWidgets import (QPlainTextEdit, QDialog, QVBoxLayout, QHBoxLayout,
+                            QPushButton, QLabel, QLineEdit, QCheckBox, QSpinBox,
+                            QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+
+# 로그 표시 영역의 기본 최대 줄 수
+# Default maximum number of lines kept in the log view
+DEFAULT_MAX_LINES = 5000
+
+# 디스크 로그에서 한 번에 불러올 줄 수
+# Number of lines loaded from the on-disk log per page
+HISTORY_PAGE_LINES = 1000
+
+# 파일 끝에서부터 줄을 읽어오는 함수
+# Function to read lines backwards from the end of a file
+def read_tail_lines(path, count, end_offset=None, block_size=64 * 1024):
+    """
+    end_offset 이전의 마지막 count 줄과 그 시작 위치를 반환
+    Return the last `count` lines before `end_offset` and the offset they start at
+    """
+    with open(path, 'rb') as f:
+        if end_offset is None:
+            f.seek(0, os.SEEK_END)
+            end_offset = f.tell()
+
+        position = end_offset
+        data = b''
+        # 필요한 줄 수를 얻을 때까지 블록 단위로 거꾸로 읽기
+        # Read blocks backwards until enough lines are available
+        while position > 0 and data.count(b'\n') <= count:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+
+    # 끝에서부터 count 번째 줄의 시작 위치 찾기
+    # Find where the count-th line from the end starts
+    search_end = len(data) - 1 if data.endswith(b'\n') else len(data)
+    index = search_end
+    for _ in range(count):
+        index = data.rfind(b'\n', 0, index)
+        if index == -1:
+            break
+    start = 0 if index == -1 else index + 1
+    start_offset = position + start
+
+    lines = data[start:search_end].split(b'\n') if start < search_end else []
+    return [line.decode('utf-8', errors='replace') for line in lines], start_offset
+
+# 줄 수가 제한된 로그 표시 위젯
+# Line-capped log display widget
+class LogView(QPlainTextEdit):
+    """
+    최대 줄 수가 제한되고 일괄 추가를 지원하는 읽기 전용 로그 뷰
+    Read-only log view with a line cap and bulk appends
+    """
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES, parent=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.setMaximumBlockCount(max_lines)
+
+    def is_at_bottom(self):
+        """
+        사용자가 맨 아래를 보고 있는지 확인
+        Check whether the user is looking at the bottom of the log
+        """
+        scroll_bar = self.verticalScrollBar()
+        return scroll_bar.value() >= scroll_bar.maximum()
+
+    def append_lines(self, lines):
+        """
+        여러 줄을 한 번에 추가하고 맨 아래에 있을 때만 자동 스크롤
+        Append several lines at once; auto-scroll only if already at the bottom
+        """
+        if not lines:
+            return
+        follow = self.is_at_bottom()
+        self.appendPlainText('\n'.join(lines))
+        if follow:
+            scroll_bar = self.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
+
+# 디스크의 세션 로그를 페이지 단위로 보여주는 대화상자
+# Dialog showing the on-disk session log page by page
+class LogHistoryDialog(QDialog):
+    """
+    세션 로그 파일의 이전 기록을 필요할 때마다 불러오는 대화상자
+    Dialog that loads older history from the session log file on demand
+    """
+
+    def __init__(self, log_file_path, page_lines=HISTORY_PAGE_LINES, parent=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__(parent)
+        self.log_file_path = log_file_path
+        self.page_lines = page_lines
+        self._end_offset = None
+
+        self.setWindowTitle('로그 기록 (Log history)')
+        self.resize(700, 500)
+        layout = QVBoxLayout(self)
+
+        button_layout = QHBoxLayout()
+        self.older_button = QPushButton('이전 기록 불러오기 (Load older)', self)
+        self.older_button.clicked.connect(self.load_older)
+        button_layout.addWidget(self.older_button)
+        self.info_label = QLabel(log_file_path, self)
+        button_layout.addWidget(self.info_label, stretch=1)
+        layout.addLayout(button_layout)
+
+        self.text = QPlainTextEdit(self)
+        self.text.setReadOnly(True)
+        self.text.setUndoRedoEnabled(False)
+        self.text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        layout.addWidget(self.text)
+
+        self.load_older()
+        scroll_bar = self.text.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+
+    def load_older(self):
+        """
+        현재 표시된 내용보다 앞선 한 페이지를 맨 위에 추가
+        Prepend the page preceding what is currently shown
+        """
+        if not os.path.exists(self.log_file_path) or self._end_offset == 0:
+            self.older_button.setEnabled(False)
+            return
+
+        lines, self._end_offset = read_tail_lines(
+            self.log_file_path, self.page_lines, self._end_offset)
+        if lines:
+            # 스크롤 위치를 유지하면서 맨 앞에 삽입
+            # Insert at the top while keeping the scroll position
+            scroll_bar = self.text.verticalScrollBar()
+            distance_from_bottom = scroll_bar.maximum() - scroll_bar.value()
+            cursor = self.text.textCursor()
+            cursor.movePosition(cursor.Start)
+            text = '\n'.join(lines)
+            if not self.text.document().isEmpty():
+                text += '\n'
+            cursor.insertText(text)
+            scroll_bar.setValue(scroll_bar.maximum() - distance_from_bottom)
+        if self._end_offset == 0:
+            self.older_button.setEnabled(False)
+
+# 지난 세션 검색 대화상자
+# Past session search dialog
+class SessionSearchDialog(QDialog):
+    """
+    세션 색인에서 버전/결과/기간/로그 내용으로 지난 세션을 찾는 대화상자
+    Dialog finding past sessions in the session index by version, result, period or log text
+
+    행을 두 번 누르면 해당 세션 로그의 기록 창을 엶
+    Double-clicking a row opens the history window of that session log
+    """
+
+    COLUMNS = ['시작 (Started)', '버전 (Version)', '결과 (Result)', '시도 (Attempts)', '시간 (Duration)', '로그 (Log)']
+
+    def __init__(self, index_path, parent=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__(parent)
+        self.index_path = index_path
+        self.sessions = []
+
+        self.setWindowTitle('세션 검색 (Search sessions)')
+        self.resize(800, 450)
+        layout = QVBoxLayout(self)
+
+        # 검색 조건
+        # Search criteria
+        filter_layout = QHBoxLayout()
+        self.text_edit = QLineEdit(self)
+        self.text_edit.setPlaceholderText('로그 내용 (Log text)')
+        self.text_edit.returnPressed.connect(self.search)
+        filter_layout.addWidget(self.text_edit, stretch=1)
+        self.version_edit = QLineEdit(self)
+        self.version_edit.setPlaceholderText('버전 (Version): 15')
+        self.version_edit.returnPressed.connect(self.search)
+        filter_layout.addWidget(self.version_edit)
+        self.failed_check = QCheckBox('실패만 (Failed only)', self)
+        self.failed_check.toggled.connect(self.search)
+        filter_layout.addWidget(self.failed_check)
+        filter_layout.addWidget(QLabel('최근 일수 (Days):', self))
+        self.days_spin = QSpinBox(self)
+        self.days_spin.setRange(0, 3650)
+        self.days_spin.setSpecialValueText('전체 (All)')
+        self.days_spin.setValue(7)
+        self.days_spin.valueChanged.connect(self.search)
+        filter_layout.addWidget(self.days_spin)
+        search_button = QPushButton('검색 (Search)', self)
+        search_button.clicked.connect(self.search)
+        filter_layout.addWidget(search_button)
+        layout.addLayout(filter_layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(len(self.COLUMNS) - 1, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.cellDoubleClicked.connect(self.open_session)
+        layout.addWidget(self.table, stretch=1)
+
+        self.info_label = QLabel(self)
+        layout.addWidget(self.info_label)
+
+        self.search()
+
+    def search(self):
+        """
+        현재 조건으로 색인을 검색해 표를 채움
+        Query the index with the current criteria and fill the table
+        """
+        if not os.path.exists(self.index_path):
+            self.info_label.setText('색인 없음 (No index yet)')
+            return
+        from session_index import SessionIndex, since_timestamp
+        index = SessionIndex(self.index_path)
+        try:
+            self.sessions = index.sessions(
+                version=self.version_edit.text().strip() or None,
+                failed=self.failed_check.isChecked(),
+                since=since_timestamp(self.days_spin.value() or None),
+                text=self.text_edit.text().strip() or None,
+                limit=500)
+        finally:
+            index.close()
+
+        self.table.setRowCount(len(self.sessions))
+        for row, session in enumerate(self.sessions):
+            duration = session['duration_seconds']
+            values = [(session['started'] or '')[:19].replace('T', ' '), session['version'] or '',
+                      session['result'] or '-', str(session['attempts'] or '-'),
+                      f"{duration:.0f} s" if duration is not None else '-', session['log_file'] or '']
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        self.info_label.setText(f'{len(self.sessions)}개 세션 ({len(self.sessions)} sessions)')
+
+    def open_session(self, row, column):
+        """
+        선택한 세션의 로그 기록 창 열기
+        Open the log history window of the chosen session
+        """
+        log_file = self.sessions[row]['log_file']
+        if log_file and os.path.exists(log_file):
+            LogHistoryDialog(log_file, parent=self).show()
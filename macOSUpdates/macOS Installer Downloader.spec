@@ -1,4 +1,16 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+sys.path.insert(0, SPECPATH)
+from build_config import INCLUDES, EXCLUDES
+from build_app import APP_NAME, ARCH_ENV, variant_name
+
+# build_app.py가 환경 변수로 아키텍처를 전달 (직접 실행하면 기존처럼 x86_64를 기본 이름으로 빌드)
+# build_app.py hands the architecture over in an environment variable (run directly, it builds
+# x86_64 under the plain name as before)
+target_arch = os.environ.get(ARCH_ENV)
+app_name = variant_name(target_arch) if target_arch else APP_NAME
+target_arch = target_arch or 'x86_64'
 
 
 a = Analysis(
@@ -6,11 +18,11 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=INCLUDES,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
     optimize=0,
 )
@@ -21,7 +33,7 @@ exe = EXE(
     a.scripts,
     [],
     exclude_binaries=True,
-    name='macOS Installer Downloader',
+    name=app_name,
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
@@ -29,7 +41,7 @@ exe = EXE(
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
-    target_arch='x86_64',
+    target_arch=target_arch,
     codesign_identity=None,
     entitlements_file=None,
 )
@@ -40,11 +52,11 @@ coll = COLLECT(
     strip=False,
     upx=True,
     upx_exclude=[],
-    name='macOS Installer Downloader',
+    name=app_name,
 )
 app = BUNDLE(
     coll,
-    name='macOS Installer Downloader.app',
+    name=app_name + '.app',
     icon=None,
     bundle_identifier=None,
 )
@@ -1,193 +1,141 @@
 import sys
-import subprocess
 import re
+import time
 import os
 import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QProgressBar, 
-                            QVBoxLayout, QWidget, QTextEdit, QLabel, QHBoxLayout)
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
-import logging
-import tempfile
-
-# 애플리케이션 리소스 경로 확인 함수
-# Function to determine application resource path
-def get_resource_path():
-    """
-    애플리케이션이 번들로 실행 중인지 확인하고 적절한 경로 반환
-    Check if application is running as a bundle and return appropriate path
-    """
-    if getattr(sys, 'frozen', False):
-        # 번들로 실행 중인 경우
-        # If running as a bundle
-        bundle_dir = os.path.dirname(sys.executable)
-        # macOS 앱 번들 구조에 맞게 경로 조정
-        # Adjust path according to macOS app bundle structure
-        if os.path.basename(os.path.dirname(os.path.dirname(bundle_dir))) == 'Contents':
-            return os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(bundle_dir))))
-        return bundle_dir
-    # 스크립트로 실행 중인 경우
-    # If running as a script
-    return os.path.dirname(os.path.abspath(__file__))
-
-# 임시 파일 경로 처리를 위한 함수
-# Function to handle temporary file paths
-def get_temp_path():
-    """
-    임시 파일 경로를 반환하는 함수 (/tmp 경로 사용)
-    Returns temp file path using /tmp directory
-    """
-    # /tmp 디렉토리 내에 로그 디렉토리 생성
-    # Create log directory in /tmp
-    temp_dir = os.path.join('/tmp', 'macOSUpdatelog')
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)
-    
-    return temp_dir
-
-# 로그 파일 처리를 위한 함수
-# Function to handle log files
-def setup_logging():
-    """
-    로깅 설정을 초기화하는 함수
-    Initialize logging configuration
-    """
-    log_dir = get_temp_path()
-    log_file = os.path.join(log_dir, 'macOS_update.log')
-    
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
-    return log_file
-
-# 디버깅 정보 출력 함수
-# Function to print debugging information
-def debug_info():
-    """
-    디버깅 정보를 출력하는 함수
-    Print debugging information
-    """
-    logging.debug(f"현재 작업 디렉토리 (Current working directory): {os.getcwd()}")
-    logging.debug(f"시스템 경로 (System path): {sys.path}")
-    logging.debug(f"환경 변수 (Environment variables): {dict(os.environ)}")
-    
-    if getattr(sys, 'frozen', False):
-        logging.debug(f"PyInstaller 환경에서 실행 중 (Running in PyInstaller environment)")
-        logging.debug(f"MEIPASS: {sys._MEIPASS}")
+                            QVBoxLayout, QWidget, QLabel, QHBoxLayout, QLineEdit,
+                            QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QAbstractItemView, QStackedWidget, QComboBox, QShortcut, QMessageBox)
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import QThread, Qt, QTimer, QObject, QEvent, pyqtSignal
+import startup_profile
+from log_view import LogView, LogHistoryDialog, SessionSearchDialog
+from download_queue import DownloadQueue, DownloadJob
+from installer_cache import InstallerCache, parse_size
+from installer_verify import InstallerVerifier, HashCache
+from app_paths import get_resource_path, get_temp_path
+from fetch_engine import FetchJob, chain_packaging, dispatch_event
+from fetch_supervisor import FetchSupervisor
+from fetch_runners import DEFAULT_TERMINATE_GRACE
+from fetch_metrics import DEFAULT_STALL_SECONDS, format_duration, format_metrics
+from catalog import CatalogStore
+from log_pipeline import setup_logging, get_logger, INDEX_NAME
+from diagnostics import debug_info, enabled_from_env
+
+# 애플리케이션 로거
+# Application logger
+logger = get_logger('gui')
+
+# 창을 닫을 때 작업 취소가 끝나기를 기다리는 최대 시간 (ms) - SIGKILL까지의 유예 시간보다 길게
+# Longest wait (ms) for cancelled jobs to end when closing the window - longer than the grace period before SIGKILL
+CLOSE_TIMEOUT = int((DEFAULT_TERMINATE_GRACE + 5) * 1000)
+
+# 창을 닫을 때 GUI 스레드에서 작업 스레드를 기다리는 최대 시간과 다시 확인하는 간격 (ms)
+# Longest the GUI thread waits for job threads when closing, and how often it checks again (ms)
+THREAD_END_WAIT = 200
+THREAD_END_POLL = 250
+
+# 받은 설치 프로그램을 패키징할 폴더와 업로드할 배포 지점을 정하는 환경 변수 (번들 앱용)
+# Environment variables naming the folder fetched installers are packaged into and the distribution
+# point they are uploaded to (for the bundled app)
+PACKAGE_DIR_ENV = 'MACOSUPDATES_PACKAGE_DIR'
+UPLOAD_URL_ENV = 'MACOSUPDATES_UPLOAD_URL'
+CACHE_MAX_VERSIONS_ENV = 'MACOSUPDATES_CACHE_MAX_VERSIONS'
+CACHE_MAX_BYTES_ENV = 'MACOSUPDATES_CACHE_MAX_BYTES'
 
 # 다운로드 작업을 위한 스레드 클래스
 # Thread class for download operations
 class DownloadThread(QThread):
     """
-    다운로드 작업을 위한 스레드 클래스
-    Download thread class for background processing
+    다운로드 작업을 위한 스레드 클래스 - 멈춤 감시/재시도와 함께 FetchEngine을 백그라운드에서 실행
+    Download thread class - runs a FetchEngine in the background under the stall watchdog/retry supervisor
     """
-    progress_signal = pyqtSignal(int)
-    status_signal = pyqtSignal(str)
-    finished_signal = pyqtSignal()
-    error_signal = pyqtSignal(str)
 
-    def __init__(self, log_file_path):
+    def __init__(self, log_sink, bridge, version, cache=None, runner=None, policy=None, verifier=None,
+                 packager=None, uploader=None):
         """
-        초기화 함수
-        Initialization function
+        초기화 함수 - packager(InstallerPackager)가 있으면 다운로드가 성공한 뒤 설치 프로그램을 압축 파일로 패키징,
+        uploader(DistributionUploader)가 있으면 그 압축 파일을 배포 지점에 업로드
+        Initialization function - with `packager` (an InstallerPackager) the installer is packaged into an
+        archive after a successful download; with `uploader` (a DistributionUploader) that archive is then
+        uploaded to the distribution point
         """
         super().__init__()
-        self.log_file_path = log_file_path
+        self.log_sink = log_sink
+        self.bridge = bridge
+        self.version = version
+        self.cache = cache
+        self.packager = packager
+        self.uploader = uploader
+        self.engine = FetchSupervisor(FetchJob(version), log_sink, bridge, runner=runner, cache=cache,
+                                      policy=policy, verifier=verifier)
 
-    def log_message(self, message):
+    def cancel(self):
         """
-        로그 메시지를 파일에 기록하는 함수
-        Function to record log messages to file
+        다운로드 취소
+        Cancel the download
         """
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        # 로그 파일에 메시지 추가
-        # Add message to log file
-        with open(self.log_file_path, 'a', encoding='utf-8') as log_file:
-            log_file.write(log_entry)
-        
-        # UI에 상태 업데이트
-        # Update status to UI
-        self.status_signal.emit(message)
+        self.engine.cancel()
+
+    def pause(self):
+        """
+        다운로드 일시 정지
+        Pause the download
+        """
+        self.engine.pause()
+
+    def resume(self):
+        """
+        다운로드 재개
+        Resume the download
+        """
+        self.engine.resume()
 
     def run(self):
         """
         스레드 실행 함수 - macOS 설치 프로그램 다운로드 수행
         Thread execution function - performs macOS installer download
         """
-        try:
-            self.log_message("다운로드 시작 (Download started)")
-            
-            # softwareupdate 명령어 실행
-            # Execute softwareupdate command
-            command = ['softwareupdate', '--fetch-full-installer', '--full-installer-version', '15.3.1']
-            
-            # 프로세스 실행
-            # Execute process
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
-            )
-
-            # 진행률 추출을 위한 정규식 패턴
-            # Regular expression pattern for progress extraction
-            progress_pattern = r"(\d+\.?\d*)%"
-            last_progress = 0
-
-            # 프로세스 출력 실시간 처리
-            # Real-time process output handling
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    output = output.strip()
-                    self.log_message(output)
-                    
-                    # 진행률 추출 및 시그널 발생
-                    # Extract progress and emit signal
-                    if "%" in output:
-                        match = re.search(progress_pattern, output)
-                        if match:
-                            progress = int(float(match.group(1)))
-                            if progress != last_progress:
-                                self.progress_signal.emit(progress)
-                                last_progress = progress
-                                self.status_signal.emit(f"다운로드 진행 중: {progress}% (Downloading: {progress}%)")
-                    
-                    # 다운로드 상태 메시지 확인
-                    # Check download status message
-                    elif "Downloading" in output:
-                        self.status_signal.emit("다운로드 시작... (Starting download...)")
-                    elif "Verifying" in output:
-                        self.status_signal.emit("다운로드 검증 중... (Verifying download...)")
-                    elif "Installing" in output:
-                        self.status_signal.emit("설치 중... (Installing...)")
-
-            # 프로세스 종료 상태 확인
-            # Check process exit status
-            if process.returncode == 0:
-                self.log_message("다운로드 완료 (Download completed)")
-                self.progress_signal.emit(100)
-                self.finished_signal.emit()
-            else:
-                error_msg = f"다운로드 중 오류가 발생했습니다. 종료 코드: {process.returncode}"
-                self.log_message(error_msg)
-                self.error_signal.emit(error_msg)
+        if self.packager is None:
+            self.engine.run()
+            return
+        # 완료 이벤트는 패키징/업로드가 끝난 뒤에 전달되므로 큐는 업로드까지 한 작업으로 봄
+        # The finished event is only delivered once packaging/upload are done, so the queue sees them as part of the job
+        installer_dirs = self.cache.installer_dirs if self.cache is not None else None
+        for event in chain_packaging(self.engine.events(), self.packager, self.version, self.log_sink,
+                                     installer_dirs, control=self.engine, uploader=self.uploader):
+            dispatch_event(event, self.bridge)
 
-        except Exception as e:
-            error_msg = f"예외 발생: {str(e)}"
-            self.log_message(error_msg)
-            self.error_signal.emit(error_msg)
+# 백그라운드 카탈로그 갱신 결과를 GUI 스레드로 전달
+# Delivers background catalog refresh results to the GUI thread
+class CatalogBridge(QObject):
+    """
+    카탈로그 갱신 스레드의 콜백을 Qt 시그널로 바꾸는 클래스
+    Turns the catalog refresh thread's callback into a Qt signal
+    """
+    catalog_signal = pyqtSignal(object, object)
+
+    def post_catalog(self, catalog, error):
+        self.catalog_signal.emit(catalog, error)
+
+# 첫 화면 그리기 감지
+# First paint detection
+class FirstPaintFilter(QObject):
+    """
+    창의 첫 Paint 이벤트에서 시작 시간을 기록하고 callback을 한 번 호출하는 이벤트 필터
+    Event filter recording the startup time and calling `callback` once on the window's first paint
+    """
+
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            QTimer.singleShot(0, self.callback)
+        return False
 
 # 메인 윈도우 클래스
 # Main window class
@@ -196,10 +144,17 @@ class MainWindow(QMainWindow):
     메인 윈도우 클래스
     Main window class
     """
-    def __init__(self):
+    def __init__(self, use_async_engine=False, catalog_store=None, package_dir=None, upload_url=None,
+                 cache_max_versions=None, cache_max_bytes=None):
         """
-        메인 윈도우 초기화 함수
-        Main window initialization function
+        메인 윈도우 초기화 함수 - use_async_engine이면 작업마다 스레드 대신 asyncio 작업 사용,
+        package_dir가 있으면 받은 설치 프로그램을 그 폴더에 압축 파일로 패키징,
+        upload_url이 있으면 패키징한 뒤 배포 지점에 업로드 (둘 다 스레드 엔진만),
+        cache_max_versions/cache_max_bytes를 넘으면 가장 오래 안 쓴 설치 프로그램부터 삭제
+        Main window initialization function - with use_async_engine each job runs as an asyncio task instead of a thread;
+        with package_dir fetched installers are packaged into archives in that folder, with upload_url they are
+        packaged and then uploaded to the distribution point (both thread engine only); past
+        cache_max_versions/cache_max_bytes the least recently used installers are deleted
         """
         super().__init__()
         
@@ -207,17 +162,60 @@ class MainWindow(QMainWindow):
         # Set up log directory
         self.log_dir = get_temp_path()
         
-        # 로그 파일 경로 설정
-        # Set up log file path
-        self.log_file_path = os.path.join(
-            self.log_dir, 
-            f"macOS_update_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        # 설치 프로그램 캐시, 검증기 및 다운로드 큐 생성
+        # Create installer cache, verifier and download queue
+        self.installer_cache = InstallerCache(max_versions=cache_max_versions, max_bytes=cache_max_bytes)
+        self.installer_verifier = InstallerVerifier(HashCache())
+        task_options = {'verifier': self.installer_verifier}
+        if use_async_engine:
+            from qt_async import AsyncDownloadTask
+            task_class = AsyncDownloadTask
+        else:
+            task_class = DownloadThread
+            if package_dir or upload_url:
+                from installer_package import InstallerPackager, DEFAULT_PACKAGE_DIR
+                task_options['packager'] = InstallerPackager(package_dir or DEFAULT_PACKAGE_DIR)
+            if upload_url:
+                from distribution_upload import DistributionUploader
+                task_options['uploader'] = DistributionUploader(upload_url)
+        self.download_queue = DownloadQueue(
+            lambda log_sink, bridge, version: task_class(log_sink, bridge, version, self.installer_cache,
+                                                         **task_options),
+            self.log_dir,
+            parent=self
         )
+        self.download_queue.job_added_signal.connect(self.add_job_row)
+        self.download_queue.job_changed_signal.connect(self.update_job_state)
+        self.download_queue.job_progress_signal.connect(self.update_progress)
+        self.download_queue.job_metrics_signal.connect(self.update_metrics)
+        self.download_queue.job_status_signal.connect(self.update_status)
+        self.download_queue.queue_idle_signal.connect(self.queue_idle)
+
+        # 버전 카탈로그 - 디스크 캐시로 즉시 표시하고 오래되면 백그라운드에서 갱신
+        # Version catalog - shown instantly from the disk cache, refreshed in the background when stale
+        self.catalog_store = catalog_store or CatalogStore()
+        self.catalog = None
+        self.catalog_bridge = CatalogBridge(self)
+        self.catalog_bridge.catalog_signal.connect(self.catalog_refreshed)
+
+        # 작업별 표 행과 로그 뷰
+        # Per-job table rows and log views
+        self.job_rows = {}
+        self.job_progress_bars = {}
+        self.job_log_views = {}
+
+        # 숨겨진 진단 패널 (처음 열 때 생성)
+        # Hidden diagnostics panel (created when first opened)
+        self.diagnostics_panel = None
+
+        # 창 닫기 상태 - 작업 취소를 기다리는 중인지, 기다림을 포기하고 닫는지
+        # Window closing state - waiting for jobs to cancel, or giving up the wait and closing anyway
+        self.closing = False
+        self.force_close = False
         
-        # UI 초기화 및 다운로드 스레드 준비
-        # Initialize UI and prepare download thread
+        # UI 초기화
+        # Initialize UI
         self.initUI()
-        self.download_thread = None
 
     def initUI(self):
         """
@@ -227,7 +225,7 @@ class MainWindow(QMainWindow):
         # 윈도우 제목 및 크기 설정
         # Set window title and size
         self.setWindowTitle('macOS Installer Downloader')
-        self.setGeometry(100, 100, 600, 400)
+        self.setGeometry(100, 100, 700, 550)
 
         # 중앙 위젯 설정
         # Set central widget
@@ -235,22 +233,88 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
 
-        # 다운로드 버튼 생성
-        # Create download button
-        self.download_button = QPushButton('macOS 15.3.1 다운로드', self)
+        # 버전 입력, 동시 실행 수 및 다운로드 버튼
+        # Version input, concurrency cap and download button
+        input_layout = QHBoxLayout()
+        input_layout.addWidget(QLabel('버전 (Versions):', self))
+        self.version_edit = QLineEdit(self)
+        self.version_edit.setPlaceholderText('15.3.1, 14.7.4')
+        input_layout.addWidget(self.version_edit, stretch=1)
+        input_layout.addWidget(QLabel('동시 다운로드 (Concurrency):', self))
+        self.concurrency_spin = QSpinBox(self)
+        self.concurrency_spin.setRange(1, 8)
+        self.concurrency_spin.setValue(self.download_queue.max_concurrency)
+        self.concurrency_spin.valueChanged.connect(self.download_queue.set_max_concurrency)
+        input_layout.addWidget(self.concurrency_spin)
+        self.download_button = QPushButton('다운로드 (Download)', self)
         self.download_button.clicked.connect(self.start_download)
-        layout.addWidget(self.download_button)
+        input_layout.addWidget(self.download_button)
+        layout.addLayout(input_layout)
+
+        # 필터 가능한 카탈로그 버전 선택기
+        # Filterable catalog version picker
+        catalog_layout = QHBoxLayout()
+        catalog_layout.addWidget(QLabel('카탈로그 (Catalog):', self))
+        self.catalog_filter = QLineEdit(self)
+        self.catalog_filter.setPlaceholderText('필터 (Filter): 15, Sonoma, 24D')
+        self.catalog_filter.textChanged.connect(self.filter_catalog)
+        catalog_layout.addWidget(self.catalog_filter)
+        self.catalog_combo = QComboBox(self)
+        self.catalog_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.catalog_combo.activated.connect(self.add_catalog_version)
+        catalog_layout.addWidget(self.catalog_combo, stretch=1)
+        add_version_button = QPushButton('추가 (Add)', self)
+        add_version_button.clicked.connect(lambda: self.add_catalog_version(self.catalog_combo.currentIndex()))
+        catalog_layout.addWidget(add_version_button)
+        refresh_catalog_button = QPushButton('새로 고침 (Refresh)', self)
+        refresh_catalog_button.clicked.connect(lambda: self.refresh_catalog(force=True))
+        catalog_layout.addWidget(refresh_catalog_button)
+        layout.addLayout(catalog_layout)
+        self.catalog_status_label = QLabel(self)
+        layout.addWidget(self.catalog_status_label)
 
         # 상태 레이블 추가
         # Add status label
         self.status_label = QLabel('준비됨 (Ready)', self)
         layout.addWidget(self.status_label)
 
-        # 프로그레스 바 생성
-        # Create progress bar
-        self.progress_bar = QProgressBar(self)
-        self.progress_bar.setMaximum(100)
-        layout.addWidget(self.progress_bar)
+        # 작업 목록 표 생성
+        # Create job table
+        self.job_table = QTableWidget(0, 4, self)
+        self.job_table.setHorizontalHeaderLabels(['버전 (Version)', '상태 (Status)', '진행률 (Progress)',
+                                                  '속도/남은 시간 (Rate/ETA)'])
+        self.job_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.job_table.verticalHeader().setVisible(False)
+        self.job_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.job_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.job_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.job_table.itemSelectionChanged.connect(self.show_selected_job)
+        layout.addWidget(self.job_table)
+
+        # 출력이 완전히 멈춘 작업을 표시하기 위한 타이머
+        # Timer flagging jobs whose output has gone silent
+        self.stall_timer = QTimer(self)
+        self.stall_timer.setInterval(1000)
+        self.stall_timer.timeout.connect(self.check_stalled_jobs)
+        self.stall_timer.start()
+
+        # 작업 제어 버튼 (우선순위 변경, 일시 정지/재개, 취소)
+        # Job control buttons (reprioritize, pause/resume, cancel)
+        job_button_layout = QHBoxLayout()
+        move_up_button = QPushButton('위로 (Move up)', self)
+        move_up_button.clicked.connect(lambda: self.move_selected_job(-1))
+        job_button_layout.addWidget(move_up_button)
+        move_down_button = QPushButton('아래로 (Move down)', self)
+        move_down_button.clicked.connect(lambda: self.move_selected_job(1))
+        job_button_layout.addWidget(move_down_button)
+        self.pause_button = QPushButton('일시 정지 (Pause)', self)
+        self.pause_button.clicked.connect(self.toggle_pause_selected_job)
+        job_button_layout.addWidget(self.pause_button)
+        cancel_button = QPushButton('취소 (Cancel)', self)
+        cancel_button.clicked.connect(self.cancel_selected_job)
+        job_button_layout.addWidget(cancel_button)
+        job_button_layout.addStretch(1)
+        layout.addLayout(job_button_layout)
 
         # 로그 표시 영역 추가
         # Add log display area
@@ -261,113 +325,408 @@ class MainWindow(QMainWindow):
         log_label = QLabel('로그 (Logs):', self)
         log_layout.addWidget(log_label)
         
-        # 로그 파일 경로 표시
-        # Display log file path
-        log_path_label = QLabel(self)
-        log_path_label.setText(f'로그 파일: {self.log_file_path}')
-        log_path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        log_layout.addWidget(log_path_label, stretch=1)
+        # 선택한 작업의 로그 파일 경로 표시
+        # Display log file path of the selected job
+        self.log_path_label = QLabel(self)
+        self.log_path_label.setText(f'로그 폴더: {self.log_dir}')
+        self.log_path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        log_layout.addWidget(self.log_path_label, stretch=1)
+
+        # 디스크 로그의 이전 기록 보기 버튼
+        # Button to view older history from the on-disk log
+        history_button = QPushButton('이전 로그 보기 (History)', self)
+        history_button.clicked.connect(self.show_log_history)
+        log_layout.addWidget(history_button)
+
+        # 지난 세션 검색 버튼
+        # Button to search past sessions
+        search_button = QPushButton('세션 검색 (Search sessions)', self)
+        search_button.clicked.connect(self.show_session_search)
+        log_layout.addWidget(search_button)
         
         layout.addLayout(log_layout)
         
-        # 로그 텍스트 영역 추가
-        # Add log text area
-        self.log_text = QTextEdit(self)
-        self.log_text.setReadOnly(True)
-        layout.addWidget(self.log_text)
+        # 작업별 로그 뷰를 전환하는 영역
+        # Area switching between per-job log views
+        self.log_stack = QStackedWidget(self)
+        self.log_stack.addWidget(LogView(parent=self))
+        layout.addWidget(self.log_stack, stretch=1)
+
+        # Ctrl+Shift+D로 진단 패널 전환
+        # Ctrl+Shift+D toggles the diagnostics panel
+        diagnostics_shortcut = QShortcut(QKeySequence('Ctrl+Shift+D'), self)
+        diagnostics_shortcut.activated.connect(self.toggle_diagnostics)
+
+        # 캐시된 카탈로그 표시와 갱신은 첫 이벤트 루프 차례로 미룸
+        # Showing the cached catalog and refreshing it wait for the first event loop turn
+        self.catalog_status_label.setText('카탈로그 불러오는 중 (Loading catalog)')
+        QTimer.singleShot(0, self.load_catalog)
+
+    def load_catalog(self):
+        """
+        캐시된 카탈로그를 바로 표시한 뒤 필요하면 백그라운드에서 갱신
+        Show the cached catalog right away, then refresh it in the background if needed
+        """
+        self.show_catalog(self.catalog_store.load())
+        self.refresh_catalog()
+
+    def show_catalog(self, catalog):
+        """
+        카탈로그를 선택기에 표시하고 버전 입력이 비어 있으면 최신 버전으로 채움
+        Show a catalog in the picker and fill an empty version field with the latest version
+        """
+        self.catalog = catalog
+        if catalog is None:
+            self.catalog_status_label.setText('카탈로그 없음 (No catalog yet)')
+            return
+        fetched = datetime.datetime.fromtimestamp(catalog.fetched_at).strftime('%Y-%m-%d %H:%M')
+        self.catalog_status_label.setText(f'{len(catalog)}개 버전, {fetched} 기준 ({len(catalog)} versions as of {fetched})')
+        self.filter_catalog(self.catalog_filter.text())
+        latest = catalog.latest()
+        if latest is not None and not self.version_edit.text().strip():
+            self.version_edit.setText(latest.version)
+
+    def filter_catalog(self, text):
+        """
+        필터 문자열과 일치하는 카탈로그 항목만 선택기에 표시
+        Show only the catalog entries matching the filter text in the picker
+        """
+        self.catalog_combo.clear()
+        if self.catalog is None:
+            return
+        for entry in self.catalog.filter(text):
+            label = f"{entry.version} ({entry.build}) {entry.title}"
+            if entry.date:
+                label = f"{label} - {entry.date}"
+            self.catalog_combo.addItem(label, entry.version)
+
+    def add_catalog_version(self, index):
+        """
+        선택한 카탈로그 버전을 버전 입력에 추가
+        Append the chosen catalog version to the version field
+        """
+        version = self.catalog_combo.itemData(index)
+        if not version:
+            return
+        versions = [v for v in re.split(r'[,\s]+', self.version_edit.text()) if v]
+        if version not in versions:
+            versions.append(version)
+        self.version_edit.setText(', '.join(versions))
+
+    def refresh_catalog(self, force=False):
+        """
+        카탈로그가 오래되었거나 force이면 백그라운드에서 새로 받음
+        Refresh the catalog in the background when stale or when forced
+        """
+        if self.catalog_store.refresh_in_background(self.catalog_bridge.post_catalog, force=force):
+            self.catalog_status_label.setText(f'{self.catalog_status_label.text()} - 갱신 중 (refreshing)')
+
+    def catalog_refreshed(self, catalog, error):
+        """
+        백그라운드 갱신 결과 처리 - 실패하면 기존 카탈로그 유지
+        Handle a background refresh result - keeps the existing catalog on failure
+        """
+        if error is not None:
+            self.show_catalog(self.catalog)
+            self.catalog_status_label.setText(
+                f'{self.catalog_status_label.text()} - 갱신 실패 (refresh failed): {error}')
+            return
+        self.show_catalog(catalog)
+
+    def selected_job(self):
+        """
+        표에서 선택된 작업 반환
+        Return the job selected in the table
+        """
+        rows = self.job_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        row = rows[0].row()
+        for job_id, job_row in self.job_rows.items():
+            if job_row == row:
+                return next(job for job in self.download_queue.jobs if job.job_id == job_id)
+        return None
 
     def start_download(self):
         """
-        다운로드 시작 함수
-        Download start function
+        다운로드 시작 함수 - 입력된 버전들을 큐에 추가
+        Download start function - adds the entered versions to the queue
         """
-        # 다운로드 버튼 비활성화 및 UI 초기화
-        # Disable download button and initialize UI
-        self.download_button.setEnabled(False)
-        self.progress_bar.setValue(0)
-        self.log_text.clear()
+        versions = [v for v in re.split(r'[,\s]+', self.version_edit.text()) if v]
+        if not versions:
+            self.status_label.setText('버전을 입력하세요 (Enter at least one version)')
+            return
+        if self.catalog is not None:
+            # 빌드 번호로 입력한 항목은 버전으로 변환
+            # Entries typed as build numbers are mapped to their version
+            entries = [self.catalog.lookup(v) for v in versions]
+            versions = [entry.version if entry else v for v, entry in zip(versions, entries)]
         self.status_label.setText('다운로드 준비 중... (Preparing download...)')
-        
-        # 로그 시작 메시지 추가
-        # Add log start message
-        start_message = f"=== macOS 15.3.1 다운로드 세션 시작 ({datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ==="
-        with open(self.log_file_path, 'w', encoding='utf-8') as log_file:
-            log_file.write(start_message + "\n")
-        self.log_text.append(start_message)
-        
-        # 다운로드 스레드 생성 및 시작
-        # Create and start download thread
-        self.download_thread = DownloadThread(self.log_file_path)
-        self.download_thread.progress_signal.connect(self.update_progress)
-        self.download_thread.status_signal.connect(self.update_status)
-        self.download_thread.finished_signal.connect(self.download_finished)
-        self.download_thread.error_signal.connect(self.download_error)
-        self.download_thread.start()
+        self.download_queue.add_versions(versions)
 
-    def update_progress(self, value):
+    def add_job_row(self, job):
         """
-        프로그레스 바 업데이트 함수
-        Progress bar update function
+        새 작업의 표 행과 로그 뷰 추가
+        Add a table row and log view for a new job
         """
-        self.progress_bar.setValue(value)
+        row = self.job_table.rowCount()
+        self.job_table.insertRow(row)
+        self.job_table.setItem(row, 0, QTableWidgetItem(job.version))
+        self.job_table.setItem(row, 1, QTableWidgetItem(job.state_label))
+        progress_bar = QProgressBar(self)
+        progress_bar.setMaximum(100)
+        self.job_table.setCellWidget(row, 2, progress_bar)
+        self.job_table.setItem(row, 3, QTableWidgetItem(''))
+
+        log_view = LogView(parent=self)
+        self.log_stack.addWidget(log_view)
+
+        self.job_rows[job.job_id] = row
+        self.job_progress_bars[job.job_id] = progress_bar
+        self.job_log_views[job.job_id] = log_view
+        if self.selected_job() is None:
+            self.job_table.selectRow(row)
 
-    def update_status(self, message):
+    def update_job_state(self, job):
         """
-        상태 메시지 업데이트 함수
-        Status message update function
+        작업 상태 표시 갱신 (대기 작업은 대기 순서도 표시)
+        Refresh job state cells (pending jobs also show their queue position)
         """
-        self.status_label.setText(message)
-        self.log_text.append(message)
-        # 항상 최신 로그가 보이도록 스크롤
-        # Scroll to show the latest log
-        self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
+        pending = self.download_queue.pending_jobs()
+        for queued in self.download_queue.jobs:
+            label = queued.state_label
+            if queued in pending:
+                label = f"{label} #{pending.index(queued) + 1}"
+            self.job_table.item(self.job_rows[queued.job_id], 1).setText(label)
 
-    def download_finished(self):
+        # 끝난 작업은 남은 시간 대신 걸린 시간 표시
+        # Ended jobs show elapsed time instead of the ETA
+        if not job.is_active and job.metrics is not None:
+            elapsed = format_duration(job.metrics.elapsed)
+            self.job_table.item(self.job_rows[job.job_id], 3).setText(f'{elapsed} 경과 (elapsed)')
+
+        if job.state == DownloadJob.FINISHED:
+            self.job_progress_bars[job.job_id].setValue(100)
+            self.status_label.setText(f'macOS {job.version} 다운로드 완료! (Download completed!)')
+        elif job.state == DownloadJob.FAILED:
+            self.status_label.setText(f'오류: macOS {job.version} - {job.last_status} (Error)')
+        elif job.state == DownloadJob.CANCELLED:
+            self.status_label.setText(f'macOS {job.version} 다운로드 취소됨 (Download cancelled)')
+        elif job.state == DownloadJob.PAUSED:
+            self.status_label.setText(f'macOS {job.version} 다운로드 일시 정지 (Download paused)')
+        elif job.state == DownloadJob.CANCELLING:
+            self.status_label.setText(f'macOS {job.version} 다운로드 취소 중... (Cancelling download...)')
+        if job is self.selected_job():
+            self.update_pause_button(job)
+
+    def update_progress(self, job, value):
         """
-        다운로드 완료 처리 함수
-        Download completion handler function
+        작업별 프로그레스 바 업데이트 함수
+        Per-job progress bar update function
         """
-        # 다운로드 완료 후 UI 업데이트
-        # Update UI after download completion
-        self.download_button.setEnabled(True)
-        self.progress_bar.setValue(100)
-        self.status_label.setText('다운로드 완료! (Download completed!)')
-        
-        # 완료 메시지 추가
-        # Add completion message
-        completion_message = f"=== 다운로드 완료 ({datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ==="
-        self.log_text.append(completion_message)
-        with open(self.log_file_path, 'a', encoding='utf-8') as log_file:
-            log_file.write(completion_message + "\n")
-
-    def download_error(self, error_message):
-        """
-        다운로드 에러 처리 함수
-        Download error handler function
-        """
-        # 오류 발생 시 UI 업데이트
-        # Update UI when error occurs
-        self.download_button.setEnabled(True)
-        self.status_label.setText(f'오류: {error_message} (Error: {error_message})')
-        
-        # 에러 메시지 추가
-        # Add error message
-        error_log = f"!!! 오류 발생: {error_message} !!!"
-        self.log_text.append(error_log)
-        with open(self.log_file_path, 'a', encoding='utf-8') as log_file:
-            log_file.write(error_log + "\n")
+        self.job_progress_bars[job.job_id].setValue(value)
+
+    def update_metrics(self, job, metrics):
+        """
+        작업별 처리량/남은 시간 표시 업데이트 함수
+        Per-job throughput/ETA update function
+        """
+        self.job_table.item(self.job_rows[job.job_id], 3).setText(format_metrics(metrics))
+
+    def check_stalled_jobs(self):
+        """
+        진행률이 DEFAULT_STALL_SECONDS 이상 바뀌지 않은 실행 중 작업을 멈춤으로 표시
+        Mark running jobs whose progress has not moved for DEFAULT_STALL_SECONDS as stalled
+        """
+        now = time.monotonic()
+        for job in self.download_queue.running_jobs():
+            if job.last_progress_time is not None and now - job.last_progress_time >= DEFAULT_STALL_SECONDS:
+                self.job_table.item(self.job_rows[job.job_id], 3).setText('멈춤 (Stalled)')
+
+    def update_status(self, job, messages):
+        """
+        상태 메시지 업데이트 함수 - 한 프레임 동안 모인 메시지를 한 번에 표시
+        Status message update function - shows all messages collected in one frame
+        """
+        if job is self.selected_job():
+            self.status_label.setText(messages[-1])
+        # 사용자가 맨 아래를 보고 있을 때만 자동 스크롤
+        # Auto-scroll only while the user is at the bottom
+        self.job_log_views[job.job_id].append_lines(messages)
+
+    def show_selected_job(self):
+        """
+        선택한 작업의 로그와 상태 표시
+        Show the log and state of the selected job
+        """
+        job = self.selected_job()
+        if job is None:
+            return
+        self.log_stack.setCurrentWidget(self.job_log_views[job.job_id])
+        if job.log_file_path:
+            self.log_path_label.setText(f'로그 파일: {job.log_file_path}')
+        else:
+            self.log_path_label.setText(f'로그 폴더: {self.log_dir}')
+        if job.last_status:
+            self.status_label.setText(job.last_status)
+        self.update_pause_button(job)
+
+    def update_pause_button(self, job):
+        """
+        선택한 작업 상태에 맞게 일시 정지/재개 버튼 표시
+        Label the pause/resume button for the selected job's state
+        """
+        if job.state == DownloadJob.PAUSED:
+            self.pause_button.setText('재개 (Resume)')
+        else:
+            self.pause_button.setText('일시 정지 (Pause)')
+        self.pause_button.setEnabled(job.state in (DownloadJob.RUNNING, DownloadJob.PAUSED))
+
+    def move_selected_job(self, offset):
+        """
+        선택한 대기 작업의 우선순위 변경
+        Reprioritize the selected pending job
+        """
+        job = self.selected_job()
+        if job is not None:
+            self.download_queue.move(job, offset)
+
+    def cancel_selected_job(self):
+        """
+        선택한 작업 취소
+        Cancel the selected job
+        """
+        job = self.selected_job()
+        if job is not None:
+            self.download_queue.cancel(job)
+
+    def toggle_pause_selected_job(self):
+        """
+        선택한 작업 일시 정지/재개
+        Pause or resume the selected job
+        """
+        job = self.selected_job()
+        if job is None:
+            return
+        if job.state == DownloadJob.PAUSED:
+            self.download_queue.resume(job)
+        else:
+            self.download_queue.pause(job)
+
+    def closeEvent(self, event):
+        """
+        창 닫기 - 진행 중인 작업이 있으면 확인 후 모두 취소하고, softwareupdate가 끝나고
+        세션 로그가 닫힌 뒤 (또는 CLOSE_TIMEOUT 뒤) 닫음 - 작업 스레드가 남아 있으면 끝날 때까지 창을 열어 둠
+        Close the window - with jobs in progress, confirm and cancel them all, then close once
+        softwareupdate has exited and the session logs are closed (or after CLOSE_TIMEOUT) - the window
+        stays open while any job thread is still running
+        """
+        active = [job for job in self.download_queue.jobs if job.is_active]
+        if not active or self.force_close:
+            # 실행 중인 QThread를 없애면 프로세스가 중단되므로 모두 끝날 때까지 GUI 스레드를 막지 않고 다시 확인
+            # Destroying a running QThread aborts the process, so keep checking back without blocking the GUI thread
+            if not self.download_queue.wait_for_threads(THREAD_END_WAIT):
+                event.ignore()
+                running = self.download_queue.running_threads()
+                self.status_label.setText(f'작업 {running}개 종료 대기 중... (Waiting for {running} job(s) to end...)')
+                if not self.closing:
+                    self.closing = True
+                    self.download_queue.cancel_all()
+                QTimer.singleShot(THREAD_END_POLL, self.close)
+                return
+            if self.diagnostics_panel is not None and self.diagnostics_panel.profiler.running:
+                self.diagnostics_panel.profiler.stop()
+            event.accept()
+            return
+        event.ignore()
+        if self.closing:
+            return
+        answer = QMessageBox.question(
+            self, '종료 (Quit)',
+            f'진행 중인 다운로드 {len(active)}개를 취소하고 종료할까요? '
+            f'(Cancel {len(active)} download(s) in progress and quit?)')
+        if answer != QMessageBox.Yes:
+            return
+        self.closing = True
+        logger.info(f"종료 전 작업 {len(active)}개 취소 (Cancelling {len(active)} job(s) before quitting)")
+        self.status_label.setText('다운로드 취소 후 종료 중... (Cancelling downloads before quitting...)')
+        self.download_queue.queue_idle_signal.connect(self.close, Qt.QueuedConnection)
+        self.download_queue.cancel_all()
+        QTimer.singleShot(CLOSE_TIMEOUT, self.close_now)
+
+    def close_now(self):
+        """
+        작업 취소를 더 기다리지 않고 창 닫기
+        Close the window without waiting any longer for jobs to cancel
+        """
+        self.force_close = True
+        self.close()
+
+    def show_log_history(self):
+        """
+        디스크의 세션 로그에서 이전 기록을 불러오는 창 표시
+        Show a window that loads older history from the on-disk session log
+        """
+        job = self.selected_job()
+        if job is None or job.log_file_path is None:
+            return
+        if job.log_sink is not None:
+            job.log_sink.flush()
+        dialog = LogHistoryDialog(job.log_file_path, parent=self)
+        dialog.show()
+
+    def show_session_search(self):
+        """
+        지난 세션을 색인에서 검색하는 창 표시
+        Show a window searching past sessions in the index
+        """
+        dialog = SessionSearchDialog(os.path.join(self.log_dir, INDEX_NAME), parent=self)
+        dialog.show()
+
+    def toggle_diagnostics(self):
+        """
+        진단 패널 표시 전환 - 처음 열면 단계 타이머와 이벤트 루프 지연 측정이 켜짐
+        Toggle the diagnostics panel - opening it the first time turns on the stage timers and latency probe
+        """
+        if self.diagnostics_panel is None:
+            from diagnostics_view import DiagnosticsPanel
+            self.diagnostics_panel = DiagnosticsPanel(self.log_dir, self.download_queue, self)
+            self.diagnostics_panel.hide()
+            self.centralWidget().layout().addWidget(self.diagnostics_panel)
+        self.diagnostics_panel.setVisible(not self.diagnostics_panel.isVisible())
+
+    def queue_idle(self):
+        """
+        큐의 모든 작업이 끝났을 때 호출
+        Called when every job in the queue has ended
+        """
+        finished = sum(1 for job in self.download_queue.jobs if job.state == DownloadJob.FINISHED)
+        total = len(self.download_queue.jobs)
+        self.status_label.setText(f'모든 작업 종료: {finished}/{total} 완료 (All jobs ended: {finished}/{total} completed)')
 
 # 메인 함수
 # Main function
-def main():
+def main(use_async_engine=False, catalog_store=None, diagnostics=False, package_dir=None, upload_url=None,
+         cache_max_versions=None, cache_max_bytes=None):
     """
-    메인 함수 - 애플리케이션 실행
-    Main function - run application
+    메인 함수 - 애플리케이션 실행, diagnostics (또는 MACOSUPDATES_DIAGNOSTICS=1)이면 진단 패널을 열고 시작,
+    package_dir (또는 MACOSUPDATES_PACKAGE_DIR)이면 받은 설치 프로그램을 패키징,
+    upload_url (또는 MACOSUPDATES_UPLOAD_URL)이면 패키징한 뒤 배포 지점에 업로드,
+    cache_max_versions/cache_max_bytes (또는 MACOSUPDATES_CACHE_MAX_VERSIONS/_BYTES)는 캐시 제한
+    Main function - run application; with `diagnostics` (or MACOSUPDATES_DIAGNOSTICS=1) it starts with the diagnostics panel open;
+    with `package_dir` (or MACOSUPDATES_PACKAGE_DIR) fetched installers are packaged;
+    with `upload_url` (or MACOSUPDATES_UPLOAD_URL) they are packaged and uploaded to the distribution point;
+    `cache_max_versions`/`cache_max_bytes` (or MACOSUPDATES_CACHE_MAX_VERSIONS/_BYTES) limit the installer cache
     """
     try:
+        # 시작 단계 기록 (--profile-startup)
+        # Record the startup stage (--profile-startup)
+        startup_profile.mark('main')
+
         # QApplication 인스턴스 생성
         # Create QApplication instance
         app = QApplication(sys.argv)
+        startup_profile.mark('qapplication')
         
         # 애플리케이션 아이콘 설정 시도
         # Try to set application icon
@@ -382,13 +741,63 @@ def main():
         
         # 메인 윈도우 생성 및 표시
         # Create and show main window
-        window = MainWindow()
+        # asyncio 엔진을 요청했고 qasync가 있으면 Qt 루프에서 asyncio 실행
+        # Run asyncio on the Qt loop when the async engine is requested and qasync is available
+        loop = None
+        if use_async_engine:
+            from qt_async import install_qt_event_loop
+            loop = install_qt_event_loop(app)
+            if loop is None:
+                print("qasync를 찾을 수 없어 스레드 엔진 사용 (qasync not found, using the thread engine)")
+
+        package_dir = package_dir or os.environ.get(PACKAGE_DIR_ENV)
+        upload_url = upload_url or os.environ.get(UPLOAD_URL_ENV)
+        if cache_max_versions is None and os.environ.get(CACHE_MAX_VERSIONS_ENV):
+            cache_max_versions = int(os.environ[CACHE_MAX_VERSIONS_ENV])
+        if cache_max_bytes is None and os.environ.get(CACHE_MAX_BYTES_ENV):
+            cache_max_bytes = parse_size(os.environ[CACHE_MAX_BYTES_ENV])
+        if (package_dir or upload_url) and loop is not None:
+            print("asyncio 엔진에서는 패키징/업로드를 지원하지 않음 "
+                  "(Packaging/upload is not supported on the asyncio engine)")
+        window = MainWindow(use_async_engine=loop is not None, catalog_store=catalog_store,
+                            package_dir=package_dir, upload_url=upload_url,
+                            cache_max_versions=cache_max_versions, cache_max_bytes=cache_max_bytes)
+        diagnostics = diagnostics or enabled_from_env()
+        if diagnostics:
+            window.toggle_diagnostics()
+        startup_profile.mark('window_built')
+
+        # 첫 화면까지의 시간을 기록 (--profile-startup 측정 중이면 바로 종료)
+        # 로깅 파이프라인 (JSON lines, 회전, 보관 제한)은 첫 화면 뒤에 시작
+        # Record the time to first paint (exit right away while measuring --profile-startup);
+        # the logging pipeline (JSON lines, rotation, retention cap) starts after the first paint
+        def first_paint():
+            startup_profile.mark('first_paint')
+            if startup_profile.enabled():
+                startup_profile.write_marks()
+                if loop is not None:
+                    loop.stop()
+                app.quit()
+                return
+            setup_logging(get_temp_path(), console=True)
+            first_paint_ms = dict(startup_profile.marks())['first_paint']
+            logger.info(f"GUI 시작 - 첫 화면까지 {first_paint_ms:.0f} ms "
+                        f"(GUI started - first paint after {first_paint_ms:.0f} ms)")
+            if diagnostics:
+                logger.info(f"진단 정보 (Diagnostics info): {debug_info()}")
+        paint_filter = FirstPaintFilter(first_paint, window)
+        window.installEventFilter(paint_filter)
         window.show()
+        if loop is not None:
+            with loop:
+                loop.run_forever()
+            sys.exit(0)
         sys.exit(app.exec_())
     except Exception as e:
         # 예외 처리 및 로깅
         # Exception handling and logging
         import traceback
+        logger.exception("애플리케이션 실행 중 오류 발생 (Application error)")
         print(f"애플리케이션 실행 중 오류 발생: {e}")
         print(traceback.format_exc())
         # 오류 메시지를 파일에 기록
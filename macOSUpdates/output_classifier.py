@@ -0,0 +1,126 @@
+import re
+from typing import NamedTuple, Optional
+
+# softwareupdate 출력 줄 분류기
+# Classifier for softwareupdate output lines
+
+# 분류 결과 타입 (줄마다 생성되므로 가벼운 NamedTuple 사용)
+# Classification result types (created per line, so lightweight NamedTuples)
+class Progress(NamedTuple):
+    """
+    진행률 줄 - 바이트 수가 출력에 있으면 함께 보관
+    Progress line - byte counts are kept when the output includes them
+    """
+    percent: float
+    bytes_done: Optional[int] = None
+    bytes_total: Optional[int] = None
+
+class Phase(NamedTuple):
+    """
+    단계 변경 줄 (downloading, verifying, installing ...)
+    Phase change line (downloading, verifying, installing ...)
+    """
+    name: str
+
+class Error(NamedTuple):
+    """
+    softwareupdate 오류 줄 - 코드가 출력에 있으면 함께 보관
+    softwareupdate error line - the code is kept when the output includes one
+    """
+    code: Optional[int]
+    text: str
+
+# 분류 규칙 빌더 함수
+# Rule builder functions
+# 진행률 줄에 바이트 수가 있을 때만 사용하는 보조 패턴
+# Secondary pattern used only when a progress line carries byte counts
+BYTES_PATTERN = re.compile(r'\((?P<bytes_done>\d+)\s*(?:/|of)\s*(?P<bytes_total>\d+)\s*bytes\)')
+
+def _build_progress(match):
+    line = match.string
+    if 'bytes' in line:
+        counts = BYTES_PATTERN.search(line, match.end())
+        if counts is not None:
+            return Progress(float(match.group(1)), int(counts.group(1)), int(counts.group(2)))
+    return Progress(float(match.group(1)))
+
+def _build_error(match):
+    code = match.group('error_code')
+    return Error(int(code) if code is not None else None, match.group('error_text').strip())
+
+def _phase(name):
+    phase = Phase(name)
+    return lambda match: phase
+
+# 기본 분류 규칙 (앞에 있을수록 우선순위가 높음)
+# 각 규칙은 (이름, 트리거 문자열, 패턴 또는 None, 빌더)
+# Default classification rules (earlier rules take priority)
+# Each rule is (name, trigger literal, pattern or None, builder)
+DEFAULT_RULES = [
+    ('progress', '%',
+     r'(\d+(?:\.\d+)?)%',
+     _build_progress),
+    ('error', 'rror',
+     r'(?:failed with error|\b[Ee]rror\b):?\s*(?P<error_text>.*?)(?:\s*\((?:error|code)?\s*(?P<error_code>-?\d+)\))?\s*$',
+     _build_error),
+    ('downloading', 'Downloading', None, _phase('downloading')),
+    ('verifying', 'Verifying', None, _phase('verifying')),
+    ('installing', 'Installing', None, _phase('installing')),
+]
+
+# 표 기반 분류기
+# Table-driven classifier
+class OutputClassifier:
+    """
+    규칙 표로 줄을 분류하는 분류기 - 정규식은 미리 컴파일되고, 트리거 문자열이 있는 규칙만
+    검사하므로 한 줄은 많아야 한 번 정규식으로 스캔됨
+    Classifier driven by a rule table - regexes are precompiled and only rules whose
+    trigger literal occurs in the line are tried, so a line is regex-scanned at most once
+    in the common case
+
+    패턴이 None인 규칙은 트리거 문자열만으로 일치
+    Rules with a None pattern match on the trigger literal alone
+    """
+
+    def __init__(self, rules=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self._rules = list(rules if rules is not None else DEFAULT_RULES)
+        self._compile()
+
+    def _compile(self):
+        self._table = tuple(
+            (trigger, re.compile(pattern).search if pattern else None, builder)
+            for _, trigger, pattern, builder in self._rules
+        )
+
+    @property
+    def rule_names(self):
+        return [rule[0] for rule in self._rules]
+
+    def register(self, name, trigger, pattern, builder, before=None):
+        """
+        새 규칙 추가 - before를 지정하면 해당 규칙보다 높은 우선순위로 삽입
+        Add a new rule - with `before`, insert it ahead of that rule
+        """
+        index = len(self._rules)
+        if before is not None:
+            index = self.rule_names.index(before)
+        self._rules.insert(index, (name, trigger, pattern, builder))
+        self._compile()
+
+    def classify(self, line):
+        """
+        한 줄을 분류해 Progress/Phase/Error 또는 None 반환
+        Classify one line and return Progress/Phase/Error, or None
+        """
+        for trigger, search, builder in self._table:
+            if trigger in line:
+                if search is None:
+                    return builder(None)
+                match = search(line)
+                if match is not None:
+                    return builder(match)
+        return None
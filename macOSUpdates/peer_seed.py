@@ -0,0 +1,507 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+import http.client
+from typing import NamedTuple
+from urllib.parse import quote, unquote, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from installer_cache import InstallerCache
+from installer_verify import InstallerVerifier, HashCache, DEFAULT_CHUNK_SIZE
+
+# LAN 피어 간 설치 프로그램 배포 - 이미 받은 설치 프로그램을 HTTP로 제공하고 받아옴
+# LAN peer distribution of installers - serve already-downloaded installers over HTTP and pull them
+
+# 기본 포트
+# Default port
+DEFAULT_SEED_PORT = 8631
+
+# 네트워크 읽기/쓰기 블록 크기
+# Network read/write block size
+BLOCK_SIZE = 1024 * 1024
+
+# 피어 연결 제한 시간 (초)
+# Peer connection timeout (seconds)
+PEER_TIMEOUT = 30
+
+# 매니페스트 저장 폴더 (캐시 색인 옆)
+# Folder holding manifests (next to the cache index)
+def _manifest_dir(cache):
+    return os.path.join(os.path.dirname(cache.index_path), 'manifests')
+
+# 설치 프로그램 매니페스트 생성
+# Build an installer manifest
+def build_manifest(app_path, version, build=None, chunk_size=DEFAULT_CHUNK_SIZE, hash_cache=None):
+    """
+    번들의 폴더/링크/파일 목록과 파일별 청크 sha256 목록으로 매니페스트 생성 (InstallerVerifier로 병렬 해시)
+    Build a manifest listing the bundle's folders, links and files with per-chunk sha256 lists
+    (hashed in parallel by InstallerVerifier)
+    """
+    steps = InstallerVerifier(hash_cache, chunk_size=chunk_size).build(app_path, version, build)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+# 범위 요청 헤더 해석
+# Parse a Range header
+def parse_range(header, size):
+    """
+    'bytes=a-b', 'bytes=a-', 'bytes=-n' 형식의 단일 범위를 (시작, 끝 포함)으로 변환, 잘못되면 None
+    Convert a single 'bytes=a-b', 'bytes=a-' or 'bytes=-n' range to (start, inclusive end); None if invalid
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, _, end = header[6:].strip().partition('-')
+    try:
+        if start == '':
+            length = int(end)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(start)
+        end = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+# 시드 서버
+# Seed server
+class SeedServer(ThreadingHTTPServer):
+    """
+    설치 프로그램 캐시에 있는 설치 프로그램을 제공하는 HTTP 서버
+    HTTP server offering the installers in the installer cache
+
+    GET /installers                               - 제공 가능한 버전 목록 (available versions)
+    GET /installers/<version>/manifest            - 매니페스트 (manifest)
+    GET /installers/<version>/files/<path>        - 파일 (Range 지원, sendfile 전송)
+                                                    file (Range supported, sent with sendfile)
+    """
+    daemon_threads = True
+
+    def __init__(self, cache=None, host='0.0.0.0', port=DEFAULT_SEED_PORT,
+                 chunk_size=DEFAULT_CHUNK_SIZE, rescan_interval=60.0):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__((host, port), SeedRequestHandler)
+        self.cache = cache or InstallerCache()
+        self.chunk_size = chunk_size
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        self._manifests = {}
+        self._building = {}
+        self._entries = {}
+        self._scanned_at = 0.0
+        # 검증 때 해시한 파일은 다시 해시하지 않도록 캐시 색인 옆의 해시 캐시를 공유
+        # Share the hash cache next to the cache index so files hashed during verification are not hashed again
+        self.hash_cache = HashCache(os.path.join(os.path.dirname(self.cache.index_path), 'hashes.json'))
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def entries(self):
+        """
+        캐시 색인 (rescan_interval마다 다시 검색)
+        Cache index (rescanned every rescan_interval)
+        """
+        with self._lock:
+            if time.monotonic() - self._scanned_at >= self.rescan_interval:
+                self._entries = self.cache.scan()
+                self._scanned_at = time.monotonic()
+            return self._entries
+
+    def manifest(self, version):
+        """
+        버전의 매니페스트 - 지문이 같으면 메모리/디스크에 저장된 것을 재사용
+        Manifest for `version` - reused from memory/disk while the fingerprint is unchanged
+        """
+        entry = self.entries().get(version)
+        if entry is None or not os.path.isdir(entry['path']):
+            return None
+        key = f"{version}-{entry['fingerprint']['checksum'][:16]}"
+        # 번들 해시는 오래 걸리므로 잠금 밖에서 만들고, 같은 버전을 동시에 요청한 스레드는 그 결과를 기다림
+        # (다른 버전의 요청은 막지 않음)
+        # Hashing a bundle takes long, so it happens outside the lock; threads asking for the same version
+        # at the same time wait for that result (requests for other versions are never held up)
+        while True:
+            with self._lock:
+                manifest = self._manifests.get(key)
+                if manifest is not None:
+                    return manifest
+                building = self._building.get(key)
+                if building is None:
+                    building = self._building[key] = threading.Event()
+                    break
+            building.wait()
+
+        try:
+            path = os.path.join(_manifest_dir(self.cache), key + '.json')
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                manifest = build_manifest(entry['path'], version, entry.get('build'), self.chunk_size,
+                                          self.hash_cache)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f)
+                os.replace(temp_path, path)
+            manifest['_root'] = entry['path']
+            manifest['_files'] = {item['path']: item for item in manifest['files']}
+            with self._lock:
+                self._manifests[key] = manifest
+            return manifest
+        finally:
+            # 실패했으면 기다리던 스레드 중 하나가 다시 만듦
+            # On failure one of the waiting threads builds it again
+            with self._lock:
+                del self._building[key]
+            building.set()
+
+    def serve_in_thread(self):
+        """
+        백그라운드 스레드에서 서버 실행 후 스레드 반환
+        Run the server on a background thread and return the thread
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+# 시드 요청 처리기
+# Seed request handler
+class SeedRequestHandler(BaseHTTPRequestHandler):
+    """
+    시드 서버의 요청 처리기 (HTTP/1.1 연결 유지)
+    Request handler of the seed server (HTTP/1.1 keep-alive)
+    """
+    protocol_version = 'HTTP/1.1'
+    server_version = 'macOSUpdatesSeed/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json({'error': message}, status)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        parts = [unquote(part) for part in self.path.split('?', 1)[0].split('/') if part]
+        if parts == ['installers']:
+            self._send_json([
+                {'version': entry['version'], 'build': entry.get('build'), 'size': entry['fingerprint']['size']}
+                for entry in self.server.entries().values()
+            ])
+            return
+        if len(parts) < 3 or parts[0] != 'installers':
+            self._send_error(404, 'not found')
+            return
+
+        manifest = self.server.manifest(parts[1])
+        if manifest is None:
+            self._send_error(404, f"version {parts[1]} not available")
+            return
+        if parts[2:] == ['manifest']:
+            self._send_json({key: value for key, value in manifest.items() if not key.startswith('_')})
+            return
+        if parts[2] == 'files' and len(parts) > 3:
+            # 매니페스트에 있는 파일만 제공 (경로 조작 방지)
+            # Only files listed in the manifest are served (prevents path traversal)
+            item = manifest['_files'].get('/'.join(parts[3:]))
+            if item is None:
+                self._send_error(404, 'file not in manifest')
+                return
+            self._send_file(os.path.join(manifest['_root'], item['path']), item['size'])
+            return
+        self._send_error(404, 'not found')
+
+    def _send_file(self, path, size):
+        start, end = 0, size - 1
+        status = 200
+        range_header = self.headers.get('Range')
+        if range_header:
+            requested = parse_range(range_header, size)
+            if requested is None:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            start, end = requested
+            status = 206
+        length = end - start + 1 if size else 0
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(length))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        if self.command == 'HEAD' or length == 0:
+            return
+
+        # 커널에서 바로 소켓으로 보내는 sendfile 사용 (지원되지 않으면 socket이 일반 전송으로 대체)
+        # Zero-copy transfer with sendfile (socket falls back to a regular send where unsupported)
+        self.wfile.flush()
+        with open(path, 'rb') as f:
+            self.connection.sendfile(f, start, length)
+
+# 청크 체크섬 불일치 오류
+# Chunk checksum mismatch error
+class ChecksumError(Exception):
+    pass
+
+# 매니페스트가 받는 폴더 밖을 가리킬 때의 오류
+# Error for a manifest pointing outside the destination folder
+class UnsafePathError(ValueError):
+    pass
+
+def _inside(root, path):
+    # 심볼릭 링크를 따라간 실제 경로가 root 안에 있는지
+    # Whether the real path, with symlinks followed, lies inside `root`
+    root = os.path.realpath(root)
+    return os.path.commonpath([root, os.path.realpath(path)]) == root
+
+def _relative_path(staging, relative):
+    """
+    피어 매니페스트의 상대 경로를 staging 폴더 안의 경로로 변환 - 절대 경로, '..', 밖으로 나가는 링크는 거부
+    Turn a relative path from a peer manifest into a path inside the staging folder - absolute paths,
+    '..' and links leading outside are rejected
+    """
+    if (not isinstance(relative, str) or not relative or os.path.isabs(relative)
+            or '..' in relative.split('/') or '\0' in relative):
+        raise UnsafePathError(f"unsafe path in manifest: {relative!r}")
+    path = os.path.join(staging, relative)
+    if not _inside(staging, path):
+        raise UnsafePathError(f"path leaves the bundle: {relative!r}")
+    return path
+
+# 피어 다운로드 진행 상황
+# Peer download progress
+class PeerProgress(NamedTuple):
+    bytes_done: int
+    bytes_total: int
+
+# 피어 클라이언트
+# Peer client
+class PeerClient:
+    """
+    피어 목록에서 설치 프로그램을 받아 청크 체크섬으로 검증하고 dest_dir에 설치하는 클라이언트
+    Client pulling an installer from a list of peers, verifying chunk checksums and placing it in dest_dir
+
+    중단된 다운로드는 staging 폴더에 남아 있다가 다음 시도에서 검증된 청크 뒤부터 이어 받음
+    (취소하면 discard_partial()로 지움)
+    Interrupted downloads stay in a staging folder and resume after the last verified chunk next time
+    (discard_partial() deletes it on cancellation)
+    """
+
+    def __init__(self, peers, dest_dir='/Applications', timeout=PEER_TIMEOUT):
+        """
+        초기화 함수 - peers는 'http://host:port' 목록
+        Initialization function - `peers` is a list of 'http://host:port' URLs
+        """
+        self.peers = [peer if '//' in peer else f'http://{peer}' for peer in peers]
+        self.dest_dir = dest_dir
+        self.timeout = timeout
+        self.staging = None
+
+    def _connect(self, peer):
+        parts = urlsplit(peer)
+        return http.client.HTTPConnection(parts.hostname, parts.port or DEFAULT_SEED_PORT, timeout=self.timeout)
+
+    def _get_json(self, connection, path):
+        connection.request('GET', path)
+        response = connection.getresponse()
+        body = response.read()
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            raise http.client.HTTPException(f"HTTP {response.status}")
+        return json.loads(body)
+
+    def download(self, version):
+        """
+        피어에서 설치 프로그램을 받는 제너레이터 - 상태 문자열과 PeerProgress를 생성하고
+        성공하면 설치 프로그램 경로를, 모든 피어가 실패하면 None을 반환
+        Generator pulling the installer from peers - yields status strings and PeerProgress,
+        returns the installer path on success or None when every peer failed
+        """
+        for peer in self.peers:
+            connection = self._connect(peer)
+            try:
+                manifest = self._get_json(connection, f"/installers/{quote(version)}/manifest")
+                if manifest is None:
+                    yield f"피어에 {version} 없음 (Not on peer): {peer}"
+                    continue
+                yield f"피어에서 받는 중 (Pulling from peer): {peer} ({manifest['size'] / 1e9:.1f} GB)"
+                path = yield from self._download_bundle(connection, manifest)
+                yield f"피어에서 받기 완료 (Pulled from peer): {path}"
+                return path
+            except (OSError, http.client.HTTPException, ValueError, KeyError, TypeError, ChecksumError) as e:
+                yield f"피어 사용 실패 (Peer failed): {peer}: {e}"
+            finally:
+                connection.close()
+        return None
+
+    def discard_partial(self):
+        """
+        마지막으로 받다 만 staging 폴더를 지우고 그 경로 반환 (없으면 None)
+        Delete the staging folder of the last unfinished pull and return its path (None when there is none)
+        """
+        staging, self.staging = self.staging, None
+        if staging is None or not os.path.isdir(staging):
+            return None
+        shutil.rmtree(staging, ignore_errors=True)
+        return staging
+
+    def _download_bundle(self, connection, manifest):
+        # 인증되지 않은 피어의 매니페스트이므로 모든 경로를 dest_dir/staging 안으로 제한
+        # The manifest comes from an unauthenticated peer, so every path is confined to dest_dir/staging
+        bundle = manifest['bundle']
+        if (not isinstance(bundle, str) or bundle != os.path.basename(bundle) or bundle.startswith('.')
+                or not bundle.endswith('.app') or '\\' in bundle):
+            raise UnsafePathError(f"unsafe bundle name in manifest: {bundle!r}")
+        staging = os.path.join(self.dest_dir, f".{bundle}.partial")
+        self.staging = staging
+        os.makedirs(staging, exist_ok=True)
+        for item in manifest['dirs']:
+            os.makedirs(_relative_path(staging, item['path']), exist_ok=True)
+
+        total = manifest['size']
+        done = 0
+        reported = 0
+        chunk_size = manifest['chunk_size']
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ChecksumError(f"invalid chunk size in manifest: {chunk_size!r}")
+        version = quote(manifest['version'])
+        for item in manifest['files']:
+            # 청크마다 체크섬이 하나씩 있어야 함 (짧은 목록은 받는 도중 IndexError가 됨)
+            # Every chunk needs exactly one checksum (a short list would turn into an IndexError mid-download)
+            size, checksums = item['size'], item['sha256']
+            if (not isinstance(size, int) or size < 0 or not isinstance(checksums, list)
+                    or len(checksums) != -(-size // chunk_size)):
+                raise ChecksumError(f"checksum list of {item['path']!r} does not cover its size")
+            path = _relative_path(staging, item['path'])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            offset = self._verified_length(path, item, chunk_size)
+            done += offset
+            if offset < item['size'] or not os.path.exists(path):
+                url = f"/installers/{version}/files/{quote(item['path'])}"
+                for written in self._download_file(connection, url, path, item, offset, chunk_size):
+                    done += written
+                    if done - reported >= chunk_size:
+                        reported = done
+                        yield PeerProgress(done, total)
+            # setuid/setgid 비트는 받지 않음
+            # setuid/setgid bits are never taken over
+            os.chmod(path, item['mode'] & 0o1777)
+        yield PeerProgress(total, total)
+
+        for item in manifest['links']:
+            link = _relative_path(staging, item['path'])
+            target = item['target']
+            if (not isinstance(target, str) or os.path.isabs(target)
+                    or not _inside(staging, os.path.join(os.path.dirname(link), target))):
+                raise UnsafePathError(f"link leaves the bundle: {item['path']!r} -> {target!r}")
+            if os.path.lexists(link):
+                os.remove(link)
+            os.symlink(target, link)
+        for item in manifest['dirs']:
+            os.chmod(_relative_path(staging, item['path']), item['mode'] & 0o1777)
+
+        # 모두 검증된 뒤에만 최종 위치로 이동 (dest_dir 밖은 절대 지우지 않음)
+        # Move into place only once everything is verified (nothing outside dest_dir is ever deleted)
+        final_path = os.path.join(self.dest_dir, bundle)
+        if os.path.islink(final_path):
+            os.remove(final_path)
+        elif os.path.exists(final_path):
+            if not _inside(self.dest_dir, final_path):
+                raise UnsafePathError(f"installer path leaves {self.dest_dir}: {final_path}")
+            shutil.rmtree(final_path)
+        os.rename(staging, final_path)
+        self.staging = None
+        return final_path
+
+    def _verified_length(self, path, item, chunk_size):
+        """
+        이미 받은 파일에서 체크섬이 맞는 앞부분의 길이 (맞지 않는 뒷부분은 잘라냄)
+        Length of the leading part of a partial file whose chunks verify (the rest is truncated)
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return 0
+        verified = 0
+        with open(path, 'r+b') as f:
+            for expected in item['sha256']:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+                complete = len(data) == chunk_size or verified + len(data) == item['size']
+                if not complete or hashlib.sha256(data).hexdigest() != expected:
+                    break
+                verified += len(data)
+            if size != verified:
+                f.truncate(verified)
+        return verified
+
+    def _download_file(self, connection, url, path, item, offset, chunk_size):
+        """
+        offset부터 파일을 받아 청크마다 검증하며 기록, 기록한 바이트 수를 생성
+        Download a file from `offset`, verifying each chunk as it is written; yields bytes written
+        """
+        headers = {'Range': f"bytes={offset}-"} if offset else {}
+        connection.request('GET', url, headers=headers)
+        response = connection.getresponse()
+        if response.status not in (200, 206) or (offset and response.status != 206):
+            response.read()
+            raise http.client.HTTPException(f"HTTP {response.status} for {item['path']}")
+
+        with open(path, 'r+b' if offset else 'wb') as f:
+            f.seek(offset)
+            position = offset
+            chunk_index = offset // chunk_size
+            hasher = hashlib.sha256()
+            remaining = item['size'] - offset
+            while remaining > 0:
+                # 청크 경계를 넘지 않도록 읽음
+                # Never read across a chunk boundary
+                boundary = (chunk_index + 1) * chunk_size
+                data = response.read(min(BLOCK_SIZE, remaining, boundary - position))
+                if not data:
+                    raise OSError(f"connection closed during {item['path']}")
+                f.write(data)
+                hasher.update(data)
+                position += len(data)
+                remaining -= len(data)
+                yield len(data)
+                if position == boundary or remaining == 0:
+                    if hasher.hexdigest() != item['sha256'][chunk_index]:
+                        f.truncate(chunk_index * chunk_size)
+                        raise ChecksumError(f"chunk {chunk_index} of {item['path']} does not match")
+                    chunk_index += 1
+                    hasher = hashlib.sha256()
+        # 연결을 재사용할 수 있도록 응답을 끝까지 읽음
+        # Finish the response so the connection can be reused
+        response.read()
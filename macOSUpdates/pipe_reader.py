@@ -0,0 +1,249 @@
+import os
+import re
+import select
+import collections
+
+# 바이트 단위 파이프 줄 읽기
+# Byte-level pipe line reading
+#
+# 텍스트 모드 (universal_newlines)는 청크마다 디코딩/줄 나누기를 하고, 끝에 붙은 \r은 다음에
+# \n이 오는지 볼 때까지 붙잡아 두므로 softwareupdate의 \r 진행률 줄이 늦게 도착함.
+# 여기서는 재사용하는 bytearray에 바로 읽고 \r과 \n 모두에서 복사 없이 나누며,
+# 실제로 전달하는 줄만 디코딩함
+# Text mode (universal_newlines) decodes and splits every chunk and holds back a trailing \r
+# until it knows whether \n follows, so softwareupdate's \r progress lines arrive late.
+# Here bytes are read straight into a reusable bytearray, split on both \r and \n without
+# copying, and only the lines actually handed out are decoded
+
+# 줄 끝 바이트 - \r\n은 한 줄 끝, 단독 \r은 진행률 덮어쓰기
+# Line ending bytes - \r\n is one line ending, a bare \r is a progress overwrite
+LINE_END_RE = re.compile(rb'\r\n|[\r\n]')
+CR = ord('\r')
+
+# 기본 버퍼 크기 - 이보다 긴 줄은 버퍼 크기에서 잘려 전달됨
+# Default buffer size - longer lines are handed out cut at the buffer size
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# 버퍼 안의 줄 나누기
+# Line splitting inside a buffer
+class LineSplitter:
+    """
+    재사용하는 bytearray에 바이트를 모아 CR/LF으로 나누는 클래스
+    Collects bytes in a reusable bytearray and splits them on CR/LF
+
+    collapse이면 같은 읽기에서 뒤에 다른 줄이 이어지는 단독 CR 줄 (터미널에서 덮어쓰이는 진행률)은
+    디코딩하지 않고 버림 - CRLF는 보통 줄 끝으로 봄
+    With `collapse`, a line ending in a bare CR and followed by another line from the same read
+    (progress a terminal would overwrite) is dropped without being decoded - CRLF is a normal line ending
+    """
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE, encoding='utf-8', collapse=True):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.encoding = encoding
+        self.collapse = collapse
+        self.start = 0
+        self.end = 0
+        self.dropped = 0
+
+    def free(self):
+        """
+        다음 읽기를 받을 버퍼의 빈 영역 (memoryview) - 먼저 남은 부분 줄을 앞으로 옮김
+        Writable free region of the buffer (memoryview) - the leftover partial line is moved to the front first
+        """
+        if self.start:
+            remaining = self.end - self.start
+            if remaining:
+                self.buffer[:remaining] = bytes(self.view[self.start:self.end])
+            self.start, self.end = 0, remaining
+        return self.view[self.end:]
+
+    def commit(self, count):
+        """
+        free()로 받은 영역에 count 바이트를 읽었음을 기록
+        Record that `count` bytes were read into the region returned by free()
+        """
+        self.end += count
+
+    def write(self, data):
+        """
+        바이트를 버퍼에 복사 (readinto를 쓸 수 없는 스트림용) - 넘치면 줄을 먼저 나눠 반환
+        Copy bytes into the buffer (for streams without readinto) - returns lines split off to make room
+        """
+        lines = []
+        offset = 0
+        while offset < len(data):
+            region = self.free()
+            if not region:
+                lines.extend(self.split(force=True))
+                continue
+            count = min(len(region), len(data) - offset)
+            region[:count] = data[offset:offset + count]
+            self.commit(count)
+            offset += count
+        return lines
+
+    def split(self, force=False):
+        """
+        완성된 줄을 디코딩해 목록으로 반환 - force이면 버퍼가 가득 찬 부분 줄도 한 줄로 반환
+        Decode and return the complete lines - with `force` a partial line filling the buffer is returned too
+        """
+        # CR이 없으면 마지막 줄바꿈까지 한 번에 디코딩하고 C 수준에서 나눔 (모든 줄을 전달하므로)
+        # Without CR every line is handed out, so decode up to the last newline at once and split in C
+        last_newline = self.buffer.rfind(b'\n', self.start, self.end)
+        if last_newline >= 0 and self.buffer.find(b'\r', self.start, self.end) < 0:
+            text = str(self.view[self.start:last_newline], self.encoding, 'replace')
+            self.start = last_newline + 1
+            return [line + '\n' for line in text.split('\n') if line]
+
+        segments = []
+        position = self.start
+        while True:
+            match = LINE_END_RE.search(self.buffer, position, self.end)
+            if match is None:
+                break
+            line_end = match.start()
+            if line_end > position:
+                segments.append((position, line_end, match.end() - line_end == 1 and self.buffer[line_end] == CR))
+            position = match.end()
+        if force and position == self.start and self.end - self.start == len(self.buffer):
+            segments.append((position, self.end, False))
+            position = self.end
+        self.start = position
+
+        # 단독 \r로 끝나고 같은 읽기에서 다음 줄이 이어지는 진행률 줄만 버림
+        # Only progress lines ending in a bare \r and followed by another line in the same read are dropped
+        lines = []
+        last = len(segments) - 1
+        for index, (line_start, line_end, carriage_return) in enumerate(segments):
+            if self.collapse and carriage_return and index < last:
+                self.dropped += 1
+                continue
+            lines.append(str(self.view[line_start:line_end], self.encoding, 'replace') + '\n')
+        return lines
+
+    def rest(self):
+        """
+        입력이 끝났을 때 남은 부분 줄 (없으면 None)
+        The leftover partial line once input ended (None when there is none)
+        """
+        if self.end <= self.start:
+            return None
+        line = str(self.view[self.start:self.end], self.encoding, 'replace') + '\n'
+        self.start = self.end
+        return line
+
+# 논블로킹 파이프 줄 읽기
+# Non-blocking pipe line reader
+class RawLineReader:
+    """
+    파이프를 논블로킹으로 읽는 readline() 호환 스트림 - 각 줄은 줄바꿈으로 끝나고 끝이면 ''
+    readline()-compatible stream reading a pipe non-blockingly - every line ends with a newline, '' at EOF
+
+    읽을 수 있을 때 쌓인 데이터를 모두 가져온 뒤 나누므로 합쳐서 도착한 CR 진행률은 마지막 것만 남음
+    Everything available is drained before splitting, so merged CR progress updates collapse to the latest
+    """
+
+    def __init__(self, stream, buffer_size=DEFAULT_BUFFER_SIZE, encoding='utf-8', collapse=True):
+        """
+        초기화 함수 - stream은 버퍼 없는 바이너리 파이프 (bufsize=0인 Popen.stdout)
+        Initialization function - `stream` is an unbuffered binary pipe (Popen.stdout with bufsize=0)
+        """
+        self.stream = stream
+        self.splitter = LineSplitter(buffer_size, encoding, collapse)
+        self._lines = collections.deque()
+        self._eof = False
+        self._empty = False
+        self._fd = stream.fileno()
+        os.set_blocking(self._fd, False)
+        self._poll = select.poll()
+        self._poll.register(self._fd, select.POLLIN)
+
+    def fileno(self):
+        return self._fd
+
+    def _drain(self):
+        # 지금 읽을 수 있는 바이트를 모두 읽음 - 읽은 것이 있거나 끝이면 True
+        # (파이프 읽기는 있는 만큼 반환하므로 빈 영역보다 적게 읽히면 더 읽지 않음)
+        # Read every byte available right now - True when something was read or EOF was hit
+        # (a pipe read returns whatever is there, so a read shorter than the region ends the drain)
+        got = False
+        while True:
+            region = self.splitter.free()
+            if not region:
+                self._lines.extend(self.splitter.split(force=True))
+                continue
+            try:
+                count = self.stream.readinto(region)
+            except BlockingIOError:
+                count = None
+            if count is None:
+                self._empty = True
+                return got
+            if count == 0:
+                self._eof = True
+                return True
+            self.splitter.commit(count)
+            got = True
+            if count < len(region):
+                self._empty = True
+                return True
+
+    def readline(self, timeout=None):
+        """
+        다음 줄 반환 - 끝이면 '', timeout초 동안 줄이 없어도 ''
+        Return the next line - '' at EOF, and also when no line arrived within `timeout` seconds
+        """
+        while not self._lines:
+            if self._eof:
+                rest = self.splitter.rest()
+                return rest if rest is not None else ''
+            # 마지막 읽기에서 파이프가 비었으면 읽기 전에 먼저 기다려 헛된 read 호출을 줄임
+            # When the last read emptied the pipe, wait before reading to save a wasted read call
+            if self._empty:
+                if not self._poll.poll(None if timeout is None else timeout * 1000) and timeout is not None:
+                    return ''
+                self._empty = False
+            if not self._drain():
+                continue
+            self._lines.extend(self.splitter.split())
+        return self._lines.popleft()
+
+    def close(self):
+        self.stream.close()
+
+# asyncio 스트림 줄 읽기
+# asyncio stream line reader
+class AsyncRawLineReader:
+    """
+    asyncio StreamReader를 CR/LF으로 나누는 readline() 호환 읽기 - 각 줄은 줄바꿈으로 끝나고 끝이면 ''
+    readline()-compatible reader splitting an asyncio StreamReader on CR/LF - lines end with a newline, '' at EOF
+    """
+
+    def __init__(self, stream, buffer_size=DEFAULT_BUFFER_SIZE, encoding='utf-8', collapse=True):
+        """
+        초기화 함수
+        Initialization function
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.splitter = LineSplitter(buffer_size, encoding, collapse)
+        self._lines = collections.deque()
+        self._eof = False
+
+    async def readline(self):
+        while not self._lines:
+            if self._eof:
+                rest = self.splitter.rest()
+                return rest if rest is not None else ''
+            data = await self.stream.read(self.buffer_size)
+            if not data:
+                self._eof = True
+                continue
+            self._lines.extend(self.splitter.write(data))
+            self._lines.extend(self.splitter.split())
+        return self._lines.popleft()
@@ -0,0 +1,98 @@
+import asyncio
+from PyQt5.QtCore import QObject, QEventLoop, QTimer
+from fetch_engine import FetchJob
+from fetch_supervisor import AsyncFetchSupervisor
+
+# Qt 이벤트 루프 위에서 asyncio 엔진을 실행하기 위한 도우미
+# Helpers for running the asyncio engine on top of the Qt event loop
+
+# qasync 이벤트 루프 설치
+# Install the qasync event loop
+def install_qt_event_loop(app):
+    """
+    qasync가 설치되어 있으면 Qt 이벤트 루프를 asyncio 루프로 설치하고 반환, 없으면 None
+    Install the Qt event loop as the asyncio loop when qasync is available; otherwise return None
+    """
+    try:
+        import qasync
+    except ImportError:
+        return None
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    return loop
+
+# DownloadThread 대신 사용하는 asyncio 작업
+# asyncio task used in place of DownloadThread
+class AsyncDownloadTask(QObject):
+    """
+    DownloadThread와 같은 start()/cancel()/pause()/resume() 인터페이스로 AsyncFetchEngine을 감시/재시도와 함께 Qt 루프에서 실행
+    Runs an AsyncFetchEngine under the watchdog/retry supervisor on the Qt loop,
+    behind the same start()/cancel()/pause()/resume() interface as DownloadThread
+    """
+
+    def __init__(self, log_sink, bridge, version, cache=None, runner=None, policy=None, parent=None,
+                 verifier=None):
+        """
+        초기화 함수
+        Initialization function
+        """
+        super().__init__(parent)
+        self.log_sink = log_sink
+        self.bridge = bridge
+        self.version = version
+        self.engine = AsyncFetchSupervisor(FetchJob(version), log_sink, runner=runner, cache=cache, policy=policy,
+                                           verifier=verifier)
+        self.task = None
+
+    def start(self):
+        """
+        현재 asyncio 루프에 다운로드 작업 예약
+        Schedule the download on the current asyncio loop
+        """
+        self.task = asyncio.ensure_future(self.engine.run(self.bridge))
+
+    def cancel(self):
+        """
+        다운로드 취소
+        Cancel the download
+        """
+        self.engine.cancel()
+
+    def pause(self):
+        """
+        다운로드 일시 정지
+        Pause the download
+        """
+        self.engine.pause()
+
+    def resume(self):
+        """
+        다운로드 재개
+        Resume the download
+        """
+        self.engine.resume()
+
+    def isRunning(self):
+        return self.task is not None and not self.task.done()
+
+    def wait(self, msecs=None):
+        """
+        작업이 (정리까지) 끝나기를 최대 msecs 동안 Qt/asyncio 이벤트를 처리하며 기다림 - 끝났으면 True
+        Wait at most `msecs` for the task to end, teardown included, while processing Qt/asyncio events -
+        True when it ended
+        """
+        if not self.isRunning():
+            return True
+        # qasync 루프는 Qt 루프이므로 중첩 Qt 루프로 작업을 계속 진행시킴
+        # The qasync loop is the Qt loop, so a nested Qt loop keeps the task making progress
+        local_loop = QEventLoop()
+
+        def ended(task):
+            local_loop.quit()
+
+        self.task.add_done_callback(ended)
+        if msecs is not None:
+            QTimer.singleShot(msecs, local_loop.quit)
+        local_loop.exec_()
+        self.task.remove_done_callback(ended)
+        return not self.isRunning()
@@ -0,0 +1,360 @@
+import os
+import re
+import json
+import time
+import glob
+import logging
+import sqlite3
+import datetime
+
+# 다운로드 세션 색인 (SQLite + 전문 검색)
+# Download session index (SQLite + full-text search)
+
+# 한 번에 커밋할 최대 줄 수와 최대 대기 시간 (초)
+# Maximum lines and seconds between commits
+COMMIT_LINES = 256
+COMMIT_INTERVAL = 1.0
+
+# 요약 JSON에서 세션 표로 옮기는 항목
+# Summary fields copied into the sessions table
+SUMMARY_COLUMNS = ('started', 'ended', 'result', 'returncode', 'attempts', 'duration_seconds',
+                   'bytes_done', 'bytes_total', 'stall_count', 'final_percent')
+
+# 실패로 보는 세션 결과
+# Session results counted as failures
+FAILED_RESULTS = ('error', 'stalled', 'timeout', 'corrupt')
+
+# 요약이 없는 기존 로그의 마지막 줄로 결과 추정
+# Results inferred from the last line of older logs without a summary
+BANNER_RESULTS = (('=== 다운로드 완료', 'finished'), ('!!! 오류 발생', 'error'), ('취소됨', 'cancelled'))
+
+# 세션 로그 한 줄 형식 '[YYYY-MM-DD HH:MM:SS] 메시지'
+# Session log line format '[YYYY-MM-DD HH:MM:SS] message'
+LOG_LINE_RE = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (.*)$')
+
+# 세션 로그 파일 이름 형식 'macOS_update_YYYYMMDD_HHMMSS_버전_세션ID.log' (이전 로그는 세션 ID 없음)
+# Session log file name format 'macOS_update_YYYYMMDD_HHMMSS_<version>_<session id>.log' (older logs have no session ID)
+LOG_NAME_RE = re.compile(r'^macOS_update_(\d{8}_\d{6})_(.+?)(?:_([0-9a-f]{12}))?\.log$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    version TEXT,
+    log_file TEXT,
+    started TEXT,
+    ended TEXT,
+    result TEXT,
+    returncode INTEGER,
+    attempts INTEGER,
+    duration_seconds REAL,
+    bytes_done INTEGER,
+    bytes_total INTEGER,
+    stall_count INTEGER,
+    final_percent REAL,
+    line_count INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started);
+CREATE INDEX IF NOT EXISTS sessions_version ON sessions (version);
+CREATE INDEX IF NOT EXISTS sessions_log_file ON sessions (log_file);
+"""
+
+LINES_FTS = "CREATE VIRTUAL TABLE IF NOT EXISTS lines USING fts5(text, session_id UNINDEXED, ts UNINDEXED)"
+LINES_PLAIN = "CREATE TABLE IF NOT EXISTS lines (text TEXT, session_id TEXT, ts TEXT)"
+
+# 시작 시각 기준 문자열
+# Start time cut-off string
+def since_timestamp(days=None, date=None):
+    """
+    days일 전 또는 'YYYY-MM-DD' 날짜를 started와 비교할 ISO 문자열로 변환
+    Turn `days` ago or a 'YYYY-MM-DD' date into an ISO string comparable with `started`
+    """
+    if date:
+        return date
+    if days is None:
+        return None
+    return (datetime.datetime.now() - datetime.timedelta(days=days)).isoformat()
+
+# 세션 색인
+# Session index
+class SessionIndex:
+    """
+    세션 메타데이터와 로그 줄 전문 색인을 담은 SQLite 파일
+    SQLite file holding session metadata and a full-text index of log lines
+
+    쓰기는 한 스레드 (로깅 리스너)에서만, 읽기는 WAL 덕분에 어느 스레드/프로세스에서나 가능
+    Writes happen on one thread (the logging listener); reads work from any thread/process thanks to WAL
+    """
+
+    def __init__(self, path):
+        """
+        초기화 함수 - FTS5가 없는 SQLite에서는 LIKE 검색으로 대체
+        Initialization function - falls back to LIKE searches on SQLite builds without FTS5
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.execute(LINES_FTS)
+        except sqlite3.OperationalError:
+            self.connection.execute(LINES_PLAIN)
+        self.fts = self._is_fts()
+        self.connection.commit()
+
+    def _is_fts(self):
+        row = self.connection.execute("SELECT sql FROM sqlite_master WHERE name = 'lines'").fetchone()
+        return row is not None and 'fts5' in row['sql'].lower()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    # 쓰기 (Writes)
+
+    def add_session(self, session_id, version=None, log_file=None, started=None):
+        """
+        세션 행이 없으면 추가
+        Insert the session row if it is not there yet
+        """
+        self.connection.execute(
+            'INSERT OR IGNORE INTO sessions (session_id, version, log_file, started) VALUES (?, ?, ?, ?)',
+            (session_id, version, log_file, started))
+
+    def add_lines(self, rows):
+        """
+        (session_id, ts, text) 줄 목록 추가
+        Append (session_id, ts, text) lines
+        """
+        self.connection.executemany('INSERT INTO lines (session_id, ts, text) VALUES (?, ?, ?)', rows)
+        counts = {}
+        for session_id, _, _ in rows:
+            counts[session_id] = counts.get(session_id, 0) + 1
+        self.connection.executemany(
+            'UPDATE sessions SET line_count = line_count + ? WHERE session_id = ?',
+            [(count, session_id) for session_id, count in counts.items()])
+
+    def update_summary(self, session_id, summary):
+        """
+        요약 JSON 항목으로 세션 행 갱신
+        Update the session row from summary JSON fields
+        """
+        self.add_session(session_id, summary.get('version'), summary.get('log_file'), summary.get('started'))
+        columns = [column for column in SUMMARY_COLUMNS if summary.get(column) is not None]
+        if not columns:
+            return
+        assignments = ', '.join(f'{column} = ?' for column in columns)
+        self.connection.execute(f'UPDATE sessions SET {assignments} WHERE session_id = ?',
+                                [summary[column] for column in columns] + [session_id])
+
+    def commit(self):
+        self.connection.commit()
+
+    def prune(self, max_age):
+        """
+        max_age초보다 오래된 세션과 그 줄을 삭제
+        Delete sessions (and their lines) older than `max_age` seconds
+        """
+        cutoff = since_timestamp(days=max_age / 86400.0)
+        old = [row['session_id'] for row in self.connection.execute(
+            'SELECT session_id FROM sessions WHERE started < ?', (cutoff,))]
+        self._delete_sessions(old)
+        return old
+
+    def forget_logs(self, paths):
+        """
+        로그 파일이 paths에 있는 (보관 제한으로 지워진) 세션과 그 줄을 삭제 - 삭제한 세션 ID 목록 반환
+        Delete sessions (and their lines) whose log file is in `paths` (removed by the retention cap) -
+        returns the deleted session IDs
+        """
+        paths = {os.path.abspath(path) for path in paths}
+        if not paths:
+            return []
+        gone = [row['session_id'] for row in self.connection.execute(
+            'SELECT session_id, log_file FROM sessions WHERE log_file IS NOT NULL')
+            if os.path.abspath(row['log_file']) in paths]
+        self._delete_sessions(gone)
+        return gone
+
+    def _delete_sessions(self, session_ids):
+        for session_id in session_ids:
+            self.connection.execute('DELETE FROM lines WHERE session_id = ?', (session_id,))
+            self.connection.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+        self.connection.commit()
+
+    def backfill(self, log_dir, before=None):
+        """
+        아직 색인되지 않은 기존 세션 로그/요약 파일을 색인 - 추가한 세션 수 반환
+        Index existing session logs/summaries that are not indexed yet - returns the number added
+
+        before 이후에 바뀐 파일 (지금 기록 중인 세션)은 건너뜀
+        Files modified after `before` (sessions being written right now) are skipped
+        """
+        known = {row['log_file'] for row in self.connection.execute('SELECT log_file FROM sessions')}
+        added = 0
+        for log_file in sorted(glob.glob(os.path.join(log_dir, 'macOS_update_*.log'))):
+            if log_file in known:
+                continue
+            if before is not None and os.path.getmtime(log_file) >= before:
+                continue
+            summary = {}
+            try:
+                with open(os.path.splitext(log_file)[0] + '.summary.json', 'r', encoding='utf-8') as f:
+                    summary = json.load(f)
+            except (OSError, ValueError):
+                pass
+            name = os.path.basename(log_file)
+            session_id, version, started = summary.get('session'), summary.get('version'), summary.get('started')
+            match = LOG_NAME_RE.match(name)
+            if match:
+                session_id = session_id or match.group(3)
+                version = version or match.group(2)
+                started = started or datetime.datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').isoformat()
+            started = started or datetime.datetime.fromtimestamp(os.path.getmtime(log_file)).isoformat()
+            session_id = session_id or 'file:' + name
+            self.add_session(session_id, version, log_file, started)
+            summary.setdefault('log_file', log_file)
+            self.update_summary(session_id, summary)
+            rows = []
+            with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    line = line.rstrip('\n')
+                    match = LOG_LINE_RE.match(line)
+                    if match:
+                        rows.append((session_id, match.group(1).replace(' ', 'T'), match.group(2)))
+                    elif line:
+                        rows.append((session_id, None, line))
+            if 'result' not in summary and rows:
+                for banner, result in BANNER_RESULTS:
+                    if banner in rows[-1][2]:
+                        self.update_summary(session_id, {'result': result})
+                        break
+            self.add_lines(rows)
+            added += 1
+        self.connection.commit()
+        return added
+
+    # 읽기 (Reads)
+
+    def sessions(self, version=None, result=None, failed=False, since=None, text=None, limit=100):
+        """
+        조건에 맞는 세션을 최신순으로 반환
+        Return matching sessions, newest first
+
+        version은 접두사 ('15'는 15.x), failed는 FAILED_RESULTS 결과, text는 로그 줄 검색어
+        `version` is a prefix ('15' means 15.x), `failed` means a FAILED_RESULTS result,
+        `text` searches the log lines
+        """
+        clauses, params = [], []
+        if version:
+            clauses.append('(version = ? OR version LIKE ?)')
+            params += [version, version.rstrip('.') + '.%']
+        if result:
+            clauses.append('result = ?')
+            params.append(result)
+        if failed:
+            clauses.append(f"result IN ({', '.join('?' * len(FAILED_RESULTS))})")
+            params += FAILED_RESULTS
+        if since:
+            clauses.append('started >= ?')
+            params.append(since)
+        if text:
+            clauses.append(f'session_id IN (SELECT session_id FROM lines WHERE {self._match_clause()})')
+            params.append(self._match_param(text))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        params.append(limit)
+        return [dict(row) for row in self.connection.execute(
+            f'SELECT * FROM sessions {where} ORDER BY started DESC LIMIT ?', params)]
+
+    def search_lines(self, text, session_id=None, limit=200):
+        """
+        검색어가 들어 있는 로그 줄 (session_id, ts, text) 목록
+        Log lines (session_id, ts, text) containing the search text
+        """
+        query = f'SELECT session_id, ts, text FROM lines WHERE {self._match_clause()}'
+        params = [self._match_param(text)]
+        if session_id:
+            query += ' AND session_id = ?'
+            params.append(session_id)
+        query += ' LIMIT ?'
+        params.append(limit)
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def _match_clause(self):
+        return 'lines MATCH ?' if self.fts else 'text LIKE ?'
+
+    def _match_param(self, text):
+        if not self.fts:
+            return f'%{text}%'
+        # 각 단어를 구문으로 감싸 FTS 문법 문자를 무시
+        # Quote every word so FTS syntax characters are taken literally
+        return ' '.join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+
+# 로깅 파이프라인에서 색인을 갱신하는 핸들러
+# Handler updating the index from the logging pipeline
+class SessionIndexHandler(logging.Handler):
+    """
+    세션 ID가 있는 레코드를 모아 색인에 일괄 기록하는 핸들러 (QueueListener 스레드에서 실행)
+    Handler batching records that carry a session ID into the index (runs on the QueueListener thread)
+
+    summary 속성이 있는 레코드는 세션 메타데이터를 갱신하고 바로 커밋
+    Records with a `summary` attribute update the session metadata and commit immediately
+    """
+
+    def __init__(self, path, commit_lines=COMMIT_LINES, commit_interval=COMMIT_INTERVAL):
+        super().__init__()
+        self.path = path
+        self.commit_lines = commit_lines
+        self.commit_interval = commit_interval
+        self.index = None
+        self._sessions = set()
+        self._rows = []
+        self._last_commit = time.monotonic()
+
+    def emit(self, record):
+        session_id = getattr(record, 'session_id', None)
+        if not session_id:
+            return
+        try:
+            if self.index is None:
+                self.index = SessionIndex(self.path)
+            ts = datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds')
+            summary = getattr(record, 'summary', None)
+            if summary is not None:
+                self._write_rows()
+                self.index.update_summary(session_id, summary)
+                self.index.commit()
+                return
+            if session_id not in self._sessions:
+                self._sessions.add(session_id)
+                self.index.add_session(session_id, getattr(record, 'version', None),
+                                       getattr(record, 'log_file', None), ts)
+            self._rows.append((session_id, ts, record.getMessage()))
+            if (len(self._rows) >= self.commit_lines
+                    or time.monotonic() - self._last_commit >= self.commit_interval):
+                self._write_rows()
+                self.index.commit()
+        except sqlite3.Error:
+            self.handleError(record)
+
+    def _write_rows(self):
+        if self._rows:
+            self.index.add_lines(self._rows)
+            self._rows = []
+        self._last_commit = time.monotonic()
+
+    def flush(self):
+        if self.index is not None:
+            self._write_rows()
+            self.index.commit()
+
+    def close(self):
+        try:
+            if self.index is not None:
+                self.flush()
+                self.index.close()
+                self.index = None
+        finally:
+            super().close()
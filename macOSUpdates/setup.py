@@ -4,41 +4,16 @@ Setup file for building macOS application
 """
 from setuptools import setup
 import os
-import subprocess
-import glob
-import sys
+from build_config import INCLUDES, EXCLUDES
+from build_app import BuildCache, discover_dependencies
 
-# Python 프레임워크 경로 찾기
-# Find Python framework path
-def find_python_framework():
-    python_path = sys.executable
-    framework_path = os.path.normpath(os.path.join(os.path.dirname(python_path), '..', '..', 'Python.framework'))
-    if os.path.exists(framework_path):
-        return framework_path
-    return None
-
-# libffi 라이브러리 경로 찾기
-# Find libffi library path
-def find_libffi():
-    try:
-        # Homebrew나 시스템에 설치된 libffi 찾기
-        # Find libffi installed via Homebrew or system
-        cmd = "find /usr/local/Cellar /opt/homebrew/Cellar /usr/local/lib /opt/homebrew/lib -name 'libffi*.dylib' 2>/dev/null || true"
-        result = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
-        paths = result.split('\n')
-        if paths and paths[0]:
-            return paths
-    except:
-        pass
-    return []
-
-# libffi 라이브러리 찾기
-# Find libffi library
-libffi_paths = find_libffi()
-
-# Python 프레임워크 찾기
-# Find Python framework
-python_framework = find_python_framework()
+# libffi와 Python 프레임워크 찾기 - 탐색 폴더가 바뀌지 않았으면 build_app 캐시의 결과를 재사용
+# (예전처럼 가져올 때마다 Cellar 전체를 셸 find로 훑지 않음)
+# Find libffi and the Python framework - the build_app cache result is reused while the searched
+# folders are unchanged (instead of a shell find over the whole Cellar on every import)
+dependencies = discover_dependencies(BuildCache())
+libffi_paths = dependencies['libffi']
+python_framework = dependencies['python_framework']
 
 # 프레임워크 파일 목록 생성
 # Create list of framework files
@@ -55,7 +30,6 @@ APP = ['macOSUpdate.py']
 DATA_FILES = frameworks
 OPTIONS = {
     'argv_emulation': False,
-    'packages': ['PyQt5', 'datetime', 're', 'subprocess', 'os'],
     # 'iconfile': 'app_icon.icns',  # 주석 처리 또는 제거
     'plist': {
         'CFBundleName': 'macOS Installer Downloader',
@@ -67,7 +41,10 @@ OPTIONS = {
         'PyRuntimeLocations': [python_framework + '/Versions/Current/Python'] if python_framework else [],
     },
     'arch': 'universal2',  # Universal Binary 설정 (Intel + Apple Silicon)
-    'includes': ['PyQt5.QtCore', 'PyQt5.QtGui', 'PyQt5.QtWidgets'],
+    # PyQt5 패키지 전체 대신 사용하는 모듈만 포함 (build_config.py 참고)
+    # Only the used modules instead of the whole PyQt5 package (see build_config.py)
+    'includes': INCLUDES,
+    'excludes': EXCLUDES,
     'frameworks': libffi_paths + ([python_framework] if python_framework else []),
 }
 
@@ -0,0 +1,111 @@
+import threading
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, Qt
+
+# 다운로드 스레드와 UI 사이의 시그널 병합 브리지
+# Coalescing signal bridge between the download thread and the UI
+class SignalBridge(QObject):
+    """
+    작업 스레드의 상태/진행률을 모아 일정한 프레임 간격으로 UI에 전달하는 클래스
+    Collects status lines and progress from a worker thread and delivers them
+    to the UI in fixed-rate frames; terminal states are delivered immediately
+    """
+    status_batch_signal = pyqtSignal(list)
+    progress_signal = pyqtSignal(int)
+    metrics_signal = pyqtSignal(object)
+    finished_signal = pyqtSignal()
+    error_signal = pyqtSignal(str)
+
+    # 종료 상태를 즉시 전달하기 위한 내부 시그널
+    # Internal signal used to deliver terminal states right away
+    _wake_signal = pyqtSignal()
+
+    def __init__(self, frame_rate=30, parent=None):
+        """
+        초기화 함수 - UI 스레드에서 생성해야 함
+        Initialization function - must be created on the UI thread
+        """
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._lines = []
+        self._progress = None
+        self._metrics = None
+        self._terminal = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(1000 / frame_rate)))
+        self._timer.timeout.connect(self.drain)
+        self._wake_signal.connect(self.drain, Qt.QueuedConnection)
+
+    def start(self):
+        """
+        프레임 타이머 시작
+        Start the frame timer
+        """
+        self._timer.start()
+
+    def post_status(self, message):
+        """
+        상태 메시지를 다음 프레임에 전달하도록 추가 (스레드 안전)
+        Queue a status line for the next frame (thread-safe)
+        """
+        with self._lock:
+            self._lines.append(message)
+
+    def post_progress(self, value):
+        """
+        최신 진행률만 보관 (스레드 안전)
+        Keep only the latest progress value (thread-safe)
+        """
+        with self._lock:
+            self._progress = value
+
+    def post_metrics(self, metrics):
+        """
+        최신 처리량/남은 시간 측정값만 보관 (스레드 안전)
+        Keep only the latest throughput/ETA measurement (thread-safe)
+        """
+        with self._lock:
+            self._metrics = metrics
+
+    def post_finished(self):
+        """
+        완료 상태를 즉시 전달 (스레드 안전)
+        Deliver the finished state immediately (thread-safe)
+        """
+        with self._lock:
+            self._terminal = ('finished', None)
+        self._wake_signal.emit()
+
+    def post_error(self, message):
+        """
+        오류 상태를 즉시 전달 (스레드 안전)
+        Deliver the error state immediately (thread-safe)
+        """
+        with self._lock:
+            self._terminal = ('error', message)
+        self._wake_signal.emit()
+
+    def drain(self):
+        """
+        모아 둔 상태/진행률을 한 번에 UI로 내보내는 함수
+        Emit everything collected since the last frame in one go
+        """
+        with self._lock:
+            lines, self._lines = self._lines, []
+            progress, self._progress = self._progress, None
+            metrics, self._metrics = self._metrics, None
+            terminal, self._terminal = self._terminal, None
+
+        if lines:
+            self.status_batch_signal.emit(lines)
+        if progress is not None:
+            self.progress_signal.emit(progress)
+        if metrics is not None:
+            self.metrics_signal.emit(metrics)
+        if terminal is not None:
+            self._timer.stop()
+            kind, message = terminal
+            if kind == 'finished':
+                self.finished_signal.emit()
+            else:
+                self.error_signal.emit(message)
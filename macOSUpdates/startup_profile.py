@@ -0,0 +1,146 @@
+import os
+import re
+import sys
+import json
+import time
+import subprocess
+
+# 시작 시간 측정 (--profile-startup)
+# Startup time measurement (--profile-startup)
+#
+# 부모 프로세스가 같은 명령을 -X importtime으로 다시 실행하고, 자식은 첫 화면을 그린 뒤
+# 단계별 시각을 기록하고 종료함. 이 모듈은 가장 먼저 가져오므로 표준 라이브러리만 사용
+# The parent re-runs the same command under -X importtime; the child records per-stage
+# timestamps and exits after its first paint. Imported first, so it only uses light stdlib modules
+
+# 자식 프로세스에 보고서 경로를 전달하는 환경 변수
+# Environment variable passing the report path to the child
+REPORT_ENV = 'MACOSUPDATES_STARTUP_REPORT'
+
+# 보고서에 넣을 가장 느린 import 수
+# Number of slowest imports kept in the report
+TOP_IMPORTS = 15
+
+# -X importtime 출력 한 줄 형식
+# Line format of -X importtime output
+IMPORTTIME_RE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)')
+
+# 단계별 시각 (프로세스 안에서 perf_counter 기준)
+# Per-stage timestamps (perf_counter within the process)
+_marks = [('start', time.perf_counter())]
+
+def mark(name):
+    """
+    단계 이름과 현재 시각을 기록
+    Record a stage name with the current time
+    """
+    _marks.append((name, time.perf_counter()))
+
+def enabled():
+    """
+    시작 시간 측정 자식 프로세스로 실행 중인지 여부
+    Whether this process is a startup profiling child
+    """
+    return bool(os.environ.get(REPORT_ENV))
+
+def marks():
+    """
+    첫 기록부터의 경과 시간 (밀리초) 목록
+    Milliseconds elapsed since the first mark, per stage
+    """
+    base = _marks[0][1]
+    return [(name, round((when - base) * 1000.0, 2)) for name, when in _marks]
+
+def write_marks():
+    """
+    측정 자식이면 단계별 시각을 보고서 경로에 기록
+    In a profiling child, write the per-stage timestamps to the report path
+    """
+    path = os.environ.get(REPORT_ENV)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(marks(), f)
+
+def parse_importtime(text, top=TOP_IMPORTS):
+    """
+    -X importtime 출력을 (전체 import 시간 ms, 누적 시간이 큰 최상위 import 목록)으로 요약
+    Summarize -X importtime output as (total import ms, top-level imports with the largest cumulative time)
+    """
+    total_us = 0
+    top_level = []
+    for line in text.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        total_us += int(self_us)
+        if len(indent) <= 1:
+            top_level.append((name, int(cumulative_us) / 1000.0))
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return round(total_us / 1000.0, 2), [(name, round(ms, 2)) for name, ms in top_level[:top]]
+
+def profile_command(argv, report_path=None, timeout=120.0, env=None):
+    """
+    argv (cli 인자)를 import 시간 기록과 함께 자식 프로세스로 실행하고 보고서 사전을 반환
+    Run `argv` (cli arguments) in a child process with import timing and return the report dict
+
+    자식은 첫 화면을 그린 뒤 종료하고, report_path를 주면 보고서를 JSON으로도 기록
+    The child exits after its first paint; with `report_path` the report is also written as JSON
+    """
+    import tempfile
+
+    fd, marks_path = tempfile.mkstemp(prefix='startup_marks_', suffix='.json')
+    os.close(fd)
+    child_env = dict(os.environ)
+    child_env.update(env or {})
+    child_env[REPORT_ENV] = marks_path
+    if getattr(sys, 'frozen', False):
+        # 번들 앱에서는 -X 옵션 대신 환경 변수 사용
+        # Bundled apps take the environment variable instead of -X
+        command = [sys.executable] + list(argv)
+        child_env['PYTHONPROFILEIMPORTTIME'] = '1'
+    else:
+        cli_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli.py')
+        command = [sys.executable, '-X', 'importtime', cli_path] + list(argv)
+
+    started = time.perf_counter()
+    try:
+        process = subprocess.run(command, env=child_env, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.PIPE, universal_newlines=True, timeout=timeout)
+        wall_ms = (time.perf_counter() - started) * 1000.0
+        try:
+            with open(marks_path, 'r', encoding='utf-8') as f:
+                stages = json.load(f)
+        except (OSError, ValueError):
+            stages = []
+    finally:
+        os.remove(marks_path)
+
+    import_ms, top_imports = parse_importtime(process.stderr)
+    report = {
+        'command': list(argv),
+        'returncode': process.returncode,
+        'wall_ms': round(wall_ms, 2),
+        'first_paint_ms': dict(stages).get('first_paint'),
+        'import_ms': import_ms,
+        'stages': stages,
+        'top_imports': top_imports,
+    }
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+def format_report(report):
+    """
+    보고서를 사람이 읽을 수 있는 여러 줄 문자열로 변환
+    Format a report as human-readable lines
+    """
+    lines = [f"전체 시간 (Wall time): {report['wall_ms']:.0f} ms, "
+             f"첫 화면 (First paint): {report['first_paint_ms'] or 0:.0f} ms, "
+             f"import: {report['import_ms']:.0f} ms"]
+    lines.append('단계 (Stages):')
+    lines.extend(f"  {name:<16} {ms:8.1f} ms" for name, ms in report['stages'])
+    lines.append('가장 느린 import (Slowest imports):')
+    lines.extend(f"  {name:<32} {ms:8.1f} ms" for name, ms in report['top_imports'])
+    return '\n'.join(lines)
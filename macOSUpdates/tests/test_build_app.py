@@ -0,0 +1,144 @@
+"""
+증분 앱 빌드 테스트 - 가짜 PyInstaller 명령으로 변형별 skip/incremental/full 계획을 확인 (Linux에서도 실행)
+Incremental app build tests - a fake PyInstaller command checks the per-variant skip/incremental/full plans
+(runs on Linux too)
+
+사용법 (Usage):
+    python -m pytest macOSUpdates/tests
+"""
+import io
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_app
+from build_app import ARCHES, ARCH_ENV, variant_name
+
+# 가짜 PyInstaller - 아키텍처 환경 변수에 맞는 이름으로 앱 번들과 작업 폴더를 만들고 호출을 기록
+# Fake PyInstaller - creates the app bundle named after the architecture variable plus the work folder,
+# and records the call
+FAKE_PYINSTALLER = f'''
+import os, sys
+sys.path.insert(0, {os.path.dirname(build_app.__file__)!r})
+from build_app import variant_name
+args = sys.argv[1:]
+dist_dir = args[args.index('--distpath') + 1]
+work_dir = args[args.index('--workpath') + 1]
+arch = os.environ[{ARCH_ENV!r}]
+name = variant_name(arch)
+os.makedirs(work_dir, exist_ok=True)
+executable_dir = os.path.join(dist_dir, name + '.app', 'Contents', 'MacOS')
+os.makedirs(executable_dir, exist_ok=True)
+with open(os.path.join(executable_dir, name), 'w') as f:
+    f.write(arch)
+with open(os.environ['FAKE_PYINSTALLER_LOG'], 'a') as f:
+    f.write(arch + chr(10))
+'''
+
+class BuildPlanTest(unittest.TestCase):
+    """
+    세 아키텍처 변형의 빌드 계획
+    Build plans of the three architecture variants
+    """
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='build_app_test_')
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.dist_dir = os.path.join(self.root, 'dist')
+        self.work_dir = os.path.join(self.root, 'build')
+        self.cache_path = os.path.join(self.work_dir, 'build_cache.json')
+        self.call_log = os.path.join(self.root, 'calls.txt')
+        fake = os.path.join(self.root, 'fake_pyinstaller.py')
+        with open(fake, 'w', encoding='utf-8') as f:
+            f.write(FAKE_PYINSTALLER)
+        self.pyinstaller = [sys.executable, fake]
+
+        # 저장소 파일 대신 임시 spec/앱 모듈을 입력으로 사용
+        # Temporary spec/app module files stand in for the repository's inputs
+        self.spec = os.path.join(self.root, 'app.spec')
+        self.module = os.path.join(self.root, 'app_module.py')
+        self.write(self.spec, 'spec 1')
+        self.write(self.module, 'module 1')
+        for patcher in (mock.patch.object(build_app, 'SPEC_PATH', self.spec),
+                        mock.patch.object(build_app, 'app_sources', lambda: [self.module]),
+                        mock.patch.dict(os.environ, {'FAKE_PYINSTALLER_LOG': self.call_log})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def write(path, text):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def build(self):
+        """
+        세 변형을 빌드하고 ({변형 이름: 계획}, 실제로 빌드한 아키텍처 목록) 반환
+        Build all three variants and return ({variant name: plan}, architectures actually built)
+        """
+        if os.path.exists(self.call_log):
+            os.remove(self.call_log)
+        out = io.StringIO()
+        ok = build_app.build(list(ARCHES), pyinstaller=self.pyinstaller, dist_dir=self.dist_dir,
+                             work_dir=self.work_dir, cache_path=self.cache_path, out=out)
+        self.assertTrue(ok, out.getvalue())
+        plans = {}
+        for line in out.getvalue().splitlines():
+            name, _, action = line.partition(': ')
+            if action in ('skip', 'incremental', 'full'):
+                plans[name] = action
+        built = []
+        if os.path.exists(self.call_log):
+            with open(self.call_log, encoding='utf-8') as f:
+                built = sorted(f.read().split())
+        return plans, built
+
+    def assert_plans(self, plans, action):
+        self.assertEqual(plans, {variant_name(arch): action for arch in ARCHES})
+
+    def test_first_build_is_full(self):
+        plans, built = self.build()
+        self.assert_plans(plans, 'full')
+        self.assertEqual(built, sorted(ARCHES))
+
+    def test_unchanged_inputs_skip_every_variant(self):
+        self.build()
+        plans, built = self.build()
+        self.assert_plans(plans, 'skip')
+        self.assertEqual(built, [])
+
+    def test_changed_app_module_is_incremental(self):
+        self.build()
+        self.write(self.module, 'module 2')
+        plans, built = self.build()
+        self.assert_plans(plans, 'incremental')
+        self.assertEqual(built, sorted(ARCHES))
+
+    def test_changed_spec_is_full(self):
+        self.build()
+        self.write(self.spec, 'spec 2')
+        plans, built = self.build()
+        self.assert_plans(plans, 'full')
+        self.assertEqual(built, sorted(ARCHES))
+
+    def test_replaced_app_is_rebuilt(self):
+        # build_universal_manual.sh처럼 x86_64 앱을 기본 이름으로 복사하면 universal2만 다시 빌드
+        # Copying the x86_64 app over the plain name, like build_universal_manual.sh, rebuilds only universal2
+        self.build()
+        universal = os.path.join(self.dist_dir, variant_name('universal2') + '.app')
+        shutil.rmtree(universal)
+        shutil.copytree(os.path.join(self.dist_dir, variant_name('x86_64') + '.app'), universal)
+        os.rename(os.path.join(universal, 'Contents', 'MacOS', variant_name('x86_64')),
+                  os.path.join(universal, 'Contents', 'MacOS', variant_name('universal2')))
+        plans, built = self.build()
+        self.assertEqual(plans[variant_name('universal2')], 'incremental')
+        self.assertEqual(plans[variant_name('arm64')], 'skip')
+        self.assertEqual(plans[variant_name('x86_64')], 'skip')
+        self.assertEqual(built, ['universal2'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+다운로드 큐 테스트 - 취소한 작업은 스레드가 끝날 때까지 실행 슬롯을 유지하고, 작업마다 자기 로그 파일을 씀
+Download queue tests - a cancelled job keeps its concurrency slot until its thread ends, and every job
+writes its own log file
+
+사용법 (Usage):
+    python -m pytest macOSUpdates/tests
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QCoreApplication
+
+from download_queue import DownloadQueue, DownloadJob
+
+class FakeThread:
+    """
+    취소 요청을 받아도 테스트가 end()를 부를 때까지 끝나지 않는 다운로드 스레드
+    Download thread that keeps running after a cancel request until the test calls end()
+    """
+
+    def __init__(self, bridge):
+        self.bridge = bridge
+        self.running = False
+        self.cancel_requested = False
+
+    def start(self):
+        self.running = True
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    def end(self, message='cancelled'):
+        self.running = False
+        self.bridge.error_signal.emit(message)
+
+    def isRunning(self):
+        return self.running
+
+    def wait(self, msecs):
+        return not self.running
+
+class DownloadQueueTest(unittest.TestCase):
+    """
+    취소 중인 작업과 동시 실행 제한, 작업별 로그
+    Cancelling jobs, the concurrency cap and per-job logs
+    """
+
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+        self.log_dir = tempfile.mkdtemp(prefix='queue_test_')
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
+        self.queue = DownloadQueue(lambda log_sink, bridge, version: FakeThread(bridge), self.log_dir,
+                                   max_concurrency=1)
+
+    def test_cancelled_job_holds_slot_until_thread_ends(self):
+        first, second = self.queue.add_versions(['99.1', '99.2'])
+        self.queue.cancel(first)
+        self.assertTrue(first.thread.cancel_requested)
+        self.assertEqual(first.state, DownloadJob.CANCELLING)
+        self.assertTrue(first.is_active)
+        self.assertEqual(second.state, DownloadJob.PENDING)
+        self.assertEqual(len([job for job in self.queue.jobs if job.thread and job.thread.isRunning()]), 1)
+
+        first.thread.end()
+        self.assertEqual(first.state, DownloadJob.CANCELLED)
+        self.assertEqual(second.state, DownloadJob.RUNNING)
+
+    def test_cancel_all_does_not_start_pending_jobs(self):
+        jobs = self.queue.add_versions(['99.1', '99.2', '99.3'])
+        self.queue.cancel_all()
+        self.assertEqual([job.state for job in jobs],
+                         [DownloadJob.CANCELLING, DownloadJob.CANCELLED, DownloadJob.CANCELLED])
+        jobs[0].thread.end()
+        self.assertEqual([job.thread is None for job in jobs], [False, True, True])
+        self.assertFalse(any(job.is_active for job in jobs))
+
+    def test_same_version_in_same_second_gets_its_own_log(self):
+        # 같은 버전을 같은 초에 두 번 시작해도 서로의 로그를 덮어쓰지 않음
+        # Starting the same version twice in one second never truncates the other job's log
+        self.queue.set_max_concurrency(2)
+        first, second = self.queue.add_versions(['99.1', '99.1'])
+        self.assertNotEqual(first.log_file_path, second.log_file_path)
+        for job in (first, second):
+            job.thread.end()
+            with open(job.log_file_path, encoding='utf-8') as f:
+                self.assertIn('99.1', f.readline())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+설치 프로그램 검증 테스트 - 없는 경로/빈 번들은 통과하거나 기준으로 저장되지 않음
+Installer verification tests - a missing path or an empty bundle never passes or becomes the reference
+
+사용법 (Usage):
+    python -m pytest macOSUpdates/tests
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from installer_verify import InstallerVerifier
+
+def run_steps(steps):
+    # 검증 제너레이터를 끝까지 돌리고 반환값 반환
+    # Run a verification generator to the end and return its value
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+class VerifyTest(unittest.TestCase):
+    """
+    번들이 없거나 비어 있을 때의 검증
+    Verification of missing or empty bundles
+    """
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='verify_test_')
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.reference_dir = os.path.join(self.root, 'verified')
+        self.verifier = InstallerVerifier(reference_dir=self.reference_dir)
+
+    def assert_rejected(self, app_path):
+        result = run_steps(self.verifier.verify(app_path, '99.9'))
+        self.assertFalse(result.ok)
+        self.assertFalse(result.recorded)
+        self.assertFalse(os.path.exists(self.reference_dir))
+
+    def test_missing_path_fails(self):
+        self.assert_rejected(os.path.join(self.root, 'missing.app'))
+
+    def test_file_instead_of_bundle_fails(self):
+        path = os.path.join(self.root, 'file.app')
+        with open(path, 'wb') as f:
+            f.write(b'x')
+        self.assert_rejected(path)
+
+    def test_empty_bundle_fails(self):
+        path = os.path.join(self.root, 'empty.app')
+        os.makedirs(os.path.join(path, 'Contents'))
+        self.assert_rejected(path)
+
+    def test_first_bundle_becomes_reference(self):
+        path = os.path.join(self.root, 'good.app')
+        os.makedirs(os.path.join(path, 'Contents'))
+        with open(os.path.join(path, 'Contents', 'payload.bin'), 'wb') as f:
+            f.write(b'payload')
+        result = run_steps(self.verifier.verify(path, '99.9'))
+        self.assertTrue(result.ok)
+        self.assertTrue(result.recorded)
+
+if __name__ == '__main__':
+    unittest.main()
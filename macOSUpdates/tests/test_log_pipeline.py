@@ -0,0 +1,60 @@
+"""
+로깅 파이프라인 테스트 - 보관 제한으로 지운 세션 로그는 색인에서도 빠짐
+Logging pipeline tests - session logs deleted by the retention cap also leave the index
+
+사용법 (Usage):
+    python -m pytest macOSUpdates/tests
+"""
+import os
+import sys
+import time
+import shutil
+import datetime
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_pipeline import LoggingPipeline
+from session_index import SessionIndex
+
+class PruneTest(unittest.TestCase):
+    """
+    크기/개수 제한으로 지운 로그와 세션 색인
+    Logs removed by the size/count caps and the session index
+    """
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp(prefix='pipeline_test_')
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
+        now = time.time()
+        self.paths = []
+        for number, version in enumerate(['99.1', '99.2', '99.3']):
+            started = datetime.datetime.fromtimestamp(now - 300 + number * 100)
+            path = os.path.join(self.log_dir, f"macOS_update_{started.strftime('%Y%m%d_%H%M%S')}_{version}.log")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f"[{started.strftime('%Y-%m-%d %H:%M:%S')}] marker{number} 다운로드 중\n")
+            os.utime(path, (now - 300 + number * 100,) * 2)
+            self.paths.append(path)
+
+    def prune(self, **retention):
+        return LoggingPipeline(self.log_dir, retention=retention).prune()
+
+    def indexed(self):
+        index = SessionIndex(os.path.join(self.log_dir, 'sessions.sqlite'))
+        try:
+            versions = sorted(row['version'] for row in index.sessions())
+            markers = sorted(row['text'].split()[0] for row in index.search_lines('다운로드'))
+        finally:
+            index.close()
+        return versions, markers
+
+    def test_count_cap_drops_deleted_sessions_from_index(self):
+        self.prune()
+        self.assertEqual(self.indexed(), (['99.1', '99.2', '99.3'], ['marker0', 'marker1', 'marker2']))
+        deleted = self.prune(max_files=2)
+        self.assertEqual(deleted, [self.paths[0]])
+        self.assertEqual(self.indexed(), (['99.2', '99.3'], ['marker1', 'marker2']))
+
+if __name__ == '__main__':
+    unittest.main()
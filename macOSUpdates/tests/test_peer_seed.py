@@ -0,0 +1,158 @@
+"""
+LAN 피어 배포 테스트 - 잘못된 매니페스트를 주는 피어는 건너뛰고 다음 피어에서 받음
+LAN peer distribution tests - a peer serving a bad manifest is skipped and the next peer serves the pull
+
+사용법 (Usage):
+    python -m pytest macOSUpdates/tests
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import plistlib
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from installer_cache import InstallerCache, ASSET_INFO_PATH
+from peer_seed import SeedServer, PeerClient, build_manifest
+
+CHUNK_SIZE = 64 * 1024
+
+def make_installer(folder, version, size=3 * CHUNK_SIZE + 10):
+    # 버전 정보와 여러 청크짜리 파일이 든 가짜 설치 프로그램 번들
+    # Fake installer bundle with version info and a multi-chunk file
+    app_path = os.path.join(folder, f'Install macOS Test {version}.app')
+    info_path = os.path.join(app_path, ASSET_INFO_PATH)
+    os.makedirs(os.path.dirname(info_path))
+    with open(info_path, 'wb') as f:
+        plistlib.dump({'Assets': [{'OSVersion': version, 'Build': 'T1'}]}, f)
+    with open(os.path.join(app_path, 'Contents', 'payload.bin'), 'wb') as f:
+        f.write(os.urandom(size))
+    return app_path
+
+def run_steps(steps):
+    # 단계 제너레이터를 끝까지 돌려 (상태 문자열 목록, 반환값) 반환
+    # Run a step generator to the end and return (status strings, return value)
+    messages = []
+    while True:
+        try:
+            step = next(steps)
+        except StopIteration as stop:
+            return messages, stop.value
+        if isinstance(step, str):
+            messages.append(step)
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'127.0.0.1:{server.server_address[1]}'
+
+class PeerClientTest(unittest.TestCase):
+    """
+    인증되지 않은 피어가 보낸 매니페스트 처리
+    Handling of manifests sent by unauthenticated peers
+    """
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='peer_test_')
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.source = os.path.join(self.root, 'source')
+        self.dest = os.path.join(self.root, 'dest')
+        os.makedirs(self.source)
+        os.makedirs(self.dest)
+        self.app_path = make_installer(self.source, '99.1')
+        cache = InstallerCache(os.path.join(self.root, 'state', 'index.json'), [self.source])
+        self.seed = SeedServer(cache, '127.0.0.1', 0, chunk_size=CHUNK_SIZE)
+        self.good_peer = serve(self.seed)
+        self.addCleanup(self.seed.server_close)
+        self.addCleanup(self.seed.shutdown)
+
+    def bad_peer(self, manifest):
+        # 주어진 매니페스트와 진짜 파일 내용을 제공하는 피어
+        # Peer serving the given manifest plus the real file contents
+        app_path = self.app_path
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.endswith('/manifest'):
+                    body = json.dumps(manifest).encode('utf-8')
+                else:
+                    with open(os.path.join(app_path, 'Contents', 'payload.bin'), 'rb') as f:
+                        body = f.read()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return serve(server)
+
+    def test_short_checksum_list_falls_through_to_next_peer(self):
+        manifest = build_manifest(self.app_path, '99.1', 'T1', CHUNK_SIZE)
+        for item in manifest['files']:
+            if item['path'].endswith('payload.bin'):
+                item['sha256'] = item['sha256'][:1]
+        client = PeerClient([self.bad_peer(manifest), self.good_peer], self.dest)
+        messages, path = run_steps(client.download('99.1'))
+        self.assertTrue(any('Peer failed' in message for message in messages), messages)
+        self.assertEqual(path, os.path.join(self.dest, os.path.basename(self.app_path)))
+
+    def test_concurrent_manifest_requests_share_one_build(self):
+        # 여러 스레드가 같은 버전을 동시에 요청해도 매니페스트는 한 번만 만듦
+        # Several threads asking for the same version at once build the manifest only once
+        import peer_seed
+        calls = []
+        original = peer_seed.build_manifest
+
+        def counting_build(*args, **kwargs):
+            calls.append(args[1])
+            return original(*args, **kwargs)
+
+        peer_seed.build_manifest = counting_build
+        self.addCleanup(setattr, peer_seed, 'build_manifest', original)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.seed.manifest('99.1'))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, ['99.1'])
+        self.assertEqual(len({id(manifest) for manifest in results}), 1)
+
+    def test_slow_manifest_build_does_not_block_other_versions(self):
+        # 한 버전의 매니페스트를 만드는 동안에도 다른 버전의 요청은 바로 처리됨
+        # A request for another version is served while one version's manifest is being built
+        import peer_seed
+        make_installer(self.source, '99.2')
+        release = threading.Event()
+        original = peer_seed.build_manifest
+
+        def blocking_build(app_path, version, *args, **kwargs):
+            if version == '99.1':
+                release.wait(10)
+            return original(app_path, version, *args, **kwargs)
+
+        peer_seed.build_manifest = blocking_build
+        self.addCleanup(setattr, peer_seed, 'build_manifest', original)
+        self.addCleanup(release.set)
+        slow = threading.Thread(target=self.seed.manifest, args=('99.1',))
+        slow.start()
+        other = []
+        fast = threading.Thread(target=lambda: other.append(self.seed.manifest('99.2')))
+        fast.start()
+        fast.join(5)
+        self.assertFalse(fast.is_alive())
+        self.assertEqual(other[0]['version'], '99.2')
+        release.set()
+        slow.join()
+
+if __name__ == '__main__':
+    unittest.main()